@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Data-driven ad schedule: pick each weekday's serving windows and bid modifiers from
+historical conversions and cost by segments.day_of_week x segments.hour, instead of the
+fixed (8, 11) / (16, 21) windows houston_mobile_notary_campaign.py gives a new campaign.
+
+The history becomes a 7 x 24 matrix of cost and conversions. Each cell scores the
+conversions it earned above what --threshold times the campaign's average efficiency
+would have earned for its cost, and each day's row is scanned for contiguous runs of
+positive hours. Runs separated by a single weak hour are bridged when the dip costs less
+than the smaller run earns, runs shorter than --min-hours are widened toward their better
+neighbour, and the six best runs a day (the API limit) become windows. Hours with no
+history score zero and are left out, so hours the current schedule never served stay
+off. Each window's bid modifier is its efficiency relative to the campaign average,
+shrunk toward 1.0 by one conversion's worth of prior and clamped to [0.5, 1.5] in 0.05
+steps. Smart bidding strategies ignore schedule bid
+modifiers; the windows still apply.
+
+The schedule goes through houston_mobile_notary_campaign.set_campaign_ad_schedule, which
+mutates only the criteria that differ from the current ones. A fit with no window worth
+serving is an error, never an empty schedule (which would serve around the clock).
+
+Usage:
+  python3 scripts/ads/ad_schedule_optimizer.py --customer-id 5072649468 --campaign-id 22917408924 --dry-run
+  python3 scripts/ads/ad_schedule_optimizer.py --customer-id 5072649468 --campaign-id 22917408924 --days 120 \
+    --threshold 0.9 --out scripts/ads/exports/ad-schedule.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from datetime import date, timedelta
+from typing import Any, Iterable, List, Optional, Tuple
+
+from google.ads.googleads.errors import GoogleAdsException
+
+from ads_client import load_client
+import ads_async
+import ads_profile
+import gaql
+import houston_mobile_notary_campaign as houston
+
+
+DAYS = houston.DAYS_OF_WEEK
+DEFAULT_DAYS = 90
+DEFAULT_THRESHOLD = 0.8
+MIN_WINDOW_HOURS = 2
+MAX_GAP_HOURS = 1
+MAX_WINDOWS_PER_DAY = 6
+PRIOR_CONVERSIONS = 1.0
+MIN_MODIFIER, MAX_MODIFIER, MODIFIER_STEP = 0.5, 1.5, 0.05
+HEAT = " .:-=+*#"
+
+HOURLY_PERFORMANCE = (
+    gaql.Query("campaign")
+    .select("segments.day_of_week", "segments.hour", "metrics.cost_micros", "metrics.conversions")
+    .where("campaign.id = :campaign_id")
+    .where("segments.date BETWEEN :first AND :last")
+)
+
+Matrix = List[List[float]]
+Window = Tuple[int, int]  # start hour, end hour (exclusive)
+
+
+def build_matrix(rows: Iterable[Any]) -> Tuple[Matrix, Matrix]:
+    """(cost in micros, conversions) by [day][hour], days in DAYS order."""
+    cost = [[0.0] * 24 for _ in DAYS]
+    conversions = [[0.0] * 24 for _ in DAYS]
+    index = {day: i for i, day in enumerate(DAYS)}
+    for row in rows:
+        d = index.get(row.segments.day_of_week.name)
+        if d is None:
+            continue
+        cost[d][row.segments.hour] += row.metrics.cost_micros
+        conversions[d][row.segments.hour] += row.metrics.conversions
+    return cost, conversions
+
+
+def positive_runs(scores: List[float]) -> List[Window]:
+    """Maximal runs of hours scoring above zero."""
+    runs: List[Window] = []
+    start = None
+    for h in range(25):
+        positive = h < 24 and scores[h] > 0
+        if positive and start is None:
+            start = h
+        elif not positive and start is not None:
+            runs.append((start, h))
+            start = None
+    return runs
+
+
+def _widen(window: Window, scores: List[float], taken: List[bool], min_hours: int) -> Window:
+    """Grow a short window one hour at a time toward its better free neighbour."""
+    start, end = window
+    while end - start < min_hours:
+        left = scores[start - 1] if start > 0 and not taken[start - 1] else None
+        right = scores[end] if end < 24 and not taken[end] else None
+        if left is None and right is None:
+            break
+        if right is None or (left is not None and left > right):
+            start -= 1
+        else:
+            end += 1
+    return start, end
+
+
+def day_windows(scores: List[float], min_hours: int, max_windows: int, max_gap: int = MAX_GAP_HOURS) -> List[Window]:
+    """
+    Serving windows for one day: runs of positive hours, bridged across dips of up to
+    `max_gap` hours that cost less than the smaller side earns, widened to `min_hours`,
+    and the `max_windows` with the largest total score.
+    """
+    merged: List[Window] = []
+    for start, end in positive_runs(scores):
+        if merged:
+            prev_start, prev_end = merged[-1]
+            gap = sum(scores[prev_end:start])
+            if start - prev_end <= max_gap and -gap < min(sum(scores[prev_start:prev_end]), sum(scores[start:end])):
+                merged[-1] = (prev_start, end)
+                continue
+        merged.append((start, end))
+
+    merged = sorted(merged, key=lambda w: sum(scores[w[0] : w[1]]), reverse=True)[:max_windows]
+    taken = [False] * 24
+    for start, end in merged:
+        for h in range(start, end):
+            taken[h] = True
+    windows: List[Window] = []
+    for window in merged:
+        start, end = _widen(window, scores, taken, min_hours)
+        for h in range(start, end):
+            taken[h] = True
+        windows.append((start, end))
+    return sorted(windows)
+
+
+def _modifier(conversions: float, expected: float) -> float:
+    index = (conversions + PRIOR_CONVERSIONS) / (expected + PRIOR_CONVERSIONS)
+    stepped = round(index / MODIFIER_STEP) * MODIFIER_STEP
+    return round(min(max(stepped, MIN_MODIFIER), MAX_MODIFIER), 2)
+
+
+def optimize(
+    cost: Matrix,
+    conversions: Matrix,
+    threshold: float = DEFAULT_THRESHOLD,
+    min_hours: int = MIN_WINDOW_HOURS,
+    max_windows: int = MAX_WINDOWS_PER_DAY,
+) -> houston.AdSchedule:
+    """(day, start_hour, end_hour) -> bid modifier for every window worth serving."""
+    total_cost = sum(map(sum, cost))
+    total_conversions = sum(map(sum, conversions))
+    if not total_conversions or not total_cost:
+        raise RuntimeError("No conversions in the history; keep the current schedule")
+    rate = total_conversions / total_cost
+    # Conversions above what `threshold` x the average efficiency would buy, per cell
+    scores = [[v - threshold * rate * c for c, v in zip(cost_row, conv_row)] for cost_row, conv_row in zip(cost, conversions)]
+
+    schedule: houston.AdSchedule = {}
+    for d, day in enumerate(DAYS):
+        for start, end in day_windows(scores[d], min_hours, max_windows):
+            window_cost = sum(cost[d][start:end])
+            window_conversions = sum(conversions[d][start:end])
+            schedule[(day, start, end)] = _modifier(window_conversions, rate * window_cost)
+    if not schedule:
+        # An empty schedule removes every window, i.e. serves around the clock
+        raise RuntimeError(f"No hour beats {threshold:g}x the average efficiency; keep the current schedule")
+    return schedule
+
+
+def print_report(cost: Matrix, conversions: Matrix, schedule: houston.AdSchedule) -> None:
+    total_cost = sum(map(sum, cost))
+    rate = sum(map(sum, conversions)) / total_cost
+    print("Efficiency by hour (conversions per cost vs. campaign average; ' ' none .. '#' 2x+):")
+    print("            " + "".join(str(h % 10) for h in range(24)))
+    for d, day in enumerate(DAYS):
+        cells = []
+        for c, v in zip(cost[d], conversions[d]):
+            index = v / (rate * c) if c else 0.0
+            cells.append(HEAT[min(int(index * (len(HEAT) - 1) / 2), len(HEAT) - 1)])
+        print(f"  {day:<9} |{''.join(cells)}|")
+    print("\nSchedule:")
+    kept_cost = kept_conversions = 0.0
+    for d, day in enumerate(DAYS):
+        windows = sorted((start, end, m) for (dd, start, end), m in schedule.items() if dd == day)
+        for start, end, _ in windows:
+            kept_cost += sum(cost[d][start:end])
+            kept_conversions += sum(conversions[d][start:end])
+        text = ", ".join(f"{start:02d}-{end:02d} x{m:.2f}" for start, end, m in windows) or "(no ads)"
+        print(f"  {day:<9} {text}")
+    print(
+        f"\nWindows held {kept_cost / total_cost:.0%} of historical cost and "
+        f"{kept_conversions / sum(map(sum, conversions)):.0%} of conversions."
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Fit a campaign's ad schedule and bid modifiers to its hourly history")
+    p.add_argument("--customer-id", required=True)
+    p.add_argument("--campaign-id", required=True)
+    p.add_argument("--config", default=None)
+    p.add_argument("--days", type=int, default=DEFAULT_DAYS, help="History to fit on, ending yesterday")
+    p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Minimum window efficiency vs. average")
+    p.add_argument("--min-hours", type=int, default=MIN_WINDOW_HOURS)
+    p.add_argument("--out", default=None, help="Also write the schedule as JSON")
+    p.add_argument("--dry-run", action="store_true", help="Report only; leave the campaign's schedule unchanged")
+    args = p.parse_args(argv)
+
+    try:
+        client = load_client(args.config)
+        last = date.today() - timedelta(days=1)
+        rows = ads_async.fetch(
+            client,
+            args.customer_id,
+            HOURLY_PERFORMANCE.bind(campaign_id=int(args.campaign_id), first=last - timedelta(days=args.days - 1), last=last),
+        )
+        cost, conversions = build_matrix(rows)
+        schedule = optimize(cost, conversions, args.threshold, args.min_hours)
+        print_report(cost, conversions, schedule)
+
+        if args.out:
+            os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump(
+                    [{"day": day, "start_hour": start, "end_hour": end, "bid_modifier": m} for (day, start, end), m in sorted(schedule.items())],
+                    f,
+                    indent=2,
+                )
+        if args.dry_run:
+            print("Dry-run: schedule not applied.")
+            return 0
+        with ads_profile.phase("write"):
+            counts = houston.set_campaign_ad_schedule(
+                client, args.customer_id, f"customers/{args.customer_id}/campaigns/{args.campaign_id}", schedule=schedule
+            )
+        print("Ad schedule: " + ", ".join(f"{k}={v}" for k, v in counts.items()))
+        return 0
+    except GoogleAdsException as ex:
+        print(f"GoogleAdsException: {ex}")
+        for e in ex.failure.errors:
+            print(f"  - {e.error_code}: {e.message}")
+        return 2
+    except Exception as ex:  # noqa: BLE001
+        print(f"Error: {ex}")
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(ads_profile.run(main))
@@ -11,6 +11,10 @@ Usage example:
     --config google-ads.yaml
 
 This script uses dynamic types from GoogleAdsClient to be version-agnostic.
+
+Assets are looked up in the account's asset index (asset_index.py) first: content that
+already exists as an asset is linked again rather than created, assets already linked
+to the campaign are skipped, and re-running the script sends no creates at all.
 """
 
 import argparse
@@ -19,15 +23,16 @@ from datetime import date
 
 from google.ads.googleads.client import GoogleAdsClient
 
+from ads_client import load_client
+import ads_profile
+import asset_index
+
 
 def micros_from_dollars(amount: float) -> int:
     return int(round(amount * 1_000_000))
 
 
-def add_sitelinks(client: GoogleAdsClient, customer_id: str, campaign_id: str, base_url: str):
-    asset_service = client.get_service("AssetService")
-    asset_operation = client.get_type("AssetOperation")
-
+def add_sitelinks(client: GoogleAdsClient, customer_id: str, campaign_id: str, base_url: str, index: asset_index.AssetIndex):
     sitelinks = [
         {"text": "Book Mobile Notary", "url": f"{base_url}/booking/enhanced"},
         {"text": "Start Online Notary", "url": f"{base_url}/ron/dashboard"},
@@ -44,29 +49,15 @@ def add_sitelinks(client: GoogleAdsClient, customer_id: str, campaign_id: str, b
         sitelink_asset = asset.sitelink_asset
         sitelink_asset.link_text = sl["text"]
         asset.final_urls.append(sl["url"])  # type: ignore[attr-defined]
-        operations.append(op)
+        operations.append(("SITELINK", op))
 
-    asset_response = asset_service.mutate_assets(customer_id=customer_id, operations=operations)
-    created_assets = [result.resource_name for result in asset_response.results]
+    # Reuse existing assets, then associate with campaign
+    asset_rns = index.ensure(client, operations)
+    campaign_res = client.get_service("GoogleAdsService").campaign_path(customer_id, campaign_id)
+    asset_index.link_to_campaign(client, customer_id, campaign_res, "SITELINK", asset_rns)
 
-    # Associate with campaign
-    campaign_asset_service = client.get_service("CampaignAssetService")
-    campaign_asset_ops = []
-    for asset_rn in created_assets:
-        ca_op = client.get_type("CampaignAssetOperation")
-        campaign_asset = ca_op.create
-        campaign_asset.asset = asset_rn
-        campaign_asset.field_type = client.enums.AssetFieldTypeEnum.SITELINK
-        campaign_asset.campaign = client.get_service("GoogleAdsService").campaign_path(customer_id, campaign_id)
-        campaign_asset_ops.append(ca_op)
 
-    if campaign_asset_ops:
-        campaign_asset_service.mutate_campaign_assets(
-            customer_id=customer_id, operations=campaign_asset_ops
-        )
-
-
-def add_callouts(client: GoogleAdsClient, customer_id: str, campaign_id: str):
+def add_callouts(client: GoogleAdsClient, customer_id: str, campaign_id: str, index: asset_index.AssetIndex):
     callouts = [
         "24/7 RON Available",
         "Same-Day Mobile*",
@@ -80,32 +71,19 @@ def add_callouts(client: GoogleAdsClient, customer_id: str, campaign_id: str):
         "Fast Online Booking",
     ]
 
-    asset_service = client.get_service("AssetService")
     operations = []
     for text in callouts:
         op = client.get_type("AssetOperation")
         asset = op.create
         asset.callout_asset.callout_text = text
-        operations.append(op)
-
-    resp = asset_service.mutate_assets(customer_id=customer_id, operations=operations)
-    asset_rns = [r.resource_name for r in resp.results]
+        operations.append(("CALLOUT", op))
 
-    campaign_asset_service = client.get_service("CampaignAssetService")
-    campaign_ops = []
-    for rn in asset_rns:
-        op = client.get_type("CampaignAssetOperation")
-        ca = op.create
-        ca.asset = rn
-        ca.field_type = client.enums.AssetFieldTypeEnum.CALLOUT
-        ca.campaign = client.get_service("GoogleAdsService").campaign_path(customer_id, campaign_id)
-        campaign_ops.append(op)
+    asset_rns = index.ensure(client, operations)
+    campaign_res = client.get_service("GoogleAdsService").campaign_path(customer_id, campaign_id)
+    asset_index.link_to_campaign(client, customer_id, campaign_res, "CALLOUT", asset_rns)
 
-    if campaign_ops:
-        campaign_asset_service.mutate_campaign_assets(customer_id=customer_id, operations=campaign_ops)
 
-
-def add_structured_snippet(client: GoogleAdsClient, customer_id: str, campaign_id: str):
+def add_structured_snippet(client: GoogleAdsClient, customer_id: str, campaign_id: str, index: asset_index.AssetIndex):
     values = [
         "Standard Mobile Notary",
         "Extended Hours Mobile",
@@ -117,33 +95,19 @@ def add_structured_snippet(client: GoogleAdsClient, customer_id: str, campaign_i
         "Evening & Weekend Mobile",
     ]
 
-    asset_service = client.get_service("AssetService")
     op = client.get_type("AssetOperation")
     asset = op.create
     ss = asset.structured_snippet_asset
-    # Some versions expose header enums directly on StructuredSnippetAsset
-    try:
-        ss.header = client.enums.StructuredSnippetAssetHeaderEnum.SERVICES
-    except Exception:
-        # Fallback enum path depending on library version
-        ss.header = client.enums.StructuredSnippetHeaderEnum.SERVICES
+    # The header is one of the predefined English header names, as a string
+    ss.header = "Services"
     ss.values.extend(values)
-    resp = asset_service.mutate_assets(customer_id=customer_id, operations=[op])
-    asset_rn = resp.results[0].resource_name
-
-    campaign_asset_service = client.get_service("CampaignAssetService")
-    ca_op = client.get_type("CampaignAssetOperation")
-    ca = ca_op.create
-    ca.asset = asset_rn
-    ca.field_type = client.enums.AssetFieldTypeEnum.STRUCTURED_SNIPPET
-    ca.campaign = client.get_service("GoogleAdsService").campaign_path(customer_id, campaign_id)
-    campaign_asset_service.mutate_campaign_assets(customer_id=customer_id, operations=[ca_op])
 
+    asset_rns = index.ensure(client, [("STRUCTURED_SNIPPET", op)])
+    campaign_res = client.get_service("GoogleAdsService").campaign_path(customer_id, campaign_id)
+    asset_index.link_to_campaign(client, customer_id, campaign_res, "STRUCTURED_SNIPPET", asset_rns)
 
-def add_price_extension(client: GoogleAdsClient, customer_id: str, campaign_id: str, base_url: str):
-    asset_service = client.get_service("AssetService")
-    money_type = client.get_type("Money")
 
+def add_price_extension(client: GoogleAdsClient, customer_id: str, campaign_id: str, base_url: str, index: asset_index.AssetIndex):
     price_items = [
         {"label": "Standard Mobile Notary", "price": 75.0, "url": f"{base_url}/booking/enhanced"},
         {"label": "Extended Hours Mobile", "price": 125.0, "url": f"{base_url}/booking/enhanced"},
@@ -156,33 +120,24 @@ def add_price_extension(client: GoogleAdsClient, customer_id: str, campaign_id:
     asset = op.create
     pa = asset.price_asset
     pa.type_ = client.enums.PriceExtensionTypeEnum.SERVICES
-    pa.price_qualifier = client.enums.PriceExtensionPriceQualifierEnum.NONE
+    # price_qualifier (FROM / UP_TO / AVERAGE) and offering units (PER_*) stay unset: flat prices
     pa.language_code = "en"
 
     for item in price_items:
         offering = client.get_type("PriceOffering")
         offering.header = item["label"]
-        offering.final_urls.append(item["url"])  # type: ignore[attr-defined]
-        offering.unit = client.enums.PriceExtensionPriceUnitEnum.NONE
+        offering.final_url = item["url"]
         offering.price.amount_micros = micros_from_dollars(item["price"])  # type: ignore[attr-defined]
         offering.price.currency_code = "USD"  # type: ignore[attr-defined]
         pa.price_offerings.append(offering)
 
-    resp = asset_service.mutate_assets(customer_id=customer_id, operations=[op])
-    asset_rn = resp.results[0].resource_name
+    asset_rns = index.ensure(client, [("PRICE", op)])
+    campaign_res = client.get_service("GoogleAdsService").campaign_path(customer_id, campaign_id)
+    asset_index.link_to_campaign(client, customer_id, campaign_res, "PRICE", asset_rns)
 
-    campaign_asset_service = client.get_service("CampaignAssetService")
-    ca_op = client.get_type("CampaignAssetOperation")
-    ca = ca_op.create
-    ca.asset = asset_rn
-    ca.field_type = client.enums.AssetFieldTypeEnum.PRICE
-    ca.campaign = client.get_service("GoogleAdsService").campaign_path(customer_id, campaign_id)
-    campaign_asset_service.mutate_campaign_assets(customer_id=customer_id, operations=[ca_op])
 
-
-def add_promo_extension(client: GoogleAdsClient, customer_id: str, campaign_id: str):
+def add_promo_extension(client: GoogleAdsClient, customer_id: str, campaign_id: str, index: asset_index.AssetIndex):
     # Promo: First-time Client — $15 Off, Aug 23, 2025 → Sep 30, 2025, code HMNP15
-    asset_service = client.get_service("AssetService")
     op = client.get_type("AssetOperation")
     asset = op.create
     promo = asset.promotion_asset
@@ -194,16 +149,9 @@ def add_promo_extension(client: GoogleAdsClient, customer_id: str, campaign_id:
     promo.start_date = "2025-08-23"
     promo.end_date = "2025-09-30"
 
-    resp = asset_service.mutate_assets(customer_id=customer_id, operations=[op])
-    asset_rn = resp.results[0].resource_name
-
-    campaign_asset_service = client.get_service("CampaignAssetService")
-    ca_op = client.get_type("CampaignAssetOperation")
-    ca = ca_op.create
-    ca.asset = asset_rn
-    ca.field_type = client.enums.AssetFieldTypeEnum.PROMOTION
-    ca.campaign = client.get_service("GoogleAdsService").campaign_path(customer_id, campaign_id)
-    campaign_asset_service.mutate_campaign_assets(customer_id=customer_id, operations=[ca_op])
+    asset_rns = index.ensure(client, [("PROMOTION", op)])
+    campaign_res = client.get_service("GoogleAdsService").campaign_path(customer_id, campaign_id)
+    asset_index.link_to_campaign(client, customer_id, campaign_res, "PROMOTION", asset_rns)
 
 
 def main():
@@ -212,23 +160,26 @@ def main():
     parser.add_argument("--campaign-id", required=True, help="Campaign ID")
     parser.add_argument("--base-url", required=True, help="Base site URL, e.g. https://example.com")
     parser.add_argument("--config", default="google-ads.yaml", help="Path to google-ads.yaml")
+    parser.add_argument("--asset-index", default=asset_index.DEFAULT_DB, help="Local asset index (SQLite)")
+    parser.add_argument("--rebuild-index", action="store_true", help="Re-read every asset into the index")
 
     args = parser.parse_args()
 
-    client = GoogleAdsClient.load_from_storage(path=args.config)
+    client = load_client(args.config)
+    index = asset_index.open_index(client, args.customer_id, args.asset_index, args.rebuild_index)
 
-    add_sitelinks(client, args.customer_id, args.campaign_id, args.base_url)
-    add_callouts(client, args.customer_id, args.campaign_id)
-    add_structured_snippet(client, args.customer_id, args.campaign_id)
-    add_price_extension(client, args.customer_id, args.campaign_id, args.base_url)
-    add_promo_extension(client, args.customer_id, args.campaign_id)
+    add_sitelinks(client, args.customer_id, args.campaign_id, args.base_url, index)
+    add_callouts(client, args.customer_id, args.campaign_id, index)
+    add_structured_snippet(client, args.customer_id, args.campaign_id, index)
+    add_price_extension(client, args.customer_id, args.campaign_id, args.base_url, index)
+    add_promo_extension(client, args.customer_id, args.campaign_id, index)
 
     print("Extensions added and associated with campaign", args.campaign_id)
 
 
 if __name__ == "__main__":
     try:
-        main()
+        ads_profile.run(main)
     except Exception as e:
         print(f"Error adding extensions: {e}", file=sys.stderr)
         sys.exit(1)
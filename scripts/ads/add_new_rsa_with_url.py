@@ -25,6 +25,19 @@ from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 from google.protobuf.field_mask_pb2 import FieldMask
 
+from ads_client import load_client
+import ads_profile
+import gaql
+
+
+AD_GROUP_RSAS = (
+    gaql.Query("ad_group_ad")
+    .select("ad_group_ad.resource_name", "ad_group_ad.status")
+    .where("ad_group_ad.ad_group = :ad_group")
+    .where("ad_group_ad.ad.type = RESPONSIVE_SEARCH_AD")
+    .where("ad_group_ad.status != REMOVED")
+)
+
 
 def run_query(client: GoogleAdsClient, customer_id: str, query: str):
     svc = client.get_service("GoogleAdsService")
@@ -38,14 +51,7 @@ def get_ad_group_resource_name(client: GoogleAdsClient, customer_id: str, ad_gro
 
 
 def list_rsas_in_ad_group(client: GoogleAdsClient, customer_id: str, ad_group_resource: str):
-    q = (
-        "SELECT ad_group_ad.resource_name, ad_group_ad.status, ad_group_ad.ad.id, "
-        "ad_group_ad.ad.final_urls FROM ad_group_ad "
-        f"WHERE ad_group_ad.ad_group = '{ad_group_resource}' "
-        "AND ad_group_ad.ad.type = RESPONSIVE_SEARCH_AD "
-        "AND ad_group_ad.status != REMOVED"
-    )
-    return list(run_query(client, customer_id, q))
+    return list(run_query(client, customer_id, AD_GROUP_RSAS.bind(ad_group=ad_group_resource)))
 
 
 def pause_ads(client: GoogleAdsClient, customer_id: str, resource_names: List[str]) -> None:
@@ -112,7 +118,7 @@ def main(argv: Optional[list[str]] = None) -> int:
     args = p.parse_args(argv)
 
     try:
-        client = GoogleAdsClient.load_from_storage(path=args.config) if args.config else GoogleAdsClient.load_from_storage()
+        client = load_client(args.config)
         ad_group_res = get_ad_group_resource_name(client, args.customer_id, args.ad_group_id)
 
         rows = list_rsas_in_ad_group(client, args.customer_id, ad_group_res)
@@ -174,6 +180,6 @@ def main(argv: Optional[list[str]] = None) -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(ads_profile.run(main))
 
 
@@ -16,21 +16,29 @@ from typing import List, Optional
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 
+from ads_client import load_client
+import ads_profile
+import gaql
+
 
 DEFAULT_CAMPAIGN_NAME = "HMNP – Mobile – 77591 Radius"
 AUDIENCE_KEYWORDS = ["Real Estate", "Financial", "Moving"]
 
+CAMPAIGNS = gaql.Query("campaign").select(
+    "campaign.resource_name", "campaign.name", "campaign.status", "campaign.advertising_channel_type"
+)
+AD_GROUPS_IN_CAMPAIGN = (
+    gaql.Query("ad_group").select("ad_group.resource_name", "ad_group.status").where("ad_group.campaign = :campaign")
+)
+USER_INTERESTS = gaql.Query("user_interest").select("user_interest.user_interest_id", "user_interest.name")
+
 
 def run_query(client: GoogleAdsClient, customer_id: str, query: str):
     return client.get_service("GoogleAdsService").search(customer_id=customer_id, query=query)
 
 
 def find_campaign(client: GoogleAdsClient, customer_id: str, name_hint: str) -> Optional[str]:
-    q = (
-        "SELECT campaign.resource_name, campaign.name, campaign.status, campaign.advertising_channel_type "
-        "FROM campaign"
-    )
-    for row in run_query(client, customer_id, q):
+    for row in run_query(client, customer_id, CAMPAIGNS.bind()):
         if row.campaign.name == name_hint:
             return row.campaign.resource_name
         if row.campaign.status.name == "ENABLED" and row.campaign.advertising_channel_type.name == "SEARCH":
@@ -40,12 +48,7 @@ def find_campaign(client: GoogleAdsClient, customer_id: str, name_hint: str) ->
 
 
 def find_enabled_ad_group(client: GoogleAdsClient, customer_id: str, campaign_res: str) -> Optional[str]:
-    q = f"""
-      SELECT ad_group.resource_name, ad_group.status
-      FROM ad_group
-      WHERE ad_group.campaign = '{campaign_res}'
-    """
-    for row in run_query(client, customer_id, q):
+    for row in run_query(client, customer_id, AD_GROUPS_IN_CAMPAIGN.bind(campaign=campaign_res)):
         if row.ad_group.status.name in ("ENABLED", "PAUSED"):
             return row.ad_group.resource_name
     return None
@@ -70,13 +73,9 @@ def ensure_observation_setting(client: GoogleAdsClient, customer_id: str, ad_gro
 
 def find_user_interests(client: GoogleAdsClient, customer_id: str, keywords: List[str]) -> List[str]:
     # Fetch in-market user interests loosely by name match
-    q = (
-        "SELECT user_interest.user_interest_id, user_interest.name, user_interest.user_interest_parent, user_interest.availability_status "
-        "FROM user_interest"
-    )
     rns: List[str] = []
     svc = client.get_service("GoogleAdsService")
-    for row in svc.search(customer_id=customer_id, query=q):
+    for row in svc.search(customer_id=customer_id, query=USER_INTERESTS.bind()):
         name = row.user_interest.name or ""
         if any(k.lower() in name.lower() for k in keywords):
             rns.append(svc.user_interest_path(customer_id, row.user_interest.user_interest_id))
@@ -105,7 +104,7 @@ def main():
     p.add_argument("--config", default="google-ads.yaml")
     args = p.parse_args()
 
-    client = GoogleAdsClient.load_from_storage(path=args.config)
+    client = load_client(args.config)
 
     try:
         campaign_res = find_campaign(client, args.customer_id, args.campaign_name)
@@ -127,6 +126,6 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    ads_profile.run(main)
 
 
@@ -0,0 +1,244 @@
+"""
+Asyncio Google Ads reader on the grpc.aio transport.
+
+AsyncQueryClient opens one secure channel for a loaded GoogleAdsClient (same credentials,
+developer token, login-customer-id and API version) and exposes async generators over
+GoogleAdsService.Search (paged) and SearchStream. Concurrency is bounded by a semaphore,
+every call goes through the same token buckets and retry policy as the sync services
+(ads_retry.py) and is recorded by the shared telemetry sink (ads_telemetry.py).
+Cancelling a task cancels its in-flight RPC; fetch_all() cancels the remaining queries
+as soon as one fails.
+
+Sync callers use the module helpers, which run one event loop per batch:
+
+    rows = ads_async.fetch(client, customer_id, query)
+    by_name = ads_async.fetch_all(client, customer_id, {"campaigns": q1, "ads": q2})
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from typing import Any, AsyncIterator, Dict, Hashable, List, Optional
+
+import grpc
+from google.ads.googleads.client import GoogleAdsClient
+from google.ads.googleads.errors import GoogleAdsException
+
+import ads_profile
+import ads_retry
+import ads_telemetry
+
+
+DEFAULT_ENDPOINT = "googleads.googleapis.com"
+DEFAULT_CONCURRENCY = 8
+CHANNEL_OPTIONS = [
+    ("grpc.max_metadata_size", 16 * 1024 * 1024),
+    ("grpc.max_receive_message_length", 64 * 1024 * 1024),
+]
+
+
+def api_version(client: GoogleAdsClient) -> str:
+    """"v17" etc., from the module the client's generated types come from."""
+    module = type(client.get_type("SearchGoogleAdsRequest")).__module__
+    match = re.search(r"\.(v\d+)\.", module)
+    if not match:
+        raise RuntimeError(f"Cannot tell the Google Ads API version from {module}")
+    return match.group(1)
+
+
+class AsyncQueryClient:
+    def __init__(self, client: GoogleAdsClient, max_concurrency: int = DEFAULT_CONCURRENCY):
+        self._client = client
+        self._max_concurrency = max_concurrency
+        version = api_version(client)
+        self._service = f"/google.ads.googleads.{version}.services.GoogleAdsService"
+        self._failure_key = f"google.ads.googleads.{version}.errors.googleadsfailure-bin"
+        self._types = {
+            name: type(client.get_type(name))
+            for name in (
+                "SearchGoogleAdsRequest",
+                "SearchGoogleAdsResponse",
+                "SearchGoogleAdsStreamRequest",
+                "SearchGoogleAdsStreamResponse",
+                "GoogleAdsFailure",
+            )
+        }
+        self._metadata = [("developer-token", client.developer_token)]
+        if getattr(client, "login_customer_id", None):
+            self._metadata.append(("login-customer-id", str(client.login_customer_id)))
+        if getattr(client, "linked_customer_id", None):
+            self._metadata.append(("linked-customer-id", str(client.linked_customer_id)))
+        self._retry = ads_retry.create_interceptor(client.developer_token)
+        self._telemetry = (
+            ads_telemetry.shared_telemetry(self._types["GoogleAdsFailure"]) if ads_telemetry.telemetry_enabled() else None
+        )
+        self._channel: Optional[grpc.aio.Channel] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncQueryClient":
+        from google.auth.transport.grpc import AuthMetadataPlugin
+        from google.auth.transport.requests import Request
+
+        call_credentials = grpc.metadata_call_credentials(AuthMetadataPlugin(self._client.credentials, Request()))
+        credentials = grpc.composite_channel_credentials(grpc.ssl_channel_credentials(), call_credentials)
+        endpoint = getattr(self._client, "endpoint", None) or DEFAULT_ENDPOINT
+        self._channel = grpc.aio.secure_channel(f"{endpoint}:443", credentials, options=CHANNEL_OPTIONS)
+        self._search = self._channel.unary_unary(
+            f"{self._service}/Search",
+            request_serializer=self._types["SearchGoogleAdsRequest"].serialize,
+            response_deserializer=self._types["SearchGoogleAdsResponse"].deserialize,
+        )
+        self._search_stream = self._channel.unary_stream(
+            f"{self._service}/SearchStream",
+            request_serializer=self._types["SearchGoogleAdsStreamRequest"].serialize,
+            response_deserializer=self._types["SearchGoogleAdsStreamResponse"].deserialize,
+        )
+        # Created inside the running loop (older Pythons bind primitives to a loop at creation)
+        self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        if self._channel is not None:
+            await self._channel.close()
+            self._channel = None
+
+    def _to_exception(self, error: grpc.aio.AioRpcError) -> BaseException:
+        """GoogleAdsException when the trailers carry a GoogleAdsFailure, else the RPC error itself."""
+        metadata = error.trailing_metadata() or ()
+        request_id = None
+        failure = None
+        for key, value in metadata:
+            if key == ads_telemetry.REQUEST_ID_KEY:
+                request_id = value
+            elif key == self._failure_key:
+                failure = self._types["GoogleAdsFailure"].deserialize(value)
+        if failure is None:
+            return error
+        return GoogleAdsException(error, error, failure, request_id)
+
+    def _record(self, method: str, start: float, request: Any, status: str = "OK", request_id: Any = None, error: Optional[BaseException] = None, **counts: Any) -> None:
+        if self._telemetry is None:
+            return
+        seconds = time.perf_counter() - start
+        if error is not None:
+            status, request_id, codes = self._telemetry.describe_error(error)
+            self._telemetry.record(method, seconds, status, request_id, request.customer_id, error_codes=codes, **counts)
+        else:
+            self._telemetry.record(method, seconds, status, request_id, request.customer_id, **counts)
+
+    async def _throttle(self, bucket: ads_retry.TokenBucket) -> None:
+        wait = bucket.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def _search_page(self, request: Any) -> Any:
+        method = f"{self._service}/Search"
+        bucket = self._retry.bucket_for(request)
+        attempt = 0
+        while True:
+            await self._throttle(bucket)
+            async with self._semaphore:
+                start = time.perf_counter()
+                call = self._search(request, metadata=self._metadata)
+                try:
+                    response = await call
+                except grpc.aio.AioRpcError as err:
+                    ex = self._to_exception(err)
+                    self._record(method, start, request, error=ex, first_page=not request.page_token)
+                    delay = self._retry.backoff(ex, attempt, method, bucket)
+                    if delay is None:
+                        raise ex from None
+                else:
+                    request_id = dict(await call.trailing_metadata() or ()).get(ads_telemetry.REQUEST_ID_KEY)
+                    self._record(method, start, request, request_id=request_id, rows=len(response.results), first_page=not request.page_token)
+                    bucket.on_success()
+                    return response
+            if delay:
+                await asyncio.sleep(delay)
+            attempt += 1
+
+    async def search(self, customer_id: str, query: str) -> AsyncIterator[Any]:
+        """Rows of a paged Search; each page is one rate-limited, retried request."""
+        page_token = ""
+        while True:
+            request = self._types["SearchGoogleAdsRequest"](customer_id=customer_id, query=query, page_token=page_token)
+            response = await self._search_page(request)
+            for row in response.results:
+                yield row
+            page_token = response.next_page_token
+            if not page_token:
+                return
+
+    async def search_stream(self, customer_id: str, query: str) -> AsyncIterator[Any]:
+        """Rows of a SearchStream; transient failures restart it only before the first batch."""
+        method = f"{self._service}/SearchStream"
+        request = self._types["SearchGoogleAdsStreamRequest"](customer_id=customer_id, query=query)
+        bucket = self._retry.bucket_for(request)
+        attempt = 0
+        while True:
+            await self._throttle(bucket)
+            async with self._semaphore:
+                start = time.perf_counter()
+                call = self._search_stream(request, metadata=self._metadata)
+                batches = rows = 0
+                try:
+                    async for batch in call:
+                        batches += 1
+                        rows += len(batch.results)
+                        for row in batch.results:
+                            yield row
+                    request_id = dict(await call.trailing_metadata() or ()).get(ads_telemetry.REQUEST_ID_KEY)
+                    self._record(method, start, request, request_id=request_id, rows=rows, pages=max(batches, 1))
+                    bucket.on_success()
+                    return
+                except grpc.aio.AioRpcError as err:
+                    ex = self._to_exception(err)
+                    self._record(method, start, request, error=ex, rows=rows, pages=max(batches, 1))
+                    delay = None if batches else self._retry.backoff(ex, attempt, method, bucket)
+                    if delay is None:
+                        raise ex from None
+                finally:
+                    if not call.done():
+                        call.cancel()
+            if delay:
+                await asyncio.sleep(delay)
+            attempt += 1
+
+    async def fetch(self, customer_id: str, query: str) -> List[Any]:
+        return [row async for row in self.search_stream(customer_id, query)]
+
+    async def fetch_all(self, customer_id: str, queries: Dict[Hashable, str]) -> Dict[Hashable, List[Any]]:
+        """Run independent queries concurrently; the first failure cancels the rest and is raised."""
+        tasks = {key: asyncio.ensure_future(self.fetch(customer_id, query)) for key, query in queries.items()}
+        if not tasks:
+            return {}
+        done, pending = await asyncio.wait(tasks.values(), return_when=asyncio.FIRST_EXCEPTION)
+        failed = next((t for t in done if not t.cancelled() and t.exception() is not None), None)
+        if failed is not None:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            raise failed.exception()
+        return {key: task.result() for key, task in tasks.items()}
+
+
+def fetch_all(
+    client: GoogleAdsClient,
+    customer_id: str,
+    queries: Dict[Hashable, str],
+    max_concurrency: int = DEFAULT_CONCURRENCY,
+) -> Dict[Hashable, List[Any]]:
+    """Blocking wrapper: run `queries` on one event loop and shared channel, keyed like the input."""
+
+    async def _run() -> Dict[Hashable, List[Any]]:
+        async with AsyncQueryClient(client, max_concurrency) as reader:
+            return await reader.fetch_all(customer_id, queries)
+
+    with ads_profile.phase("query"):
+        return asyncio.run(_run())
+
+
+def fetch(client: GoogleAdsClient, customer_id: str, query: str) -> List[Any]:
+    return fetch_all(client, customer_id, {0: query})[0]
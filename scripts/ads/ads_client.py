@@ -0,0 +1,64 @@
+"""
+Shared GoogleAdsClient loader for the scripts in this directory.
+
+Every entry point loads its client through load_client() so cross-cutting behaviour
+is installed in one place: each service returned by client.get_service() carries the
+extra gRPC interceptors, outermost first:
+  - "query" phase timing, only while --profile is on (ads_profile.py)
+  - rate limiting and retry of transient errors (ads_retry.py)
+  - per-call telemetry (ads_telemetry.py), so every attempt is recorded
+"""
+
+from __future__ import annotations
+
+from typing import Any, List, Optional
+
+from google.ads.googleads.client import GoogleAdsClient
+
+import ads_profile
+import ads_retry
+import ads_telemetry
+
+
+def _failure_type(client: GoogleAdsClient) -> Optional[Any]:
+    try:
+        return client.get_type("GoogleAdsFailure")
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def install_interceptors(client: GoogleAdsClient, interceptors: List[Any]) -> GoogleAdsClient:
+    """Make client.get_service() append `interceptors` to whatever the caller passes."""
+    if not interceptors:
+        return client
+    get_service = client.get_service
+
+    def _get_service(name: str, *args: Any, interceptors: Optional[List[Any]] = None, **kwargs: Any):
+        return get_service(name, *args, interceptors=[*(interceptors or []), *extra], **kwargs)
+
+    extra = list(interceptors)
+    client.get_service = _get_service  # type: ignore[method-assign]
+    return client
+
+
+def _refresh_credentials(client: GoogleAdsClient) -> None:
+    """Fetch the OAuth token now rather than inside the first API call (profiling only)."""
+    try:
+        from google.auth.transport.requests import Request
+
+        client.credentials.refresh(Request())
+    except Exception:  # noqa: BLE001 - the first call will refresh and surface the error
+        pass
+
+
+def load_client(config_file: Optional[str] = None) -> GoogleAdsClient:
+    with ads_profile.phase("auth"):
+        client = GoogleAdsClient.load_from_storage(path=config_file) if config_file else GoogleAdsClient.load_from_storage()
+        if ads_profile.active():
+            _refresh_credentials(client)
+    interceptors: List[Any] = [ads_retry.create_interceptor(getattr(client, "developer_token", ""))]
+    if ads_profile.active():
+        interceptors.insert(0, ads_profile.create_interceptor())
+    if ads_telemetry.telemetry_enabled():
+        interceptors.append(ads_telemetry.create_interceptor(_failure_type(client)))
+    return install_interceptors(client, interceptors)
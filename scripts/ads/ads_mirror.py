@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+"""
+Local SQLite mirror of account structure: campaigns, budgets, ad groups, ads, ad group
+and campaign criteria, assets, campaign assets and conversion actions.
+
+The first sync streams every entity concurrently (ads_async, no paging). Later syncs read
+change_status since the stored watermark and re-fetch only the resources it reports,
+by resource name, in chunks; resources that no longer come back are deleted. Budgets
+and conversion actions are not covered by change_status and are small, so they are
+reloaded on every sync. change_status only reaches back 90 days, so a mirror whose
+watermark is older than that (or that falls behind by more than one 10k-row page at a
+single timestamp) is fully reloaded.
+
+list_ad_urls.py, list_campaign_assets.py and audit_campaign.py read the mirror with
+--mirror (sync first) or --offline (no API calls at all).
+
+Usage:
+  python3 scripts/ads/ads_mirror.py sync --customer-id 5072649468 --config google-ads.yaml
+  python3 scripts/ads/ads_mirror.py sync --customer-id 5072649468 --full
+  python3 scripts/ads/ads_mirror.py status
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+from google.ads.googleads.client import GoogleAdsClient
+from google.ads.googleads.errors import GoogleAdsException
+
+from ads_client import load_client
+import ads_async
+import ads_profile
+import gaql
+
+
+DEFAULT_DB = "scripts/ads/exports/account_mirror.sqlite"
+CHANGE_STATUS_LIMIT = 10_000
+CHANGE_WINDOW_DAYS = 89  # change_status keeps 90 days; leave a day of slack for time zones
+REFETCH_CHUNK = 500
+INSERT_BATCH = 5_000
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+CHANGE_LAG = timedelta(minutes=15)
+
+
+class Entity(NamedTuple):
+    table: str
+    resource: str  # GAQL FROM resource
+    fields: str  # GAQL SELECT list
+    columns: Tuple[str, ...]  # table columns after resource_name and customer_id
+    extract: Callable[[Any], Tuple[Any, ...]]
+    change_type: Optional[str]  # change_status.resource_type, None when not tracked
+
+
+def _enum(value: Any) -> str:
+    return getattr(value, "name", str(value))
+
+
+ENTITIES: List[Entity] = [
+    Entity(
+        "campaigns",
+        "campaign",
+        "campaign.resource_name, campaign.id, campaign.name, campaign.status, campaign.advertising_channel_type, "
+        "campaign.bidding_strategy_type, campaign.campaign_budget, campaign.start_date, campaign.end_date",
+        ("campaign_id", "name", "status", "channel", "bidding", "budget", "start_date", "end_date"),
+        lambda r: (
+            r.campaign.resource_name, r.campaign.id, r.campaign.name, _enum(r.campaign.status),
+            _enum(r.campaign.advertising_channel_type), _enum(r.campaign.bidding_strategy_type),
+            r.campaign.campaign_budget, r.campaign.start_date, r.campaign.end_date,
+        ),
+        "CAMPAIGN",
+    ),
+    Entity(
+        "budgets",
+        "campaign_budget",
+        "campaign_budget.resource_name, campaign_budget.name, campaign_budget.amount_micros, "
+        "campaign_budget.delivery_method, campaign_budget.explicitly_shared",
+        ("name", "amount_micros", "delivery", "shared"),
+        lambda r: (
+            r.campaign_budget.resource_name, r.campaign_budget.name, r.campaign_budget.amount_micros,
+            _enum(r.campaign_budget.delivery_method), int(bool(r.campaign_budget.explicitly_shared)),
+        ),
+        None,
+    ),
+    Entity(
+        "ad_groups",
+        "ad_group",
+        "ad_group.resource_name, ad_group.id, campaign.id, ad_group.name, ad_group.status",
+        ("ad_group_id", "campaign_id", "name", "status"),
+        lambda r: (r.ad_group.resource_name, r.ad_group.id, r.campaign.id, r.ad_group.name, _enum(r.ad_group.status)),
+        "AD_GROUP",
+    ),
+    Entity(
+        "ads",
+        "ad_group_ad",
+        "ad_group_ad.resource_name, ad_group_ad.ad.id, ad_group.id, campaign.id, ad_group_ad.ad.type, "
+        "ad_group_ad.status, ad_group_ad.ad.final_urls, ad_group_ad.ad.responsive_search_ad.path1, "
+        "ad_group_ad.ad.responsive_search_ad.path2",
+        ("ad_id", "ad_group_id", "campaign_id", "type", "status", "final_urls", "path1", "path2"),
+        lambda r: (
+            r.ad_group_ad.resource_name, r.ad_group_ad.ad.id, r.ad_group.id, r.campaign.id,
+            _enum(r.ad_group_ad.ad.type_), _enum(r.ad_group_ad.status), json.dumps(list(r.ad_group_ad.ad.final_urls)),
+            r.ad_group_ad.ad.responsive_search_ad.path1, r.ad_group_ad.ad.responsive_search_ad.path2,
+        ),
+        "AD_GROUP_AD",
+    ),
+    Entity(
+        "ad_group_criteria",
+        "ad_group_criterion",
+        "ad_group_criterion.resource_name, ad_group_criterion.criterion_id, ad_group.id, campaign.id, "
+        "ad_group_criterion.type, ad_group_criterion.status, ad_group_criterion.negative, "
+        "ad_group_criterion.keyword.text, ad_group_criterion.keyword.match_type",
+        ("criterion_id", "ad_group_id", "campaign_id", "type", "status", "negative", "keyword_text", "match_type"),
+        lambda r: (
+            r.ad_group_criterion.resource_name, r.ad_group_criterion.criterion_id, r.ad_group.id, r.campaign.id,
+            _enum(r.ad_group_criterion.type_), _enum(r.ad_group_criterion.status), int(bool(r.ad_group_criterion.negative)),
+            r.ad_group_criterion.keyword.text, _enum(r.ad_group_criterion.keyword.match_type),
+        ),
+        "AD_GROUP_CRITERION",
+    ),
+    Entity(
+        "campaign_criteria",
+        "campaign_criterion",
+        "campaign_criterion.resource_name, campaign_criterion.criterion_id, campaign.id, campaign_criterion.type, "
+        "campaign_criterion.negative, campaign_criterion.keyword.text, campaign_criterion.keyword.match_type, "
+        "campaign_criterion.location.geo_target_constant, campaign_criterion.proximity.address.postal_code, "
+        "campaign_criterion.proximity.address.country_code, campaign_criterion.proximity.radius, "
+        "campaign_criterion.proximity.radius_units, campaign_criterion.ad_schedule.day_of_week, "
+        "campaign_criterion.ad_schedule.start_hour, campaign_criterion.ad_schedule.end_hour",
+        (
+            "criterion_id", "campaign_id", "type", "negative", "keyword_text", "match_type", "geo_target",
+            "postal_code", "country_code", "radius", "radius_units", "day_of_week", "start_hour", "end_hour",
+        ),
+        lambda r: (
+            r.campaign_criterion.resource_name, r.campaign_criterion.criterion_id, r.campaign.id,
+            _enum(r.campaign_criterion.type_), int(bool(r.campaign_criterion.negative)),
+            r.campaign_criterion.keyword.text, _enum(r.campaign_criterion.keyword.match_type),
+            r.campaign_criterion.location.geo_target_constant,
+            r.campaign_criterion.proximity.address.postal_code, r.campaign_criterion.proximity.address.country_code,
+            r.campaign_criterion.proximity.radius, _enum(r.campaign_criterion.proximity.radius_units),
+            _enum(r.campaign_criterion.ad_schedule.day_of_week),
+            r.campaign_criterion.ad_schedule.start_hour, r.campaign_criterion.ad_schedule.end_hour,
+        ),
+        "CAMPAIGN_CRITERION",
+    ),
+    Entity(
+        "assets",
+        "asset",
+        "asset.resource_name, asset.id, asset.type, asset.sitelink_asset.link_text, asset.callout_asset.callout_text, "
+        "asset.structured_snippet_asset.header, asset.structured_snippet_asset.values, asset.price_asset.type, "
+        "asset.promotion_asset.promotion_target, asset.final_urls",
+        (
+            "asset_id", "type", "sitelink_text", "callout_text", "snippet_header", "snippet_values",
+            "price_type", "promotion_target", "final_urls",
+        ),
+        lambda r: (
+            r.asset.resource_name, r.asset.id, _enum(r.asset.type_), r.asset.sitelink_asset.link_text,
+            r.asset.callout_asset.callout_text, str(r.asset.structured_snippet_asset.header),
+            json.dumps(list(r.asset.structured_snippet_asset.values)), _enum(r.asset.price_asset.type_),
+            r.asset.promotion_asset.promotion_target, json.dumps(list(r.asset.final_urls)),
+        ),
+        "ASSET",
+    ),
+    Entity(
+        "campaign_assets",
+        "campaign_asset",
+        "campaign_asset.resource_name, campaign.id, asset.id, campaign_asset.field_type, campaign_asset.status",
+        ("campaign_id", "asset_id", "field_type", "status"),
+        lambda r: (
+            r.campaign_asset.resource_name, r.campaign.id, r.asset.id,
+            _enum(r.campaign_asset.field_type), _enum(r.campaign_asset.status),
+        ),
+        "CAMPAIGN_ASSET",
+    ),
+    Entity(
+        "conversion_actions",
+        "conversion_action",
+        "conversion_action.resource_name, conversion_action.id, conversion_action.name, conversion_action.status, "
+        "conversion_action.primary_for_goal, conversion_action.category, conversion_action.type, "
+        "conversion_action.value_settings.default_value",
+        ("conversion_action_id", "name", "status", "primary_for_goal", "category", "type", "default_value"),
+        lambda r: (
+            r.conversion_action.resource_name, r.conversion_action.id, r.conversion_action.name,
+            _enum(r.conversion_action.status), int(bool(r.conversion_action.primary_for_goal)),
+            _enum(r.conversion_action.category), _enum(r.conversion_action.type_),
+            r.conversion_action.value_settings.default_value,
+        ),
+        None,
+    ),
+]
+ENTITY_BY_CHANGE_TYPE = {e.change_type: e for e in ENTITIES if e.change_type}
+# change_status row field that holds the changed resource's name, per resource_type
+CHANGE_FIELDS = {
+    "CAMPAIGN": "campaign",
+    "AD_GROUP": "ad_group",
+    "AD_GROUP_AD": "ad_group_ad",
+    "AD_GROUP_CRITERION": "ad_group_criterion",
+    "CAMPAIGN_CRITERION": "campaign_criterion",
+    "ASSET": "asset",
+    "CAMPAIGN_ASSET": "campaign_asset",
+}
+
+CUSTOMER_TIME_ZONE = gaql.Query("customer").select("customer.time_zone")
+CHANGED_RESOURCES = (
+    gaql.Query("change_status")
+    .select("change_status.resource_type", "change_status.last_change_date_time")
+    .select(*(f"change_status.{f}" for f in sorted(set(CHANGE_FIELDS.values()))))
+    .where("change_status.last_change_date_time BETWEEN :since AND :until")
+    .order_by("change_status.last_change_date_time")
+    .limit(CHANGE_STATUS_LIMIT)
+)
+
+
+def _schema() -> str:
+    tables = []
+    for e in ENTITIES:
+        cols = ",\n  ".join(e.columns)
+        tables.append(
+            f"CREATE TABLE IF NOT EXISTS {e.table} (\n  resource_name TEXT PRIMARY KEY,\n"
+            f"  customer_id TEXT NOT NULL,\n  {cols}\n);"
+        )
+    return "\n".join(tables) + """
+CREATE INDEX IF NOT EXISTS ad_groups_campaign ON ad_groups (customer_id, campaign_id);
+CREATE INDEX IF NOT EXISTS ads_campaign ON ads (customer_id, campaign_id, ad_group_id);
+CREATE INDEX IF NOT EXISTS ad_group_criteria_campaign ON ad_group_criteria (customer_id, campaign_id, ad_group_id);
+CREATE INDEX IF NOT EXISTS campaign_criteria_campaign ON campaign_criteria (customer_id, campaign_id);
+CREATE INDEX IF NOT EXISTS campaign_assets_campaign ON campaign_assets (customer_id, campaign_id);
+CREATE INDEX IF NOT EXISTS assets_id ON assets (customer_id, asset_id);
+CREATE TABLE IF NOT EXISTS sync_state (
+  customer_id TEXT PRIMARY KEY,
+  time_zone TEXT NOT NULL,
+  watermark TEXT NOT NULL,
+  full_sync_at TEXT NOT NULL,
+  synced_at TEXT NOT NULL
+);
+"""
+
+
+def open_mirror(path: str) -> sqlite3.Connection:
+    if path != ":memory:":
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_schema())
+    return conn
+
+
+def _stream(client: GoogleAdsClient, customer_id: str, query: str) -> Iterator[Any]:
+    svc = client.get_service("GoogleAdsService")
+    for batch in svc.search_stream(customer_id=customer_id, query=query):
+        yield from batch.results
+
+
+def _insert(conn: sqlite3.Connection, entity: Entity, customer_id: str, rows: Iterable[Any]) -> int:
+    cols = ("resource_name", "customer_id") + entity.columns
+    sql = f"INSERT OR REPLACE INTO {entity.table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})"
+    count = 0
+    batch: List[tuple] = []
+    for row in rows:
+        values = entity.extract(row)
+        batch.append((values[0], customer_id) + values[1:])
+        if len(batch) >= INSERT_BATCH:
+            conn.executemany(sql, batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        conn.executemany(sql, batch)
+        count += len(batch)
+    return count
+
+
+def _select(entity: Entity) -> gaql.Query:
+    return gaql.Query(entity.resource).select(*entity.fields.split(", "))
+
+
+def load_entity(conn: sqlite3.Connection, entity: Entity, customer_id: str, rows: Iterable[Any]) -> int:
+    conn.execute(f"DELETE FROM {entity.table} WHERE customer_id = ?", (customer_id,))
+    return _insert(conn, entity, customer_id, rows)
+
+
+def refetch_queries(entity: Entity, resource_names: List[str]) -> Dict[Tuple[str, ...], str]:
+    """One query per REFETCH_CHUNK resource names, keyed by (table, *names) for refetch()."""
+    query = _select(entity).where(f"{entity.resource}.resource_name IN :names")
+    queries = {}
+    for i in range(0, len(resource_names), REFETCH_CHUNK):
+        chunk = tuple(resource_names[i : i + REFETCH_CHUNK])
+        queries[(entity.table,) + chunk] = query.bind(names=chunk)
+    return queries
+
+
+def refetch(conn: sqlite3.Connection, entity: Entity, customer_id: str, resource_names: Iterable[str], rows: List[Any]) -> Tuple[int, int]:
+    """Store re-read resources; names that no longer came back are deleted. Returns (upserted, deleted)."""
+    upserted = _insert(conn, entity, customer_id, rows)
+    found = {entity.extract(r)[0] for r in rows}
+    gone = [(rn,) for rn in resource_names if rn not in found]
+    if gone:
+        conn.executemany(f"DELETE FROM {entity.table} WHERE resource_name = ?", gone)
+    return upserted, len(gone)
+
+
+def account_now(client: GoogleAdsClient, customer_id: str) -> Tuple[str, str]:
+    """(account time zone, current time there) — change_status timestamps are in account time."""
+    rows = list(_stream(client, customer_id, CUSTOMER_TIME_ZONE.bind()))
+    tz = rows[0].customer.time_zone if rows else "UTC"
+    return tz, datetime.now(ZoneInfo(tz)).strftime(TIMESTAMP_FORMAT)
+
+
+def read_changes(client: GoogleAdsClient, customer_id: str, since: str, until: str) -> Optional[Dict[str, set]]:
+    """
+    Changed resource names per change_status resource_type between two account-time
+    timestamps, paging past the 10k row cap by advancing the lower bound. Returns None
+    when a single timestamp alone overflows a page.
+    """
+    changes: Dict[str, set] = {}
+    lower = since
+    while True:
+        rows = list(_stream(client, customer_id, CHANGED_RESOURCES.bind(since=lower, until=until)))
+        for row in rows:
+            cs = row.change_status
+            rtype = _enum(cs.resource_type)
+            field = CHANGE_FIELDS.get(rtype)
+            if field:
+                changes.setdefault(rtype, set()).add(getattr(cs, field))
+        if len(rows) < CHANGE_STATUS_LIMIT:
+            return changes
+        first, last = rows[0].change_status.last_change_date_time, rows[-1].change_status.last_change_date_time
+        if first == last:
+            return None
+        lower = last
+
+
+def _is_expired(watermark: str, now: str) -> bool:
+    wm = datetime.strptime(watermark[:19], "%Y-%m-%d %H:%M:%S")
+    return datetime.strptime(now[:19], "%Y-%m-%d %H:%M:%S") - wm > timedelta(days=CHANGE_WINDOW_DAYS)
+
+
+def sync(conn: sqlite3.Connection, client: GoogleAdsClient, customer_id: str, full: bool = False) -> Dict[str, Any]:
+    """Bring the mirror for one customer up to date. Returns a summary of what was done."""
+    state = conn.execute("SELECT * FROM sync_state WHERE customer_id = ?", (customer_id,)).fetchone()
+    tz, started = account_now(client, customer_id)
+    changes = None
+    reason = "requested" if full else "first sync"
+    if state and not full:
+        if _is_expired(state["watermark"], started):
+            reason = "watermark older than the change_status window"
+        else:
+            changes = read_changes(client, customer_id, state["watermark"], started)
+            if changes is None:
+                reason = "more than one change_status page at a single timestamp"
+
+    # Every query of the pass is independent, so they run concurrently on one channel
+    # before the write transaction opens
+    if changes is None:
+        queries: Dict[Any, str] = {entity.table: _select(entity).bind() for entity in ENTITIES}
+    else:
+        queries = {}
+        for rtype, names in changes.items():
+            queries.update(refetch_queries(ENTITY_BY_CHANGE_TYPE[rtype], sorted(names)))
+        queries.update({entity.table: _select(entity).bind() for entity in ENTITIES if entity.change_type is None})
+    results = ads_async.fetch_all(client, customer_id, queries)
+
+    summary: Dict[str, Any] = {"mode": "incremental" if changes is not None else "full", "tables": {}}
+    by_table = {entity.table: entity for entity in ENTITIES}
+    with conn:
+        for key, rows in results.items():
+            if isinstance(key, str):
+                summary["tables"][key] = {"loaded": load_entity(conn, by_table[key], customer_id, rows)}
+                continue
+            upserted, deleted = refetch(conn, by_table[key[0]], customer_id, key[1:], rows)
+            totals = summary["tables"].setdefault(key[0], {"upserted": 0, "deleted": 0})
+            totals["upserted"] += upserted
+            totals["deleted"] += deleted
+        if changes is None:
+            summary["reason"] = reason
+            full_sync_at = started
+            watermark = started
+        else:
+            full_sync_at = state["full_sync_at"]
+            # change_status can surface a change a few minutes after it happened, so the next
+            # sync re-reads a trailing window; refetching a resource twice is harmless
+            lagged = (datetime.strptime(started, TIMESTAMP_FORMAT) - CHANGE_LAG).strftime(TIMESTAMP_FORMAT)
+            watermark = max(state["watermark"], lagged)
+        conn.execute(
+            "INSERT OR REPLACE INTO sync_state (customer_id, time_zone, watermark, full_sync_at, synced_at) VALUES (?, ?, ?, ?, ?)",
+            (customer_id, tz, watermark, full_sync_at, started),
+        )
+    summary["watermark"] = watermark
+    return summary
+
+
+def load_tables(conn: sqlite3.Connection, client: GoogleAdsClient, customer_id: str, tables: Sequence[str]) -> Dict[str, int]:
+    """
+    One-off full load of just `tables` (concurrently), for a throwaway mirror. Leaves
+    sync_state alone, so it never passes for a synced mirror. Returns rows per table.
+    """
+    by_table = {entity.table: entity for entity in ENTITIES}
+    results = ads_async.fetch_all(client, customer_id, {t: _select(by_table[t]).bind() for t in tables})
+    with conn:
+        return {table: load_entity(conn, by_table[table], customer_id, rows) for table, rows in results.items()}
+
+
+def open_for_tool(
+    path: str,
+    customer_id: str,
+    client: Optional[GoogleAdsClient] = None,
+) -> sqlite3.Connection:
+    """Open the mirror for a reporting tool, syncing first when a client is given."""
+    conn = open_mirror(path)
+    if client is not None:
+        summary = sync(conn, client, customer_id)
+        changed = sum(t.get("upserted", 0) + t.get("deleted", 0) for t in summary["tables"].values())
+        detail = f"{changed} changed rows" if summary["mode"] == "incremental" else summary.get("reason", "")
+        print(f"(mirror: {summary['mode']} sync, {detail})")
+    elif conn.execute("SELECT 1 FROM sync_state WHERE customer_id = ?", (customer_id,)).fetchone() is None:
+        raise RuntimeError(f"No mirror for customer {customer_id} in {path}; run ads_mirror.py sync first")
+    return conn
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Local SQLite mirror of Google Ads account structure")
+    sub = p.add_subparsers(dest="command", required=True)
+    s = sub.add_parser("sync", help="Incremental sync via change_status (full load the first time)")
+    s.add_argument("--customer-id", required=True)
+    s.add_argument("--config", default=None)
+    s.add_argument("--full", action="store_true", help="Reload everything instead of applying changes")
+    s.add_argument("--db", default=DEFAULT_DB)
+    st = sub.add_parser("status", help="Row counts and watermarks")
+    st.add_argument("--db", default=DEFAULT_DB)
+    args = p.parse_args(argv)
+
+    try:
+        conn = open_mirror(args.db)
+        if args.command == "status":
+            for state in conn.execute("SELECT * FROM sync_state ORDER BY customer_id"):
+                print(
+                    f"Customer {state['customer_id']} ({state['time_zone']}): watermark {state['watermark']} | "
+                    f"last full sync {state['full_sync_at']} | last sync {state['synced_at']}"
+                )
+                for entity in ENTITIES:
+                    (n,) = conn.execute(f"SELECT COUNT(*) FROM {entity.table} WHERE customer_id = ?", (state["customer_id"],)).fetchone()
+                    print(f"  {entity.table:<20} {n:>8}")
+            return 0
+
+        client = load_client(args.config)
+        summary = sync(conn, client, args.customer_id, full=args.full)
+        print(f"{summary['mode'].capitalize()} sync" + (f" ({summary['reason']})" if "reason" in summary else ""))
+        for table, counts in summary["tables"].items():
+            print(f"  {table:<20} " + ", ".join(f"{k}={v}" for k, v in counts.items()))
+        print(f"Watermark: {summary['watermark']}")
+        return 0
+    except GoogleAdsException as ex:
+        print(f"GoogleAdsException: {ex}")
+        for e in ex.failure.errors:
+            print(f"  - {e.error_code}: {e.message}")
+        return 2
+    except Exception as ex:  # noqa: BLE001
+        print(f"Error: {ex}")
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(ads_profile.run(main))
@@ -0,0 +1,311 @@
+"""
+Opt-in profiling for the scripts in this directory.
+
+Every entry point ends with `raise SystemExit(ads_profile.run(main))`. Without --profile
+on the command line run() just calls main(); nothing below is imported or installed.
+
+  --profile                 everything: cpu, wall, mem (phases are always timed)
+  --profile=wall,mem        pick from cpu (cProfile), wall (stack sampler), mem (tracemalloc)
+
+Results go to scripts/ads/exports/profiles/<script>-<timestamp>.*:
+  .pstats        cProfile stats (snakeviz, `python -m pstats`)
+  .wall.folded   sampled wall-clock stacks in folded format (flamegraph.pl, speedscope)
+  .mem.folded    live allocations by stack, in bytes, at the phase boundary with the most
+                 traced memory (same tools)
+  .phases.json   per-phase wall time, tracemalloc peak and top allocation sites
+
+Phases are exclusive: time inside a nested phase is not counted in its parent.
+  startup    process start until main() runs (mostly imports)
+  auth       ads_client.load_client(), including the OAuth token refresh
+  query      every Google Ads API round trip, retries and rate-limit waits included
+  write      file and email output, where scripts mark it with phase("write")
+  transform  everything else in main()
+
+Usage:
+  python3 scripts/ads/weekly_summary.py --customer-id 5072649468 --profile
+  python3 scripts/ads/houston_mobile_notary_campaign.py --customer-id 5072649468 --profile=wall
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "exports", "profiles")
+MODES = ("cpu", "wall", "mem")
+SAMPLE_INTERVAL = 0.005
+TOP_ALLOCATIONS = 15
+MEM_FRAMES = 16
+
+_IMPORTED_AT = time.time()
+_NULL_PHASE = contextlib.nullcontext()
+_active: Optional["Profiler"] = None
+
+
+def _process_start() -> float:
+    """Wall-clock time the interpreter started (Linux /proc), else when this module was imported."""
+    try:
+        with open("/proc/self/stat") as f:
+            fields = f.read().rpartition(")")[2].split()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        started_ago = uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK")
+        return time.time() - started_ago
+    except (OSError, ValueError, IndexError):
+        return _IMPORTED_AT
+
+
+class PhaseTimer:
+    """Exclusive wall time per named phase, for the main thread."""
+
+    def __init__(self, default: str = "transform", on_switch: Optional[Callable[[], None]] = None):
+        self.totals: Dict[str, float] = Counter()
+        self._stack: List[str] = [default]
+        self._mark = time.perf_counter()
+        self._main = threading.main_thread()
+        self._on_switch = on_switch
+
+    def _switch(self, name: Optional[str]) -> None:
+        now = time.perf_counter()
+        self.totals[self._stack[-1]] += now - self._mark
+        if self._on_switch is not None:
+            self._on_switch()
+        self._mark = time.perf_counter()
+        if name is None:
+            self._stack.pop()
+        else:
+            self._stack.append(name)
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        if threading.current_thread() is not self._main:
+            yield
+            return
+        self._switch(name)
+        try:
+            yield
+        finally:
+            self._switch(None)
+
+    def stop(self) -> Dict[str, float]:
+        self.totals[self._stack[-1]] += time.perf_counter() - self._mark
+        self._mark = time.perf_counter()
+        return dict(self.totals)
+
+
+class StackSampler(threading.Thread):
+    """Samples every thread's Python stack at a fixed interval and counts folded stacks."""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        super().__init__(name="ads-profile-sampler", daemon=True)
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        me = threading.get_ident()
+        names = {}
+        while not self._stop_event.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                if ident not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                frames = []
+                while frame is not None:
+                    code = frame.f_code
+                    frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                frames.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(frames))] += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+def _write_folded(path: str, stacks: Dict[str, int]) -> None:
+    with open(path, "w") as f:
+        for stack, count in sorted(stacks.items()):
+            f.write(f"{stack} {count}\n")
+
+
+class Profiler:
+    def __init__(self, modes: List[str], script: str):
+        self.modes = modes
+        self.script = script
+        self.phases = PhaseTimer(on_switch=self._maybe_snapshot if "mem" in modes else None)
+        self._cprofile = None
+        self._snapshot = None
+        self._snapshot_bytes = 0
+        self._sampler: Optional[StackSampler] = None
+        self._startup = time.time() - _process_start()
+
+    def start(self) -> None:
+        if "mem" in self.modes:
+            import tracemalloc
+
+            tracemalloc.start(MEM_FRAMES)
+        if "cpu" in self.modes:
+            import cProfile
+
+            self._cprofile = cProfile.Profile()
+        if "wall" in self.modes:
+            self._sampler = StackSampler()
+            self._sampler.start()
+        if self._cprofile is not None:
+            self._cprofile.enable()
+
+    def _maybe_snapshot(self) -> None:
+        """Keep a tracemalloc snapshot from the phase boundary with the most memory traced so far."""
+        import tracemalloc
+
+        current = tracemalloc.get_traced_memory()[0]
+        # 10% headroom keeps a steadily growing run from snapshotting at every API call
+        if current > self._snapshot_bytes * 1.1:
+            self._snapshot = tracemalloc.take_snapshot()
+            self._snapshot_bytes = current
+
+    def stop(self) -> str:
+        """Stop collectors, write every output and return the common path prefix."""
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+        phases = {"startup": self._startup, **self.phases.stop()}
+
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        prefix = os.path.join(PROFILE_DIR, f"{self.script}-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
+        report: Dict[str, Any] = {"script": self.script, "argv": sys.argv[1:], "modes": self.modes, "phases": phases}
+
+        if self._cprofile is not None:
+            self._cprofile.dump_stats(f"{prefix}.pstats")
+        if self._sampler is not None:
+            _write_folded(f"{prefix}.wall.folded", self._sampler.stacks)
+            report["wall_samples"] = sum(self._sampler.stacks.values())
+        if "mem" in self.modes:
+            import tracemalloc
+
+            self._maybe_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = self._snapshot
+            tracemalloc.stop()
+            by_stack: Dict[str, int] = {}
+            for stat in snapshot.statistics("traceback"):
+                # Traceback frames are oldest first, which is the folded-stack order too
+                by_stack[";".join(f"{os.path.basename(fr.filename)}:{fr.lineno}" for fr in stat.traceback)] = stat.size
+            _write_folded(f"{prefix}.mem.folded", by_stack)
+            report["memory"] = {
+                "peak_bytes": peak,
+                "current_bytes": current,
+                "snapshot_bytes": self._snapshot_bytes,
+                "top": [
+                    {"site": f"{s.traceback[0].filename}:{s.traceback[0].lineno}", "bytes": s.size, "blocks": s.count}
+                    for s in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]
+                ],
+            }
+        with open(f"{prefix}.phases.json", "w") as f:
+            json.dump(report, f, indent=2)
+        self._print_summary(report, prefix)
+        return prefix
+
+    def _print_summary(self, report: Dict[str, Any], prefix: str) -> None:
+        total = sum(report["phases"].values()) or 1.0
+        print(f"\nProfile ({', '.join(self.modes) or 'phases'}):", file=sys.stderr)
+        for name, seconds in sorted(report["phases"].items(), key=lambda kv: -kv[1]):
+            print(f"  {name:<10} {seconds:8.3f}s  {seconds / total:6.1%}", file=sys.stderr)
+        if "memory" in report:
+            print(f"  peak traced memory {report['memory']['peak_bytes'] / 1_048_576:.1f} MiB", file=sys.stderr)
+        if self._cprofile is not None:
+            import pstats
+
+            print("", file=sys.stderr)
+            pstats.Stats(self._cprofile, stream=sys.stderr).sort_stats("cumulative").print_stats(15)
+        print(f"Profile written to {prefix}.*", file=sys.stderr)
+
+
+def active() -> bool:
+    return _active is not None
+
+
+def phase(name: str):
+    """Context manager attributing the enclosed wall time to `name`; free when not profiling."""
+    if _active is None:
+        return _NULL_PHASE
+    return _active.phases.phase(name)
+
+
+def _pop_profile_flag(argv: List[str]) -> Optional[List[str]]:
+    """Remove --profile[=modes] from argv in place; return the requested modes or None."""
+    for i, arg in enumerate(argv):
+        if arg == "--profile" or arg.startswith("--profile="):
+            del argv[i]
+            value = arg.partition("=")[2]
+            modes = [m.strip() for m in value.split(",") if m.strip()] if value else list(MODES)
+            unknown = [m for m in modes if m not in MODES]
+            if unknown:
+                raise SystemExit(f"--profile: unknown mode(s) {', '.join(unknown)}; choose from {', '.join(MODES)}")
+            return modes
+    return None
+
+
+def run(main: Callable[[], Optional[int]]) -> Optional[int]:
+    global _active
+    modes = _pop_profile_flag(sys.argv)
+    if modes is None:
+        return main()
+    script = os.path.splitext(os.path.basename(sys.argv[0] or "python"))[0] or "python"
+    _active = Profiler(modes, script)
+    _active.start()
+    try:
+        return main()
+    finally:
+        profiler, _active = _active, None
+        profiler.stop()
+
+
+class PhaseInterceptor:
+    """gRPC interceptor that books every API round trip to the "query" phase."""
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        with phase("query"):
+            response = continuation(client_call_details, request)
+            response.exception()
+            return response
+
+    def intercept_unary_stream(self, continuation, client_call_details, request):
+        with phase("query"):
+            call = continuation(client_call_details, request)
+        return _PhasedStream(call)
+
+
+class _PhasedStream:
+    def __init__(self, call: Any):
+        self._call = call
+        self._iter = iter(call)
+
+    def __iter__(self) -> Iterator[Any]:
+        return self
+
+    def __next__(self) -> Any:
+        with phase("query"):
+            return next(self._iter)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._call, name)
+
+
+def create_interceptor() -> Any:
+    import grpc
+
+    class _Interceptor(PhaseInterceptor, grpc.UnaryUnaryClientInterceptor, grpc.UnaryStreamClientInterceptor):
+        pass
+
+    return _Interceptor()
@@ -0,0 +1,267 @@
+"""
+Rate limiting and retry for Google Ads API calls.
+
+RetryInterceptor is installed by ads_client.load_client() on every service, outside the
+telemetry interceptor so each attempt is recorded. Before a call it takes a token from a
+bucket keyed by (developer token, customer id); buckets are shared by every thread in the
+process, so fan-out jobs run at the highest rate the account sustains.
+
+Buckets adapt (AIMD): a RESOURCE_EXHAUSTED halves the bucket's rate and blocks it for the
+retry_delay Google returns in quota_error_details; each success adds back a little rate,
+up to the configured ceiling.
+
+Retries are idempotent:
+  - reads (Search, SearchStream, Get*, List*, Suggest*, Generate*) retry on
+    RESOURCE_EXHAUSTED, UNAVAILABLE and DEADLINE_EXCEEDED
+  - writes retry on RESOURCE_EXHAUSTED and UNAVAILABLE only, which Google returns before
+    applying anything; a DEADLINE_EXCEEDED mutate may have been applied, so it is raised
+  - a SearchStream is only retried before its first batch is handed to the caller
+
+Tuning (environment):
+  ADS_MAX_QPS           per-bucket ceiling, requests/second (default 10)
+  ADS_MAX_RETRIES       attempts after the first (default 5)
+  ADS_MAX_RETRY_DELAY   give up instead of sleeping longer than this many seconds (default 300);
+                        daily quota exhaustion asks for hours and should fail fast
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import grpc
+
+
+TRANSIENT_READ_CODES = frozenset({"RESOURCE_EXHAUSTED", "UNAVAILABLE", "DEADLINE_EXCEEDED"})
+TRANSIENT_WRITE_CODES = frozenset({"RESOURCE_EXHAUSTED", "UNAVAILABLE"})
+READ_METHOD_PREFIXES = ("Search", "Get", "List", "Suggest", "Generate")
+
+BASE_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 60.0
+MIN_RATE = 0.2
+
+
+class TokenBucket:
+    """Thread-safe token bucket whose refill rate backs off on quota errors and recovers on success."""
+
+    def __init__(self, max_rate: float, burst: Optional[float] = None):
+        self.max_rate = max_rate
+        self.rate = max_rate
+        self.capacity = burst if burst is not None else max(1.0, max_rate)
+        self.tokens = self.capacity
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take a token and return how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1.0
+            wait = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+            return max(wait, self.blocked_until - now)
+
+    def acquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def on_success(self) -> None:
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+    def on_throttled(self, retry_delay: float) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(MIN_RATE, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+            self.blocked_until = max(self.blocked_until, now + retry_delay)
+
+
+class RateLimiter:
+    """Process-wide registry of buckets keyed by (developer token, customer id)."""
+
+    def __init__(self, max_rate: float):
+        self.max_rate = max_rate
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, developer_token: str, customer_id: str) -> TokenBucket:
+        key = (developer_token, customer_id)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(self.max_rate)
+            return bucket
+
+
+def _status_name(ex: BaseException) -> Optional[str]:
+    call = getattr(ex, "error", None) or ex
+    try:
+        return call.code().name
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def retry_delay_seconds(ex: BaseException) -> Optional[float]:
+    """Largest quota_error_details.retry_delay in a GoogleAdsException, if Google sent one."""
+    failure = getattr(ex, "failure", None)
+    delay = None
+    for err in getattr(failure, "errors", ()) or ():
+        try:
+            rd = err.details.quota_error_details.retry_delay
+            seconds = rd.seconds + rd.nanos / 1e9
+        except AttributeError:
+            continue
+        if seconds > 0:
+            delay = max(delay or 0.0, seconds)
+    return delay
+
+
+def is_read_method(full_method: str) -> bool:
+    return full_method.rpartition("/")[2].startswith(READ_METHOD_PREFIXES)
+
+
+class RetryInterceptor(grpc.UnaryUnaryClientInterceptor, grpc.UnaryStreamClientInterceptor):
+    def __init__(
+        self,
+        limiter: RateLimiter,
+        developer_token: str,
+        max_retries: int = 5,
+        max_retry_delay: float = 300.0,
+    ):
+        self.limiter = limiter
+        self.developer_token = developer_token or ""
+        self.max_retries = max_retries
+        self.max_retry_delay = max_retry_delay
+
+    def bucket_for(self, request: Any) -> TokenBucket:
+        return self.limiter.bucket(self.developer_token, str(getattr(request, "customer_id", "") or ""))
+
+    def backoff(self, ex: BaseException, attempt: int, full_method: str, bucket: TokenBucket) -> Optional[float]:
+        """Seconds to sleep before retrying, or None when the error must be raised."""
+        status = _status_name(ex)
+        transient = TRANSIENT_READ_CODES if is_read_method(full_method) else TRANSIENT_WRITE_CODES
+        if status not in transient or attempt >= self.max_retries:
+            return None
+        # Full jitter keeps concurrent workers from retrying in lockstep
+        delay = random.uniform(0, min(MAX_BACKOFF_SECONDS, BASE_BACKOFF_SECONDS * 2 ** attempt))
+        if status == "RESOURCE_EXHAUSTED":
+            hinted = retry_delay_seconds(ex)
+            if hinted is not None:
+                delay = hinted
+            if delay <= self.max_retry_delay:
+                bucket.on_throttled(delay)
+        if delay > self.max_retry_delay:
+            return None
+        method = full_method.rpartition("/")[2]
+        print(f"  ! {method} {status}; retry {attempt + 1}/{self.max_retries} in {delay:.1f}s", file=sys.stderr)
+        # A throttled bucket already holds every caller (this one included) until the delay passes
+        return 0.0 if status == "RESOURCE_EXHAUSTED" else delay
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        bucket = self.bucket_for(request)
+        attempt = 0
+        while True:
+            bucket.acquire()
+            try:
+                response = continuation(client_call_details, request)
+                error = response.exception()
+            except grpc.RpcError as ex:
+                error = ex
+            except Exception as ex:
+                if _status_name(ex) is None:
+                    raise
+                error = ex
+            if error is None:
+                bucket.on_success()
+                return response
+            delay = self.backoff(error, attempt, client_call_details.method, bucket)
+            if delay is None:
+                raise error
+            if delay:
+                time.sleep(delay)
+            attempt += 1
+
+    def intercept_unary_stream(self, continuation, client_call_details, request):
+        return _RetryingStream(self, continuation, client_call_details, request)
+
+
+class _RetryingStream:
+    """Restarts a server stream on transient errors, but only until its first batch is consumed."""
+
+    def __init__(self, interceptor: RetryInterceptor, continuation, details, request):
+        self._interceptor = interceptor
+        self._continuation = continuation
+        self._details = details
+        self._request = request
+        self._bucket = interceptor.bucket_for(request)
+        self._attempt = 0
+        self._started = False
+        self._call = self._open()
+        self._iter: Iterator[Any] = iter(self._call)
+
+    def _open(self):
+        self._bucket.acquire()
+        return self._continuation(self._details, self._request)
+
+    def __iter__(self) -> Iterator[Any]:
+        return self
+
+    def __next__(self) -> Any:
+        while True:
+            try:
+                batch = next(self._iter)
+            except StopIteration:
+                if not self._started:
+                    self._bucket.on_success()
+                raise
+            except Exception as ex:
+                if self._started or _status_name(ex) is None:
+                    raise
+                delay = self._interceptor.backoff(ex, self._attempt, self._details.method, self._bucket)
+                if delay is None:
+                    raise
+                if delay:
+                    time.sleep(delay)
+                self._attempt += 1
+                self._call = self._open()
+                self._iter = iter(self._call)
+                continue
+            if not self._started:
+                self._started = True
+                self._bucket.on_success()
+            return batch
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._call, name)
+
+
+_LIMITER: Optional[RateLimiter] = None
+
+
+def shared_limiter() -> RateLimiter:
+    global _LIMITER
+    if _LIMITER is None:
+        _LIMITER = RateLimiter(float(os.environ.get("ADS_MAX_QPS", "10")))
+    return _LIMITER
+
+
+def create_interceptor(developer_token: str) -> RetryInterceptor:
+    return RetryInterceptor(
+        shared_limiter(),
+        developer_token,
+        max_retries=int(os.environ.get("ADS_MAX_RETRIES", "5")),
+        max_retry_delay=float(os.environ.get("ADS_MAX_RETRY_DELAY", "300")),
+    )
@@ -0,0 +1,339 @@
+"""
+Per-call telemetry for Google Ads API requests.
+
+TelemetryInterceptor is a gRPC client interceptor installed on every service returned by
+ads_client.load_client(). For each Search page, SearchStream and Mutate* call it records
+latency, rows, operations, the request_id Google returns and any error codes, and:
+  - appends one JSON line per call to logs/ads-telemetry.jsonl
+  - at exit writes logs/ads-telemetry-<script>.prom (node_exporter textfile format)
+  - at exit prints a per-method summary table to stderr
+
+The output directory defaults to logs/ (next to logs/ads-daily.log in the cron setup)
+and can be changed with ADS_TELEMETRY_DIR; ADS_TELEMETRY=0 turns telemetry off.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import grpc
+
+
+REQUEST_ID_KEY = "request-id"
+FAILURE_KEY_SUFFIX = "googleadsfailure-bin"
+
+
+def _split_method(full_method: str) -> Tuple[str, str]:
+    # "/google.ads.googleads.v17.services.GoogleAdsService/Search" -> ("GoogleAdsService", "Search")
+    service, _, method = full_method.lstrip("/").rpartition("/")
+    return service.rsplit(".", 1)[-1], method
+
+
+def _metadata_value(metadata: Any, key: str) -> Optional[Any]:
+    for k, v in metadata or ():
+        if k == key:
+            return v
+    return None
+
+
+def failure_codes(failure: Any) -> List[str]:
+    codes = []
+    for err in failure.errors:
+        pb = type(err.error_code).pb(err.error_code)
+        field = pb.WhichOneof("error_code")
+        codes.append(f"{field}.{getattr(err.error_code, field).name}" if field else "UNKNOWN")
+    return codes
+
+
+class Telemetry:
+    """Collects call records, streams them as JSON lines and aggregates per service/method."""
+
+    def __init__(self, out_dir: str, script: str, failure_type: Optional[Any] = None):
+        self.out_dir = out_dir
+        self.script = script
+        self._failure_type = failure_type
+        self._lock = threading.Lock()
+        self._jsonl = None
+        self._started = time.time()
+        # (service, method) -> counters
+        self.totals: Dict[Tuple[str, str], Dict[str, float]] = defaultdict(
+            lambda: {"calls": 0, "timed": 0, "queries": 0, "errors": 0, "seconds": 0.0, "max_seconds": 0.0, "rows": 0, "operations": 0}
+        )
+        self.statuses: Dict[Tuple[str, str, str], int] = defaultdict(int)
+
+    def error_codes(self, metadata: Any) -> List[str]:
+        """Decode GoogleAdsFailure error codes ("quota_error.RESOURCE_EXHAUSTED") from trailing metadata."""
+        if self._failure_type is None:
+            return []
+        for k, v in metadata or ():
+            if k.endswith(FAILURE_KEY_SUFFIX):
+                try:
+                    return failure_codes(self._failure_type.deserialize(v))
+                except Exception:  # noqa: BLE001
+                    return []
+        return []
+
+    def describe_error(self, ex: BaseException) -> Tuple[str, Optional[str], List[str]]:
+        """(status, request_id, error codes) for a GoogleAdsException or a bare grpc.RpcError."""
+        call = getattr(ex, "error", None) or ex
+        status = call.code().name if hasattr(call, "code") else type(ex).__name__
+        failure = getattr(ex, "failure", None)
+        if failure is not None:
+            return status, getattr(ex, "request_id", None), failure_codes(failure)
+        metadata = call.trailing_metadata() if hasattr(call, "trailing_metadata") else None
+        return status, _metadata_value(metadata, REQUEST_ID_KEY), self.error_codes(metadata)
+
+    def record(
+        self,
+        full_method: str,
+        seconds: float,
+        status: str,
+        request_id: Optional[str],
+        customer_id: Optional[str],
+        rows: int = 0,
+        operations: int = 0,
+        pages: int = 1,
+        first_page: bool = True,
+        error_codes: Optional[List[str]] = None,
+    ) -> None:
+        service, method = _split_method(full_method)
+        entry = {
+            "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "script": self.script,
+            "service": service,
+            "method": method,
+            "customer_id": customer_id,
+            "status": status,
+            "latency_ms": round(seconds * 1000, 1),
+            "pages": pages,
+            "rows": rows,
+            "operations": operations,
+            "request_id": request_id,
+        }
+        if error_codes:
+            entry["error_codes"] = error_codes
+        with self._lock:
+            t = self.totals[(service, method)]
+            t["calls"] += pages
+            t["timed"] += 1
+            t["queries"] += 1 if first_page else 0
+            t["errors"] += 0 if status == "OK" else 1
+            t["seconds"] += seconds
+            t["max_seconds"] = max(t["max_seconds"], seconds)
+            t["rows"] += rows
+            t["operations"] += operations
+            self.statuses[(service, method, status)] += 1
+            if self._jsonl is None:
+                os.makedirs(self.out_dir, exist_ok=True)
+                self._jsonl = open(os.path.join(self.out_dir, "ads-telemetry.jsonl"), "a", buffering=1)
+            self._jsonl.write(json.dumps(entry) + "\n")
+
+    def write_prometheus(self) -> Optional[str]:
+        if not self.totals:
+            return None
+        os.makedirs(self.out_dir, exist_ok=True)
+        path = os.path.join(self.out_dir, f"ads-telemetry-{self.script}.prom")
+        lines = [
+            "# HELP google_ads_api_requests_total Google Ads API calls (Search pages count individually).",
+            "# TYPE google_ads_api_requests_total counter",
+        ]
+        for (service, method, status), n in sorted(self.statuses.items()):
+            lines.append(
+                f'google_ads_api_requests_total{{script="{self.script}",service="{service}",method="{method}",status="{status}"}} {n}'
+            )
+        metrics = [
+            ("google_ads_api_request_duration_seconds_sum", "counter", "Total time spent in calls.", "seconds"),
+            ("google_ads_api_request_duration_seconds_count", "counter", "Calls timed (a SearchStream counts once).", "timed"),
+            ("google_ads_api_request_duration_seconds_max", "gauge", "Slowest single call this run.", "max_seconds"),
+            ("google_ads_api_rows_total", "counter", "Rows returned by Search/SearchStream.", "rows"),
+            ("google_ads_api_operations_total", "counter", "Mutate operations sent.", "operations"),
+        ]
+        for name, kind, help_text, field in metrics:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for (service, method), t in sorted(self.totals.items()):
+                lines.append(f'{name}{{script="{self.script}",service="{service}",method="{method}"}} {t[field]:g}')
+        lines.append("# HELP google_ads_api_last_run_timestamp_seconds When this script last finished.")
+        lines.append("# TYPE google_ads_api_last_run_timestamp_seconds gauge")
+        lines.append(f'google_ads_api_last_run_timestamp_seconds{{script="{self.script}"}} {time.time():.0f}')
+        # Atomic replace so the textfile collector never reads a half-written file
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, path)
+        return path
+
+    def summary_table(self) -> str:
+        header = f"{'service.method':<48} {'calls':>6} {'queries':>7} {'errors':>6} {'total s':>8} {'avg ms':>8} {'max ms':>8} {'rows':>8} {'ops':>6}"
+        lines = [header, "-" * len(header)]
+        for (service, method), t in sorted(self.totals.items(), key=lambda kv: -kv[1]["seconds"]):
+            avg_ms = t["seconds"] / t["timed"] * 1000 if t["timed"] else 0.0
+            lines.append(
+                f"{service + '.' + method:<48} {t['calls']:>6.0f} {t['queries']:>7.0f} {t['errors']:>6.0f} "
+                f"{t['seconds']:>8.2f} {avg_ms:>8.1f} {t['max_seconds'] * 1000:>8.1f} {t['rows']:>8.0f} {t['operations']:>6.0f}"
+            )
+        return "\n".join(lines)
+
+    def close(self) -> None:
+        if not self.totals:
+            return
+        try:
+            path = self.write_prometheus()
+            print(f"\nGoogle Ads API telemetry ({time.time() - self._started:.1f}s wall):", file=sys.stderr)
+            print(self.summary_table(), file=sys.stderr)
+            if path:
+                print(f"Metrics: {path}", file=sys.stderr)
+        finally:
+            if self._jsonl is not None:
+                self._jsonl.close()
+                self._jsonl = None
+
+
+class _CountingStream:
+    """Wraps a SearchStream call: counts batches/rows and records once the stream ends."""
+
+    def __init__(self, call: Any, on_done: Callable[[Any, int, int, Optional[BaseException]], None]):
+        self._call = call
+        self._iter = iter(call)
+        self._on_done = on_done
+        self._batches = 0
+        self._rows = 0
+        self._done = False
+
+    def __iter__(self) -> Iterator[Any]:
+        return self
+
+    def __next__(self) -> Any:
+        try:
+            batch = next(self._iter)
+        except StopIteration:
+            self._finish(None)
+            raise
+        except Exception as ex:
+            self._finish(ex)
+            raise
+        self._batches += 1
+        self._rows += len(getattr(batch, "results", ()) or ())
+        return batch
+
+    def _finish(self, error: Optional[BaseException]) -> None:
+        if not self._done:
+            self._done = True
+            self._on_done(self._call, self._batches, self._rows, error)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._call, name)
+
+
+class TelemetryInterceptor(grpc.UnaryUnaryClientInterceptor, grpc.UnaryStreamClientInterceptor):
+    """
+    Caller-supplied interceptors run outside the google-ads ExceptionInterceptor, so a
+    failed call arrives here as a raised GoogleAdsException (or bare grpc.RpcError).
+    """
+
+    def __init__(self, telemetry: Telemetry):
+        self.telemetry = telemetry
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        start = time.perf_counter()
+        try:
+            response = continuation(client_call_details, request)
+        except Exception as ex:
+            self._record_error(client_call_details, request, ex, time.perf_counter() - start)
+            raise
+        seconds = time.perf_counter() - start
+        try:
+            if response.exception() is not None:
+                self._record_error(client_call_details, request, response.exception(), seconds)
+            else:
+                operations = len(getattr(request, "operations", ()) or ())
+                self.telemetry.record(
+                    client_call_details.method,
+                    seconds,
+                    "OK",
+                    _metadata_value(response.trailing_metadata(), REQUEST_ID_KEY),
+                    getattr(request, "customer_id", None),
+                    rows=0 if operations else len(getattr(response.result(), "results", ()) or ()),
+                    operations=operations,
+                    first_page=not getattr(request, "page_token", ""),
+                )
+        except Exception:  # noqa: BLE001 - telemetry must never break a call
+            pass
+        return response
+
+    def _record_error(self, details, request, ex: BaseException, seconds: float) -> None:
+        try:
+            status, request_id, codes = self.telemetry.describe_error(ex)
+            self.telemetry.record(
+                details.method,
+                seconds,
+                status,
+                request_id,
+                getattr(request, "customer_id", None),
+                operations=len(getattr(request, "operations", ()) or ()),
+                first_page=not getattr(request, "page_token", ""),
+                error_codes=codes,
+            )
+        except Exception:  # noqa: BLE001
+            pass
+
+    def intercept_unary_stream(self, continuation, client_call_details, request):
+        start = time.perf_counter()
+        try:
+            call = continuation(client_call_details, request)
+        except Exception as ex:
+            self._record_error(client_call_details, request, ex, time.perf_counter() - start)
+            raise
+
+        def on_done(underlying, batches: int, rows: int, error: Optional[BaseException]) -> None:
+            try:
+                if error is not None:
+                    status, request_id, codes = self.telemetry.describe_error(error)
+                else:
+                    status, codes = "OK", None
+                    request_id = _metadata_value(underlying.trailing_metadata(), REQUEST_ID_KEY)
+                self.telemetry.record(
+                    client_call_details.method,
+                    time.perf_counter() - start,
+                    status,
+                    request_id,
+                    getattr(request, "customer_id", None),
+                    rows=rows,
+                    pages=max(batches, 1),
+                    error_codes=codes,
+                )
+            except Exception:  # noqa: BLE001
+                pass
+
+        return _CountingStream(call, on_done)
+
+
+def telemetry_enabled() -> bool:
+    return os.environ.get("ADS_TELEMETRY", "1").lower() not in ("0", "false", "off", "no")
+
+
+_SHARED: Optional[Telemetry] = None
+
+
+def shared_telemetry(failure_type: Optional[Any] = None) -> Telemetry:
+    """The process-wide Telemetry sink (flushed at exit), shared by every client and the async reader."""
+    global _SHARED
+    if _SHARED is None:
+        script = os.path.splitext(os.path.basename(sys.argv[0] or "python"))[0] or "python"
+        _SHARED = Telemetry(os.environ.get("ADS_TELEMETRY_DIR", "logs"), script, failure_type)
+        atexit.register(_SHARED.close)
+    elif _SHARED._failure_type is None:
+        _SHARED._failure_type = failure_type
+    return _SHARED
+
+
+def create_interceptor(failure_type: Optional[Any] = None) -> TelemetryInterceptor:
+    return TelemetryInterceptor(shared_telemetry(failure_type))
@@ -13,16 +13,50 @@ Usage:
 from __future__ import annotations
 
 import argparse
-from typing import Optional, List
+from typing import Dict, Optional, List
 
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 from google.protobuf.field_mask_pb2 import FieldMask
 
+from ads_client import load_client
+import ads_profile
+import gaql
+
 
 ACTIVE_CAMPAIGN_NAME_HINT = "HMNP – Mobile – 77591 Radius"
 BUDGET_MICROS_TARGET = 25_000_000
 
+CAMPAIGNS = (
+    gaql.Query("campaign")
+    .select("campaign.resource_name", "campaign.name", "campaign.status", "campaign.advertising_channel_type")
+    .order_by("campaign.status DESC")
+)
+CAMPAIGN_CRITERIA = (
+    gaql.Query("campaign_criterion")
+    .select("campaign_criterion.resource_name", "campaign_criterion.type", "campaign_criterion.negative")
+    .where("campaign_criterion.campaign = :campaign")
+)
+CAMPAIGN_BUDGET = (
+    gaql.Query("campaign").select("campaign.campaign_budget").where("campaign.resource_name = :campaign").limit(1)
+)
+AD_GROUPS = (
+    gaql.Query("ad_group")
+    .select("ad_group.resource_name", "ad_group.name", "ad_group.status")
+    .where("ad_group.campaign = :campaign")
+    .order_by("ad_group.name")
+)
+AD_GROUP_ADS = (
+    gaql.Query("ad_group_ad")
+    .select("ad_group_ad.resource_name", "ad_group_ad.status", "ad_group_ad.ad.type")
+    .where("ad_group_ad.ad_group = :ad_group")
+)
+CONVERSION_ACTIONS = (
+    gaql.Query("conversion_action")
+    .select("conversion_action.resource_name", "conversion_action.name", "conversion_action.primary_for_goal")
+    .order_by("conversion_action.name")
+)
+
 
 def run_query(client: GoogleAdsClient, customer_id: str, query: str):
     svc = client.get_service("GoogleAdsService")
@@ -31,12 +65,8 @@ def run_query(client: GoogleAdsClient, customer_id: str, query: str):
 
 def find_active_campaign(client: GoogleAdsClient, customer_id: str) -> Optional[str]:
     # Prefer exact name match, else first ENABLED Search campaign
-    q = (
-        "SELECT campaign.resource_name, campaign.name, campaign.status, campaign.advertising_channel_type, campaign.campaign_budget "
-        "FROM campaign ORDER BY campaign.status DESC"
-    )
     candidate = None
-    for row in run_query(client, customer_id, q):
+    for row in run_query(client, customer_id, CAMPAIGNS.bind()):
         if row.campaign.name == ACTIVE_CAMPAIGN_NAME_HINT:
             return row.campaign.resource_name
         if row.campaign.status.name == "ENABLED" and row.campaign.advertising_channel_type.name == "SEARCH" and not candidate:
@@ -45,16 +75,12 @@ def find_active_campaign(client: GoogleAdsClient, customer_id: str) -> Optional[
 
 
 def remove_location_includes_keep_radius(client: GoogleAdsClient, customer_id: str, campaign_res: str) -> None:
-    q = (
-        "SELECT campaign_criterion.resource_name, campaign_criterion.type, campaign_criterion.location.geo_target_constant, "
-        "campaign_criterion.proximity.address.postal_code FROM campaign_criterion "
-        f"WHERE campaign_criterion.campaign = '{campaign_res}'"
-    )
     to_remove: List[str] = []
-    for row in run_query(client, customer_id, q):
+    for row in run_query(client, customer_id, CAMPAIGN_CRITERIA.bind(campaign=campaign_res)):
         cc = row.campaign_criterion
         t = cc.type_.name
-        if t == "LOCATION":
+        # Location exclusions (e.g. from a geo_radius.py plan) stay with the radius
+        if t == "LOCATION" and not cc.negative:
             to_remove.append(cc.resource_name)
     if not to_remove:
         return
@@ -69,45 +95,42 @@ def remove_location_includes_keep_radius(client: GoogleAdsClient, customer_id: s
 
 def ensure_budget_amount(client: GoogleAdsClient, customer_id: str, campaign_res: str, micros: int) -> None:
     # Fetch campaign to get budget
-    q = (
-        "SELECT campaign.campaign_budget FROM campaign WHERE campaign.resource_name = '"
-        + campaign_res + "' LIMIT 1"
-    )
     budget_res = None
-    for row in run_query(client, customer_id, q):
+    for row in run_query(client, customer_id, CAMPAIGN_BUDGET.bind(campaign=campaign_res)):
         budget_res = row.campaign.campaign_budget
     if not budget_res:
         return
-    budget_svc = client.get_service("CampaignBudgetService")
-    op = client.get_type("CampaignBudgetOperation")
-    budget = op.update
-    budget.resource_name = budget_res
-    budget.amount_micros = micros
-    mask = FieldMask()
-    mask.paths.append("amount_micros")
-    op.update_mask.CopyFrom(mask)
-    budget_svc.mutate_campaign_budgets(customer_id=customer_id, operations=[op])
+    set_budget_amounts(client, customer_id, {budget_res: micros})
+
+
+def set_budget_amounts(client: GoogleAdsClient, customer_id: str, amounts: Dict[str, int]) -> None:
+    """Update several budgets' amount_micros in one request (budget_pacing.py batches through this)."""
+    ops = []
+    for budget_res, micros in amounts.items():
+        op = client.get_type("CampaignBudgetOperation")
+        budget = op.update
+        budget.resource_name = budget_res
+        budget.amount_micros = micros
+        mask = FieldMask()
+        mask.paths.append("amount_micros")
+        op.update_mask.CopyFrom(mask)
+        ops.append(op)
+    if ops:
+        budget_svc = client.get_service("CampaignBudgetService")
+        budget_svc.mutate_campaign_budgets(customer_id=customer_id, operations=ops)
 
 
 def add_second_rsa_if_needed(client: GoogleAdsClient, customer_id: str, campaign_res: str, final_url: str) -> None:
     # Find an enabled ad group in this campaign
-    q_ag = (
-        "SELECT ad_group.resource_name, ad_group.name, ad_group.status FROM ad_group "
-        f"WHERE ad_group.campaign = '{campaign_res}' ORDER BY ad_group.name"
-    )
     ag_res = None
-    for row in run_query(client, customer_id, q_ag):
+    for row in run_query(client, customer_id, AD_GROUPS.bind(campaign=campaign_res)):
         if row.ad_group.status.name in ("ENABLED", "PAUSED") and not ag_res:
             ag_res = row.ad_group.resource_name
     if not ag_res:
         return
     # Count enabled RSAs
-    q_ads = (
-        "SELECT ad_group_ad.resource_name, ad_group_ad.status, ad_group_ad.ad.type FROM ad_group_ad "
-        f"WHERE ad_group_ad.ad_group = '{ag_res}'"
-    )
     enabled_rsas = 0
-    for row in run_query(client, customer_id, q_ads):
+    for row in run_query(client, customer_id, AD_GROUP_ADS.bind(ad_group=ag_res)):
         if row.ad_group_ad.ad.type.name == "RESPONSIVE_SEARCH_AD" and row.ad_group_ad.status.name == "ENABLED":
             enabled_rsas += 1
     if enabled_rsas >= 2:
@@ -148,13 +171,9 @@ def add_second_rsa_if_needed(client: GoogleAdsClient, customer_id: str, campaign
 
 
 def demote_ga4_custom_book_appointment(client: GoogleAdsClient, customer_id: str) -> None:
-    q = (
-        "SELECT conversion_action.resource_name, conversion_action.name, conversion_action.include_in_conversions_metric, conversion_action.primary_for_goal "
-        "FROM conversion_action ORDER BY conversion_action.name"
-    )
     ops = []
     ca_svc = client.get_service("ConversionActionService")
-    for row in run_query(client, customer_id, q):
+    for row in run_query(client, customer_id, CONVERSION_ACTIONS.bind()):
         name = row.conversion_action.name
         rn = row.conversion_action.resource_name
         if name.startswith("Book appointment (Google Analytics event"):
@@ -189,7 +208,7 @@ def main(argv: Optional[list[str]] = None) -> int:
     args = p.parse_args(argv)
 
     try:
-        client = GoogleAdsClient.load_from_storage(path=args.config) if args.config else GoogleAdsClient.load_from_storage()
+        client = load_client(args.config)
         campaign_res = find_active_campaign(client, args.customer_id)
         if not campaign_res:
             print("No active Search campaign found.")
@@ -211,6 +230,6 @@ def main(argv: Optional[list[str]] = None) -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(ads_profile.run(main))
 
 
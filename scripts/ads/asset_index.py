@@ -0,0 +1,282 @@
+"""
+Content-addressed index of the account's extension assets, kept across runs.
+
+Assets are immutable and can't be removed, so a sitelink, callout, structured snippet,
+price or promotion with the same content can be linked again instead of created again.
+Each asset is keyed by a fingerprint: SHA-256 of its type and its content fields,
+normalized (whitespace collapsed, enums by name, money in micros), so the same content
+hashes the same whether it comes from a query row or from an AssetOperation being
+built.
+
+The index lives in SQLite (scripts/ads/exports/asset_index.sqlite). Opening it for an
+account reads only assets with a higher ID than the highest one the last refresh read
+(kept in refresh_state; assets this script creates are indexed but don't move it, so
+ones made meanwhile in the UI or by other scripts with lower IDs are still picked up).
+Asset IDs aren't guaranteed to increase, so every FULL_REFRESH_DAYS the refresh reads
+all assets again; the first run (or rebuild=True) does too.
+
+    index = asset_index.open_index(client, customer_id)
+    resource_names = index.ensure(client, [("CALLOUT", op), ...])   # creates only new ones
+    asset_index.link_to_campaign(client, customer_id, campaign_res, "CALLOUT", resource_names)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from google.ads.googleads.client import GoogleAdsClient
+
+import ads_async
+import gaql
+
+
+DEFAULT_DB = "scripts/ads/exports/asset_index.sqlite"
+ASSET_TYPES = ("SITELINK", "CALLOUT", "STRUCTURED_SNIPPET", "PRICE", "PROMOTION")
+FULL_REFRESH_DAYS = 7
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS assets (
+  customer_id TEXT NOT NULL,
+  fingerprint TEXT NOT NULL,
+  asset_type TEXT NOT NULL,
+  resource_name TEXT NOT NULL,
+  asset_id INTEGER NOT NULL,
+  indexed_at TEXT NOT NULL,
+  PRIMARY KEY (customer_id, fingerprint)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS refresh_state (
+  customer_id TEXT PRIMARY KEY,
+  watermark INTEGER NOT NULL,
+  full_refresh_at TEXT NOT NULL,
+  refreshed_at TEXT NOT NULL
+);
+"""
+
+ASSETS = (
+    gaql.Query("asset")
+    .select(
+        "asset.id",
+        "asset.resource_name",
+        "asset.type",
+        "asset.final_urls",
+        "asset.final_mobile_urls",
+        *gaql.fields("asset.sitelink_asset", "link_text description1 description2"),
+        "asset.callout_asset.callout_text",
+        *gaql.fields("asset.structured_snippet_asset", "header values"),
+        *gaql.fields("asset.price_asset", "type price_qualifier language_code price_offerings"),
+        *gaql.fields(
+            "asset.promotion_asset",
+            "promotion_target discount_modifier percent_off money_amount_off.amount_micros money_amount_off.currency_code "
+            "promotion_code orders_over_amount.amount_micros orders_over_amount.currency_code occasion language_code "
+            "start_date end_date",
+        ),
+    )
+    .where("asset.type IN :types")
+    .where("asset.id > :after")
+)
+CAMPAIGN_LINKS = (
+    gaql.Query("campaign_asset")
+    .select("campaign_asset.asset")
+    .where("campaign_asset.campaign = :campaign")
+    .where("campaign_asset.field_type = :field_type")
+    .where("campaign_asset.status != REMOVED")
+)
+
+
+def _text(value: Any) -> str:
+    return " ".join(str(value).split())
+
+
+def _enum(value: Any) -> str:
+    return getattr(value, "name", str(value))
+
+
+def _money(money: Any) -> List[Any]:
+    return [int(money.amount_micros or 0), money.currency_code or ""]
+
+
+def content(asset_type: str, asset: Any) -> Dict[str, Any]:
+    """The normalized fields that make two assets of `asset_type` the same."""
+    urls = {"final_urls": [u.strip() for u in asset.final_urls], "final_mobile_urls": [u.strip() for u in asset.final_mobile_urls]}
+    if asset_type == "SITELINK":
+        s = asset.sitelink_asset
+        return {"link_text": _text(s.link_text), "description1": _text(s.description1), "description2": _text(s.description2), **urls}
+    if asset_type == "CALLOUT":
+        return {"callout_text": _text(asset.callout_asset.callout_text)}
+    if asset_type == "STRUCTURED_SNIPPET":
+        s = asset.structured_snippet_asset
+        return {"header": _text(s.header), "values": [_text(v) for v in s.values]}
+    if asset_type == "PRICE":
+        p = asset.price_asset
+        offerings = [
+            {
+                "header": _text(o.header),
+                "description": _text(o.description),
+                "final_url": o.final_url.strip(),
+                "unit": _enum(o.unit),
+                "price": _money(o.price),
+            }
+            for o in p.price_offerings
+        ]
+        return {"type": _enum(p.type_), "price_qualifier": _enum(p.price_qualifier), "language_code": p.language_code, "offerings": offerings}
+    if asset_type == "PROMOTION":
+        p = asset.promotion_asset
+        return {
+            "promotion_target": _text(p.promotion_target),
+            "discount_modifier": _enum(p.discount_modifier),
+            "percent_off": int(p.percent_off or 0),
+            "money_amount_off": _money(p.money_amount_off),
+            "promotion_code": p.promotion_code,
+            "orders_over_amount": _money(p.orders_over_amount),
+            "occasion": _enum(p.occasion),
+            "language_code": p.language_code,
+            "start_date": p.start_date,
+            "end_date": p.end_date,
+            **urls,
+        }
+    raise ValueError(f"Unsupported asset type: {asset_type}")
+
+
+def fingerprint(asset_type: str, asset: Any) -> str:
+    payload = json.dumps([asset_type, content(asset_type, asset)], sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime(TIMESTAMP_FORMAT)
+
+
+class AssetIndex:
+    def __init__(self, conn: sqlite3.Connection, customer_id: str):
+        self.conn = conn
+        self.customer_id = customer_id
+
+    def refresh(self, client: GoogleAdsClient, rebuild: bool = False) -> int:
+        """
+        Index assets above the last refresh's watermark, or all of them on the first run,
+        with `rebuild`, or when the last full read is FULL_REFRESH_DAYS old. Returns how
+        many were read.
+        """
+        now = _now()
+        state = self.conn.execute(
+            "SELECT watermark, full_refresh_at FROM refresh_state WHERE customer_id = ?", (self.customer_id,)
+        ).fetchone()
+        stale = state is None or datetime.strptime(state[1], TIMESTAMP_FORMAT) < datetime.strptime(
+            now, TIMESTAMP_FORMAT
+        ) - timedelta(days=FULL_REFRESH_DAYS)
+        full = rebuild or stale
+        if rebuild:
+            with self.conn:
+                self.conn.execute("DELETE FROM assets WHERE customer_id = ?", (self.customer_id,))
+        after = 0 if full else state[0]
+        rows = ads_async.fetch(client, self.customer_id, ASSETS.bind(types=[gaql.Enum(t) for t in ASSET_TYPES], after=after))
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO refresh_state (customer_id, watermark, full_refresh_at, refreshed_at) VALUES (?, ?, ?, ?)",
+                (self.customer_id, max([after] + [row.asset.id for row in rows]), now if full else state[1], now),
+            )
+            for row in rows:
+                asset_type = row.asset.type_.name
+                # Keep the first (oldest) asset when the account already holds duplicates
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO assets (customer_id, fingerprint, asset_type, resource_name, asset_id, indexed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (self.customer_id, fingerprint(asset_type, row.asset), asset_type, row.asset.resource_name, row.asset.id, _now()),
+                )
+        return len(rows)
+
+    def lookup(self, asset_type: str, asset: Any) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT resource_name FROM assets WHERE customer_id = ? AND fingerprint = ?",
+            (self.customer_id, fingerprint(asset_type, asset)),
+        ).fetchone()
+        return row[0] if row else None
+
+    def record(self, asset_type: str, asset: Any, resource_name: str) -> None:
+        asset_id = int(resource_name.rsplit("/", 1)[-1])
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO assets (customer_id, fingerprint, asset_type, resource_name, asset_id, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.customer_id, fingerprint(asset_type, asset), asset_type, resource_name, asset_id, _now()),
+            )
+
+    def ensure(self, client: GoogleAdsClient, operations: Sequence[Tuple[str, Any]]) -> List[str]:
+        """
+        Resource names for the assets in `operations` ((asset type, AssetOperation) with
+        `create` filled in), in order: indexed ones are reused, the rest created in one
+        request. Identical assets within `operations` are created once.
+        """
+        resource_names: List[Optional[str]] = []
+        pending: Dict[str, List[int]] = {}
+        to_create: List[Tuple[str, Any]] = []
+        for i, (asset_type, op) in enumerate(operations):
+            existing = self.lookup(asset_type, op.create)
+            resource_names.append(existing)
+            if existing:
+                continue
+            key = fingerprint(asset_type, op.create)
+            if key not in pending:
+                pending[key] = []
+                to_create.append((asset_type, op))
+            pending[key].append(i)
+        if to_create:
+            response = client.get_service("AssetService").mutate_assets(
+                customer_id=self.customer_id, operations=[op for _, op in to_create]
+            )
+            for (asset_type, op), result in zip(to_create, response.results):
+                self.record(asset_type, op.create, result.resource_name)
+                for i in pending[fingerprint(asset_type, op.create)]:
+                    resource_names[i] = result.resource_name
+        return [rn for rn in resource_names if rn is not None]
+
+    def counts(self) -> Dict[str, int]:
+        return dict(
+            self.conn.execute(
+                "SELECT asset_type, COUNT(*) FROM assets WHERE customer_id = ? GROUP BY asset_type", (self.customer_id,)
+            ).fetchall()
+        )
+
+
+def open_index(
+    client: GoogleAdsClient, customer_id: str, path: str = DEFAULT_DB, rebuild: bool = False
+) -> AssetIndex:
+    """The account's index, caught up with assets created since the last run."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    index = AssetIndex(conn, customer_id)
+    index.refresh(client, rebuild)
+    return index
+
+
+def linked_assets(client: GoogleAdsClient, customer_id: str, campaign_res: str, field_type: str) -> Set[str]:
+    rows = ads_async.fetch(client, customer_id, CAMPAIGN_LINKS.bind(campaign=campaign_res, field_type=gaql.Enum(field_type)))
+    return {row.campaign_asset.asset for row in rows}
+
+
+def link_to_campaign(
+    client: GoogleAdsClient, customer_id: str, campaign_res: str, field_type: str, asset_resource_names: Iterable[str]
+) -> int:
+    """Link the assets not yet linked to the campaign as `field_type`, in one request. Returns how many were linked."""
+    linked = linked_assets(client, customer_id, campaign_res, field_type)
+    operations = []
+    for rn in dict.fromkeys(asset_resource_names):
+        if rn in linked:
+            continue
+        op = client.get_type("CampaignAssetOperation")
+        op.create.asset = rn
+        op.create.field_type = getattr(client.enums.AssetFieldTypeEnum, field_type)
+        op.create.campaign = campaign_res
+        operations.append(op)
+    if operations:
+        client.get_service("CampaignAssetService").mutate_campaign_assets(customer_id=customer_id, operations=operations)
+    return len(operations)
@@ -11,9 +11,11 @@ from __future__ import annotations
 import argparse
 from typing import Optional
 
-from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 
+from ads_client import load_client
+import ads_profile
+
 
 def main(argv: Optional[list[str]] = None) -> int:
     p = argparse.ArgumentParser(description="Attach Call asset")
@@ -24,7 +26,7 @@ def main(argv: Optional[list[str]] = None) -> int:
     args = p.parse_args(argv)
 
     try:
-        client = GoogleAdsClient.load_from_storage(path=args.config) if args.config else GoogleAdsClient.load_from_storage()
+        client = load_client(args.config)
 
         # 1) Create the Asset (Call)
         asset_svc = client.get_service("AssetService")
@@ -58,6 +60,6 @@ def main(argv: Optional[list[str]] = None) -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(ads_profile.run(main))
 
 
@@ -15,22 +15,30 @@ from typing import Optional
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 
+from ads_client import load_client
+import ads_profile
+import gaql
+
 
 ACTIVE_CAMPAIGN_NAME_HINT = "HMNP – Mobile – 77591 Radius"
 
 
+CAMPAIGNS = (
+    gaql.Query("campaign")
+    .select("campaign.resource_name", "campaign.name", "campaign.status", "campaign.advertising_channel_type")
+    .order_by("campaign.status DESC")
+)
+ASSET_SETS = gaql.Query("asset_set").select("asset_set.resource_name", "asset_set.type")
+
+
 def run_query(client: GoogleAdsClient, customer_id: str, query: str):
     svc = client.get_service("GoogleAdsService")
     return svc.search(customer_id=customer_id, query=query)
 
 
 def find_active_campaign(client: GoogleAdsClient, customer_id: str) -> Optional[str]:
-    q = (
-        "SELECT campaign.resource_name, campaign.name, campaign.status, campaign.advertising_channel_type "
-        "FROM campaign ORDER BY campaign.status DESC"
-    )
     candidate = None
-    for row in run_query(client, customer_id, q):
+    for row in run_query(client, customer_id, CAMPAIGNS.bind()):
         if row.campaign.name == ACTIVE_CAMPAIGN_NAME_HINT:
             return row.campaign.resource_name
         if row.campaign.status.name == "ENABLED" and row.campaign.advertising_channel_type.name == "SEARCH" and not candidate:
@@ -40,11 +48,7 @@ def find_active_campaign(client: GoogleAdsClient, customer_id: str) -> Optional[
 
 def find_location_asset_set(client: GoogleAdsClient, customer_id: str) -> Optional[str]:
     # Prefer existing LOCATION AssetSet (typically created when GBP is linked)
-    q = (
-        "SELECT asset_set.resource_name, asset_set.id, asset_set.name, asset_set.type "
-        "FROM asset_set"
-    )
-    for row in run_query(client, customer_id, q):
+    for row in run_query(client, customer_id, ASSET_SETS.bind()):
         try:
             if row.asset_set.type_.name == "LOCATION":
                 return row.asset_set.resource_name
@@ -70,7 +74,7 @@ def main(argv: Optional[list[str]] = None) -> int:
     args = p.parse_args(argv)
 
     try:
-        client = GoogleAdsClient.load_from_storage(path=args.config) if args.config else GoogleAdsClient.load_from_storage()
+        client = load_client(args.config)
         campaign_res = find_active_campaign(client, args.customer_id)
         if not campaign_res:
             print("No active Search campaign found.")
@@ -93,6 +97,6 @@ def main(argv: Optional[list[str]] = None) -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(ads_profile.run(main))
 
 
@@ -3,22 +3,32 @@
 Audit Google Ads account configuration: campaigns, budgets, bidding, geo, schedules,
 ad groups, keywords/negatives, ads (RSA), and conversion action status.
 
+Every section is read from the account mirror schema (ads_mirror.py). By default only
+the tables the audit reports are loaded into a throwaway in-memory mirror; --mirror
+syncs and reads the on-disk mirror instead (incremental after the first run), and
+--offline reads it without any API calls.
+
 Usage:
   python3 scripts/ads/audit_campaign.py --customer-id 5072649468 --config /abs/path/google-ads.yaml
+  python3 scripts/ads/audit_campaign.py --customer-id 5072649468 --mirror
+  python3 scripts/ads/audit_campaign.py --customer-id 5072649468 --offline
 """
 
 from __future__ import annotations
 
 import argparse
+import sqlite3
 from typing import Optional
 
-from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 
+from ads_client import load_client
+import ads_mirror
+import ads_profile
+
 
-def run_query(client: GoogleAdsClient, customer_id: str, query: str):
-    service = client.get_service("GoogleAdsService")
-    return service.search(customer_id=customer_id, query=query)
+# Mirror tables the sections below read; the throwaway mirror loads only these
+AUDITED_TABLES = ("campaigns", "budgets", "campaign_criteria", "ad_groups", "ad_group_criteria", "ads", "conversion_actions")
 
 
 def print_header(title: str) -> None:
@@ -27,117 +37,100 @@ def print_header(title: str) -> None:
     print("=" * 80)
 
 
-def audit_campaigns(client: GoogleAdsClient, customer_id: str) -> None:
+def audit_campaigns(conn: sqlite3.Connection, customer_id: str) -> None:
     print_header("Campaigns Overview")
-    query = (
-        "SELECT campaign.id, campaign.name, campaign.status, campaign.advertising_channel_type, "
-        "campaign.bidding_strategy_type, campaign.campaign_budget, campaign.start_date, campaign.end_date "
-        "FROM campaign ORDER BY campaign.name"
-    )
-    for row in run_query(client, customer_id, query):
-        c = row.campaign
-        print(f"- {c.name} (ID {c.id}) | Status={c.status.name} | Channel={c.advertising_channel_type.name} | Bidding={c.bidding_strategy_type.name}")
-        print(f"  Budget resource: {c.campaign_budget} | Dates: {c.start_date} → {c.end_date or '-'}")
+    for c in conn.execute("SELECT * FROM campaigns WHERE customer_id = ? ORDER BY name", (customer_id,)):
+        print(f"- {c['name']} (ID {c['campaign_id']}) | Status={c['status']} | Channel={c['channel']} | Bidding={c['bidding']}")
+        print(f"  Budget resource: {c['budget']} | Dates: {c['start_date']} → {c['end_date'] or '-'}")
 
 
-def audit_budgets(client: GoogleAdsClient, customer_id: str) -> None:
+def audit_budgets(conn: sqlite3.Connection, customer_id: str) -> None:
     print_header("Budgets")
-    query = (
-        "SELECT campaign_budget.resource_name, campaign_budget.name, campaign_budget.amount_micros, "
-        "campaign_budget.delivery_method, campaign_budget.explicitly_shared "
-        "FROM campaign_budget ORDER BY campaign_budget.name"
-    )
-    for row in run_query(client, customer_id, query):
-        b = row.campaign_budget
-        print(f"- {b.name} | amount_micros={b.amount_micros} | delivery={b.delivery_method.name} | shared={b.explicitly_shared}")
+    for b in conn.execute("SELECT * FROM budgets WHERE customer_id = ? ORDER BY name", (customer_id,)):
+        print(f"- {b['name']} | amount_micros={b['amount_micros']} | delivery={b['delivery']} | shared={bool(b['shared'])}")
 
 
-def audit_geo_and_schedule(client: GoogleAdsClient, customer_id: str) -> None:
+def audit_geo_and_schedule(conn: sqlite3.Connection, customer_id: str) -> None:
     print_header("Geo & Ad Schedule (Campaign Criteria)")
-    query = (
-        "SELECT campaign.name, campaign.id, campaign_criterion.type, campaign_criterion.negative, "
-        "campaign_criterion.location.geo_target_constant, campaign_criterion.proximity.address.postal_code, "
-        "campaign_criterion.proximity.address.country_code, campaign_criterion.proximity.radius, campaign_criterion.proximity.radius_units, "
-        "campaign_criterion.ad_schedule.day_of_week, campaign_criterion.ad_schedule.start_hour, campaign_criterion.ad_schedule.end_hour "
-        "FROM campaign_criterion "
-        "WHERE campaign_criterion.type IN (LOCATION, PROXIMITY, AD_SCHEDULE) "
-        "ORDER BY campaign.name"
+    rows = conn.execute(
+        """
+        SELECT c.name AS campaign_name, cc.*
+        FROM campaign_criteria cc
+        JOIN campaigns c ON c.customer_id = cc.customer_id AND c.campaign_id = cc.campaign_id
+        WHERE cc.customer_id = ? AND cc.type IN ('LOCATION', 'PROXIMITY', 'AD_SCHEDULE')
+        ORDER BY c.name
+        """,
+        (customer_id,),
     )
-    for row in run_query(client, customer_id, query):
-        c = row.campaign
-        cc = row.campaign_criterion
-        if cc.type_.name == "LOCATION":
-            print(f"- {c.name} | LOCATION include | geo_target={cc.location.geo_target_constant}")
-        elif cc.type_.name == "PROXIMITY":
-            prox = cc.proximity
+    for cc in rows:
+        if cc["type"] == "LOCATION":
+            print(f"- {cc['campaign_name']} | LOCATION include | geo_target={cc['geo_target']}")
+        elif cc["type"] == "PROXIMITY":
             print(
-                f"- {c.name} | PROXIMITY include | {prox.address.postal_code},{prox.address.country_code} radius={prox.radius} {prox.radius_units.name}"
+                f"- {cc['campaign_name']} | PROXIMITY include | {cc['postal_code']},{cc['country_code']} radius={cc['radius']} {cc['radius_units']}"
             )
-        elif cc.type_.name == "AD_SCHEDULE":
-            sch = cc.ad_schedule
-            print(f"- {c.name} | SCHEDULE {sch.day_of_week.name} {sch.start_hour}:00–{sch.end_hour}:00")
+        elif cc["type"] == "AD_SCHEDULE":
+            print(f"- {cc['campaign_name']} | SCHEDULE {cc['day_of_week']} {cc['start_hour']}:00–{cc['end_hour']}:00")
 
 
-def audit_adgroups_keywords_ads(client: GoogleAdsClient, customer_id: str) -> None:
+def audit_adgroups_keywords_ads(conn: sqlite3.Connection, customer_id: str) -> None:
     print_header("Ad Groups")
-    q_ag = (
-        "SELECT campaign.name, ad_group.id, ad_group.name, ad_group.status "
-        "FROM ad_group ORDER BY campaign.name, ad_group.name"
-    )
-    for row in run_query(client, customer_id, q_ag):
-        print(f"- {row.campaign.name} › {row.ad_group.name} (ID {row.ad_group.id}) | {row.ad_group.status.name}")
+    q_ag = """
+        SELECT c.name AS campaign_name, g.ad_group_id, g.name, g.status
+        FROM ad_groups g JOIN campaigns c ON c.customer_id = g.customer_id AND c.campaign_id = g.campaign_id
+        WHERE g.customer_id = ? ORDER BY c.name, g.name
+    """
+    for row in conn.execute(q_ag, (customer_id,)):
+        print(f"- {row['campaign_name']} › {row['name']} (ID {row['ad_group_id']}) | {row['status']}")
 
     print_header("Keywords (non-negative)")
-    q_kw = (
-        "SELECT campaign.name, ad_group.name, ad_group_criterion.criterion_id, ad_group_criterion.status, "
-        "ad_group_criterion.keyword.text, ad_group_criterion.keyword.match_type "
-        "FROM ad_group_criterion "
-        "WHERE ad_group_criterion.type = KEYWORD AND ad_group_criterion.negative = FALSE "
-        "ORDER BY campaign.name, ad_group.name"
-    )
+    q_kw = """
+        SELECT c.name AS campaign_name, g.name AS ad_group_name, k.keyword_text, k.match_type
+        FROM ad_group_criteria k
+        JOIN ad_groups g ON g.customer_id = k.customer_id AND g.ad_group_id = k.ad_group_id
+        JOIN campaigns c ON c.customer_id = k.customer_id AND c.campaign_id = k.campaign_id
+        WHERE k.customer_id = ? AND k.type = 'KEYWORD' AND k.negative = 0
+        ORDER BY c.name, g.name
+    """
     cnt = 0
-    for row in run_query(client, customer_id, q_kw):
+    for row in conn.execute(q_kw, (customer_id,)):
         cnt += 1
-        print(f"- {row.campaign.name} › {row.ad_group.name} | [{row.ad_group_criterion.keyword.match_type.name}] {row.ad_group_criterion.keyword.text}")
+        print(f"- {row['campaign_name']} › {row['ad_group_name']} | [{row['match_type']}] {row['keyword_text']}")
     print(f"Total keywords: {cnt}")
 
     print_header("Campaign Negatives")
-    q_neg = (
-        "SELECT campaign.name, campaign_criterion.criterion_id, campaign_criterion.negative, "
-        "campaign_criterion.keyword.text, campaign_criterion.keyword.match_type "
-        "FROM campaign_criterion "
-        "WHERE campaign_criterion.negative = TRUE "
-        "ORDER BY campaign.name"
-    )
+    q_neg = """
+        SELECT c.name AS campaign_name, cc.keyword_text, cc.match_type
+        FROM campaign_criteria cc JOIN campaigns c ON c.customer_id = cc.customer_id AND c.campaign_id = cc.campaign_id
+        WHERE cc.customer_id = ? AND cc.negative = 1
+        ORDER BY c.name
+    """
     ncnt = 0
-    for row in run_query(client, customer_id, q_neg):
+    for row in conn.execute(q_neg, (customer_id,)):
         ncnt += 1
-        print(f"- {row.campaign.name} | NEG [{row.campaign_criterion.keyword.match_type.name}] {row.campaign_criterion.keyword.text}")
+        print(f"- {row['campaign_name']} | NEG [{row['match_type']}] {row['keyword_text']}")
     print(f"Total negatives: {ncnt}")
 
     print_header("Ads (RSA)")
-    q_ads = (
-        "SELECT campaign.name, ad_group.name, ad_group_ad.ad.type, ad_group_ad.status, ad_group_ad.ad.id "
-        "FROM ad_group_ad ORDER BY campaign.name, ad_group.name"
-    )
+    q_ads = """
+        SELECT c.name AS campaign_name, g.name AS ad_group_name, a.type, a.status
+        FROM ads a
+        JOIN ad_groups g ON g.customer_id = a.customer_id AND g.ad_group_id = a.ad_group_id
+        JOIN campaigns c ON c.customer_id = a.customer_id AND c.campaign_id = a.campaign_id
+        WHERE a.customer_id = ? ORDER BY c.name, g.name
+    """
     acnt = 0
-    for row in run_query(client, customer_id, q_ads):
+    for row in conn.execute(q_ads, (customer_id,)):
         acnt += 1
-        print(f"- {row.campaign.name} › {row.ad_group.name} | {row.ad_group_ad.ad.type.name} | {row.ad_group_ad.status.name}")
+        print(f"- {row['campaign_name']} › {row['ad_group_name']} | {row['type']} | {row['status']}")
     print(f"Total ads: {acnt}")
 
 
-def audit_conversions(client: GoogleAdsClient, customer_id: str) -> None:
+def audit_conversions(conn: sqlite3.Connection, customer_id: str) -> None:
     print_header("Conversion Actions")
-    q = (
-        "SELECT conversion_action.id, conversion_action.name, conversion_action.status, conversion_action.primary_for_goal, "
-        "conversion_action.category, conversion_action.value_settings.default_value, conversion_action.type "
-        "FROM conversion_action ORDER BY conversion_action.name"
-    )
-    for row in run_query(client, customer_id, q):
-        ca = row.conversion_action
+    for ca in conn.execute("SELECT * FROM conversion_actions WHERE customer_id = ? ORDER BY name", (customer_id,)):
         print(
-            f"- {ca.name} (ID {ca.id}) | {ca.status.name} | primary={ca.primary_for_goal} | cat={ca.category.name} | type={ca.type.name} | default_value={ca.value_settings.default_value}"
+            f"- {ca['name']} (ID {ca['conversion_action_id']}) | {ca['status']} | primary={bool(ca['primary_for_goal'])} | cat={ca['category']} | type={ca['type']} | default_value={ca['default_value']}"
         )
 
 
@@ -145,15 +138,23 @@ def main(argv: Optional[list[str]] = None) -> int:
     parser = argparse.ArgumentParser(description="Audit Google Ads account setup")
     parser.add_argument("--customer-id", required=True)
     parser.add_argument("--config", default=None)
+    parser.add_argument("--mirror", action="store_true", help="Sync the on-disk account mirror, then audit it")
+    parser.add_argument("--offline", action="store_true", help="Audit the on-disk account mirror without calling the API")
+    parser.add_argument("--db", default=ads_mirror.DEFAULT_DB)
     args = parser.parse_args(argv)
 
     try:
-        client = GoogleAdsClient.load_from_storage(path=args.config) if args.config else GoogleAdsClient.load_from_storage()
-        audit_campaigns(client, args.customer_id)
-        audit_budgets(client, args.customer_id)
-        audit_geo_and_schedule(client, args.customer_id)
-        audit_adgroups_keywords_ads(client, args.customer_id)
-        audit_conversions(client, args.customer_id)
+        client = None if args.offline else load_client(args.config)
+        if args.mirror or args.offline:
+            conn = ads_mirror.open_for_tool(args.db, args.customer_id, client)
+        else:
+            conn = ads_mirror.open_mirror(":memory:")
+            ads_mirror.load_tables(conn, client, args.customer_id, AUDITED_TABLES)
+        audit_campaigns(conn, args.customer_id)
+        audit_budgets(conn, args.customer_id)
+        audit_geo_and_schedule(conn, args.customer_id)
+        audit_adgroups_keywords_ads(conn, args.customer_id)
+        audit_conversions(conn, args.customer_id)
         return 0
     except GoogleAdsException as ex:
         print(f"GoogleAdsException: {ex}")
@@ -166,6 +167,6 @@ def main(argv: Optional[list[str]] = None) -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(ads_profile.run(main))
 
 
@@ -19,6 +19,8 @@ import subprocess
 import sys
 from typing import Optional
 
+import ads_profile
+
 
 def run(cmd: list[str]) -> int:
     print(">>", " ".join(cmd))
@@ -61,6 +63,6 @@ def main(argv: Optional[list[str]] = None) -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(ads_profile.run(main))
 
 
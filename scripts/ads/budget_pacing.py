@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Intraday budget pacing: project today's and this month's spend per campaign and nudge
+daily budgets toward the monthly target, instead of finding out from the next day's
+daily_export.py CSV.
+
+Each run reads, concurrently (ads_async), today's spend by segments.hour, month-to-date
+spend and the current budgets. Hourly spend curves are fitted once a day from the last
+28 days (segments.day_of_week x segments.hour), per campaign and weekday, shrunk toward
+the campaign's all-days curve, and cached in --curve-cache; hourly runs therefore cost
+three small queries. The curve gives the share of a day's spend normally gone by now
+(reporting lags ~2 hours, --lag-hours), so:
+
+  projected today  spend so far / expected share (or budget-paced once the share is tiny)
+  desired today    (monthly target - spend before today) / days left including today
+  projected month  spend before today + projected today + remaining days at the budget
+
+A campaign projected over desired gets its budget scaled down by desired / projected; one
+projected under desired gets it scaled up only when it is budget-limited (projected near
+its budget), since more budget does not help a campaign that is not spending what it has; no
+budget is raised before the expected share reaches 15%. Steps are bounded by --max-step and
+--min-budget/--max-budget (a fixed ceiling, not relative to the current budget), changes
+inside a 5% dead band are skipped, shared budgets are left alone, and all changes go out
+in one batched budget mutate (apply_fixes.set_budget_amounts).
+
+Usage:
+  python3 scripts/ads/budget_pacing.py --customer-id 5072649468 --config google-ads.yaml --dry-run
+  python3 scripts/ads/budget_pacing.py --customer-id 5072649468 --monthly-target 760 --campaign-id 22917408924
+  python3 scripts/ads/budget_pacing.py --customer-id 5072649468 --report scripts/ads/exports/pacing.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import calendar
+import csv
+import json
+import os
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+from zoneinfo import ZoneInfo
+
+from google.ads.googleads.client import GoogleAdsClient
+from google.ads.googleads.errors import GoogleAdsException
+
+from ads_client import load_client
+import ads_async
+import ads_mirror
+import ads_profile
+import apply_fixes
+import gaql
+
+
+DEFAULT_CURVE_CACHE = "scripts/ads/exports/pacing_curves.json"
+HISTORY_DAYS = 28  # four of each weekday
+# Weight of a campaign's all-days curve in each weekday curve, in days of average spend
+PRIOR_DAYS = 3.0
+REPORTING_LAG_HOURS = 2.0
+# Before this share of the day is normally spent, spend so far says little about the rest
+MIN_EXPECTED_SHARE = 0.15
+# Projected within this of the budget counts as budget-limited
+BUDGET_LIMITED = 0.95
+MAX_STEP = 0.2
+# Default --max-budget: a fixed multiple of the standard budget, so repeated raises can't ratchet it up
+DEFAULT_MAX_BUDGET_MICROS = 2 * apply_fixes.BUDGET_MICROS_TARGET
+DEAD_BAND = 0.05
+MICROS_PER_CENT = 10_000
+FLAT = [h / 24 for h in range(25)]
+
+ENABLED_BUDGETS = (
+    gaql.Query("campaign")
+    .select(
+        "campaign.id",
+        "campaign.name",
+        "campaign.campaign_budget",
+        "campaign_budget.amount_micros",
+        "campaign_budget.explicitly_shared",
+    )
+    .where("campaign.status = ENABLED")
+)
+SPEND_BY_HOUR = (
+    gaql.Query("campaign")
+    .select("campaign.id", "segments.hour", "metrics.cost_micros")
+    .where("segments.date = :day")
+    .where("metrics.cost_micros > 0")
+)
+SPEND_BETWEEN = (
+    gaql.Query("campaign")
+    .select("campaign.id", "metrics.cost_micros")
+    .where("segments.date BETWEEN :first AND :last")
+    .where("metrics.cost_micros > 0")
+)
+HOURLY_HISTORY = (
+    gaql.Query("campaign")
+    .select("campaign.id", "segments.day_of_week", "segments.hour", "metrics.cost_micros")
+    .where("segments.date BETWEEN :first AND :last")
+    .where("metrics.cost_micros > 0")
+)
+
+
+class Pace(NamedTuple):
+    campaign_id: str
+    name: str
+    budget: str
+    budget_micros: int
+    spent_today: int
+    expected_share: float
+    projected_today: int
+    desired_today: int
+    spent_before_today: int
+    projected_month: int
+    target_month: int
+    new_budget_micros: int
+    reason: str
+
+
+def fit_curves(rows: Iterable[Any]) -> Dict[str, Dict[str, List[float]]]:
+    """
+    Campaign id -> weekday -> cumulative share of the day's spend before each hour
+    (25 points, 0.0 .. 1.0). Each weekday curve is that weekday's hourly spend plus
+    PRIOR_DAYS of the campaign's average hourly spend, so thin weekdays lean on the mean.
+    """
+    hourly: Dict[str, Dict[str, List[float]]] = {}
+    for row in rows:
+        by_day = hourly.setdefault(str(row.campaign.id), {})
+        by_day.setdefault(row.segments.day_of_week.name, [0.0] * 24)[row.segments.hour] += row.metrics.cost_micros
+
+    curves: Dict[str, Dict[str, List[float]]] = {}
+    for campaign_id, by_day in hourly.items():
+        overall = [sum(hour) for hour in zip(*by_day.values())]
+        total = sum(overall)
+        prior = [cost * PRIOR_DAYS / HISTORY_DAYS for cost in overall]
+        curves[campaign_id] = {"ALL": [0.0] + [c / total for c in accumulate(overall)]}
+        for weekday, costs in by_day.items():
+            blended = [cost + p for cost, p in zip(costs, prior)]
+            day_total = sum(blended)
+            curves[campaign_id][weekday] = [0.0] + [c / day_total for c in accumulate(blended)]
+    return curves
+
+
+def expected_share(curve: List[float], hours: float) -> float:
+    """Share of the day's spend normally gone `hours` into the day, interpolated within the hour."""
+    if hours <= 0:
+        return 0.0
+    if hours >= 24:
+        return 1.0
+    h = int(hours)
+    return curve[h] + (hours - h) * (curve[h + 1] - curve[h])
+
+
+def load_curves(
+    client: GoogleAdsClient, customer_id: str, today: date, path: str
+) -> Dict[str, Dict[str, List[float]]]:
+    """Today's fitted curves from the cache, refitting from history on the first run of the day."""
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("customer_id") == customer_id and cached.get("date") == today.isoformat():
+            return cached["curves"]
+    rows = ads_async.fetch(
+        client,
+        customer_id,
+        HOURLY_HISTORY.bind(first=today - timedelta(days=HISTORY_DAYS), last=today - timedelta(days=1)),
+    )
+    curves = fit_curves(rows)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"customer_id": customer_id, "date": today.isoformat(), "curves": curves}, f)
+    return curves
+
+
+def _bounded(current: int, wanted: float, max_step: float, floor: int, ceiling: int) -> int:
+    stepped = min(max(wanted, current * (1 - max_step)), current * (1 + max_step))
+    return int(round(min(max(stepped, floor), ceiling) / MICROS_PER_CENT)) * MICROS_PER_CENT
+
+
+def plan(
+    budgets: Iterable[Any],
+    spend_by_hour: Iterable[Any],
+    spend_before_today: Iterable[Any],
+    curves: Dict[str, Dict[str, List[float]]],
+    now: datetime,
+    target_month: int,
+    max_step: float = MAX_STEP,
+    floor: int = 0,
+    ceiling: int = DEFAULT_MAX_BUDGET_MICROS,
+    lag_hours: float = REPORTING_LAG_HOURS,
+) -> List[Pace]:
+    """One Pace per enabled campaign; new_budget_micros == budget_micros means hold."""
+    spent: Dict[str, int] = {}
+    for row in spend_by_hour:
+        spent[str(row.campaign.id)] = spent.get(str(row.campaign.id), 0) + row.metrics.cost_micros
+    before: Dict[str, int] = {}
+    for row in spend_before_today:
+        before[str(row.campaign.id)] = before.get(str(row.campaign.id), 0) + row.metrics.cost_micros
+
+    days_left = calendar.monthrange(now.year, now.month)[1] - now.day + 1
+    hours = now.hour + now.minute / 60 - lag_hours
+    weekday = now.strftime("%A").upper()
+    paces = []
+    for row in budgets:
+        campaign_id = str(row.campaign.id)
+        budget_micros = row.campaign_budget.amount_micros
+        by_day = curves.get(campaign_id, {})
+        share = expected_share(by_day.get(weekday) or by_day.get("ALL") or FLAT, hours)
+        spent_today = spent.get(campaign_id, 0)
+        if share >= MIN_EXPECTED_SHARE:
+            projected_today = int(spent_today / share)
+        else:
+            projected_today = int(spent_today + (1 - share) * budget_micros)
+        spent_month = before.get(campaign_id, 0)
+        desired_today = int(max(target_month - spent_month, 0) / days_left)
+        projected_month = spent_month + projected_today + (days_left - 1) * budget_micros
+
+        # Delivery scales roughly with the budget, so aim it at desired / projected of itself
+        wanted = budget_micros
+        scaled = budget_micros * desired_today / projected_today if projected_today else budget_micros
+        if row.campaign_budget.explicitly_shared:
+            reason = "shared budget, left alone"
+        elif projected_today > desired_today * (1 + DEAD_BAND):
+            wanted, reason = scaled, "over pace"
+        elif projected_today < desired_today * (1 - DEAD_BAND):
+            if share < MIN_EXPECTED_SHARE:
+                # A budget-paced projection always looks budget-limited; wait for real spend
+                reason = "under pace, too early in the day to raise"
+            elif projected_today >= BUDGET_LIMITED * budget_micros:
+                wanted, reason = scaled, "under pace, budget-limited"
+            else:
+                reason = "under pace, not budget-limited"
+        else:
+            reason = "on pace"
+        new_budget = budget_micros
+        if wanted != budget_micros:
+            new_budget = _bounded(budget_micros, wanted, max_step, floor, max(ceiling, budget_micros))
+            if abs(new_budget - budget_micros) < DEAD_BAND * budget_micros:
+                new_budget, reason = budget_micros, reason + " (change inside dead band)"
+        paces.append(
+            Pace(
+                campaign_id, row.campaign.name, row.campaign.campaign_budget, budget_micros, spent_today, share,
+                projected_today, desired_today, spent_month, projected_month, target_month, new_budget, reason,
+            )
+        )
+    return paces
+
+
+def _usd(micros: int) -> str:
+    return f"${micros / 1_000_000:,.2f}"
+
+
+def print_report(paces: List[Pace], now: datetime) -> None:
+    print(f"Pacing at {now:%Y-%m-%d %H:%M} account time")
+    for p in paces:
+        change = (
+            f"{_usd(p.budget_micros)} -> {_usd(p.new_budget_micros)}"
+            if p.new_budget_micros != p.budget_micros
+            else f"hold {_usd(p.budget_micros)}"
+        )
+        print(f"- {p.name} ({p.campaign_id}): {change} | {p.reason}")
+        print(
+            f"    today {_usd(p.spent_today)} spent, {p.expected_share:.0%} of day expected, "
+            f"projected {_usd(p.projected_today)} vs desired {_usd(p.desired_today)}"
+        )
+        print(
+            f"    month {_usd(p.spent_before_today)} before today, projected {_usd(p.projected_month)} "
+            f"vs target {_usd(p.target_month)}"
+        )
+
+
+def write_report(paces: List[Pace], path: str) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(Pace._fields)
+        writer.writerows(paces)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Intraday budget pacing against a monthly target")
+    p.add_argument("--customer-id", required=True)
+    p.add_argument("--config", default=None)
+    p.add_argument("--campaign-id", action="append", default=None, help="Pace only these campaigns (repeatable)")
+    p.add_argument(
+        "--monthly-target", type=float, default=None,
+        help="Dollars per campaign per month (default: apply_fixes budget x days in month)",
+    )
+    p.add_argument("--max-step", type=float, default=MAX_STEP, help="Largest budget change per run, as a fraction")
+    p.add_argument("--min-budget", type=float, default=5.0, help="Dollars/day floor")
+    p.add_argument("--max-budget", type=float, default=None, help="Dollars/day ceiling (default: 2x apply_fixes.BUDGET_MICROS_TARGET)")
+    p.add_argument("--lag-hours", type=float, default=REPORTING_LAG_HOURS, help="How far hourly spend trails real time")
+    p.add_argument("--curve-cache", default=DEFAULT_CURVE_CACHE)
+    p.add_argument("--report", default=None, help="Also write the pacing table as CSV")
+    p.add_argument("--dry-run", action="store_true", help="Report only; change no budgets")
+    args = p.parse_args(argv)
+
+    try:
+        client = load_client(args.config)
+        time_zone, started = ads_mirror.account_now(client, args.customer_id)
+        now = datetime.strptime(started, ads_mirror.TIMESTAMP_FORMAT).replace(tzinfo=ZoneInfo(time_zone))
+        today = now.date()
+        curves = load_curves(client, args.customer_id, today, args.curve_cache)
+
+        queries = {
+            "budgets": ENABLED_BUDGETS.bind(),
+            "today": SPEND_BY_HOUR.bind(day=today),
+        }
+        if today.day > 1:
+            queries["month"] = SPEND_BETWEEN.bind(first=today.replace(day=1), last=today - timedelta(days=1))
+        results = ads_async.fetch_all(client, args.customer_id, queries)
+        budgets = results["budgets"]
+        if args.campaign_id:
+            budgets = [row for row in budgets if str(row.campaign.id) in args.campaign_id]
+
+        days_in_month = calendar.monthrange(today.year, today.month)[1]
+        target = (
+            int(args.monthly_target * 1_000_000)
+            if args.monthly_target is not None
+            else apply_fixes.BUDGET_MICROS_TARGET * days_in_month
+        )
+        paces = plan(
+            budgets, results["today"], results.get("month", []), curves, now, target, args.max_step,
+            int(args.min_budget * 1_000_000), int(args.max_budget * 1_000_000) if args.max_budget else DEFAULT_MAX_BUDGET_MICROS, args.lag_hours,
+        )
+        print_report(paces, now)
+        if args.report:
+            write_report(paces, args.report)
+
+        changes = {pace.budget: pace.new_budget_micros for pace in paces if pace.new_budget_micros != pace.budget_micros}
+        if args.dry_run:
+            print(f"Dry-run: {len(changes)} budget change(s) not applied.")
+            return 0
+        if changes:
+            with ads_profile.phase("write"):
+                apply_fixes.set_budget_amounts(client, args.customer_id, changes)
+        print(f"Applied {len(changes)} budget change(s) in {1 if changes else 0} request(s).")
+        return 0
+    except GoogleAdsException as ex:
+        print(f"GoogleAdsException: {ex}")
+        for e in ex.failure.errors:
+            print(f"  - {e.error_code}: {e.message}")
+        return 2
+    except Exception as ex:  # noqa: BLE001
+        print(f"Error: {ex}")
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(ads_profile.run(main))
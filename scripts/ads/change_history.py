@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Local change history from change_event: who changed what, when, old and new values.
+
+apply_fixes.py, replace_sitelinks.py, update_ad_final_url_all.py and the other scripts
+mutate the live account without leaving a record of their own; change_event has one, but
+only for 30 days and only through the API. sync pulls change_event rows incrementally
+from a per-customer watermark, paging past the 10k-row cap by advancing the lower bound
+(rows are keyed by their change_event resource name, so boundary rows re-read on the
+next page are not stored twice). Only the changed fields are kept, as a compact
+{"field": [old, new]} map, and rows are indexed by changed resource and by campaign and
+time, so diff answers "what changed in campaign X between A and B" from the store alone.
+
+Run sync at least every few weeks (setup_cron.sh); a watermark older than the 30-day
+change_event window leaves a gap, which sync reports.
+
+Usage:
+  python3 scripts/ads/change_history.py sync --customer-id 5072649468 --config google-ads.yaml
+  python3 scripts/ads/change_history.py diff --customer-id 5072649468 --campaign-id 22917408924 --since 2025-01-01 --until 2025-01-31
+  python3 scripts/ads/change_history.py diff --customer-id 5072649468 --since 2025-01-20 --client-type GOOGLE_ADS_API
+  python3 scripts/ads/change_history.py status
+"""
+
+from __future__ import annotations
+
+import argparse
+import enum
+import json
+import os
+import sqlite3
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from google.ads.googleads.client import GoogleAdsClient
+from google.ads.googleads.errors import GoogleAdsException
+
+from ads_client import load_client
+import ads_async
+import ads_mirror
+import ads_profile
+import gaql
+
+
+DEFAULT_DB = "scripts/ads/exports/change_history.sqlite"
+CHANGE_EVENT_LIMIT = 10_000
+CHANGE_WINDOW_DAYS = 29  # change_event keeps 30 days; leave a day of slack for time zones
+CHANGE_LAG = timedelta(minutes=15)
+TIMESTAMP_FORMAT = ads_mirror.TIMESTAMP_FORMAT
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS change_events (
+  resource_name TEXT PRIMARY KEY,
+  customer_id TEXT NOT NULL,
+  changed_at TEXT NOT NULL,
+  resource_type TEXT NOT NULL,
+  changed_resource TEXT NOT NULL,
+  campaign_id INTEGER,
+  ad_group_id INTEGER,
+  operation TEXT NOT NULL,
+  client_type TEXT,
+  user_email TEXT,
+  changes TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS change_events_campaign ON change_events (customer_id, campaign_id, changed_at);
+CREATE INDEX IF NOT EXISTS change_events_resource ON change_events (changed_resource, changed_at);
+CREATE INDEX IF NOT EXISTS change_events_time ON change_events (customer_id, changed_at);
+CREATE TABLE IF NOT EXISTS sync_state (
+  customer_id TEXT PRIMARY KEY,
+  time_zone TEXT NOT NULL,
+  watermark TEXT NOT NULL,
+  synced_at TEXT NOT NULL
+);
+"""
+
+CHANGE_EVENTS = (
+    gaql.Query("change_event")
+    .select(
+        *gaql.fields(
+            "change_event",
+            "resource_name change_date_time change_resource_type change_resource_name client_type user_email "
+            "resource_change_operation changed_fields old_resource new_resource campaign ad_group",
+        )
+    )
+    .where("change_event.change_date_time >= :since")
+    .where("change_event.change_date_time <= :until")
+    .order_by("change_event.change_date_time")
+    .limit(CHANGE_EVENT_LIMIT)
+)
+
+
+def open_store(path: str) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _enum(value: Any) -> str:
+    return getattr(value, "name", str(value))
+
+
+def _id(resource_name: str) -> Optional[int]:
+    """customers/1/campaigns/123 -> 123"""
+    tail = resource_name.rsplit("/", 1)[-1] if resource_name else ""
+    return int(tail) if tail.isdigit() else None
+
+
+def _plain(value: Any) -> Any:
+    """A proto field value as JSON: enums by name, repeated fields as lists, messages as text."""
+    if isinstance(value, enum.Enum):
+        return value.name
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, (list, tuple)) or type(value).__name__.startswith("Repeated"):
+        return [_plain(v) for v in value]
+    return str(value).strip()
+
+
+def _get(message: Any, path: str) -> Any:
+    for name in path.split("."):
+        if message is None:
+            return None
+        # proto-plus suffixes fields named like Python builtins: type -> type_
+        message = getattr(message, name, None) if hasattr(message, name) else getattr(message, name + "_", None)
+    return _plain(message)
+
+
+def field_changes(event: Any) -> Dict[str, List[Any]]:
+    """{changed field path: [old value, new value]} for one change_event row."""
+    kind = _enum(event.change_resource_type).lower()
+    old = getattr(event.old_resource, kind, None)
+    new = getattr(event.new_resource, kind, None)
+    return {path: [_get(old, path), _get(new, path)] for path in event.changed_fields.paths}
+
+
+def _row(customer_id: str, event: Any) -> Tuple[Any, ...]:
+    return (
+        event.resource_name,
+        customer_id,
+        event.change_date_time,
+        _enum(event.change_resource_type),
+        event.change_resource_name,
+        _id(event.campaign),
+        _id(event.ad_group),
+        _enum(event.resource_change_operation),
+        _enum(event.client_type),
+        event.user_email,
+        json.dumps(field_changes(event), separators=(",", ":"), default=str),
+    )
+
+
+def ingest(
+    conn: sqlite3.Connection, client: GoogleAdsClient, customer_id: str, since: str, until: str
+) -> Tuple[int, int]:
+    """
+    Store change events between two account-time timestamps, one 10k page at a time.
+    Returns (rows read, pages where one timestamp alone filled the page and rows were skipped).
+    """
+    read = overflowed = 0
+    lower = since
+    while True:
+        rows = ads_async.fetch(client, customer_id, CHANGE_EVENTS.bind(since=lower, until=until))
+        read += len(rows)
+        conn.executemany(
+            "INSERT OR REPLACE INTO change_events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [_row(customer_id, row.change_event) for row in rows],
+        )
+        if len(rows) < CHANGE_EVENT_LIMIT:
+            return read, overflowed
+        first, last = rows[0].change_event.change_date_time, rows[-1].change_event.change_date_time
+        if first == last:
+            # A single bulk mutate with more than 10k operations: the rest of it is unreachable
+            overflowed += 1
+            last = (datetime.fromisoformat(last) + timedelta(microseconds=1)).strftime(TIMESTAMP_FORMAT)
+        lower = last
+
+
+def sync(conn: sqlite3.Connection, client: GoogleAdsClient, customer_id: str) -> Dict[str, Any]:
+    """Pull change events since the stored watermark. Returns a summary of what was done."""
+    state = conn.execute("SELECT * FROM sync_state WHERE customer_id = ?", (customer_id,)).fetchone()
+    tz, started = ads_mirror.account_now(client, customer_id)
+    now = datetime.strptime(started, TIMESTAMP_FORMAT)
+    oldest = (now - timedelta(days=CHANGE_WINDOW_DAYS)).strftime(TIMESTAMP_FORMAT)
+    since = max(state["watermark"], oldest) if state else oldest
+    summary: Dict[str, Any] = {"since": since, "until": started}
+    if state and state["watermark"] < oldest:
+        summary["gap"] = (state["watermark"], oldest)
+
+    with conn:
+        summary["read"], summary["overflowed"] = ingest(conn, client, customer_id, since, started)
+        # change_event can surface a change a few minutes after it happened, so the next
+        # sync re-reads a trailing window; re-read rows replace themselves
+        watermark = max(since, (now - CHANGE_LAG).strftime(TIMESTAMP_FORMAT))
+        conn.execute(
+            "INSERT OR REPLACE INTO sync_state (customer_id, time_zone, watermark, synced_at) VALUES (?, ?, ?, ?)",
+            (customer_id, tz, watermark, started),
+        )
+    summary["watermark"] = watermark
+    return summary
+
+
+def changes_between(
+    conn: sqlite3.Connection,
+    customer_id: str,
+    since: date,
+    until: date,
+    campaign_id: Optional[int] = None,
+    client_type: Optional[str] = None,
+) -> List[sqlite3.Row]:
+    """Stored change events for [since, until] (account dates), oldest first."""
+    return conn.execute(
+        "SELECT * FROM change_events WHERE customer_id = ? AND changed_at >= ? AND changed_at < ? "
+        "AND (? IS NULL OR campaign_id = ?) AND (? IS NULL OR client_type = ?) "
+        "ORDER BY changed_at, resource_name",
+        (
+            customer_id, since.isoformat(), (until + timedelta(days=1)).isoformat(),
+            campaign_id, campaign_id, client_type, client_type,
+        ),
+    ).fetchall()
+
+
+def net_changes(events: Iterable[sqlite3.Row]) -> Dict[Tuple[str, str], Dict[str, List[Any]]]:
+    """
+    Per (resource type, changed resource): each field's value before the first change and
+    after the last, leaving out fields that ended where they started.
+    """
+    net: Dict[Tuple[str, str], Dict[str, List[Any]]] = {}
+    for event in events:
+        fields = net.setdefault((event["resource_type"], event["changed_resource"]), {})
+        if event["operation"] == "REMOVE":
+            fields.setdefault("(resource)", ["present", None])[1] = "removed"
+        for path, (old, new) in json.loads(event["changes"]).items():
+            fields.setdefault(path, [old, new])[1] = new
+    return {
+        key: {path: values for path, values in fields.items() if values[0] != values[1]}
+        for key, fields in net.items()
+        if any(values[0] != values[1] for values in fields.values())
+    }
+
+
+def _short(value: Any) -> str:
+    text = json.dumps(value) if not isinstance(value, str) else value
+    return text if len(text) <= 80 else text[:77] + "..."
+
+
+def print_diff(events: List[sqlite3.Row], net: Dict[Tuple[str, str], Dict[str, List[Any]]]) -> None:
+    for event in events:
+        who = event["user_email"] or "-"
+        print(f"{event['changed_at'][:19]}  {event['operation']:<6} {event['resource_type']:<20} {event['changed_resource']}")
+        print(f"    by {who} via {event['client_type']}")
+        for path, (old, new) in json.loads(event["changes"]).items():
+            print(f"    {path}: {_short(old)} -> {_short(new)}")
+    print(f"\nNet change ({len(net)} resources):")
+    for (resource_type, resource), fields in sorted(net.items()):
+        print(f"  {resource_type} {resource}")
+        for path, (old, new) in fields.items():
+            print(f"    {path}: {_short(old)} -> {_short(new)}")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Local change history from Google Ads change_event")
+    sub = p.add_subparsers(dest="command", required=True)
+    s = sub.add_parser("sync", help="Pull change events since the last sync (last 29 days the first time)")
+    s.add_argument("--customer-id", required=True)
+    s.add_argument("--config", default=None)
+    s.add_argument("--db", default=DEFAULT_DB)
+    d = sub.add_parser("diff", help="What changed between two dates, from the local store")
+    d.add_argument("--customer-id", required=True)
+    d.add_argument("--campaign-id", type=int, default=None, help="Only changes in this campaign")
+    d.add_argument("--since", type=date.fromisoformat, default=None, help="YYYY-MM-DD, account time (default: 7 days ago)")
+    d.add_argument("--until", type=date.fromisoformat, default=None, help="YYYY-MM-DD inclusive (default: today)")
+    d.add_argument("--client-type", default=None, help="e.g. GOOGLE_ADS_API for changes made by these scripts")
+    d.add_argument("--db", default=DEFAULT_DB)
+    st = sub.add_parser("status", help="Event counts and watermarks")
+    st.add_argument("--db", default=DEFAULT_DB)
+    args = p.parse_args(argv)
+
+    try:
+        conn = open_store(args.db)
+        if args.command == "status":
+            for state in conn.execute("SELECT * FROM sync_state ORDER BY customer_id"):
+                n, first = conn.execute(
+                    "SELECT COUNT(*), MIN(changed_at) FROM change_events WHERE customer_id = ?", (state["customer_id"],)
+                ).fetchone()
+                print(
+                    f"Customer {state['customer_id']} ({state['time_zone']}): {n} events since {first} | "
+                    f"watermark {state['watermark']} | last sync {state['synced_at']}"
+                )
+            return 0
+
+        if args.command == "diff":
+            until = args.until or date.today()
+            since = args.since or until - timedelta(days=7)
+            events = changes_between(conn, args.customer_id, since, until, args.campaign_id, args.client_type)
+            scope = f"campaign {args.campaign_id}" if args.campaign_id else f"customer {args.customer_id}"
+            print(f"{len(events)} change events in {scope}, {since} to {until}\n")
+            print_diff(events, net_changes(events))
+            return 0
+
+        client = load_client(args.config)
+        summary = sync(conn, client, args.customer_id)
+        print(f"Read {summary['read']} change events, {summary['since']} to {summary['until']}")
+        if "gap" in summary:
+            print(f"Warning: no history between {summary['gap'][0]} and {summary['gap'][1]} (older than change_event keeps)")
+        if summary["overflowed"]:
+            print(f"Warning: {summary['overflowed']} timestamp(s) had more than {CHANGE_EVENT_LIMIT} events; the rest were skipped")
+        print(f"Watermark: {summary['watermark']}")
+        return 0
+    except GoogleAdsException as ex:
+        print(f"GoogleAdsException: {ex}")
+        for e in ex.failure.errors:
+            print(f"  - {e.error_code}: {e.message}")
+        return 2
+    except Exception as ex:  # noqa: BLE001
+        print(f"Error: {ex}")
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(ads_profile.run(main))
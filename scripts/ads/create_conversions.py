@@ -7,6 +7,8 @@ It will create:
   1) Booking – HMNP           (primary, include in conversions)
   2) Calls from ads           (primary, include in conversions)
   3) Click-to-call (website)  (secondary, do NOT include in conversions)
+  4) Booked calls (import)    (primary; calls from ads that became bookings, uploaded
+                               by upload_call_conversions.py)
 
 It prints the created ConversionAction resource names and, critically, each
 conversion's "id" and "tag_snippets" info including the CONVERSION_LABEL needed
@@ -25,6 +27,17 @@ from typing import Optional
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 
+from ads_client import load_client
+import ads_profile
+import gaql
+
+
+CONVERSION_ACTION = (
+    gaql.Query("conversion_action")
+    .select("conversion_action.id", "conversion_action.name", "conversion_action.type", "conversion_action.tag_snippets")
+    .where("conversion_action.resource_name = :resource_name")
+)
+
 
 def _enum(client, enum_name: str, member: str) -> int:
     """
@@ -133,21 +146,38 @@ def create_calls_from_ads(client: GoogleAdsClient, customer_id: str) -> str:
     return resource_name
 
 
+def create_booked_calls_import(client: GoogleAdsClient, customer_id: str) -> str:
+    """
+    Creates the 'Booked calls (import)' conversion for calls from ads (see
+    create_calls_from_ads) that turned into bookings offline. Conversions are uploaded
+    from phone-system logs by upload_call_conversions.py; there is no tag.
+    """
+    svc = client.get_service("ConversionActionService")
+    op = client.get_type("ConversionActionOperation")
+    ca = op.create
+
+    ca.name = "Booked calls (import)"
+    ca.type_ = _enum(client, "ConversionActionTypeEnum", "UPLOAD_CALLS")
+    ca.category = _try_enum(client, "ConversionActionCategoryEnum", "BOOK_APPOINTMENT", None)
+    ca.primary_for_goal = True
+    ca.counting_type = _enum(client, "ConversionActionCountingTypeEnum", "ONE_PER_CLICK")
+    ca.value_settings.default_value = 35.0
+    ca.value_settings.always_use_default_value = False
+
+    res = svc.mutate_conversion_actions(customer_id=customer_id, operations=[op])
+    resource_name = res.results[0].resource_name
+    print(f"[OK] Booked calls import conversion created: {resource_name}")
+    _print_conversion_label(client, customer_id, resource_name)
+    return resource_name
+
+
 def _print_conversion_label(client: GoogleAdsClient, customer_id: str, resource_name: str) -> None:
     """
     Queries the created conversion and prints its ID and tag snippet label.
     The label is used in gtag/gtm send_to: AW-ACCOUNT_ID/LABEL
     """
     ga_svc = client.get_service("GoogleAdsService")
-    query = f"""
-      SELECT
-        conversion_action.id,
-        conversion_action.name,
-        conversion_action.type,
-        conversion_action.tag_snippets
-      FROM conversion_action
-      WHERE conversion_action.resource_name = '{resource_name}'
-    """
+    query = CONVERSION_ACTION.bind(resource_name=resource_name)
     rows = ga_svc.search(customer_id=customer_id, query=query)
     for row in rows:
         ca = row.conversion_action
@@ -189,9 +219,10 @@ def main(argv: Optional[list[str]] = None) -> int:
     args = p.parse_args(argv)
 
     try:
-        client = GoogleAdsClient.load_from_storage(path=args.config) if args.config else GoogleAdsClient.load_from_storage()
+        client = load_client(args.config)
         create_booking_conversion(client, args.customer_id)
         create_calls_from_ads(client, args.customer_id)
+        create_booked_calls_import(client, args.customer_id)
         create_click_to_call_website(client, args.customer_id)
         print("\nDone. Note the CONVERSION_LABEL values above for env NEXT_PUBLIC_GOOGLE_ADS_SEND_TO.")
         return 0
@@ -209,6 +240,6 @@ def main(argv: Optional[list[str]] = None) -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(ads_profile.run(main))
 
 
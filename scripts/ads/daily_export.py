@@ -18,6 +18,28 @@ from datetime import datetime, timedelta, timezone
 
 from google.ads.googleads.client import GoogleAdsClient
 
+from ads_client import load_client
+import ads_async
+import ads_profile
+import gaql
+
+
+DAILY_CAMPAIGN_METRICS = (
+    gaql.Query("campaign")
+    .select(
+        "segments.date",
+        "campaign.id",
+        "campaign.name",
+        "metrics.impressions",
+        "metrics.clicks",
+        "metrics.cost_micros",
+        "metrics.conversions",
+        "metrics.conversions_value",
+    )
+    .where("segments.date = :day")
+    .order_by("campaign.name")
+)
+
 
 def micros_to_usd(micros: int) -> float:
     return round(micros / 1_000_000, 2)
@@ -26,29 +48,12 @@ def micros_to_usd(micros: int) -> float:
 def export_daily(client: GoogleAdsClient, customer_id: str, out_dir: str) -> str:
     # Use previous day in account time zone; Google will handle account TZ.
     yesterday = (datetime.now(timezone.utc) - timedelta(days=1)).date()
-    day_str = yesterday.strftime("%Y-%m-%d")
-
-    query = f"""
-      SELECT
-        segments.date,
-        campaign.id,
-        campaign.name,
-        metrics.impressions,
-        metrics.clicks,
-        metrics.cost_micros,
-        metrics.conversions,
-        metrics.conversions_value
-      FROM campaign
-      WHERE segments.date = '{day_str}'
-      ORDER BY campaign.name
-    """
-
-    svc = client.get_service("GoogleAdsService")
-    rows = svc.search(customer_id=customer_id, query=query)
+
+    rows = ads_async.fetch(client, customer_id, DAILY_CAMPAIGN_METRICS.bind(day=yesterday))
 
     os.makedirs(out_dir, exist_ok=True)
     out_path = os.path.join(out_dir, f"daily-{yesterday.strftime('%Y%m%d')}.csv")
-    with open(out_path, "w", newline="") as f:
+    with ads_profile.phase("write"), open(out_path, "w", newline="") as f:
         writer = csv.writer(f)
         writer.writerow([
             "date",
@@ -84,13 +89,13 @@ def main() -> int:
     p.add_argument("--config", default="google-ads.yaml")
     args = p.parse_args()
 
-    client = GoogleAdsClient.load_from_storage(path=args.config)
+    client = load_client(args.config)
     path = export_daily(client, args.customer_id, args.out_dir)
     print(f"Wrote {path}")
     return 0
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(ads_profile.run(main))
 
 
@@ -0,0 +1,567 @@
+#!/usr/bin/env python3
+"""
+Render Google Ads Editor / UI bulk CSVs from a campaign spec, and bulk-import those CSVs
+back into the account through batched mutations.
+
+The CSVs in docs/ads are rendered from the seed data in houston_mobile_notary_campaign.py
+(seed_spec), the same constants the API builder creates the campaign from, so the two
+can't disagree:
+  google-ads-editor-campaigns.csv   google-ads-editor-adgroups.csv
+  google-ads-editor-keywords.csv    google-ads-editor-negatives.csv
+  google-ads-editor-ads.csv         ui-bulk-keywords.csv   ui-bulk-negatives.csv
+Other campaigns can be rendered from a YAML or JSON spec (--spec) of the same shape as
+seed_spec(). A spec may carry a `matrix` of cities × services that expands into one ad
+group per pair, named "<service> – <city>", with "{city}" substituted in keywords:
+  matrix:
+    cities: [Pasadena, Pearland, League City]
+    services:
+      Mobile Notary:
+        keywords: ["[mobile notary {city}]", '"mobile notary {city}"']
+
+Rows are written as they are generated, so large city-by-service expansions never sit
+in memory as a whole.
+
+Usage:
+  # Render the editor CSVs from the builder's seed data
+  python3 scripts/ads/editor_csv.py render --out-dir docs/ads
+
+  # Import editor CSVs (any mix of the files above) – dry-run first, then --apply
+  python3 scripts/ads/editor_csv.py import --customer-id 5072649468 --config google-ads.yaml \
+    docs/ads/google-ads-editor-campaigns.csv docs/ads/google-ads-editor-adgroups.csv \
+    docs/ads/google-ads-editor-keywords.csv docs/ads/google-ads-editor-negatives.csv \
+    docs/ads/google-ads-editor-ads.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import sys
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from google.ads.googleads.client import GoogleAdsClient
+from google.ads.googleads.errors import GoogleAdsException
+
+sys.path.insert(0, os.path.dirname(__file__))
+from ads_client import load_client  # noqa: E402
+import ads_profile  # noqa: E402
+import gaql  # noqa: E402
+
+
+MUTATE_BATCH = 5_000
+
+AD_GROUPS = (
+    gaql.Query("ad_group")
+    .select("ad_group.resource_name", "ad_group.name")
+    .where("ad_group.campaign = :campaign")
+    .where("ad_group.status != REMOVED")
+)
+KEYWORDS = (
+    gaql.Query("ad_group_criterion")
+    .select("ad_group.resource_name", "ad_group_criterion.keyword.text", "ad_group_criterion.keyword.match_type")
+    .where("campaign.resource_name = :campaign")
+    .where("ad_group_criterion.type = KEYWORD")
+    .where("ad_group_criterion.negative = FALSE")
+    .where("ad_group_criterion.status != REMOVED")
+)
+CAMPAIGN_NEGATIVES = (
+    gaql.Query("campaign_criterion")
+    .select("campaign_criterion.keyword.text", "campaign_criterion.keyword.match_type")
+    .where("campaign_criterion.campaign = :campaign")
+    .where("campaign_criterion.negative = TRUE")
+    .where("campaign_criterion.type = KEYWORD")
+)
+RSAS = (
+    gaql.Query("ad_group_ad")
+    .select("ad_group.resource_name", "ad_group_ad.ad.final_urls", "ad_group_ad.ad.responsive_search_ad.headlines")
+    .where("campaign.resource_name = :campaign")
+    .where("ad_group_ad.ad.type = RESPONSIVE_SEARCH_AD")
+    .where("ad_group_ad.status != REMOVED")
+)
+MAX_HEADLINES = 15
+MAX_DESCRIPTIONS = 4
+
+EDITOR_MATCH = {"EXACT": "Exact match", "PHRASE": "Phrase match", "BROAD": "Broad match"}
+UI_MATCH = {"EXACT": "Exact", "PHRASE": "Phrase", "BROAD": "Broad"}
+
+
+# ---------- Spec ----------
+
+def load_spec(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".json"):
+            return json.load(f)
+        import yaml
+
+        return yaml.safe_load(f)
+
+
+BID_STRATEGY_LABELS = {"maximize_clicks": "Maximize clicks", "manual_cpc": "Manual CPC"}
+
+
+def seed_spec(campaign_name: str, domain: str) -> Dict[str, Any]:
+    """Spec equivalent of the seed data used by houston_mobile_notary_campaign.upsert_campaign."""
+    from houston_mobile_notary_campaign import (
+        AD_GROUP_TO_KEYWORDS,
+        CAMPAIGN_NEGATIVE_KEYWORDS,
+        DEFAULT_BIDDING_MODE,
+        DEFAULT_DAILY_BUDGET_MICROS,
+        RSA_ASSETS,
+        RSA_PATHS,
+    )
+
+    return {
+        "campaign": {
+            "name": campaign_name,
+            "state": "Paused",
+            "type": "Search",
+            "budget": f"{DEFAULT_DAILY_BUDGET_MICROS / 1_000_000:g}",
+            "budget_type": "Daily",
+            "bid_strategy": BID_STRATEGY_LABELS[DEFAULT_BIDDING_MODE],
+            "networks": "Google search",
+        },
+        "final_url": f"{domain}?utm_source=google&utm_medium=cpc&utm_campaign=mobile_77591&utm_term={{keyword}}&utm_content={{adgroupid}}",
+        "path1": RSA_PATHS[0],
+        "path2": RSA_PATHS[1],
+        "headlines": RSA_ASSETS["headlines"],
+        "descriptions": RSA_ASSETS["descriptions"],
+        "ad_groups": [
+            {"name": name, "keywords": kw.get("exact", []) + kw.get("phrase", []) + kw.get("broad", [])}
+            for name, kw in AD_GROUP_TO_KEYWORDS.items()
+        ],
+        "negatives": CAMPAIGN_NEGATIVE_KEYWORDS.get("exact", []) + CAMPAIGN_NEGATIVE_KEYWORDS.get("phrase", []),
+    }
+
+
+def split_match(keyword: str) -> Tuple[str, str]:
+    """'[text]' -> ('text', 'EXACT'); '"text"' -> ('text', 'PHRASE'); else BROAD."""
+    text = keyword.strip()
+    if text.startswith("[") and text.endswith("]"):
+        return text[1:-1], "EXACT"
+    if text.startswith('"') and text.endswith('"'):
+        return text[1:-1], "PHRASE"
+    return text, "BROAD"
+
+
+def join_match(text: str, match: str) -> str:
+    match = match.strip().upper().replace(" MATCH", "")
+    if match == "EXACT":
+        return f"[{text}]"
+    if match == "PHRASE":
+        return f'"{text}"'
+    return text
+
+
+def iter_ad_groups(spec: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yield fully resolved ad groups (explicit ones first, then the city × service matrix)."""
+    defaults = {
+        "final_url": spec.get("final_url", ""),
+        "keyword_final_url": spec.get("keyword_final_url", ""),
+        "path1": spec.get("path1", ""),
+        "path2": spec.get("path2", ""),
+        "headlines": spec.get("headlines", []),
+        "descriptions": spec.get("descriptions", []),
+        "state": spec.get("ad_group_state", "Paused"),
+        "ad_state": spec.get("ad_state", "Paused"),
+    }
+    for ag in spec.get("ad_groups", []):
+        yield {**defaults, **ag}
+
+    matrix = spec.get("matrix") or {}
+    for service, svc_spec in (matrix.get("services") or {}).items():
+        for city in matrix.get("cities", []):
+            resolved = {**defaults, **svc_spec, "name": f"{service} – {city}"}
+            resolved["keywords"] = [kw.replace("{city}", city.lower()) for kw in svc_spec.get("keywords", [])]
+            for key in ("final_url", "keyword_final_url"):
+                resolved[key] = resolved[key].replace("{city}", city)
+            yield resolved
+
+
+# ---------- Render ----------
+
+def campaign_rows(spec: Dict[str, Any]) -> Iterator[List[Any]]:
+    c = spec["campaign"]
+    yield [
+        "Campaign",
+        c["name"],
+        c.get("state", "Paused"),
+        c.get("type", "Search"),
+        c.get("budget", ""),
+        c.get("budget_type", "Daily"),
+        c.get("bid_strategy", ""),
+        c.get("networks", "Google search"),
+    ]
+
+
+def ad_group_rows(spec: Dict[str, Any]) -> Iterator[List[Any]]:
+    for ag in iter_ad_groups(spec):
+        yield ["Ad group", spec["campaign"]["name"], ag["name"], ag["state"]]
+
+
+def keyword_rows(spec: Dict[str, Any], ui: bool = False) -> Iterator[List[Any]]:
+    labels = UI_MATCH if ui else EDITOR_MATCH
+    for ag in iter_ad_groups(spec):
+        for kw in ag.get("keywords", []):
+            text, match = split_match(kw)
+            row = [spec["campaign"]["name"], ag["name"], text, labels[match], ag["keyword_final_url"]]
+            yield row if ui else ["Ad group keyword", *row]
+
+
+def negative_rows(spec: Dict[str, Any], ui: bool = False) -> Iterator[List[Any]]:
+    labels = UI_MATCH if ui else EDITOR_MATCH
+    for kw in spec.get("negatives", []):
+        text, match = split_match(kw)
+        if ui:
+            yield [spec["campaign"]["name"], text, labels[match]]
+        else:
+            yield ["Campaign negative keyword", spec["campaign"]["name"], "", text, labels[match]]
+
+
+def ad_rows(spec: Dict[str, Any], n_headlines: int, n_descriptions: int) -> Iterator[List[Any]]:
+    for ag in iter_ad_groups(spec):
+        headlines = list(ag["headlines"][:MAX_HEADLINES])
+        descriptions = list(ag["descriptions"][:MAX_DESCRIPTIONS])
+        yield [
+            "Ad",
+            spec["campaign"]["name"],
+            ag["name"],
+            "Responsive search ad",
+            ag["ad_state"],
+            ag["final_url"],
+            ag["path1"],
+            ag["path2"],
+            *headlines,
+            *[""] * (n_headlines - len(headlines)),
+            *descriptions,
+            *[""] * (n_descriptions - len(descriptions)),
+        ]
+
+
+def _asset_widths(specs: List[Dict[str, Any]]) -> Tuple[int, int]:
+    n_h = n_d = 0
+    for spec in specs:
+        for ag in iter_ad_groups(spec):
+            n_h = max(n_h, min(len(ag["headlines"]), MAX_HEADLINES))
+            n_d = max(n_d, min(len(ag["descriptions"]), MAX_DESCRIPTIONS))
+    return n_h, n_d
+
+
+def _write_csv(path: str, header: List[str], rows: Iterable[List[Any]]) -> int:
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(header)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def _chain(specs: List[Dict[str, Any]], fn: Callable[..., Iterator[List[Any]]], *args: Any) -> Iterator[List[Any]]:
+    for spec in specs:
+        yield from fn(spec, *args)
+
+
+def render(specs: List[Dict[str, Any]], out_dir: str) -> Dict[str, int]:
+    os.makedirs(out_dir, exist_ok=True)
+    n_h, n_d = _asset_widths(specs)
+    files = {
+        "google-ads-editor-campaigns.csv": (
+            ["Type", "Campaign", "Campaign state", "Campaign type", "Budget", "Budget type", "Bid strategy type", "Networks"],
+            _chain(specs, campaign_rows),
+        ),
+        "google-ads-editor-adgroups.csv": (
+            ["Type", "Campaign", "Ad group", "Ad group state"],
+            _chain(specs, ad_group_rows),
+        ),
+        "google-ads-editor-keywords.csv": (
+            ["Type", "Campaign", "Ad group", "Keyword", "Match type", "Final URL"],
+            _chain(specs, keyword_rows),
+        ),
+        "google-ads-editor-negatives.csv": (
+            ["Type", "Campaign", "Ad group", "Negative keyword", "Match type"],
+            _chain(specs, negative_rows),
+        ),
+        "google-ads-editor-ads.csv": (
+            ["Type", "Campaign", "Ad group", "Ad type", "Ad state", "Final URL", "Path 1", "Path 2"]
+            + [f"Headline {i}" for i in range(1, n_h + 1)]
+            + [f"Description {i}" for i in range(1, n_d + 1)],
+            _chain(specs, ad_rows, n_h, n_d),
+        ),
+        "ui-bulk-keywords.csv": (
+            ["Campaign", "Ad group", "Keyword", "Match type", "Final URL"],
+            _chain(specs, keyword_rows, True),
+        ),
+        "ui-bulk-negatives.csv": (
+            ["Campaign", "Negative keyword", "Match type"],
+            _chain(specs, negative_rows, True),
+        ),
+    }
+    return {name: _write_csv(os.path.join(out_dir, name), header, rows) for name, (header, rows) in files.items()}
+
+
+# ---------- Parse ----------
+
+def parse_csvs(paths: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Fold editor / UI bulk CSV rows into per-campaign specs:
+      {campaign_name: {"campaign": {...}, "ad_groups": {name: {...}}, "negatives": [...]}}
+    Row kind comes from the Type column when present, otherwise from the columns the file has.
+    """
+    campaigns: Dict[str, Dict[str, Any]] = {}
+
+    def campaign(name: str) -> Dict[str, Any]:
+        return campaigns.setdefault(name, {"campaign": {"name": name}, "ad_groups": {}, "negatives": []})
+
+    def ad_group(camp: Dict[str, Any], name: str) -> Dict[str, Any]:
+        return camp["ad_groups"].setdefault(name, {"name": name, "state": "Paused", "keywords": [], "ads": []})
+
+    for path in paths:
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                name = (row.get("Campaign") or "").strip()
+                if not name:
+                    continue
+                kind = (row.get("Type") or "").strip().lower()
+                group = (row.get("Ad group") or "").strip()
+                camp = campaign(name)
+                if kind == "campaign":
+                    camp["campaign"].update({
+                        "state": row.get("Campaign state") or "Paused",
+                        "type": row.get("Campaign type") or "Search",
+                        "budget": row.get("Budget") or "",
+                        "budget_type": row.get("Budget type") or "Daily",
+                        "bid_strategy": row.get("Bid strategy type") or "",
+                        "networks": row.get("Networks") or "",
+                    })
+                elif kind == "ad group" and group:
+                    ad_group(camp, group)["state"] = row.get("Ad group state") or "Paused"
+                elif group and (kind in ("ad group keyword", "keyword") or (not kind and row.get("Keyword"))):
+                    ag = ad_group(camp, group)
+                    ag["keywords"].append((join_match(row["Keyword"], row.get("Match type") or ""), row.get("Final URL") or ""))
+                elif kind in ("campaign negative keyword", "negative keyword") or (not kind and row.get("Negative keyword")):
+                    camp["negatives"].append(join_match(row["Negative keyword"], row.get("Match type") or ""))
+                elif group and kind in ("ad", "responsive search ad"):
+                    ag = ad_group(camp, group)
+                    ag["ads"].append({
+                        "final_url": row.get("Final URL") or "",
+                        "path1": row.get("Path 1") or "",
+                        "path2": row.get("Path 2") or "",
+                        "state": row.get("Ad state") or "Paused",
+                        "headlines": [row[f"Headline {i}"] for i in range(1, MAX_HEADLINES + 1) if row.get(f"Headline {i}")],
+                        "descriptions": [row[f"Description {i}"] for i in range(1, MAX_DESCRIPTIONS + 1) if row.get(f"Description {i}")],
+                    })
+    return campaigns
+
+
+# ---------- Import ----------
+
+def run_query(client: GoogleAdsClient, customer_id: str, query: str):
+    return client.get_service("GoogleAdsService").search(customer_id=customer_id, query=query)
+
+
+def _mutate_in_chunks(mutate: Callable[..., Any], customer_id: str, operations: List[Any]) -> List[str]:
+    resource_names: List[str] = []
+    for i in range(0, len(operations), MUTATE_BATCH):
+        resp = mutate(customer_id=customer_id, operations=operations[i:i + MUTATE_BATCH])
+        resource_names.extend(r.resource_name for r in resp.results)
+    return resource_names
+
+
+def _status(client: GoogleAdsClient, enum_name: str, state: str):
+    return getattr(getattr(client.enums, enum_name), "ENABLED" if state.strip().lower() == "enabled" else "PAUSED")
+
+
+def import_campaign(client: GoogleAdsClient, customer_id: str, spec: Dict[str, Any], apply: bool) -> Dict[str, int]:
+    from houston_mobile_notary_campaign import create_campaign, create_or_get_budget, find_campaign_by_name
+
+    c = spec["campaign"]
+    counts = {"ad_groups": 0, "keywords": 0, "negatives": 0, "ads": 0}
+    campaign_res = find_campaign_by_name(client, customer_id, c["name"])
+    if not campaign_res:
+        if not apply:
+            counts["campaigns"] = 1
+            counts["ad_groups"] = len(spec["ad_groups"])
+            counts["keywords"] = sum(len(ag["keywords"]) for ag in spec["ad_groups"].values())
+            counts["negatives"] = len(set(spec["negatives"]))
+            counts["ads"] = sum(len(ag["ads"]) for ag in spec["ad_groups"].values())
+            return counts
+        budget_micros = int(round(float(c.get("budget") or 10) * 1_000_000))
+        budget_res = create_or_get_budget(client, customer_id, f"{c['name']} – Budget", budget_micros)
+        bidding = "manual_cpc" if "manual" in (c.get("bid_strategy") or "").lower() else "maximize_clicks"
+        if bidding == "maximize_clicks" and "clicks" not in (c.get("bid_strategy") or "clicks").lower():
+            print(f"  [NOTE] '{c['bid_strategy']}' is not set by create_campaign; created with Maximize clicks – adjust in the UI")
+        campaign_res = create_campaign(client, customer_id, c["name"], budget_res, bidding_mode=bidding)
+        counts["campaigns"] = 1
+
+    # Existing structure, one query per entity type
+    existing_groups: Dict[str, str] = {}
+    for row in run_query(client, customer_id, AD_GROUPS.bind(campaign=campaign_res)):
+        existing_groups[row.ad_group.name] = row.ad_group.resource_name
+
+    existing_keywords = set()
+    for row in run_query(client, customer_id, KEYWORDS.bind(campaign=campaign_res)):
+        kw = row.ad_group_criterion.keyword
+        existing_keywords.add((row.ad_group.resource_name, kw.text.lower(), kw.match_type.name))
+
+    existing_negatives = set()
+    for row in run_query(client, customer_id, CAMPAIGN_NEGATIVES.bind(campaign=campaign_res)):
+        kw = row.campaign_criterion.keyword
+        existing_negatives.add((kw.text.lower(), kw.match_type.name))
+
+    existing_ads = set()
+    for row in run_query(client, customer_id, RSAS.bind(campaign=campaign_res)):
+        ad = row.ad_group_ad.ad
+        existing_ads.add((
+            row.ad_group.resource_name,
+            tuple(ad.final_urls),
+            tuple(h.text for h in ad.responsive_search_ad.headlines),
+        ))
+
+    # Ad groups
+    ag_ops = []
+    new_groups: List[str] = []
+    for name, ag in spec["ad_groups"].items():
+        if name in existing_groups:
+            continue
+        op = client.get_type("AdGroupOperation")
+        group = op.create
+        group.name = name
+        group.campaign = campaign_res
+        group.status = _status(client, "AdGroupStatusEnum", ag["state"])
+        group.cpc_bid_micros = 1_800_000
+        ag_ops.append(op)
+        new_groups.append(name)
+    counts["ad_groups"] = len(ag_ops)
+    if ag_ops and apply:
+        created = _mutate_in_chunks(client.get_service("AdGroupService").mutate_ad_groups, customer_id, ag_ops)
+        existing_groups.update(zip(new_groups, created))
+    elif ag_ops:
+        existing_groups.update((name, f"(new) {name}") for name in new_groups)
+
+    # Keywords
+    kw_ops = []
+    for name, ag in spec["ad_groups"].items():
+        ag_res = existing_groups[name]
+        for keyword, final_url in ag["keywords"]:
+            text, match = split_match(keyword)
+            key = (ag_res, text.lower(), match)
+            if key in existing_keywords:
+                continue
+            existing_keywords.add(key)
+            op = client.get_type("AdGroupCriterionOperation")
+            criterion = op.create
+            criterion.ad_group = ag_res
+            criterion.status = client.enums.AdGroupCriterionStatusEnum.ENABLED
+            criterion.keyword.text = text
+            criterion.keyword.match_type = getattr(client.enums.KeywordMatchTypeEnum, match)
+            if final_url:
+                criterion.final_urls.append(final_url)
+            kw_ops.append(op)
+    counts["keywords"] = len(kw_ops)
+    if kw_ops and apply:
+        _mutate_in_chunks(client.get_service("AdGroupCriterionService").mutate_ad_group_criteria, customer_id, kw_ops)
+
+    # Campaign negatives
+    neg_ops = []
+    for keyword in spec["negatives"]:
+        text, match = split_match(keyword)
+        if (text.lower(), match) in existing_negatives:
+            continue
+        existing_negatives.add((text.lower(), match))
+        op = client.get_type("CampaignCriterionOperation")
+        criterion = op.create
+        criterion.campaign = campaign_res
+        criterion.negative = True
+        criterion.keyword.text = text
+        criterion.keyword.match_type = getattr(client.enums.KeywordMatchTypeEnum, match)
+        neg_ops.append(op)
+    counts["negatives"] = len(neg_ops)
+    if neg_ops and apply:
+        _mutate_in_chunks(client.get_service("CampaignCriterionService").mutate_campaign_criteria, customer_id, neg_ops)
+
+    # Responsive search ads
+    ad_ops = []
+    for name, ag in spec["ad_groups"].items():
+        ag_res = existing_groups[name]
+        for ad_spec in ag["ads"]:
+            key = (ag_res, (ad_spec["final_url"],), tuple(ad_spec["headlines"]))
+            if key in existing_ads or not ad_spec["headlines"]:
+                continue
+            existing_ads.add(key)
+            op = client.get_type("AdGroupAdOperation")
+            aga = op.create
+            aga.ad_group = ag_res
+            aga.status = _status(client, "AdGroupAdStatusEnum", ad_spec["state"])
+            ad = aga.ad
+            ad.final_urls.append(ad_spec["final_url"])
+            rsa = ad.responsive_search_ad
+            rsa.path1 = ad_spec["path1"]
+            rsa.path2 = ad_spec["path2"]
+            for text in ad_spec["headlines"][:MAX_HEADLINES]:
+                asset = client.get_type("AdTextAsset")
+                asset.text = text
+                rsa.headlines.append(asset)
+            for text in ad_spec["descriptions"][:MAX_DESCRIPTIONS]:
+                asset = client.get_type("AdTextAsset")
+                asset.text = text
+                rsa.descriptions.append(asset)
+            ad_ops.append(op)
+    counts["ads"] = len(ad_ops)
+    if ad_ops and apply:
+        _mutate_in_chunks(client.get_service("AdGroupAdService").mutate_ad_group_ads, customer_id, ad_ops)
+
+    return counts
+
+
+# ---------- CLI ----------
+
+def main(argv: Optional[list[str]] = None) -> int:
+    from houston_mobile_notary_campaign import DEFAULT_CAMPAIGN_NAME
+
+    p = argparse.ArgumentParser(description="Render or import Google Ads Editor CSVs")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    r = sub.add_parser("render", help="Render editor/UI bulk CSVs from a campaign spec")
+    r.add_argument("--spec", action="append", default=None, help="YAML/JSON campaign spec; repeatable")
+    r.add_argument("--out-dir", default="docs/ads")
+    r.add_argument("--campaign-name", default=DEFAULT_CAMPAIGN_NAME, help="Used with the built-in seed spec")
+    r.add_argument("--domain", default="https://houstonmobilenotarypros.com/booking/enhanced", help="Used with the built-in seed spec")
+
+    i = sub.add_parser("import", help="Bulk-load editor/UI bulk CSVs through batched mutations")
+    i.add_argument("csv", nargs="+", help="Editor or UI bulk CSV files")
+    i.add_argument("--customer-id", required=True)
+    i.add_argument("--config", default=None)
+    i.add_argument("--apply", action="store_true", help="Actually create entities (omit for dry-run)")
+    args = p.parse_args(argv)
+
+    if args.command == "render":
+        specs = [load_spec(path) for path in args.spec] if args.spec else [seed_spec(args.campaign_name, args.domain)]
+        for name, count in render(specs, args.out_dir).items():
+            print(f"Wrote {os.path.join(args.out_dir, name)} ({count} rows)")
+        return 0
+
+    try:
+        campaigns = parse_csvs(args.csv)
+        client = load_client(args.config)
+        for name, spec in campaigns.items():
+            counts = import_campaign(client, args.customer_id, spec, args.apply)
+            verb = "Created" if args.apply else "Would create"
+            print(f"- {name}: {verb} " + ", ".join(f"{k}={v}" for k, v in counts.items()))
+        if not args.apply:
+            print("\nDry-run only. Re-run with --apply to make changes.")
+        return 0
+    except GoogleAdsException as ex:
+        print(f"GoogleAdsException: {ex}")
+        for e in ex.failure.errors:
+            print(f"  - {e.error_code}: {e.message}")
+        return 2
+    except Exception as ex:  # noqa: BLE001
+        print(f"Error: {ex}")
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(ads_profile.run(main))
@@ -24,6 +24,8 @@ from typing import Dict, List, Optional
 
 import requests
 
+import ads_profile
+
 
 def parse_kv_params(items: Optional[List[str]]) -> Dict[str, str]:
     params: Dict[str, str] = {}
@@ -74,6 +76,6 @@ def main(argv: Optional[List[str]] = None) -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(ads_profile.run(main))
 
 
@@ -0,0 +1,131 @@
+"""
+GAQL query builder with typed parameter binding.
+
+Queries are declared once, usually at module level, with named placeholders, and bound
+per call. Values are rendered by type, so names with quotes, IDs and enum filters cannot
+change the shape of a query:
+
+    ADS_BY_CAMPAIGN = (
+        gaql.Query("ad_group_ad")
+        .select("ad_group_ad.ad.id", "ad_group_ad.ad.final_urls")
+        .where("campaign.id = :campaign_id")
+        .where("ad_group_ad.status != :status")
+    )
+    rows = run_query(client, customer_id, ADS_BY_CAMPAIGN.bind(campaign_id=123, status=gaql.Enum("REMOVED")))
+
+  int           123            bool       TRUE / FALSE
+  str           'it\\'s'        float      1.5
+  date          '2025-01-31'   datetime   '2025-01-31 13:05:00'
+  Enum("X")     X              list/tuple/set of the above: (a, b, c) for IN / CONTAINS ANY
+
+Only the fields passed to select() are requested: each caller lists what it reads, so
+rows carry nothing else. Compiled text is cached per query shape (lru_cache), so binding
+a query in a loop only substitutes values.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+_PLACEHOLDER = re.compile(r":([A-Za-z_][A-Za-z0-9_]*)")
+_FIELD = re.compile(r"^[a-z][a-z0-9_]*(\.[a-z][a-z0-9_]*)+$")
+_ENUM = re.compile(r"^[A-Z][A-Z0-9_]*$")
+
+
+class Enum(str):
+    """A GAQL enum literal, rendered bare (status != REMOVED)."""
+
+    def __new__(cls, name: str) -> "Enum":
+        name = getattr(name, "name", name)
+        if not _ENUM.match(name):
+            raise ValueError(f"Not a GAQL enum value: {name!r}")
+        return super().__new__(cls, name)
+
+
+def literal(value: Any) -> str:
+    """Render one Python value as a GAQL literal."""
+    if isinstance(value, Enum):
+        return str(value)
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        return repr(value)
+    if isinstance(value, datetime):
+        return f"'{value.strftime('%Y-%m-%d %H:%M:%S')}'"
+    if isinstance(value, date):
+        return f"'{value.isoformat()}'"
+    if isinstance(value, str):
+        return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = sorted(value) if isinstance(value, (set, frozenset)) else value
+        if not items:
+            raise ValueError("Empty list in a GAQL IN clause")
+        return "(" + ", ".join(literal(v) for v in items) + ")"
+    raise TypeError(f"Cannot bind {type(value).__name__} into GAQL")
+
+
+class Query(NamedTuple):
+    resource: str
+    fields: Tuple[str, ...] = ()
+    conditions: Tuple[str, ...] = ()
+    ordering: Tuple[str, ...] = ()
+    row_limit: Optional[int] = None
+
+    def select(self, *fields: str) -> "Query":
+        added = [f for f in fields if f not in self.fields]
+        for field in added:
+            if not _FIELD.match(field):
+                raise ValueError(f"Not a GAQL field: {field!r}")
+        return self._replace(fields=self.fields + tuple(dict.fromkeys(added)))
+
+    def where(self, condition: str) -> "Query":
+        """Add an ANDed condition; values go in as :name placeholders, never inline."""
+        if "'" in condition or '"' in condition:
+            raise ValueError(f"Bind string values as placeholders, not inline: {condition!r}")
+        return self._replace(conditions=self.conditions + (condition,))
+
+    def order_by(self, *terms: str) -> "Query":
+        return self._replace(ordering=self.ordering + terms)
+
+    def limit(self, n: int) -> "Query":
+        return self._replace(row_limit=int(n))
+
+    def bind(self, **params: Any) -> str:
+        segments = _compile(self)
+        missing = set(segments[1::2]) - params.keys()
+        if missing:
+            raise KeyError(f"Unbound GAQL parameter(s): {', '.join(sorted(missing))}")
+        parts: List[str] = []
+        for i, segment in enumerate(segments):
+            parts.append(literal(params[segment]) if i % 2 else segment)
+        return "".join(parts)
+
+    def __str__(self) -> str:
+        return self.bind()
+
+
+@lru_cache(maxsize=256)
+def _compile(query: Query) -> Tuple[str, ...]:
+    """Query text split into alternating literal text and placeholder names."""
+    if not query.fields:
+        raise ValueError(f"GAQL query on {query.resource} selects no fields")
+    text = f"SELECT {', '.join(query.fields)} FROM {query.resource}"
+    if query.conditions:
+        text += " WHERE " + " AND ".join(query.conditions)
+    if query.ordering:
+        text += " ORDER BY " + ", ".join(query.ordering)
+    if query.row_limit is not None:
+        text += f" LIMIT {query.row_limit}"
+    return tuple(_PLACEHOLDER.split(text))
+
+
+def fields(prefix: str, names: Union[str, Iterable[str]]) -> Tuple[str, ...]:
+    """fields("ad_group_ad.ad", "id final_urls") -> ("ad_group_ad.ad.id", "ad_group_ad.ad.final_urls")"""
+    if isinstance(names, str):
+        names = names.split()
+    return tuple(f"{prefix}.{name}" for name in names)
@@ -16,6 +16,8 @@ import os
 import sys
 import yaml  # type: ignore
 
+import ads_profile
+
 
 def main() -> int:
     out_path = os.getenv("GOOGLE_ADS_JSON_PATH", "google-ads.yaml")
@@ -41,6 +43,6 @@ def main() -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(ads_profile.run(main))
 
 
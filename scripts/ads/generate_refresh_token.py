@@ -19,6 +19,8 @@ from typing import Optional
 
 from google_auth_oauthlib.flow import InstalledAppFlow
 
+import ads_profile
+
 
 SCOPE = "https://www.googleapis.com/auth/adwords"
 
@@ -57,6 +59,6 @@ def main(argv: Optional[list[str]] = None) -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(ads_profile.run(main))
 
 
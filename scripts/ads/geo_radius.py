@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Radius and ZIP exclusion recommendations from performance by postal code.
+
+houston_mobile_notary_campaign.py targets a fixed 25-mile radius around one ZIP and
+apply_fixes.py strips city includes; this puts data behind both. analyze reads, for one
+campaign, user_location_view (where searchers physically were) and geographic_view
+(split by location type, to show how much spend came from people only interested in
+the area) segmented by segments.geo_target_postal_code, and aggregates them per ZIP.
+
+Distances come from a local ZIP centroid table (scripts/ads/data/zip_centroids.csv:
+zip,lat,lng; not checked in), built once by the zips command from the Census ZCTA
+Gazetteer file and trimmed to the area around the service point. Distances from the center to every ZIP
+are computed in one pass over the table's latitude/longitude columns (haversine), then:
+
+  simulate   cost, conversions and CPA inside each candidate radius, and of each ring
+             between consecutive radii
+  radius     the outermost ring with spend, before the first that converts worse than
+             --max-cpa (default 1.25x the campaign's CPA); rings without spend never widen it
+  exclude    ZIPs inside that radius that spent at least 2x --max-cpa without converting,
+             or converted at more than 2x --max-cpa
+
+Only ZIPs that have been served can be judged, so radii beyond the current targeting
+show no more than what has leaked through. The plan is written as JSON for
+houston_mobile_notary_campaign.py --geo-plan, which applies the radius and exclusions.
+
+Usage:
+  # Once per checkout, from https://www.census.gov/geographies/reference-files/time-series/geo/gazetteer-files.html
+  python3 scripts/ads/geo_radius.py zips 2023_Gaz_zcta_national.txt --center 77591 --within 100
+
+  python3 scripts/ads/geo_radius.py analyze --customer-id 5072649468 --campaign-id 22917408924 --center 77591
+  python3 scripts/ads/geo_radius.py analyze --customer-id 5072649468 --campaign-id 22917408924 --days 180 \
+    --radii 5,10,15,20,25,30,40,50 --out scripts/ads/exports/geo-plan.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import math
+import os
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from google.ads.googleads.client import GoogleAdsClient
+from google.ads.googleads.errors import GoogleAdsException
+
+from ads_client import load_client
+import ads_async
+import ads_profile
+import gaql
+
+
+DEFAULT_ZIP_TABLE = "scripts/ads/data/zip_centroids.csv"
+DEFAULT_CENTER = "77591"
+DEFAULT_RADII = (5, 10, 15, 20, 25, 30, 40, 50)
+DEFAULT_DAYS = 90
+EARTH_RADIUS_MILES = 3958.8
+CPA_SLACK = 1.25
+EXCLUDE_FACTOR = 2.0
+
+USER_LOCATIONS = (
+    gaql.Query("user_location_view")
+    .select("segments.geo_target_postal_code", "metrics.cost_micros", "metrics.conversions", "metrics.clicks")
+    .where("campaign.id = :campaign_id")
+    .where("segments.date BETWEEN :first AND :last")
+)
+GEOGRAPHIC = (
+    gaql.Query("geographic_view")
+    .select("geographic_view.location_type", "segments.geo_target_postal_code", "metrics.cost_micros", "metrics.conversions")
+    .where("campaign.id = :campaign_id")
+    .where("segments.date BETWEEN :first AND :last")
+)
+POSTAL_CODES = (
+    gaql.Query("geo_target_constant")
+    .select("geo_target_constant.resource_name", "geo_target_constant.name")
+    .where("geo_target_constant.resource_name IN :names")
+)
+
+
+class ZipStats(NamedTuple):
+    zip: str
+    geo_target_constant: str
+    distance_miles: float
+    cost_micros: int
+    conversions: float
+    clicks: int
+    interest_cost_micros: int  # spend on people only interested in the area (geographic_view)
+
+
+def haversine_miles(lat0: float, lng0: float, lats: Sequence[float], lngs: Sequence[float]) -> List[float]:
+    """Great-circle miles from one point to each of many, in one pass over the columns."""
+    phi0, lam0 = math.radians(lat0), math.radians(lng0)
+    cos0 = math.cos(phi0)
+    phis = list(map(math.radians, lats))
+    lams = list(map(math.radians, lngs))
+    return [
+        2 * EARTH_RADIUS_MILES * math.asin(
+            math.sqrt(math.sin((phi - phi0) / 2) ** 2 + cos0 * math.cos(phi) * math.sin((lam - lam0) / 2) ** 2)
+        )
+        for phi, lam in zip(phis, lams)
+    ]
+
+
+def load_zip_table(path: str) -> Tuple[List[str], List[float], List[float]]:
+    """(zips, latitudes, longitudes) as parallel columns."""
+    if not os.path.exists(path):
+        raise RuntimeError(f"No ZIP table at {path}; build it with: geo_radius.py zips <Census ZCTA Gazetteer file>")
+    zips: List[str] = []
+    lats: List[float] = []
+    lngs: List[float] = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            zips.append(row["zip"])
+            lats.append(float(row["lat"]))
+            lngs.append(float(row["lng"]))
+    return zips, lats, lngs
+
+
+def build_zip_table(gazetteer: str, out: str, center: str, within: float) -> int:
+    """Write the ZCTAs within `within` miles of `center` from a Census Gazetteer file. Returns the count."""
+    zips: List[str] = []
+    lats: List[float] = []
+    lngs: List[float] = []
+    with open(gazetteer, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f, delimiter="\t")
+        header = [h.strip() for h in next(reader)]
+        z, lat, lng = header.index("GEOID"), header.index("INTPTLAT"), header.index("INTPTLONG")
+        for row in reader:
+            zips.append(row[z].strip())
+            lats.append(float(row[lat]))
+            lngs.append(float(row[lng]))
+    if center not in zips:
+        raise RuntimeError(f"ZIP {center} is not in {gazetteer}")
+    i = zips.index(center)
+    distances = haversine_miles(lats[i], lngs[i], lats, lngs)
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    count = 0
+    with open(out, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["zip", "lat", "lng"])
+        for zip_code, la, ln, d in sorted(zip(zips, lats, lngs, distances)):
+            if d <= within:
+                writer.writerow([zip_code, f"{la:.6f}", f"{ln:.6f}"])
+                count += 1
+    return count
+
+
+def fetch_by_zip(
+    client: GoogleAdsClient, customer_id: str, campaign_id: int, first: date, last: date
+) -> Tuple[Dict[str, Dict[str, float]], Dict[str, str]]:
+    """Metrics per geo target constant, and geo target constant -> postal code."""
+    params = {"campaign_id": campaign_id, "first": first, "last": last}
+    results = ads_async.fetch_all(
+        client, customer_id, {"user": USER_LOCATIONS.bind(**params), "geo": GEOGRAPHIC.bind(**params)}
+    )
+    metrics: Dict[str, Dict[str, float]] = {}
+    for row in results["user"]:
+        m = metrics.setdefault(row.segments.geo_target_postal_code, {"cost": 0, "conversions": 0.0, "clicks": 0, "interest": 0})
+        m["cost"] += row.metrics.cost_micros
+        m["conversions"] += row.metrics.conversions
+        m["clicks"] += row.metrics.clicks
+    for row in results["geo"]:
+        if row.geographic_view.location_type.name == "AREA_OF_INTEREST":
+            m = metrics.setdefault(row.segments.geo_target_postal_code, {"cost": 0, "conversions": 0.0, "clicks": 0, "interest": 0})
+            m["interest"] += row.metrics.cost_micros
+    names = sorted(name for name in metrics if name)
+    postal: Dict[str, str] = {}
+    if names:
+        for row in ads_async.fetch(client, customer_id, POSTAL_CODES.bind(names=names)):
+            postal[row.geo_target_constant.resource_name] = row.geo_target_constant.name
+    return metrics, postal
+
+
+def zip_stats(
+    metrics: Dict[str, Dict[str, float]], postal: Dict[str, str], center: str, table: Tuple[List[str], List[float], List[float]]
+) -> Tuple[List[ZipStats], int]:
+    """Served ZIPs with their distance from `center`, nearest first, and spend on ZIPs not in the table."""
+    zips, lats, lngs = table
+    if center not in zips:
+        raise RuntimeError(f"Center ZIP {center} is not in the ZIP table")
+    i = zips.index(center)
+    distance = dict(zip(zips, haversine_miles(lats[i], lngs[i], lats, lngs)))
+    stats = []
+    unplaced = 0
+    for resource_name, m in metrics.items():
+        zip_code = postal.get(resource_name, "")
+        if zip_code not in distance:
+            unplaced += m["cost"]
+            continue
+        stats.append(
+            ZipStats(zip_code, resource_name, distance[zip_code], m["cost"], m["conversions"], m["clicks"], m["interest"])
+        )
+    stats.sort(key=lambda s: s.distance_miles)
+    return stats, unplaced
+
+
+def simulate(stats: List[ZipStats], radii: Iterable[float]) -> List[Dict[str, Any]]:
+    """Cumulative and ring cost/conversions at each radius."""
+    rows = []
+    cost = conversions = 0.0
+    i = 0
+    for radius in sorted(radii):
+        ring_cost = ring_conversions = 0.0
+        while i < len(stats) and stats[i].distance_miles <= radius:
+            ring_cost += stats[i].cost_micros
+            ring_conversions += stats[i].conversions
+            i += 1
+        cost += ring_cost
+        conversions += ring_conversions
+        rows.append(
+            {
+                "radius_miles": radius,
+                "cost_micros": int(cost),
+                "conversions": round(conversions, 2),
+                "cpa_micros": int(cost / conversions) if conversions else None,
+                "ring_cost_micros": int(ring_cost),
+                "ring_conversions": round(ring_conversions, 2),
+                "ring_cpa_micros": int(ring_cost / ring_conversions) if ring_conversions else None,
+            }
+        )
+    return rows
+
+
+def recommend(
+    stats: List[ZipStats], simulation: List[Dict[str, Any]], max_cpa_micros: float
+) -> Tuple[float, List[ZipStats]]:
+    """(radius, ZIPs to exclude inside it)."""
+    radius = simulation[0]["radius_miles"]
+    for row in simulation:
+        ring_cost, ring_conversions = row["ring_cost_micros"], row["ring_conversions"]
+        if not ring_cost:
+            continue
+        if not ring_conversions or ring_cost / ring_conversions > max_cpa_micros:
+            break
+        radius = row["radius_miles"]
+    limit = EXCLUDE_FACTOR * max_cpa_micros
+    exclusions = [
+        s
+        for s in stats
+        if s.distance_miles <= radius
+        and (
+            (not s.conversions and s.cost_micros >= limit)
+            or (s.conversions and s.cost_micros / s.conversions > limit)
+        )
+    ]
+    return radius, exclusions
+
+
+def _usd(micros: Optional[float]) -> str:
+    return "-" if micros is None else f"${micros / 1_000_000:,.2f}"
+
+
+def print_report(
+    simulation: List[Dict[str, Any]], radius: float, exclusions: List[ZipStats], stats: List[ZipStats], unplaced: int
+) -> None:
+    print("Radius simulation (cumulative | ring):")
+    for row in simulation:
+        mark = "  <- recommended" if row["radius_miles"] == radius else ""
+        print(
+            f"  {row['radius_miles']:>4} mi  cost {_usd(row['cost_micros']):>11}  conv {row['conversions']:>7}  "
+            f"CPA {_usd(row['cpa_micros']):>9} | ring cost {_usd(row['ring_cost_micros']):>10}  "
+            f"conv {row['ring_conversions']:>6}  CPA {_usd(row['ring_cpa_micros']):>9}{mark}"
+        )
+    interest = sum(s.interest_cost_micros for s in stats)
+    print(f"\nArea-of-interest spend (searchers elsewhere): {_usd(interest)}; spend on ZIPs not in the table: {_usd(unplaced)}")
+    print(f"Exclusions inside {radius} mi ({len(exclusions)}):")
+    for s in exclusions:
+        print(f"  {s.zip} ({s.distance_miles:.1f} mi): cost {_usd(s.cost_micros)}, conv {s.conversions:g}")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Recommend a radius and ZIP exclusions from performance by postal code")
+    sub = p.add_subparsers(dest="command", required=True)
+    z = sub.add_parser("zips", help="Build the local ZIP centroid table from a Census ZCTA Gazetteer file")
+    z.add_argument("gazetteer", help="e.g. 2023_Gaz_zcta_national.txt")
+    z.add_argument("--center", default=DEFAULT_CENTER)
+    z.add_argument("--within", type=float, default=100.0, help="Keep ZIPs within this many miles of the center")
+    z.add_argument("--zip-table", default=DEFAULT_ZIP_TABLE)
+    a = sub.add_parser("analyze", help="Simulate radii and recommend a radius plus exclusions")
+    a.add_argument("--customer-id", required=True)
+    a.add_argument("--campaign-id", required=True, type=int)
+    a.add_argument("--config", default=None)
+    a.add_argument("--center", default=DEFAULT_CENTER, help="ZIP at the center of the radius")
+    a.add_argument("--days", type=int, default=DEFAULT_DAYS, help="History to use, ending yesterday")
+    a.add_argument("--radii", default=",".join(map(str, DEFAULT_RADII)), help="Candidate radii in miles")
+    a.add_argument("--max-cpa", type=float, default=None, help="Dollars (default: 1.25x the campaign CPA)")
+    a.add_argument("--zip-table", default=DEFAULT_ZIP_TABLE)
+    a.add_argument("--out", default=None, help="Write the plan as JSON for houston_mobile_notary_campaign.py --geo-plan")
+    args = p.parse_args(argv)
+
+    try:
+        if args.command == "zips":
+            count = build_zip_table(args.gazetteer, args.zip_table, args.center, args.within)
+            print(f"Wrote {count} ZIPs within {args.within:g} mi of {args.center} to {args.zip_table}")
+            return 0
+
+        table = load_zip_table(args.zip_table)
+        client = load_client(args.config)
+        last = date.today() - timedelta(days=1)
+        metrics, postal = fetch_by_zip(client, args.customer_id, args.campaign_id, last - timedelta(days=args.days - 1), last)
+        stats, unplaced = zip_stats(metrics, postal, args.center, table)
+        total_cost = sum(s.cost_micros for s in stats)
+        total_conversions = sum(s.conversions for s in stats)
+        if not total_conversions:
+            raise RuntimeError("No conversions by postal code in the history; nothing to size a radius on")
+        max_cpa = args.max_cpa * 1_000_000 if args.max_cpa else CPA_SLACK * total_cost / total_conversions
+
+        simulation = simulate(stats, [float(r) for r in args.radii.split(",")])
+        radius, exclusions = recommend(stats, simulation, max_cpa)
+        print_report(simulation, radius, exclusions, stats, unplaced)
+
+        if args.out:
+            plan = {
+                "center_zip": args.center,
+                "radius_miles": radius,
+                "max_cpa_micros": int(max_cpa),
+                "exclusions": [
+                    {"zip": s.zip, "geo_target_constant": s.geo_target_constant, "distance_miles": round(s.distance_miles, 1)}
+                    for s in exclusions
+                ],
+                "simulation": simulation,
+            }
+            os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump(plan, f, indent=2)
+            print(f"Plan written to {args.out}")
+        return 0
+    except GoogleAdsException as ex:
+        print(f"GoogleAdsException: {ex}")
+        for e in ex.failure.errors:
+            print(f"  - {e.error_code}: {e.message}")
+        return 2
+    except Exception as ex:  # noqa: BLE001
+        print(f"Error: {ex}")
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(ads_profile.run(main))
@@ -1,6 +1,19 @@
 #!/usr/bin/env python3
 """
-Create a basic GTM Web container with GA4 tags via Google Tag Manager API.
+Bring GTM Web containers to a desired state (tags, triggers, variables) via the Google Tag Manager API.
+
+The desired state is a JSON/YAML spec (default: scripts/ads/gtm_spec.yaml, the GA4
+configuration tag plus the booking_complete, booking_started and click_to_call DLVs,
+triggers and GA4 event tags). For each container the script:
+  - finds the container by name (one list per account) and creates it if missing
+  - finds the workspace by name, creating it if missing
+  - reads the workspace's variables, triggers and tags in bulk (gtm_workspace.py)
+  - creates what is missing and updates what differs by fingerprint; with --prune,
+    deletes what the spec doesn't name
+  - creates one version and publishes it, only if something changed (or the workspace
+    still holds unpublished changes from an interrupted run)
+Re-running against containers that already match makes no writes and publishes nothing.
+Containers are reconciled in parallel, sharing one Tag Manager quota pacer.
 
 This script uses OAuth user credentials. You'll need a GCP project with the Tag Manager API enabled and an OAuth client.
 
@@ -8,6 +21,7 @@ Prep:
   - Install deps: pip install -r scripts/ads/requirements.txt
   - Create OAuth creds in Google Cloud Console, download client_secret.json
   - Set env var: export GOOGLE_APPLICATION_CREDENTIALS=/abs/path/client_secret.json (for oauthlib flow)
+  - The first run opens a browser for consent (local redirect server; gtm_workspace.get_credentials)
 
 Usage:
   python3 scripts/ads/gtm_container_setup.py \
@@ -15,84 +29,239 @@ Usage:
     --container-name "Site Web" \
     --domain your-domain.com \
     --ga4-measurement-id G-XXXXXXX
+
+  # Many client containers, listed under `containers:` in a spec; preview first
+  python3 scripts/ads/gtm_container_setup.py --spec clients.yaml --dry-run
+  python3 scripts/ads/gtm_container_setup.py --spec clients.yaml --prune
 """
 
 from __future__ import annotations
 
 import argparse
+import json
+import os
+import re
 import sys
-from typing import Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from string import Template
+from typing import Any, Dict, List, Optional, Tuple
 
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+import ads_profile
+import gtm_workspace
 
-SCOPES = [
-    "https://www.googleapis.com/auth/tagmanager.edit.containers",
-    "https://www.googleapis.com/auth/tagmanager.publish",
-]
 
+DEFAULT_SPEC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gtm_spec.yaml")
+SPEC_SECTIONS = {"variables": "variable", "triggers": "trigger", "tags": "tag"}
+DEFAULT_WORKSPACE = "Default Workspace"
 
-def get_service() -> any:
-    flow = InstalledAppFlow.from_client_secrets_file(
-        filename=sys.getenv("GOOGLE_APPLICATION_CREDENTIALS", "client_secret.json"),
-        scopes=SCOPES,
-    )
-    creds = flow.run_console()
-    return build("tagmanager", "v2", credentials=creds)
+
+def load_spec(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".json"):
+            return json.load(f)
+        import yaml
+
+        return yaml.safe_load(f)
+
+
+def _substitute(value: Any, params: Dict[str, str]) -> Any:
+    if isinstance(value, dict):
+        return {k: _substitute(v, params) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_substitute(v, params) for v in value]
+    if isinstance(value, str):
+        return Template(value).safe_substitute(params)
+    return value
 
 
-def create_container(service, account_id: str, container_name: str, domain: str) -> str:
+def render(spec: Dict[str, Any], target: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """The spec's entities for one container ({kind: [body, ...]}), ${...} filled from `target`."""
+    params = {k: str(v) for k, v in target.items() if v is not None}
+    desired = {kind: _substitute(spec.get(section) or [], params) for section, kind in SPEC_SECTIONS.items()}
+    for kind, bodies in desired.items():
+        for body in bodies:
+            unfilled = re.search(r"\$\{\w+\}", json.dumps(body, ensure_ascii=False))
+            if unfilled:
+                raise ValueError(f"{kind} '{body['name']}' needs {unfilled.group(0)}; set it on the container entry")
+    return desired
+
+
+def list_all(pacer: gtm_workspace.Pacer, collection: Any, parent: str, key: str) -> List[Dict[str, Any]]:
+    items: List[Dict[str, Any]] = []
+    page_token = None
+    while True:
+        kwargs = {"parent": parent}
+        if page_token:
+            kwargs["pageToken"] = page_token
+        res = pacer.execute(collection.list(**kwargs))
+        items.extend(res.get(key, []))
+        page_token = res.get("nextPageToken")
+        if not page_token:
+            return items
+
+
+def create_container(service, pacer: gtm_workspace.Pacer, account_id: str, container_name: str, domain: str) -> Dict[str, Any]:
     body = {
         "name": container_name,
         "usageContext": ["web"],
-        "domainName": [domain],
+        "domainName": [domain] if domain else [],
     }
-    res = service.accounts().containers().create(parent=f"accounts/{account_id}", body=body).execute()
-    return res["path"]  # e.g., accounts/1234567/containers/7654321
+    return pacer.execute(service.accounts().containers().create(parent=f"accounts/{account_id}", body=body), write=True)
 
 
-def create_workspace(service, container_path: str) -> str:
-    res = service.accounts().containers().workspaces().create(parent=container_path, body={"name": "Initial"}).execute()
-    return res["path"]
+def find_or_create_workspace(service, pacer: gtm_workspace.Pacer, container_path: str, name: str) -> str:
+    workspaces = service.accounts().containers().workspaces()
+    for ws in list_all(pacer, workspaces, container_path, "workspace"):
+        if ws["name"] == name:
+            return ws["path"]
+    return pacer.execute(workspaces.create(parent=container_path, body={"name": name}), write=True)["path"]
 
 
-def add_ga4_tag(service, workspace_path: str, measurement_id: str) -> None:
-    # GA4 Configuration tag
-    tag_body = {
-        "name": "GA4 - Configuration",
-        "type": "gaawc",
-        "parameter": [
-            {"type": "template", "key": "measurementId", "value": measurement_id},
-        ],
-        "firingTriggerId": ["2147479553"],  # All Pages built-in trigger
-    }
-    service.accounts().containers().workspaces().tags().create(parent=workspace_path, body=tag_body).execute()
+def has_unpublished_changes(service, pacer: gtm_workspace.Pacer, workspace_path: str) -> bool:
+    status = pacer.execute(service.accounts().containers().workspaces().getStatus(path=workspace_path))
+    return bool(status.get("workspaceChange"))
+
 
+def publish(service, pacer: gtm_workspace.Pacer, workspace_path: str, name: str, notes: str) -> str:
+    """Create a version from the workspace and publish it. Returns the version ID."""
+    res = pacer.execute(
+        service.accounts().containers().workspaces().create_version(path=workspace_path, body={"name": name, "notes": notes}),
+        write=True,
+    )
+    if res.get("compilerError"):
+        raise RuntimeError(f"{workspace_path}: workspace did not compile; nothing was published")
+    version = res["containerVersion"]
+    pacer.execute(service.accounts().containers().versions().publish(path=version["path"]), write=True)
+    return version["containerVersionId"]
+
+
+def reconcile_container(
+    service,
+    pacer: gtm_workspace.Pacer,
+    spec: Dict[str, Any],
+    target: Dict[str, Any],
+    containers: Dict[str, Dict[str, Any]],
+    workspace_name: str,
+    dry_run: bool,
+    prune: bool,
+) -> Tuple[List[str], Dict[str, Any]]:
+    """
+    Make one container match the spec. `containers` is the account's live containers by
+    name. Returns the log lines and a summary.
+    """
+    lines: List[str] = []
+    desired = render(spec, target)
+    name = target["container_name"]
+    container = containers.get(name)
+    if container is None:
+        total = sum(len(bodies) for bodies in desired.values())
+        if dry_run:
+            lines.append(f"  [CREATE] container '{name}' with {total} entities (dry run)")
+            return lines, {"container": name, "created": total, "published": None}
+        container = create_container(service, pacer, str(target["account_id"]), name, target.get("domain"))
+        lines.append(f"  [CREATE] container '{name}' ({container['path']})")
+
+    workspace_path = find_or_create_workspace(service, pacer, container["path"], workspace_name)
+    index = gtm_workspace.WorkspaceIndex(service, workspace_path, pacer).load()
+    counts = gtm_workspace.sync(index, desired, dry_run=dry_run, prune=prune, log=lines.append)
+    changed = counts["created"] + counts["updated"] + counts["deleted"]
 
-def publish(service, workspace_path: str) -> None:
-    service.accounts().containers().workspaces().create_version(parent=workspace_path, body={"name": "v1"}).execute()
-    service.accounts().containers().versions().publish(path=workspace_path.replace("workspaces", "versions/1")).execute()
+    version_id = None
+    if not dry_run and (changed or has_unpublished_changes(service, pacer, workspace_path)):
+        stamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+        notes = ", ".join(f"{k}={v}" for k, v in counts.items())
+        version_id = publish(service, pacer, workspace_path, f"Desired state {stamp}", f"gtm_container_setup.py: {notes}")
+        lines.append(f"  [PUBLISH] version {version_id}")
+    return lines, {"container": name, "path": container["path"], **counts, "published": version_id}
+
+
+def targets_from(spec: Dict[str, Any], args: argparse.Namespace) -> List[Dict[str, Any]]:
+    targets = [dict(t) for t in spec.get("containers") or []]
+    if args.account_id or args.container_name:
+        if not (args.account_id and args.container_name):
+            raise ValueError("--account-id and --container-name go together")
+        targets.append(
+            {
+                "account_id": args.account_id,
+                "container_name": args.container_name,
+                "domain": args.domain,
+                "ga4_measurement_id": args.ga4_measurement_id,
+            }
+        )
+    if not targets:
+        raise ValueError("No containers: pass --account-id/--container-name or list `containers` in the spec")
+    for t in targets:
+        if not (t.get("account_id") and t.get("container_name")):
+            raise ValueError(f"Container entry needs account_id and container_name: {t}")
+    return targets
 
 
 def main(argv: Optional[list[str]] = None) -> int:
-    parser = argparse.ArgumentParser(description="Provision a GTM Web container with GA4 tag")
-    parser.add_argument("--account-id", required=True)
-    parser.add_argument("--container-name", required=True)
-    parser.add_argument("--domain", required=True)
-    parser.add_argument("--ga4-measurement-id", required=True)
+    parser = argparse.ArgumentParser(description="Reconcile GTM Web containers with a desired-state spec and publish changes")
+    parser.add_argument("--account-id")
+    parser.add_argument("--container-name")
+    parser.add_argument("--domain")
+    parser.add_argument("--ga4-measurement-id")
+    parser.add_argument("--spec", default=DEFAULT_SPEC, help="JSON/YAML spec of variables, triggers, tags (and containers)")
+    parser.add_argument("--workspace", default=DEFAULT_WORKSPACE, help="Workspace to reconcile and publish from")
+    parser.add_argument("--prune", action="store_true", help="Delete variables, triggers and tags the spec doesn't name")
+    parser.add_argument("--dry-run", action="store_true", help="Report the changes; create, update, delete and publish nothing")
+    parser.add_argument("--workers", type=int, default=4, help="Containers reconciled in parallel")
+    parser.add_argument("--max-qps", type=float, default=None, help="Tag Manager requests/second (default GTM_MAX_QPS or 0.25)")
     args = parser.parse_args(argv)
 
     try:
-        service = get_service()
-        container_path = create_container(service, args.account_id, args.container_name, args.domain)
-        workspace_path = create_workspace(service, container_path)
-        add_ga4_tag(service, workspace_path, args.ga4_measurement_id)
-        publish(service, workspace_path)
-        print("GTM container created and published.")
-        print(f"Container: {container_path}")
-        return 0
+        spec = load_spec(args.spec)
+        targets = targets_from(spec, args)
+        creds = gtm_workspace.get_credentials()
+        service = gtm_workspace.build_service(creds)
+        pacer = gtm_workspace.Pacer(max_rate=args.max_qps)
+
+        # One container list per account, however many of its containers are managed
+        by_account: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for account_id in dict.fromkeys(str(t["account_id"]) for t in targets):
+            live = list_all(pacer, service.accounts().containers(), f"accounts/{account_id}", "container")
+            by_account[account_id] = {c["name"]: c for c in live}
+
+        print_lock = threading.Lock()
+        local = threading.local()
+        failures = 0
+
+        def run(target: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            nonlocal failures
+            # googleapiclient's HTTP transport isn't thread-safe: one service per worker thread
+            if not hasattr(local, "service"):
+                local.service = gtm_workspace.build_service(creds)
+            try:
+                lines, summary = reconcile_container(
+                    local.service, pacer, spec, target, by_account[str(target["account_id"])], args.workspace, args.dry_run, args.prune
+                )
+            except (HttpError, RuntimeError, ValueError) as ex:
+                with print_lock:
+                    failures += 1
+                    print(f"{target['container_name']}: FAILED: {ex}", file=sys.stderr)
+                return None
+            with print_lock:
+                print(f"{target['container_name']}:")
+                for line in lines:
+                    print(line)
+            return summary
+
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+            summaries = [s for s in pool.map(run, targets) if s]
+
+        published = sum(1 for s in summaries if s.get("published"))
+        unchanged = sum(1 for s in summaries if not any(s.get(k) for k in ("created", "updated", "deleted")))
+        verb = "checked" if args.dry_run else "reconciled"
+        print(
+            f"{len(summaries)}/{len(targets)} containers {verb}: {unchanged} already up to date, {published} published "
+            f"({pacer.calls['read']} reads, {pacer.calls['write']} writes)"
+        )
+        return 1 if failures else 0
     except HttpError as ex:
         print(f"HTTP Error: {ex}", file=sys.stderr)
         return 1
@@ -102,6 +271,4 @@ def main(argv: Optional[list[str]] = None) -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
-
-
+    raise SystemExit(ads_profile.run(main))
@@ -6,79 +6,54 @@ Adds:
   - Data Layer Variables (DLV): value, currency, transaction_id, enhanced_conversion_data
   - Custom Event Triggers: booking_complete, booking_started, click_to_call
 
+The workspace's variables, triggers and tags are read once (gtm_workspace.py); only
+items that are missing are created and only items whose definition differs are
+updated, with requests paced to the Tag Manager API quota. Re-running on an
+up-to-date workspace makes no writes.
+
 Usage:
   python3 scripts/ads/gtm_extend_workspace.py \
     --account-id 123456 \
     --container-id 789012 \
     --workspace-id 1
+
+  # Show what would change without writing
+  python3 scripts/ads/gtm_extend_workspace.py --account-id 123456 --container-id 789012 --workspace-id 1 --dry-run
+
 Requires OAuth user creds for Tag Manager API v2 (see gtm_container_setup.py header).
 """
 from __future__ import annotations
 
 import argparse
 import sys
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
-SCOPES = [
-    "https://www.googleapis.com/auth/tagmanager.edit.containers",
-    "https://www.googleapis.com/auth/tagmanager.publish",
-]
+import ads_profile
+import gtm_workspace
 
+EVENTS = ["booking_complete", "booking_started", "click_to_call"]
 
-def get_service():
-    flow = InstalledAppFlow.from_client_secrets_file("client_secret.json", scopes=SCOPES)
-    creds = flow.run_local_server(port=0, open_browser=True)
-    return build("tagmanager", "v2", credentials=creds)
 
-
-def create_dlv(service, parent: str, name: str, key: str) -> None:
+def dlv_body(name: str, key: str) -> Dict[str, Any]:
     """
     name: display name in GTM
     key:  dataLayer key
     """
-    var_name = f"DLV – {name}"
-    # Check if variable already exists
-    try:
-        vars_list = service.accounts().containers().workspaces().variables().list(parent=parent).execute()
-        for var in vars_list.get("variable", []):
-            if var.get("name") == var_name:
-                print(f"  [SKIP] Variable '{var_name}' already exists")
-                return
-    except Exception:
-        pass  # Continue to create if check fails
-    
-    body = {
-        "name": var_name,
+    return {
+        "name": f"DLV – {name}",
         "type": "v",  # dataLayer variable
         "parameter": [
             {"type": "TEMPLATE", "key": "name", "value": key},
             {"type": "INTEGER", "key": "dataLayerVersion", "value": "2"},
         ],
     }
-    service.accounts().containers().workspaces().variables().create(
-        parent=parent, body=body
-    ).execute()
-    print(f"  [OK] Created variable '{var_name}'")
 
 
-def create_custom_event_trigger(service, parent: str, event_name: str) -> None:
-    trigger_name = f"Event – {event_name}"
-    # Check if trigger already exists
-    try:
-        triggers_list = service.accounts().containers().workspaces().triggers().list(parent=parent).execute()
-        for trig in triggers_list.get("trigger", []):
-            if trig.get("name") == trigger_name:
-                print(f"  [SKIP] Trigger '{trigger_name}' already exists")
-                return
-    except Exception:
-        pass  # Continue to create if check fails
-    
-    body = {
-        "name": trigger_name,
+def custom_event_trigger_body(event_name: str) -> Dict[str, Any]:
+    return {
+        "name": f"Event – {event_name}",
         "type": "CUSTOM_EVENT",
         "customEventFilter": [
             {
@@ -90,10 +65,15 @@ def create_custom_event_trigger(service, parent: str, event_name: str) -> None:
             }
         ],
     }
-    service.accounts().containers().workspaces().triggers().create(
-        parent=parent, body=body
-    ).execute()
-    print(f"  [OK] Created trigger '{trigger_name}'")
+
+
+def desired_entities() -> Dict[str, List[Dict[str, Any]]]:
+    return {
+        "variable": [
+            dlv_body(key, key) for key in ["event", "value", "currency", "transaction_id", "enhanced_conversion_data"]
+        ],
+        "trigger": [custom_event_trigger_body(evt) for evt in EVENTS],
+    }
 
 
 def main(argv: Optional[list[str]] = None) -> int:
@@ -101,24 +81,21 @@ def main(argv: Optional[list[str]] = None) -> int:
     p.add_argument("--account-id", required=True)
     p.add_argument("--container-id", required=True)
     p.add_argument("--workspace-id", required=True)
+    p.add_argument("--dry-run", action="store_true", help="Report what would be created or updated; write nothing")
+    p.add_argument("--max-qps", type=float, default=None, help="Tag Manager requests/second (default GTM_MAX_QPS or 0.25)")
     args = p.parse_args(argv)
 
     try:
-        svc = get_service()
+        svc = gtm_workspace.build_service()
         parent = f"accounts/{args.account_id}/containers/{args.container_id}/workspaces/{args.workspace_id}"
 
-        # Variables
-        create_dlv(svc, parent, "event", "event")
-        create_dlv(svc, parent, "value", "value")
-        create_dlv(svc, parent, "currency", "currency")
-        create_dlv(svc, parent, "transaction_id", "transaction_id")
-        create_dlv(svc, parent, "enhanced_conversion_data", "enhanced_conversion_data")
-
-        # Triggers
-        for evt in ["booking_complete", "booking_started", "click_to_call"]:
-            create_custom_event_trigger(svc, parent, evt)
+        # One paged list per entity type, then writes only for what's missing or changed
+        pacer = gtm_workspace.Pacer(max_rate=args.max_qps)
+        index = gtm_workspace.WorkspaceIndex(svc, parent, pacer).load()
+        counts = gtm_workspace.sync(index, desired_entities(), dry_run=args.dry_run)
 
-        print("Workspace extended with variables and triggers.")
+        summary = ", ".join(f"{k}={v}" for k, v in counts.items())
+        print(f"Workspace {'checked' if args.dry_run else 'synced'}: {summary} ({pacer.calls['read']} reads, {pacer.calls['write']} writes)")
         return 0
     except HttpError as ex:
         print(f"HTTP Error: {ex}", file=sys.stderr)
@@ -129,6 +106,6 @@ def main(argv: Optional[list[str]] = None) -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(ads_profile.run(main))
 
 
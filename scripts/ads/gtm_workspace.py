@@ -0,0 +1,284 @@
+"""
+Bulk reads and paced, minimal writes for a Tag Manager workspace.
+
+WorkspaceIndex lists a workspace's variables, triggers and tags once (a few paged list
+calls instead of one per item), keyed by name. sync() compares desired entity bodies
+against it by fingerprint and creates only what is missing and updates only what
+changed (and, with prune=True, deletes what isn't desired), so a re-run against an
+up-to-date workspace makes no writes.
+
+A fingerprint is SHA-256 of the fields a desired body sets, normalized so the API's
+echo of a body hashes the same as the body itself: enum spellings ("CUSTOM_EVENT" vs
+"customEvent") folded, parameters sorted by key, trigger references sorted, empty
+values dropped. Fields the body doesn't set (notes, folders, fields edited in the UI)
+are neither compared nor overwritten.
+
+Tags name their triggers in firingTriggerId / blockingTriggerId; names are resolved to
+trigger IDs from the index (numeric IDs, e.g. built-in triggers, pass through), which
+is why sync() applies variables, then triggers, then tags.
+
+Every call goes through a Pacer: a token bucket (ads_retry.TokenBucket) at the Tag
+Manager quota, shared by all threads, with retries on 429/5xx that honour Retry-After.
+
+The GTM scripts authorize through get_credentials(): the installed-app OAuth flow on a
+local redirect server, with the OAuth client JSON at $GOOGLE_APPLICATION_CREDENTIALS
+(default ./client_secret.json).
+
+    service = gtm_workspace.build_service()
+    index = gtm_workspace.WorkspaceIndex(service, workspace_path).load()
+    counts = gtm_workspace.sync(index, {"variable": [...], "trigger": [...], "tag": [...]})
+
+Tuning (environment):
+  GTM_MAX_QPS       requests/second across the process (default 0.25, i.e. 15/minute)
+  GTM_MAX_RETRIES   attempts after the first (default 5)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from google_auth_oauthlib.flow import InstalledAppFlow
+from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+
+import ads_profile
+import ads_retry
+
+
+SCOPES = [
+    "https://www.googleapis.com/auth/tagmanager.edit.containers",
+    "https://www.googleapis.com/auth/tagmanager.publish",
+]
+KINDS = ("variable", "trigger", "tag")  # Apply order: tags reference triggers by ID
+COLLECTIONS = {"variable": "variables", "trigger": "triggers", "tag": "tags"}
+TRIGGER_REF_FIELDS = ("firingTriggerId", "blockingTriggerId")
+# Set by the API; never compared, never sent back in an update body
+SERVER_FIELDS = frozenset(
+    {"path", "accountId", "containerId", "workspaceId", "fingerprint", "tagManagerUrl", "variableId", "triggerId", "tagId"}
+)
+TRANSIENT_READ_STATUSES = frozenset({429, 500, 502, 503, 504})
+TRANSIENT_WRITE_STATUSES = frozenset({429, 503})  # Rejected before anything was applied
+MAX_BACKOFF_SECONDS = 60.0
+OUTCOMES = {"create": "created", "update": "updated", "delete": "deleted", "unchanged": "unchanged"}
+LABELS = {"create": "CREATE", "update": "UPDATE", "delete": "DELETE", "unchanged": "SKIP"}
+
+
+def get_credentials() -> Any:
+    flow = InstalledAppFlow.from_client_secrets_file(
+        os.getenv("GOOGLE_APPLICATION_CREDENTIALS", "client_secret.json"),
+        scopes=SCOPES,
+    )
+    return flow.run_local_server(port=0, open_browser=True)
+
+
+def build_service(creds: Any = None) -> Any:
+    """A Tag Manager API v2 client (not thread-safe: build one per thread from shared `creds`)."""
+    return build("tagmanager", "v2", credentials=creds or get_credentials())
+
+
+class Pacer:
+    """Runs Tag Manager requests at the API quota and retries the transient failures."""
+
+    def __init__(self, max_rate: Optional[float] = None, max_retries: Optional[int] = None):
+        self.bucket = ads_retry.TokenBucket(
+            max_rate if max_rate is not None else float(os.environ.get("GTM_MAX_QPS", "0.25")), burst=1.0
+        )
+        self.max_retries = max_retries if max_retries is not None else int(os.environ.get("GTM_MAX_RETRIES", "5"))
+        self.calls = {"read": 0, "write": 0}
+        self._lock = threading.Lock()
+
+    def execute(self, request: Any, write: bool = False) -> Dict[str, Any]:
+        transient = TRANSIENT_WRITE_STATUSES if write else TRANSIENT_READ_STATUSES
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            with self._lock:
+                self.calls["write" if write else "read"] += 1
+            try:
+                with ads_profile.phase("write" if write else "fetch"):
+                    response = request.execute()
+            except HttpError as ex:
+                status = int(getattr(ex.resp, "status", 0) or 0)
+                if status not in transient or attempt >= self.max_retries:
+                    raise
+                delay = random.uniform(0, min(MAX_BACKOFF_SECONDS, 2.0 ** attempt))
+                if status == 429:
+                    retry_after = ex.resp.get("retry-after") if hasattr(ex.resp, "get") else None
+                    if retry_after and str(retry_after).isdigit():
+                        delay = float(retry_after)
+                    self.bucket.on_throttled(delay)
+                    delay = 0.0  # The bucket holds every caller until then
+                print(f"  ! Tag Manager HTTP {status}; retry {attempt + 1}/{self.max_retries}", file=sys.stderr)
+                if delay:
+                    time.sleep(delay)
+                attempt += 1
+                continue
+            self.bucket.on_success()
+            return response
+
+
+_PACER: Optional[Pacer] = None
+
+
+def shared_pacer() -> Pacer:
+    global _PACER
+    if _PACER is None:
+        _PACER = Pacer()
+    return _PACER
+
+
+def _collection(service: Any, kind: str) -> Any:
+    return getattr(service.accounts().containers().workspaces(), COLLECTIONS[kind])()
+
+
+def _fold(value: str) -> str:
+    return value.replace("_", "").lower()
+
+
+def normalize(value: Any, key: str = "") -> Any:
+    """Canonical form of an entity field for comparison (see module docstring)."""
+    if isinstance(value, Mapping):
+        out = {k: normalize(v, k) for k, v in value.items() if k not in SERVER_FIELDS}
+        return {k: v for k, v in sorted(out.items()) if v not in (None, "", [], {})}
+    if isinstance(value, (list, tuple)):
+        items = [normalize(v) for v in value]
+        if key in ("parameter", "map") or key in TRIGGER_REF_FIELDS:
+            # Named parameters (top level or in a map) and trigger IDs are unordered; "list" values keep their order
+            items.sort(key=lambda v: json.dumps(v, sort_keys=True))
+        return items
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if key == "type" and isinstance(value, str):
+        return _fold(value)
+    return value if isinstance(value, str) else str(value)
+
+
+def fingerprint(body: Mapping[str, Any], fields: Optional[Sequence[str]] = None) -> str:
+    """SHA-256 of `body` restricted to `fields` (default: the body's own fields)."""
+    keys = fields if fields is not None else [k for k in body if k not in SERVER_FIELDS]
+    payload = json.dumps(normalize({k: body.get(k) for k in keys}), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class WorkspaceIndex:
+    """A workspace's variables, triggers and tags by name, read with one paged list each."""
+
+    def __init__(self, service: Any, workspace_path: str, pacer: Optional[Pacer] = None):
+        self.service = service
+        self.workspace_path = workspace_path
+        self.pacer = pacer or shared_pacer()
+        self.entities: Dict[str, Dict[str, Dict[str, Any]]] = {kind: {} for kind in KINDS}
+
+    def load(self) -> "WorkspaceIndex":
+        for kind in KINDS:
+            self.entities[kind] = {e["name"]: e for e in self._list(kind)}
+        return self
+
+    def _list(self, kind: str) -> List[Dict[str, Any]]:
+        items: List[Dict[str, Any]] = []
+        page_token = None
+        while True:
+            kwargs = {"parent": self.workspace_path}
+            if page_token:
+                kwargs["pageToken"] = page_token
+            res = self.pacer.execute(_collection(self.service, kind).list(**kwargs))
+            items.extend(res.get(kind, []))
+            page_token = res.get("nextPageToken")
+            if not page_token:
+                return items
+
+    def get(self, kind: str, name: str) -> Optional[Dict[str, Any]]:
+        return self.entities[kind].get(name)
+
+    def trigger_id(self, ref: str) -> Optional[str]:
+        if str(ref).isdigit():
+            return str(ref)
+        trigger = self.get("trigger", ref)
+        return trigger["triggerId"] if trigger else None
+
+    def resolve(self, kind: str, body: Mapping[str, Any]) -> Dict[str, Any]:
+        """`body` with tag trigger names replaced by IDs. Unknown names are kept (dry runs)."""
+        body = dict(body)
+        if kind == "tag":
+            for field in TRIGGER_REF_FIELDS:
+                if field in body:
+                    body[field] = [self.trigger_id(ref) or ref for ref in body[field]]
+        return body
+
+    def diff(self, kind: str, body: Mapping[str, Any]) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """("create" | "update" | "unchanged", live entity) for one desired body."""
+        live = self.get(kind, body["name"])
+        if live is None:
+            return "create", None
+        desired = self.resolve(kind, body)
+        fields = [k for k in desired if k not in SERVER_FIELDS]
+        if fingerprint(desired, fields) == fingerprint(live, fields):
+            return "unchanged", live
+        return "update", live
+
+    def create(self, kind: str, body: Mapping[str, Any]) -> Dict[str, Any]:
+        created = self.pacer.execute(
+            _collection(self.service, kind).create(parent=self.workspace_path, body=self.resolve(kind, body)), write=True
+        )
+        self.entities[kind][created["name"]] = created
+        return created
+
+    def update(self, kind: str, live: Mapping[str, Any], body: Mapping[str, Any]) -> Dict[str, Any]:
+        # An update replaces the entity: keep the live fields the desired body doesn't manage
+        merged = {k: v for k, v in live.items() if k not in SERVER_FIELDS}
+        merged.update(self.resolve(kind, body))
+        updated = self.pacer.execute(
+            _collection(self.service, kind).update(path=live["path"], fingerprint=live.get("fingerprint"), body=merged),
+            write=True,
+        )
+        self.entities[kind][updated["name"]] = updated
+        return updated
+
+    def delete(self, kind: str, live: Mapping[str, Any]) -> None:
+        self.pacer.execute(_collection(self.service, kind).delete(path=live["path"]), write=True)
+        self.entities[kind].pop(live["name"], None)
+
+
+def sync(
+    index: WorkspaceIndex,
+    desired: Mapping[str, Sequence[Mapping[str, Any]]],
+    dry_run: bool = False,
+    prune: bool = False,
+    log: Optional[Callable[[str], None]] = print,
+) -> Dict[str, int]:
+    """
+    Create or update the entities in `desired` ({kind: [body, ...]}) that differ from
+    the index; with `prune`, also delete the ones `desired` doesn't name. Returns counts.
+    """
+    counts = dict.fromkeys(OUTCOMES.values(), 0)
+    suffix = " (dry run)" if dry_run else ""
+    for kind in KINDS:
+        for body in desired.get(kind, []):
+            action, live = index.diff(kind, body)
+            if action == "create" and not dry_run:
+                index.create(kind, body)
+            elif action == "update" and not dry_run:
+                index.update(kind, live, body)
+            counts[OUTCOMES[action]] += 1
+            if log:
+                log(f"  [{LABELS[action]}] {kind} '{body['name']}'{suffix if action != 'unchanged' else ''}")
+    if prune:
+        # Tags before the triggers they fire on
+        for kind in reversed(KINDS):
+            wanted = {body["name"] for body in desired.get(kind, [])}
+            for name, live in list(index.entities[kind].items()):
+                if name in wanted:
+                    continue
+                if not dry_run:
+                    index.delete(kind, live)
+                counts[OUTCOMES["delete"]] += 1
+                if log:
+                    log(f"  [{LABELS['delete']}] {kind} '{name}'{suffix}")
+    return counts
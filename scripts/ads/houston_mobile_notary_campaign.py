@@ -4,7 +4,8 @@ Turnkey Google Ads setup for "Houston Mobile Notary" using the official google-a
 
 What this script does:
 - Creates a Search campaign with either Maximize Clicks (with CPC cap) or Manual CPC and daily budget
-- Adds geo targeting via radius around ZIP or Houston-area city includes
+- Adds geo targeting via radius around ZIP (optionally sized, with ZIP exclusions, by a geo_radius.py plan)
+  or Houston-area city includes
 - Creates ad groups for: Mobile Notary (default), and optionally Loan Signing / RON
 - Adds starter keyword lists and campaign-level negatives
 - Creates a Responsive Search Ad (RSA) in each ad group with multiple headlines/descriptions
@@ -20,6 +21,16 @@ Usage (lean launch example):
     --campaign-name "HMNP – Mobile – 77591 Radius" --domain "https://houstonmobilenotarypros.com/booking/enhanced" \
     --daily-budget 15000000 --zip 77591 --radius-miles 25 --bidding maximize_clicks --cpc-cap-micros 1800000
 
+  # New campaign, budget, targeting, ad groups, keywords, RSAs and negatives in one request
+  python3 scripts/ads/houston_mobile_notary_campaign.py --customer-id 1234567890 \
+    --campaign-name "HMNP – Mobile – 77591 Radius" --domain "https://houstonmobilenotarypros.com/booking/enhanced" \
+    --zip 77591 --radius-miles 25 --single-mutate
+
+  # Radius and ZIP exclusions from performance (see geo_radius.py)
+  python3 scripts/ads/houston_mobile_notary_campaign.py --customer-id 1234567890 \
+    --campaign-name "HMNP – Mobile – 77591 Radius" --domain "https://houstonmobilenotarypros.com/booking/enhanced" \
+    --geo-plan scripts/ads/exports/geo-plan.json
+
 Notes:
 - daily-budget is in micros (e.g., 20000000 = $20/day)
 - You can re-run safely; the script checks for existing entities by name and skips creation if found.
@@ -28,17 +39,28 @@ Notes:
 from __future__ import annotations
 
 import argparse
+import json
 import sys
 from typing import Dict, List, Optional, Tuple
-from datetime import datetime
-from zoneinfo import ZoneInfo
 
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
+from google.protobuf.field_mask_pb2 import FieldMask
+
+import ads_client
+import ads_profile
+import gaql
+
 # Avoid version-specific imports. Use dynamic types/enums via the client.
 
 
 # ---------- Configurable seed data ----------
+# Also the source of the Editor / UI bulk CSVs (editor_csv.py seed_spec).
+
+DEFAULT_CAMPAIGN_NAME = "Houston Mobile Notary – Core"
+DEFAULT_DAILY_BUDGET_MICROS = 20_000_000
+DEFAULT_BIDDING_MODE = "maximize_clicks"
+RSA_PATHS: Tuple[str, str] = ("mobile-notary", "book-now")
 
 HOUSTON_AREA_CITY_NAMES: List[str] = [
     "Houston",
@@ -151,10 +173,62 @@ RSA_ASSETS: Dict[str, List[str]] = {
 }
 
 
+CAMPAIGN_BY_NAME = gaql.Query("campaign").select("campaign.resource_name").where("campaign.name = :name").limit(1)
+AD_GROUP_BY_NAME = (
+    gaql.Query("ad_group")
+    .select("ad_group.resource_name")
+    .where("ad_group.name = :name")
+    .where("ad_group.campaign = :campaign")
+    .limit(1)
+)
+BIDDING_STRATEGY_BY_NAME = (
+    gaql.Query("bidding_strategy").select("bidding_strategy.resource_name").where("bidding_strategy.name = :name").limit(1)
+)
+BUDGET_BY_NAME = gaql.Query("campaign_budget").select("campaign_budget.resource_name").where("campaign_budget.name = :name").limit(1)
+GEO_TARGETS = (
+    gaql.Query("geo_target_constant")
+    .select("geo_target_constant.resource_name", "geo_target_constant.target_type")
+    .where("geo_target_constant.country_code = :country_code")
+    .where("geo_target_constant.status = ENABLED")
+)
+GEO_TARGETS_BY_NAME = GEO_TARGETS.where("geo_target_constant.name = :name")
+GEO_TARGETS_LIKE_NAME = GEO_TARGETS.where("geo_target_constant.name LIKE :pattern")
+AD_SCHEDULE_CRITERIA = (
+    gaql.Query("campaign_criterion")
+    .select(
+        "campaign_criterion.resource_name",
+        "campaign_criterion.bid_modifier",
+        *gaql.fields("campaign_criterion.ad_schedule", "day_of_week start_hour start_minute end_hour end_minute"),
+    )
+    .where("campaign_criterion.campaign = :campaign")
+    .where("campaign_criterion.type = AD_SCHEDULE")
+)
+PROXIMITY_CRITERIA = (
+    gaql.Query("campaign_criterion")
+    .select(
+        "campaign_criterion.resource_name",
+        *gaql.fields("campaign_criterion.proximity", "radius radius_units address.postal_code address.country_code"),
+    )
+    .where("campaign_criterion.campaign = :campaign")
+    .where("campaign_criterion.type = PROXIMITY")
+)
+LOCATION_EXCLUSIONS = (
+    gaql.Query("campaign_criterion")
+    .select("campaign_criterion.resource_name", "campaign_criterion.location.geo_target_constant")
+    .where("campaign_criterion.campaign = :campaign")
+    .where("campaign_criterion.type = LOCATION")
+    .where("campaign_criterion.negative = TRUE")
+)
+POSTAL_CODE_CONSTANTS = (
+    gaql.Query("geo_target_constant")
+    .select("geo_target_constant.resource_name")
+    .where("geo_target_constant.resource_name IN :names")
+    .where("geo_target_constant.target_type = :target_type")
+)
+
+
 def load_client(config_file: Optional[str] = None) -> GoogleAdsClient:
-    if config_file:
-        return GoogleAdsClient.load_from_storage(path=config_file)
-    return GoogleAdsClient.load_from_storage()
+    return ads_client.load_client(config_file)
 
 
 def get_existing_resource_by_name(
@@ -177,12 +251,7 @@ def get_existing_resource_by_name(
 
 def find_campaign_by_name(client: GoogleAdsClient, customer_id: str, name: str) -> Optional[str]:
     ga_service = client.get_service("GoogleAdsService")
-    query = f"""
-        SELECT campaign.resource_name, campaign.name
-        FROM campaign
-        WHERE campaign.name = '{name.replace("'", "\\'")}'
-        LIMIT 1
-    """
+    query = CAMPAIGN_BY_NAME.bind(name=name)
     results = ga_service.search(customer_id=customer_id, query=query)
     for row in results:
         return row.campaign.resource_name
@@ -191,25 +260,14 @@ def find_campaign_by_name(client: GoogleAdsClient, customer_id: str, name: str)
 
 def find_ad_group_by_name(client: GoogleAdsClient, customer_id: str, campaign_resource_name: str, name: str) -> Optional[str]:
     ga_service = client.get_service("GoogleAdsService")
-    query = f"""
-        SELECT ad_group.resource_name, ad_group.name, ad_group.campaign
-        FROM ad_group
-        WHERE ad_group.name = '{name.replace("'", "\\'")}'
-          AND ad_group.campaign = '{campaign_resource_name}'
-        LIMIT 1
-    """
+    query = AD_GROUP_BY_NAME.bind(name=name, campaign=campaign_resource_name)
     results = ga_service.search(customer_id=customer_id, query=query)
     for row in results:
         return row.ad_group.resource_name
     return None
 def find_bidding_strategy_by_name(client: GoogleAdsClient, customer_id: str, name: str) -> Optional[str]:
     ga_service = client.get_service("GoogleAdsService")
-    query = f"""
-        SELECT bidding_strategy.resource_name, bidding_strategy.name
-        FROM bidding_strategy
-        WHERE bidding_strategy.name = '{name.replace("'", "\\'")}'
-        LIMIT 1
-    """
+    query = BIDDING_STRATEGY_BY_NAME.bind(name=name)
     results = ga_service.search(customer_id=customer_id, query=query)
     for row in results:
         return row.bidding_strategy.resource_name
@@ -238,16 +296,19 @@ def create_or_get_portfolio_maximize_clicks(
 
 
 
-def create_budget(client: GoogleAdsClient, customer_id: str, budget_name: str, amount_micros: int) -> str:
-    budget_service = client.get_service("CampaignBudgetService")
-    op = client.get_type("CampaignBudgetOperation")
-    budget = op.create
+def _fill_budget(client: GoogleAdsClient, budget, budget_name: str, amount_micros: int) -> None:
     budget.name = budget_name
     budget.delivery_method = client.enums.BudgetDeliveryMethodEnum.STANDARD
     budget.amount_micros = amount_micros
     # Recommended: set explicitly false to allow shared budgets reuse across campaigns
     budget.explicitly_shared = False
 
+
+def create_budget(client: GoogleAdsClient, customer_id: str, budget_name: str, amount_micros: int) -> str:
+    budget_service = client.get_service("CampaignBudgetService")
+    op = client.get_type("CampaignBudgetOperation")
+    _fill_budget(client, op.create, budget_name, amount_micros)
+
     response = budget_service.mutate_campaign_budgets(
         customer_id=customer_id,
         operations=[op],
@@ -255,17 +316,19 @@ def create_budget(client: GoogleAdsClient, customer_id: str, budget_name: str, a
     return response.results[0].resource_name
 
 
-def create_or_get_budget(client: GoogleAdsClient, customer_id: str, budget_name: str, amount_micros: int) -> str:
+def find_budget_by_name(client: GoogleAdsClient, customer_id: str, budget_name: str) -> Optional[str]:
     ga_service = client.get_service("GoogleAdsService")
-    query = f"""
-        SELECT campaign_budget.resource_name, campaign_budget.name, campaign_budget.amount_micros
-        FROM campaign_budget
-        WHERE campaign_budget.name = '{budget_name.replace("'", "\\'")}'
-        LIMIT 1
-    """
+    query = BUDGET_BY_NAME.bind(name=budget_name)
     results = ga_service.search(customer_id=customer_id, query=query)
     for row in results:
         return row.campaign_budget.resource_name
+    return None
+
+
+def create_or_get_budget(client: GoogleAdsClient, customer_id: str, budget_name: str, amount_micros: int) -> str:
+    existing = find_budget_by_name(client, customer_id, budget_name)
+    if existing:
+        return existing
     return create_budget(client, customer_id, budget_name, amount_micros)
 
 
@@ -280,33 +343,34 @@ def create_campaign(
     campaign_service = client.get_service("CampaignService")
 
     op = client.get_type("CampaignOperation")
-    campaign = op.create
+    _fill_campaign(client, op.create, campaign_name, budget_resource_name, bidding_mode, cpc_cap_micros)
+
+    response = campaign_service.mutate_campaigns(
+        customer_id=customer_id,
+        operations=[op],
+    )
+    return response.results[0].resource_name
+
+
+def _fill_campaign(
+    client: GoogleAdsClient,
+    campaign,
+    campaign_name: str,
+    budget_resource_name: str,
+    bidding_mode: str,
+    cpc_cap_micros: int,
+) -> None:
     campaign.name = campaign_name
     campaign.advertising_channel_type = client.enums.AdvertisingChannelTypeEnum.SEARCH
     campaign.status = client.enums.CampaignStatusEnum.PAUSED
     campaign.campaign_budget = budget_resource_name
 
-    # Bidding mode (prefer standard Maximize Clicks with CPC cap; fallback to portfolio or ManualCpc)
+    # Bidding mode: standard Maximize Clicks is TargetSpend in the API, set on the campaign
+    # itself, so filling a campaign never has to create a portfolio strategy first
     if bidding_mode == "maximize_clicks":
-        try:
-            campaign.maximize_clicks.cpc_bid_ceiling_micros = int(cpc_cap_micros)
-        except Exception:
-            # Fallback to portfolio TARGET_SPEND if library/oneof constraints require it
-            try:
-                bs_name = f"HMNP MaxClicks Cap {cpc_cap_micros}"
-                bs_res = create_or_get_portfolio_maximize_clicks(client, customer_id, bs_name, cpc_cap_micros)
-                campaign.bidding_strategy = bs_res
-            except Exception:
-                try:
-                    campaign.manual_cpc.CopyFrom(client.get_type("ManualCpc"))
-                except Exception:
-                    pass
+        campaign.target_spend.cpc_bid_ceiling_micros = int(cpc_cap_micros)
     else:
-        # Manual CPC
-        try:
-            campaign.manual_cpc.CopyFrom(client.get_type("ManualCpc"))
-        except Exception:
-            pass
+        client.copy_from(campaign.manual_cpc, client.get_type("ManualCpc"))
 
     # Network settings: Google Search and Search partners
     network_settings = campaign.network_settings
@@ -331,8 +395,8 @@ def create_campaign(
     except Exception:
         pass
 
-    # Start date in local timezone (America/Chicago) per business hours alignment
-    campaign.start_date = datetime.now(ZoneInfo("America/Chicago")).strftime("%Y-%m-%d")
+    # Start left unset (start_date_time replaced start_date): the campaign is created paused
+    # and starts serving when enabled
 
     # Location options: Presence only for positive geo targets if supported
     try:
@@ -341,12 +405,6 @@ def create_campaign(
     except Exception:
         pass
 
-    response = campaign_service.mutate_campaigns(
-        customer_id=customer_id,
-        operations=[op],
-    )
-    return response.results[0].resource_name
-
 
 def create_or_get_campaign(client: GoogleAdsClient, customer_id: str, campaign_name: str, budget_resource_name: str) -> str:
     existing = find_campaign_by_name(client, customer_id, campaign_name)
@@ -361,12 +419,7 @@ def resolve_city_geo_targets(client: GoogleAdsClient, city_names: List[str], cou
     for name in city_names:
         search_request = client.get_type("SearchGeoTargetConstantsRequest")
         # Exact name match first; fall back to LIKE
-        search_request.query = (
-            f"SELECT geo_target_constant.resource_name, geo_target_constant.name, geo_target_constant.country_code, geo_target_constant.target_type "
-            f"WHERE geo_target_constant.name = '{name.replace("'", "\\'")}' "
-            f"AND geo_target_constant.country_code = '{country_code}' "
-            f"AND geo_target_constant.status = 'ENABLED'"
-        )
+        search_request.query = GEO_TARGETS_BY_NAME.bind(name=name, country_code=country_code)
         response = geo_service.search_geo_target_constants(request=search_request)
         chosen = None
         for row in response.results:
@@ -376,12 +429,7 @@ def resolve_city_geo_targets(client: GoogleAdsClient, city_names: List[str], cou
                 break
         if not chosen:
             # fallback: partial match
-            search_request.query = (
-                f"SELECT geo_target_constant.resource_name, geo_target_constant.name, geo_target_constant.country_code, geo_target_constant.target_type "
-                f"WHERE geo_target_constant.name LIKE '%{name.replace("'", "\\'")}%' "
-                f"AND geo_target_constant.country_code = '{country_code}' "
-                f"AND geo_target_constant.status = 'ENABLED'"
-            )
+            search_request.query = GEO_TARGETS_LIKE_NAME.bind(pattern=f"%{name}%", country_code=country_code)
             response = geo_service.search_geo_target_constants(request=search_request)
             for row in response.results:
                 if row.geo_target_constant.target_type in ("City", "Municipality", "Township"):
@@ -415,12 +463,15 @@ def set_campaign_language(
 ) -> None:
     svc = client.get_service("CampaignCriterionService")
     op = client.get_type("CampaignCriterionOperation")
-    c = op.create
-    c.campaign = campaign_resource_name
-    c.language.language_constant = language_constant
+    _fill_language(op.create, campaign_resource_name, language_constant)
     svc.mutate_campaign_criteria(customer_id=customer_id, operations=[op])
 
 
+def _fill_language(criterion, campaign_resource_name: str, language_constant: str = "languageConstants/1000") -> None:
+    criterion.campaign = campaign_resource_name
+    criterion.language.language_constant = language_constant
+
+
 def suggest_city_geo_targets(
     client: GoogleAdsClient,
     city_names: List[str],
@@ -440,38 +491,96 @@ def suggest_city_geo_targets(
     return resource_names
 
 
+DAYS_OF_WEEK = ["MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY", "SATURDAY", "SUNDAY"]
+
+# (day, start_hour, end_hour) -> bid modifier; schedule criteria are whole hours here
+AdSchedule = Dict[Tuple[str, int, int], float]
+# Lean-budget windows for a new campaign, every day; ad_schedule_optimizer.py refits them
+DEFAULT_AD_SCHEDULE_WINDOWS: List[Tuple[int, int]] = [(8, 11), (16, 21)]
+
+
+def current_ad_schedule(client: GoogleAdsClient, customer_id: str, campaign_resource_name: str) -> Dict[tuple, Tuple[str, float]]:
+    """
+    Existing AD_SCHEDULE criteria: (day, start_hour, end_hour) -> (resource name, bid modifier).
+    Criteria set to other than whole hours in the UI keep their minutes in the key, so no
+    schedule here matches them and set_campaign_ad_schedule replaces them.
+    """
+    ga = client.get_service("GoogleAdsService")
+    current: Dict[tuple, Tuple[str, float]] = {}
+    for row in ga.search(customer_id=customer_id, query=AD_SCHEDULE_CRITERIA.bind(campaign=campaign_resource_name)):
+        c = row.campaign_criterion
+        key: tuple = (c.ad_schedule.day_of_week.name, c.ad_schedule.start_hour, c.ad_schedule.end_hour)
+        if c.ad_schedule.start_minute.name != "ZERO" or c.ad_schedule.end_minute.name != "ZERO":
+            key += (c.ad_schedule.start_minute.name, c.ad_schedule.end_minute.name)
+        current[key] = (c.resource_name, c.bid_modifier or 1.0)
+    return current
+
+
 def set_campaign_ad_schedule(
     client: GoogleAdsClient,
     customer_id: str,
     campaign_resource_name: str,
     windows: List[Tuple[int, int]] | None = None,
-) -> None:
-    """Add ad schedule criteria. windows is a list of (start_hour, end_hour) in 24h local time."""
-    cc_service = client.get_service("CampaignCriterionService")
+    schedule: AdSchedule | None = None,
+) -> Dict[str, int]:
+    """
+    Make the campaign's ad schedule criteria match `schedule` (see ad_schedule_optimizer.py)
+    or, without one, `windows` as (start_hour, end_hour) in 24h local time on every day.
+    Only criteria that differ are mutated, in one request: missing windows are created,
+    windows no longer wanted are removed and changed bid modifiers are updated, so a
+    re-run with the same schedule sends nothing. Returns counts per operation.
+    An empty schedule raises: removing every window would serve around the clock.
+    """
+    if schedule is None:
+        schedule = {
+            (day, start_hour, end_hour): 1.0 for day in DAYS_OF_WEEK for (start_hour, end_hour) in windows or DEFAULT_AD_SCHEDULE_WINDOWS
+        }
+    if not schedule:
+        raise ValueError(f"Empty ad schedule for {campaign_resource_name}; refusing to remove every window")
+    current = current_ad_schedule(client, customer_id, campaign_resource_name)
+
     operations: List[object] = []
-    if not windows:
-        windows = [(8, 11), (16, 21)]  # default lean windows
-    for day in [
-        "MONDAY",
-        "TUESDAY",
-        "WEDNESDAY",
-        "THURSDAY",
-        "FRIDAY",
-        "SATURDAY",
-        "SUNDAY",
-    ]:
-        for (start_hour, end_hour) in windows:
+    counts = {"created": 0, "updated": 0, "removed": 0, "unchanged": 0}
+    for key, (resource_name, bid_modifier) in current.items():
+        if key not in schedule:
+            op = client.get_type("CampaignCriterionOperation")
+            op.remove = resource_name
+            operations.append(op)
+            counts["removed"] += 1
+        elif round(bid_modifier, 2) != round(schedule[key], 2):
             op = client.get_type("CampaignCriterionOperation")
-            c = op.create
-            c.campaign = campaign_resource_name
-            c.ad_schedule.day_of_week = getattr(client.enums.DayOfWeekEnum, day)
-            c.ad_schedule.start_hour = start_hour
-            c.ad_schedule.start_minute = client.enums.MinuteOfHourEnum.ZERO
-            c.ad_schedule.end_hour = end_hour
-            c.ad_schedule.end_minute = client.enums.MinuteOfHourEnum.ZERO
+            c = op.update
+            c.resource_name = resource_name
+            c.bid_modifier = schedule[key]
+            op.update_mask.CopyFrom(FieldMask(paths=["bid_modifier"]))
             operations.append(op)
+            counts["updated"] += 1
+        else:
+            counts["unchanged"] += 1
+    for (day, start_hour, end_hour), bid_modifier in sorted(schedule.items()):
+        if (day, start_hour, end_hour) in current:
+            continue
+        op = client.get_type("CampaignCriterionOperation")
+        _fill_ad_schedule(client, op.create, campaign_resource_name, day, start_hour, end_hour, bid_modifier)
+        operations.append(op)
+        counts["created"] += 1
     if operations:
+        cc_service = client.get_service("CampaignCriterionService")
         cc_service.mutate_campaign_criteria(customer_id=customer_id, operations=operations)
+    return counts
+
+
+def _fill_ad_schedule(
+    client: GoogleAdsClient, criterion, campaign_resource_name: str, day: str, start_hour: int, end_hour: int, bid_modifier: float
+) -> None:
+    criterion.campaign = campaign_resource_name
+    criterion.ad_schedule.day_of_week = getattr(client.enums.DayOfWeekEnum, day)
+    criterion.ad_schedule.start_hour = start_hour
+    criterion.ad_schedule.start_minute = client.enums.MinuteOfHourEnum.ZERO
+    criterion.ad_schedule.end_hour = end_hour
+    criterion.ad_schedule.end_minute = client.enums.MinuteOfHourEnum.ZERO
+    if round(bid_modifier, 2) != 1.0:
+        criterion.bid_modifier = bid_modifier
 
 
 def set_campaign_radius_target(
@@ -480,18 +589,108 @@ def set_campaign_radius_target(
     campaign_resource_name: str,
     postal_code: str,
     country_code: str,
-    radius_miles: int,
+    radius_miles: float,
 ) -> None:
+    """
+    Make `radius_miles` around `postal_code` the campaign's only proximity target. A
+    matching radius is left alone; any other (a different radius, or one around another
+    ZIP from an earlier plan) is removed, in one request, so re-runs and new plans from
+    geo_radius.py don't stack proximity criteria.
+    """
+    ga = client.get_service("GoogleAdsService")
+    operations: List[object] = []
+    matched = False
+    for row in ga.search(customer_id=customer_id, query=PROXIMITY_CRITERIA.bind(campaign=campaign_resource_name)):
+        prox = row.campaign_criterion.proximity
+        if (
+            not matched
+            and prox.address.postal_code == postal_code
+            and prox.radius_units.name == "MILES"
+            and round(prox.radius, 1) == round(float(radius_miles), 1)
+        ):
+            matched = True
+            continue
+        op = client.get_type("CampaignCriterionOperation")
+        op.remove = row.campaign_criterion.resource_name
+        operations.append(op)
+
+    if not matched:
+        op = client.get_type("CampaignCriterionOperation")
+        _fill_proximity(client, op.create, campaign_resource_name, postal_code, country_code, radius_miles)
+        operations.append(op)
+    if not operations:
+        return
     campaign_criterion_service = client.get_service("CampaignCriterionService")
-    op = client.get_type("CampaignCriterionOperation")
-    criterion = op.create
+    campaign_criterion_service.mutate_campaign_criteria(customer_id=customer_id, operations=operations)
+
+
+def _fill_proximity(
+    client: GoogleAdsClient, criterion, campaign_resource_name: str, postal_code: str, country_code: str, radius_miles: float
+) -> None:
     criterion.campaign = campaign_resource_name
     prox = criterion.proximity
     prox.radius_units = client.enums.ProximityRadiusUnitsEnum.MILES
     prox.radius = float(radius_miles)
     prox.address.postal_code = postal_code
     prox.address.country_code = country_code
-    campaign_criterion_service.mutate_campaign_criteria(customer_id=customer_id, operations=[op])
+
+
+def set_campaign_location_exclusions(
+    client: GoogleAdsClient,
+    customer_id: str,
+    campaign_resource_name: str,
+    geo_target_constants: List[str],
+) -> Dict[str, int]:
+    """
+    Make the campaign's excluded postal codes exactly `geo_target_constants` (the ZIPs
+    from a geo_radius.py plan): missing exclusions are added and excluded postal codes
+    no longer in the list removed, in one request. Other excluded locations (cities,
+    counties, states) are not the plan's to judge and are left alone. Returns counts per
+    operation.
+    """
+    ga = client.get_service("GoogleAdsService")
+    current: Dict[str, str] = {}
+    for row in ga.search(customer_id=customer_id, query=LOCATION_EXCLUSIONS.bind(campaign=campaign_resource_name)):
+        current[row.campaign_criterion.location.geo_target_constant] = row.campaign_criterion.resource_name
+    if current:
+        postal_codes = {
+            row.geo_target_constant.resource_name
+            for row in ga.search(
+                customer_id=customer_id, query=POSTAL_CODE_CONSTANTS.bind(names=sorted(current), target_type="Postal Code")
+            )
+        }
+        current = {gtc: rn for gtc, rn in current.items() if gtc in postal_codes}
+
+    wanted = set(geo_target_constants)
+    operations: List[object] = []
+    counts = {"created": 0, "removed": 0, "unchanged": 0}
+    for geo_target_constant, resource_name in current.items():
+        if geo_target_constant in wanted:
+            counts["unchanged"] += 1
+            continue
+        op = client.get_type("CampaignCriterionOperation")
+        op.remove = resource_name
+        operations.append(op)
+        counts["removed"] += 1
+    for geo_target_constant in sorted(wanted - set(current)):
+        op = client.get_type("CampaignCriterionOperation")
+        c = op.create
+        c.campaign = campaign_resource_name
+        c.negative = True
+        c.location.geo_target_constant = geo_target_constant
+        operations.append(op)
+        counts["created"] += 1
+    if operations:
+        cc_service = client.get_service("CampaignCriterionService")
+        cc_service.mutate_campaign_criteria(customer_id=customer_id, operations=operations)
+    return counts
+
+
+def load_geo_plan(path: str) -> Tuple[str, float, List[str]]:
+    """(center ZIP, radius in miles, excluded geo target constants) from a geo_radius.py plan."""
+    with open(path, encoding="utf-8") as f:
+        plan = json.load(f)
+    return plan["center_zip"], float(plan["radius_miles"]), [e["geo_target_constant"] for e in plan.get("exclusions", [])]
 
 
 def create_or_get_ad_group(client: GoogleAdsClient, customer_id: str, campaign_resource_name: str, ad_group_name: str) -> str:
@@ -500,7 +699,12 @@ def create_or_get_ad_group(client: GoogleAdsClient, customer_id: str, campaign_r
         return existing
     ad_group_service = client.get_service("AdGroupService")
     op = client.get_type("AdGroupOperation")
-    ad_group = op.create
+    _fill_ad_group(client, op.create, campaign_resource_name, ad_group_name)
+    response = ad_group_service.mutate_ad_groups(customer_id=customer_id, operations=[op])
+    return response.results[0].resource_name
+
+
+def _fill_ad_group(client: GoogleAdsClient, ad_group, campaign_resource_name: str, ad_group_name: str) -> None:
     ad_group.name = ad_group_name
     ad_group.campaign = campaign_resource_name
     ad_group.status = client.enums.AdGroupStatusEnum.ENABLED
@@ -509,8 +713,6 @@ def create_or_get_ad_group(client: GoogleAdsClient, customer_id: str, campaign_r
         ad_group.cpc_bid_micros = int(1_800_000)
     except Exception:
         pass
-    response = ad_group_service.mutate_ad_groups(customer_id=customer_id, operations=[op])
-    return response.results[0].resource_name
 
 
 def _strip_match_syntax(client: GoogleAdsClient, kw: str) -> Tuple[str, object]:
@@ -528,36 +730,42 @@ def add_keywords_to_ad_group(client: GoogleAdsClient, customer_id: str, ad_group
     agc_service = client.get_service("AdGroupCriterionService")
     operations: List[object] = []
     for kw in keywords:
-        text, match_type = _strip_match_syntax(client, kw)
         op = client.get_type("AdGroupCriterionOperation")
-        criterion = op.create
-        criterion.ad_group = ad_group_resource_name
-        criterion.status = client.enums.AdGroupCriterionStatusEnum.ENABLED
-        criterion.keyword.text = text
-        criterion.keyword.match_type = match_type
+        _fill_keyword(client, op.create, ad_group_resource_name, kw)
         operations.append(op)
     if operations:
         agc_service.mutate_ad_group_criteria(customer_id=customer_id, operations=operations)
 
 
+def _fill_keyword(client: GoogleAdsClient, criterion, ad_group_resource_name: str, kw: str) -> None:
+    text, match_type = _strip_match_syntax(client, kw)
+    criterion.ad_group = ad_group_resource_name
+    criterion.status = client.enums.AdGroupCriterionStatusEnum.ENABLED
+    criterion.keyword.text = text
+    criterion.keyword.match_type = match_type
+
+
 def add_campaign_negative_keywords(client: GoogleAdsClient, customer_id: str, campaign_resource_name: str, negatives: List[str]) -> None:
     if not negatives:
         return
     cc_service = client.get_service("CampaignCriterionService")
     operations: List[object] = []
     for kw in negatives:
-        text, match_type = _strip_match_syntax(client, kw)
         op = client.get_type("CampaignCriterionOperation")
-        criterion = op.create
-        criterion.campaign = campaign_resource_name
-        criterion.negative = True
-        criterion.keyword.text = text
-        criterion.keyword.match_type = match_type
+        _fill_negative_keyword(client, op.create, campaign_resource_name, kw)
         operations.append(op)
     if operations:
         cc_service.mutate_campaign_criteria(customer_id=customer_id, operations=operations)
 
 
+def _fill_negative_keyword(client: GoogleAdsClient, criterion, campaign_resource_name: str, kw: str) -> None:
+    text, match_type = _strip_match_syntax(client, kw)
+    criterion.campaign = campaign_resource_name
+    criterion.negative = True
+    criterion.keyword.text = text
+    criterion.keyword.match_type = match_type
+
+
 def create_rsa(
     client: GoogleAdsClient,
     customer_id: str,
@@ -568,7 +776,20 @@ def create_rsa(
 ) -> str:
     aga_service = client.get_service("AdGroupAdService")
     op = client.get_type("AdGroupAdOperation")
-    ad_group_ad = op.create
+    _fill_rsa(client, op.create, ad_group_resource_name, final_url, headlines, descriptions)
+
+    response = aga_service.mutate_ad_group_ads(customer_id=customer_id, operations=[op])
+    return response.results[0].resource_name
+
+
+def _fill_rsa(
+    client: GoogleAdsClient,
+    ad_group_ad,
+    ad_group_resource_name: str,
+    final_url: str,
+    headlines: List[str],
+    descriptions: List[str],
+) -> None:
     ad_group_ad.ad_group = ad_group_resource_name
     ad_group_ad.status = client.enums.AdGroupAdStatusEnum.PAUSED
 
@@ -578,8 +799,7 @@ def create_rsa(
     rsa = ad.responsive_search_ad
     # Optional: cleaner display URL paths
     try:
-        rsa.path1 = "mobile-notary"
-        rsa.path2 = "book-now"
+        rsa.path1, rsa.path2 = RSA_PATHS
     except Exception:
         pass
     for h in headlines[:15]:
@@ -591,8 +811,121 @@ def create_rsa(
         asset.text = d
         rsa.descriptions.append(asset)
 
-    response = aga_service.mutate_ad_group_ads(customer_id=customer_id, operations=[op])
-    return response.results[0].resource_name
+
+MAX_MUTATE_OPERATIONS = 10_000  # GoogleAdsService.Mutate, per request
+
+
+class MutateBatch:
+    """
+    Operations for GoogleAdsService.mutate. Resources created in the batch get negative
+    temporary IDs (customers/<id>/campaigns/-2, ...) so later operations can reference
+    them before they exist. submit() sends everything in as few requests as the
+    per-request limit allows, which for one campaign here is a single request; when it
+    has to split, references to resources created by an earlier request are rewritten
+    to their real names first.
+    """
+
+    def __init__(self, client: GoogleAdsClient, customer_id: str):
+        self.client = client
+        self.customer_id = customer_id
+        self.ga = client.get_service("GoogleAdsService")
+        # (operation kind, MutateOperation, fields of the created message that hold resource names)
+        self.operations: List[Tuple[str, object, Tuple[str, ...]]] = []
+        self._next_id = -1
+
+    def create(self, kind: str, *refs: str):
+        """Append a `<kind>_operation` create (e.g. "campaign_criterion") and return the message to fill."""
+        op = self.client.get_type("MutateOperation")
+        self.operations.append((kind, op, refs))
+        return getattr(op, f"{kind}_operation").create
+
+    def name(self, message, path: str, *parent_ids: str) -> str:
+        """Give a created message a temporary resource name via a GoogleAdsService path helper."""
+        message.resource_name = getattr(self.ga, path)(self.customer_id, *parent_ids, str(self._next_id))
+        self._next_id -= 1
+        return message.resource_name
+
+    def submit(self, validate_only: bool = False) -> Dict[str, str]:
+        """Send the operations in order; returns temporary resource name -> real resource name."""
+        resolved: Dict[str, str] = {}
+        for start in range(0, len(self.operations), MAX_MUTATE_OPERATIONS):
+            chunk = self.operations[start : start + MAX_MUTATE_OPERATIONS]
+            for kind, op, refs in chunk:
+                message = getattr(op, f"{kind}_operation").create
+                for field in refs:
+                    if getattr(message, field) in resolved:
+                        setattr(message, field, resolved[getattr(message, field)])
+            response = self.ga.mutate(
+                customer_id=self.customer_id, mutate_operations=[op for _, op, _ in chunk], validate_only=validate_only
+            )
+            if validate_only:
+                continue
+            for (kind, op, _), result in zip(chunk, response.mutate_operation_responses):
+                temp_name = getattr(op, f"{kind}_operation").create.resource_name
+                if temp_name:
+                    resolved[temp_name] = getattr(result, f"{kind}_result").resource_name
+        return resolved
+
+
+def compile_new_campaign(
+    client: GoogleAdsClient,
+    customer_id: str,
+    campaign_name: str,
+    budget_resource_name: Optional[str],
+    daily_budget_micros: int,
+    bidding_mode: str,
+    cpc_cap_micros: int,
+    final_url: str,
+    ad_groups: List[str],
+    zip_code: str | None = None,
+    radius_miles: float | None = None,
+    exclusions: List[str] | None = None,
+    city_targets: List[str] | None = None,
+) -> Tuple[MutateBatch, str]:
+    """
+    Everything upsert_campaign sets up for a campaign that doesn't exist yet, as one
+    MutateBatch: budget (unless `budget_resource_name` is given), campaign, geo,
+    schedule, language, ad groups with keywords and RSA, and negatives. Returns the batch
+    and the campaign's temporary resource name.
+    """
+    batch = MutateBatch(client, customer_id)
+    if not budget_resource_name:
+        budget = batch.create("campaign_budget")
+        _fill_budget(client, budget, f"{campaign_name} – Budget", daily_budget_micros)
+        budget_resource_name = batch.name(budget, "campaign_budget_path")
+
+    campaign = batch.create("campaign", "campaign_budget")
+    _fill_campaign(client, campaign, campaign_name, budget_resource_name, bidding_mode, cpc_cap_micros)
+    campaign_res = batch.name(campaign, "campaign_path")
+
+    if zip_code and radius_miles:
+        _fill_proximity(client, batch.create("campaign_criterion", "campaign"), campaign_res, zip_code, "US", radius_miles)
+        for geo_target_constant in exclusions or []:
+            c = batch.create("campaign_criterion", "campaign")
+            c.campaign = campaign_res
+            c.negative = True
+            c.location.geo_target_constant = geo_target_constant
+    for geo_target_constant in city_targets or []:
+        c = batch.create("campaign_criterion", "campaign")
+        c.campaign = campaign_res
+        c.location.geo_target_constant = geo_target_constant
+    for day in DAYS_OF_WEEK:
+        for start_hour, end_hour in DEFAULT_AD_SCHEDULE_WINDOWS:
+            _fill_ad_schedule(client, batch.create("campaign_criterion", "campaign"), campaign_res, day, start_hour, end_hour, 1.0)
+    _fill_language(batch.create("campaign_criterion", "campaign"), campaign_res)
+
+    for ad_group_name in ad_groups:
+        ad_group = batch.create("ad_group", "campaign")
+        _fill_ad_group(client, ad_group, campaign_res, ad_group_name)
+        ag_res = batch.name(ad_group, "ad_group_path")
+        kw_map = AD_GROUP_TO_KEYWORDS[ad_group_name]
+        for kw in kw_map.get("exact", []) + kw_map.get("phrase", []) + kw_map.get("broad", []):
+            _fill_keyword(client, batch.create("ad_group_criterion", "ad_group"), ag_res, kw)
+        _fill_rsa(client, batch.create("ad_group_ad", "ad_group"), ag_res, final_url, RSA_ASSETS["headlines"], RSA_ASSETS["descriptions"])
+
+    for kw in CAMPAIGN_NEGATIVE_KEYWORDS.get("exact", []) + CAMPAIGN_NEGATIVE_KEYWORDS.get("phrase", []):
+        _fill_negative_keyword(client, batch.create("campaign_criterion", "campaign"), campaign_res, kw)
+    return batch, campaign_res
 
 
 def upsert_campaign(
@@ -602,19 +935,71 @@ def upsert_campaign(
     domain: str,
     daily_budget_micros: int,
     zip_code: str | None = None,
-    radius_miles: int | None = None,
-    bidding_mode: str = "maximize_clicks",
+    radius_miles: float | None = None,
+    geo_plan: str | None = None,
+    bidding_mode: str = DEFAULT_BIDDING_MODE,
     cpc_cap_micros: int = 1_800_000,
     include_loan_signing: bool = False,
     include_ron: bool = False,
+    single_mutate: bool = False,
+    validate_only: bool = False,
 ) -> None:
-    # Budget
+    if validate_only and not single_mutate:
+        raise ValueError("validate_only needs single_mutate; the incremental path has no validate-only mode")
+    exclusions: List[str] | None = None
+    if geo_plan:
+        zip_code, radius_miles, exclusions = load_geo_plan(geo_plan)
+
+    # Determine which ad groups to build
+    groups_to_build: List[str] = ["Mobile Notary"]
+    if include_loan_signing:
+        groups_to_build.append("Loan Signing")
+    if include_ron:
+        groups_to_build.append("RON Online Notary")
+    final_url = f"{domain}?utm_source=google&utm_medium=cpc&utm_campaign=mobile_77591&utm_term={{keyword}}&utm_content={{adgroupid}}"
     budget_name = f"{campaign_name} – Budget"
+
+    # New campaign in one request: everything below, compiled into a single GoogleAdsService.mutate
+    existing = find_campaign_by_name(client, customer_id, campaign_name)
+    if validate_only and existing:
+        # The existing-campaign path below writes; validating must never change the account
+        raise RuntimeError(f"Campaign '{campaign_name}' already exists ({existing}); --validate-only only covers new campaigns")
+    if single_mutate and not existing:
+        city_targets = None
+        if not (zip_code and radius_miles):
+            city_targets = suggest_city_geo_targets(client, HOUSTON_AREA_CITY_NAMES, country_code="US")
+        batch, campaign_temp = compile_new_campaign(
+            client,
+            customer_id,
+            campaign_name,
+            find_budget_by_name(client, customer_id, budget_name),
+            daily_budget_micros,
+            bidding_mode,
+            cpc_cap_micros,
+            final_url,
+            [name for name in AD_GROUP_TO_KEYWORDS if name in groups_to_build],
+            zip_code,
+            radius_miles,
+            exclusions,
+            city_targets,
+        )
+        with ads_profile.phase("write"):
+            resolved = batch.submit(validate_only)
+        requests = -(-len(batch.operations) // MAX_MUTATE_OPERATIONS)
+        if validate_only:
+            print(f"Validated {len(batch.operations)} operations in {requests} request(s); nothing was created.")
+            return
+        print(f"Created {resolved[campaign_temp]} with {len(batch.operations)} operations in {requests} request(s).")
+        print("Setup complete. Review campaign in the UI before enabling.")
+        return
+
+    # Budget
     budget_res = create_or_get_budget(client, customer_id, budget_name, daily_budget_micros)
 
     # Campaign
-    campaign_res = find_campaign_by_name(client, customer_id, campaign_name)
-    if not campaign_res:
+    campaign_res = existing
+    is_new = not campaign_res
+    if is_new:
         # Create with bidding preferences
         campaign_res = create_campaign(
             client=client,
@@ -635,24 +1020,21 @@ def upsert_campaign(
             country_code="US",
             radius_miles=radius_miles,
         )
+        if exclusions is not None:
+            set_campaign_location_exclusions(client, customer_id, campaign_res, exclusions)
     else:
         # Default: Houston-area city includes via suggestions (robust to name variants)
         city_targets = suggest_city_geo_targets(client, HOUSTON_AREA_CITY_NAMES, country_code="US")
         set_campaign_locations(client, customer_id, campaign_res, city_targets)
 
-    # Ad schedule: compressed windows for lean budget
-    set_campaign_ad_schedule(client, customer_id, campaign_res, windows=[(8, 11), (16, 21)])
+    # Ad schedule: compressed windows for lean budget, only where there is no schedule yet;
+    # re-runs keep the windows and modifiers set since (e.g. by ad_schedule_optimizer.py)
+    if is_new or not current_ad_schedule(client, customer_id, campaign_res):
+        set_campaign_ad_schedule(client, customer_id, campaign_res, windows=DEFAULT_AD_SCHEDULE_WINDOWS)
 
     # Language targeting (English)
     set_campaign_language(client, customer_id, campaign_res)
 
-    # Determine which ad groups to build
-    groups_to_build: List[str] = ["Mobile Notary"]
-    if include_loan_signing:
-        groups_to_build.append("Loan Signing")
-    if include_ron:
-        groups_to_build.append("RON Online Notary")
-
     # Ad groups + keywords + RSA
     for ad_group_name, kw_map in AD_GROUP_TO_KEYWORDS.items():
         if ad_group_name not in groups_to_build:
@@ -666,7 +1048,7 @@ def upsert_campaign(
             client,
             customer_id,
             ag_res,
-            final_url=f"{domain}?utm_source=google&utm_medium=cpc&utm_campaign=mobile_77591&utm_term={{keyword}}&utm_content={{adgroupid}}",
+            final_url=final_url,
             headlines=RSA_ASSETS["headlines"],
             descriptions=RSA_ASSETS["descriptions"],
         )
@@ -681,17 +1063,29 @@ def upsert_campaign(
 def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Create a Houston Mobile Notary Search campaign")
     parser.add_argument("--customer-id", required=True, help="Ads customer ID (no dashes)")
-    parser.add_argument("--campaign-name", default="Houston Mobile Notary – Core", help="Campaign name")
+    parser.add_argument("--campaign-name", default=DEFAULT_CAMPAIGN_NAME, help="Campaign name")
     parser.add_argument("--domain", required=True, help="Final URL domain, e.g., https://example.com")
-    parser.add_argument("--daily-budget", type=int, default=20000000, help="Daily budget in micros (e.g., 20000000=$20)")
+    parser.add_argument("--daily-budget", type=int, default=DEFAULT_DAILY_BUDGET_MICROS, help="Daily budget in micros (e.g., 20000000=$20)")
     parser.add_argument("--config", default=None, help="Path to google-ads.yaml (optional)")
     parser.add_argument("--zip", dest="zip_code", default=None, help="Postal code center for radius targeting (e.g., 77591)")
-    parser.add_argument("--radius-miles", type=int, dest="radius_miles", default=None, help="Radius in miles around the ZIP")
-    parser.add_argument("--bidding", choices=["maximize_clicks","manual_cpc"], default="maximize_clicks", help="Bidding mode")
+    parser.add_argument("--radius-miles", type=float, dest="radius_miles", default=None, help="Radius in miles around the ZIP")
+    parser.add_argument(
+        "--geo-plan", default=None, help="geo_radius.py plan JSON; sets the ZIP, radius and ZIP exclusions (overrides --zip/--radius-miles)"
+    )
+    parser.add_argument("--bidding", choices=["maximize_clicks","manual_cpc"], default=DEFAULT_BIDDING_MODE, help="Bidding mode")
     parser.add_argument("--cpc-cap-micros", type=int, default=1_800_000, help="CPC ceiling when using maximize_clicks")
     parser.add_argument("--include-loan-signing", action="store_true", help="Include Loan Signing ad group")
     parser.add_argument("--include-ron", action="store_true", help="Include RON ad group")
-    return parser.parse_args(argv)
+    parser.add_argument(
+        "--single-mutate",
+        action="store_true",
+        help="Create a new campaign and everything in it with one GoogleAdsService.mutate (existing campaigns are updated as usual)",
+    )
+    parser.add_argument("--validate-only", action="store_true", help="With --single-mutate, for a new campaign: validate the request, create nothing")
+    args = parser.parse_args(argv)
+    if args.validate_only and not args.single_mutate:
+        parser.error("--validate-only requires --single-mutate")
+    return args
 
 
 def main(argv: Optional[List[str]] = None) -> int:
@@ -706,10 +1100,13 @@ def main(argv: Optional[List[str]] = None) -> int:
             daily_budget_micros=args.daily_budget,
             zip_code=args.zip_code,
             radius_miles=args.radius_miles,
+            geo_plan=args.geo_plan,
             bidding_mode=args.bidding,
             cpc_cap_micros=args.cpc_cap_micros,
             include_loan_signing=args.include_loan_signing,
             include_ron=args.include_ron,
+            single_mutate=args.single_mutate,
+            validate_only=args.validate_only,
         )
         return 0
     except GoogleAdsException as ex:
@@ -723,6 +1120,6 @@ def main(argv: Optional[List[str]] = None) -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(ads_profile.run(main))
 
 
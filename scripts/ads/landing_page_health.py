@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Check that every landing page the account sends traffic to answers fast and with 200.
+
+URLs come from ad final URLs (and final mobile URLs) and sitelink final URLs linked at
+the account, campaign or ad group level, read in one concurrent batch (ads_async).
+Query parameters carrying ValueTrack or custom parameters ({keyword}, {adgroupid},
+{_promo}, ...) and fragments are stripped, and the rest of the URL normalized, so
+utm_term={keyword} variants of /booking/enhanced are fetched once.
+
+Pages are fetched concurrently on one event loop by a small HTTP/1.1 client over
+asyncio streams that keeps connections alive per host (at most --per-host at once, and
+--concurrency overall). Redirects are followed by hand so each hop is recorded; for the
+final response it records status, TTFB (request sent, or connection opened, to status
+line received), total time across hops and page weight (body bytes on the wire). A
+page is flagged when it errors, ends on anything but 200, redirects more than
+--max-redirects times, or is slower than --slow-ms TTFB or heavier than --heavy-kb.
+
+--url checks extra URLs, and with no --customer-id only those, e.g. against a local
+stand-in:  python3 -m http.server 8000  then  --url http://127.0.0.1:8000/
+
+Usage:
+  python3 scripts/ads/landing_page_health.py --customer-id 5072649468
+  python3 scripts/ads/landing_page_health.py --customer-id 5072649468 --slow-ms 600 --out scripts/ads/exports/lp-health.csv --strict
+  python3 scripts/ads/landing_page_health.py --url https://houstonmobilenotarypros.com/lp/mobile-priority
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import os
+import ssl
+import time
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from google.ads.googleads.client import GoogleAdsClient
+from google.ads.googleads.errors import GoogleAdsException
+
+from ads_client import load_client
+import ads_async
+import ads_profile
+import gaql
+
+
+DEFAULT_CONCURRENCY = 16
+DEFAULT_PER_HOST = 6
+DEFAULT_TIMEOUT = 15.0
+SLOW_TTFB_MS = 800
+HEAVY_KB = 3000
+MAX_REDIRECTS = 1
+REDIRECT_LIMIT = 10
+MAX_BODY_BYTES = 20 * 1024 * 1024
+USER_AGENT = "Mozilla/5.0 (compatible; landing-page-health/1.0)"
+
+AD_URLS = (
+    gaql.Query("ad_group_ad")
+    .select("ad_group_ad.ad.id", "ad_group_ad.ad.final_urls", "ad_group_ad.ad.final_mobile_urls")
+    .where("ad_group_ad.status != REMOVED")
+    .where("ad_group.status != REMOVED")
+    .where("campaign.status != REMOVED")
+)
+SITELINK_URLS = {
+    level: (
+        gaql.Query(f"{level}_asset")
+        .select("asset.id", "asset.final_urls", "asset.final_mobile_urls")
+        .where(f"{level}_asset.field_type = SITELINK")
+        .where(f"{level}_asset.status != REMOVED")
+    )
+    for level in ("customer", "campaign", "ad_group")
+}
+
+
+class PageCheck(NamedTuple):
+    url: str
+    status: Optional[int]
+    redirects: List[str]  # each hop's Location, in order
+    ttfb_ms: Optional[float]
+    total_ms: Optional[float]
+    bytes: Optional[int]
+    content_type: str
+    error: str
+
+
+def canonical_url(url: str) -> str:
+    """Drop ValueTrack/custom-parameter query values and the fragment; normalize the rest."""
+    parts = urlsplit(url.strip())
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if "{" not in v and "{" not in k)
+    host = (parts.hostname or "").lower()
+    default_port = {"http": 80, "https": 443}.get(parts.scheme.lower())
+    if parts.port and parts.port != default_port:
+        host = f"{host}:{parts.port}"
+    return urlunsplit((parts.scheme.lower(), host, parts.path or "/", urlencode(query), ""))
+
+
+def collect_urls(client: GoogleAdsClient, customer_id: str) -> Dict[str, Set[str]]:
+    """Canonical URL -> where it's used ("ad 123", "sitelink 456")."""
+    queries = {"ads": AD_URLS.bind()}
+    queries.update({level: q.bind() for level, q in SITELINK_URLS.items()})
+    results = ads_async.fetch_all(client, customer_id, queries)
+    used_by: Dict[str, Set[str]] = defaultdict(set)
+    for row in results["ads"]:
+        ad = row.ad_group_ad.ad
+        for url in list(ad.final_urls) + list(ad.final_mobile_urls):
+            used_by[canonical_url(url)].add(f"ad {ad.id}")
+    for level in SITELINK_URLS:
+        for row in results[level]:
+            for url in list(row.asset.final_urls) + list(row.asset.final_mobile_urls):
+                used_by[canonical_url(url)].add(f"sitelink {row.asset.id}")
+    return used_by
+
+
+class ConnectionPool:
+    """Keep-alive HTTP/1.1 connections over asyncio streams, at most `per_host` open per origin."""
+
+    def __init__(self, per_host: int = DEFAULT_PER_HOST, max_body: int = MAX_BODY_BYTES):
+        self._per_host = per_host
+        self._max_body = max_body
+        self._idle: Dict[Tuple[str, str, int], List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]] = defaultdict(list)
+        self._slots: Dict[Tuple[str, str, int], asyncio.Semaphore] = {}
+        self._ssl = ssl.create_default_context()
+
+    async def get(self, url: str, timeout: float) -> Tuple[int, Dict[str, str], int, float, float]:
+        """
+        (status, headers, body bytes, TTFB seconds, total seconds) for one GET, reusing an
+        idle connection when there is one. `timeout` and the timings start once a slot for
+        the host is free, so queueing behind other pages on the same host doesn't count.
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {url}")
+        origin = (scheme, parts.hostname or "", parts.port or (443 if scheme == "https" else 80))
+        target = urlunsplit(("", "", parts.path or "/", parts.query, ""))
+        host = parts.netloc.rsplit("@", 1)[-1]
+        request = (
+            f"GET {target} HTTP/1.1\r\nHost: {host}\r\nUser-Agent: {USER_AGENT}\r\n"
+            "Accept: text/html,application/xhtml+xml,*/*;q=0.8\r\nAccept-Encoding: gzip, deflate, br\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        ).encode("latin-1")
+        slots = self._slots.setdefault(origin, asyncio.Semaphore(self._per_host))
+        async with slots:
+            return await asyncio.wait_for(self._get(origin, scheme, request), timeout)
+
+    async def _get(self, origin: Tuple[str, str, int], scheme: str, request: bytes) -> Tuple[int, Dict[str, str], int, float, float]:
+        while self._idle[origin]:
+            reader, writer = self._idle[origin].pop()
+            try:
+                return await self._exchange(origin, reader, writer, request, time.perf_counter())
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()  # server dropped the idle connection; try the next or a fresh one
+            except BaseException:
+                writer.close()  # timed out or failed mid-exchange: never back in the pool
+                raise
+        started = time.perf_counter()
+        tls = scheme == "https"
+        reader, writer = await asyncio.open_connection(
+            origin[1], origin[2], ssl=self._ssl if tls else None, server_hostname=origin[1] if tls else None
+        )
+        try:
+            return await self._exchange(origin, reader, writer, request, started)
+        except BaseException:
+            writer.close()
+            raise
+
+    async def _exchange(
+        self,
+        origin: Tuple[str, str, int],
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        request: bytes,
+        started: float,
+    ) -> Tuple[int, Dict[str, str], int, float, float]:
+        """One request/response on an open connection; `started` includes connection setup when it was just opened."""
+        writer.write(request)
+        await writer.drain()
+        status_line = await reader.readline()
+        ttfb = time.perf_counter() - started
+        if not status_line:
+            raise ConnectionResetError("Connection closed before a response")
+        parts = status_line.split()
+        if len(parts) < 2 or not parts[1].isdigit():
+            raise ValueError(f"Malformed status line: {status_line[:80]!r}")
+        status = int(parts[1])
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        size, complete = await self._read_body(reader, status, headers)
+        if complete and headers.get("connection", "").lower() != "close":
+            self._idle[origin].append((reader, writer))
+        else:
+            writer.close()
+        return status, headers, size, ttfb, time.perf_counter() - started
+
+    async def _read_body(self, reader: asyncio.StreamReader, status: int, headers: Dict[str, str]) -> Tuple[int, bool]:
+        """(bytes read, whether the connection is positioned at the next response)."""
+        if status < 200 or status in (204, 304):
+            return 0, True
+        size = 0
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            while True:
+                chunk = int((await reader.readline()).split(b";")[0].strip() or b"0", 16)
+                if chunk == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    return size, True
+                size += chunk
+                if size > self._max_body:
+                    return size, False
+                await reader.readexactly(chunk + 2)
+        if "content-length" in headers:
+            length = int(headers["content-length"])
+            if length > self._max_body:
+                return length, False
+            await reader.readexactly(length)
+            return length, True
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                return size, False
+            size += len(data)
+            if size > self._max_body:
+                return size, False
+
+    def close(self) -> None:
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+
+async def check_page(pool: ConnectionPool, url: str, timeout: float) -> PageCheck:
+    """Fetch `url`, following redirects, and describe the final response."""
+    redirects: List[str] = []
+    total = 0.0
+    current = url
+    try:
+        for _ in range(REDIRECT_LIMIT + 1):
+            status, headers, size, ttfb, elapsed = await pool.get(current, timeout)
+            total += elapsed
+            if status in (301, 302, 303, 307, 308) and headers.get("location"):
+                current = urljoin(current, headers["location"])
+                redirects.append(current)
+                continue
+            return PageCheck(
+                url,
+                status,
+                redirects,
+                round(ttfb * 1000, 1),
+                round(total * 1000, 1),
+                size,
+                headers.get("content-type", ""),
+                "",
+            )
+        return PageCheck(url, None, redirects, None, None, None, "", f"More than {REDIRECT_LIMIT} redirects")
+    except asyncio.TimeoutError:
+        return PageCheck(url, None, redirects, None, None, None, "", f"Timed out after {timeout:g}s")
+    except Exception as ex:  # noqa: BLE001
+        # Whatever one page's server sends, the other pages' results still get reported
+        return PageCheck(url, None, redirects, None, None, None, "", f"{type(ex).__name__}: {ex}")
+
+
+async def check_pages(
+    urls: List[str], concurrency: int = DEFAULT_CONCURRENCY, per_host: int = DEFAULT_PER_HOST, timeout: float = DEFAULT_TIMEOUT
+) -> List[PageCheck]:
+    pool = ConnectionPool(per_host)
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one(url: str) -> PageCheck:
+        async with limit:
+            return await check_page(pool, url, timeout)
+
+    try:
+        return list(await asyncio.gather(*(one(url) for url in urls)))
+    finally:
+        pool.close()
+
+
+def problems(check: PageCheck, slow_ms: float, heavy_kb: float, max_redirects: int) -> List[str]:
+    if check.error:
+        return [check.error]
+    found = []
+    if check.status != 200:
+        found.append(f"status {check.status}")
+    if len(check.redirects) > max_redirects:
+        found.append(f"{len(check.redirects)} redirects")
+    if check.ttfb_ms is not None and check.ttfb_ms > slow_ms:
+        found.append(f"slow TTFB {check.ttfb_ms:.0f} ms")
+    if check.bytes is not None and check.bytes > heavy_kb * 1024:
+        found.append(f"heavy {check.bytes / 1024:.0f} KB")
+    return found
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Check the account's landing pages for status, redirects, TTFB and weight")
+    p.add_argument("--customer-id", default=None, help="Read final and sitelink URLs from this account")
+    p.add_argument("--config", default=None)
+    p.add_argument("--url", action="append", default=[], help="Also check this URL; repeatable")
+    p.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    p.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST, help="Connections per host")
+    p.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Seconds per request")
+    p.add_argument("--slow-ms", type=float, default=SLOW_TTFB_MS, help="Flag TTFB above this")
+    p.add_argument("--heavy-kb", type=float, default=HEAVY_KB, help="Flag pages heavier than this")
+    p.add_argument("--max-redirects", type=int, default=MAX_REDIRECTS, help="Flag longer redirect chains")
+    p.add_argument("--out", default=None, help="Also write results as CSV")
+    p.add_argument("--strict", action="store_true", help="Exit 3 when any page is flagged")
+    args = p.parse_args(argv)
+    if not args.customer_id and not args.url:
+        p.error("pass --customer-id and/or --url")
+
+    try:
+        used_by: Dict[str, Set[str]] = defaultdict(set)
+        if args.customer_id:
+            client = load_client(args.config)
+            used_by.update(collect_urls(client, args.customer_id))
+        for url in args.url:
+            used_by[canonical_url(url)].add("--url")
+
+        urls = sorted(used_by)
+        with ads_profile.phase("http"):
+            checks = asyncio.run(check_pages(urls, args.concurrency, args.per_host, args.timeout))
+
+        flagged = 0
+        print(f"Checked {len(checks)} distinct landing pages:\n")
+        for check in checks:
+            found = problems(check, args.slow_ms, args.heavy_kb, args.max_redirects)
+            flagged += bool(found)
+            mark = "FAIL" if found else "ok  "
+            timing = f"TTFB {check.ttfb_ms:>6.0f} ms  total {check.total_ms:>6.0f} ms  {check.bytes / 1024:>7.0f} KB" if check.status else ""
+            print(f"  {mark} {check.status or '---'}  {timing}  {check.url}")
+            for hop in check.redirects:
+                print(f"         -> {hop}")
+            if found:
+                print(f"         {'; '.join(found)} (used by {', '.join(sorted(used_by[check.url]))})")
+        print(f"\n{flagged} of {len(checks)} pages flagged.")
+
+        if args.out:
+            os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+            with open(args.out, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["url", "status", "redirects", "ttfb_ms", "total_ms", "bytes", "content_type", "problems", "used_by"])
+                for check in checks:
+                    writer.writerow(
+                        [
+                            check.url,
+                            check.status or "",
+                            " ".join(check.redirects),
+                            check.ttfb_ms if check.ttfb_ms is not None else "",
+                            check.total_ms if check.total_ms is not None else "",
+                            check.bytes if check.bytes is not None else "",
+                            check.content_type,
+                            "; ".join(problems(check, args.slow_ms, args.heavy_kb, args.max_redirects)),
+                            " ".join(sorted(used_by[check.url])),
+                        ]
+                    )
+        return 3 if args.strict and flagged else 0
+    except GoogleAdsException as ex:
+        print(f"GoogleAdsException: {ex}")
+        for e in ex.failure.errors:
+            print(f"  - {e.error_code}: {e.message}")
+        return 2
+    except Exception as ex:  # noqa: BLE001
+        print(f"Error: {ex}")
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(ads_profile.run(main))
@@ -22,6 +22,8 @@ from google.oauth2 import service_account
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 
+import ads_profile
+
 SCOPES = ["https://www.googleapis.com/auth/analytics.edit"]
 
 
@@ -65,6 +67,6 @@ def main(argv: Optional[list[str]] = None) -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(ads_profile.run(main))
 
 
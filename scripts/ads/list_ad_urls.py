@@ -4,66 +4,122 @@ List final URLs and key details for Responsive Search Ads in a campaign.
 
 Usage:
   python3 scripts/ads/list_ad_urls.py --customer-id 5072649468 --campaign-id 22917408924 --config google-ads.yaml
+
+  # Read the local account mirror (ads_mirror.py) after an incremental sync, or with no API calls at all
+  python3 scripts/ads/list_ad_urls.py --customer-id 5072649468 --mirror
+  python3 scripts/ads/list_ad_urls.py --customer-id 5072649468 --offline
 """
 
 from __future__ import annotations
 
 import argparse
-from typing import Optional
+import json
+import sqlite3
+from typing import List, Optional
 
 from google.ads.googleads.client import GoogleAdsClient
 
+from ads_client import load_client
+import ads_mirror
+import ads_profile
+import gaql
+
+
+RSA_URLS = (
+    gaql.Query("ad_group_ad")
+    .select(
+        "campaign.name",
+        "ad_group.name",
+        "ad_group_ad.status",
+        "ad_group_ad.ad.id",
+        "ad_group_ad.ad.final_urls",
+        "ad_group_ad.ad.responsive_search_ad.path1",
+        "ad_group_ad.ad.responsive_search_ad.path2",
+    )
+    .where("ad_group_ad.ad.type = RESPONSIVE_SEARCH_AD")
+    .where("ad_group_ad.status != REMOVED")
+    .order_by("campaign.name", "ad_group.name")
+)
+RSA_URLS_IN_CAMPAIGN = RSA_URLS.where("campaign.id = :campaign_id")
+
 
 def list_ad_urls(client: GoogleAdsClient, customer_id: str, campaign_id: Optional[str] = None) -> None:
-    where = "WHERE ad_group_ad.ad.type = RESPONSIVE_SEARCH_AD AND ad_group_ad.status != REMOVED"
-    if campaign_id:
-        where += f" AND campaign.id = {campaign_id}"
-
-    query = f"""
-      SELECT
-        campaign.id,
-        campaign.name,
-        ad_group.id,
-        ad_group.name,
-        ad_group_ad.status,
-        ad_group_ad.ad.id,
-        ad_group_ad.ad.final_urls,
-        ad_group_ad.ad.responsive_search_ad.path1,
-        ad_group_ad.ad.responsive_search_ad.path2
-      FROM ad_group_ad
-      {where}
-      ORDER BY campaign.name, ad_group.name
-    """
+    query = RSA_URLS_IN_CAMPAIGN.bind(campaign_id=int(campaign_id)) if campaign_id else RSA_URLS.bind()
 
     svc = client.get_service("GoogleAdsService")
     rows = svc.search(customer_id=customer_id, query=query)
 
     print("\nAds and Final URLs:\n")
     for row in rows:
-        urls = list(row.ad_group_ad.ad.final_urls) if row.ad_group_ad.ad.final_urls else []
-        path1 = row.ad_group_ad.ad.responsive_search_ad.path1 or ""
-        path2 = row.ad_group_ad.ad.responsive_search_ad.path2 or ""
-        print(
-            f"- {row.campaign.name} › {row.ad_group.name} | Ad {row.ad_group_ad.ad.id} | {row.ad_group_ad.status.name}\n"
-            f"  Final URLs: {', '.join(urls) if urls else '(none)'}\n"
-            f"  Display path: /{path1}/{path2}\n"
+        print_ad(
+            row.campaign.name,
+            row.ad_group.name,
+            row.ad_group_ad.ad.id,
+            row.ad_group_ad.status.name,
+            list(row.ad_group_ad.ad.final_urls) if row.ad_group_ad.ad.final_urls else [],
+            row.ad_group_ad.ad.responsive_search_ad.path1 or "",
+            row.ad_group_ad.ad.responsive_search_ad.path2 or "",
+        )
+
+
+def list_ad_urls_from_mirror(conn: sqlite3.Connection, customer_id: str, campaign_id: Optional[str] = None) -> None:
+    sql = """
+      SELECT c.name AS campaign_name, g.name AS ad_group_name, a.ad_id, a.status, a.final_urls, a.path1, a.path2
+      FROM ads a
+      JOIN campaigns c ON c.customer_id = a.customer_id AND c.campaign_id = a.campaign_id
+      JOIN ad_groups g ON g.customer_id = a.customer_id AND g.ad_group_id = a.ad_group_id
+      WHERE a.customer_id = ? AND a.type = 'RESPONSIVE_SEARCH_AD' AND a.status != 'REMOVED'
+    """
+    params: list = [customer_id]
+    if campaign_id:
+        sql += " AND a.campaign_id = ?"
+        params.append(int(campaign_id))
+    sql += " ORDER BY c.name, g.name"
+
+    print("\nAds and Final URLs:\n")
+    for row in conn.execute(sql, params):
+        print_ad(
+            row["campaign_name"],
+            row["ad_group_name"],
+            row["ad_id"],
+            row["status"],
+            json.loads(row["final_urls"]),
+            row["path1"] or "",
+            row["path2"] or "",
         )
 
 
+def print_ad(campaign: str, ad_group: str, ad_id: int, status: str, urls: List[str], path1: str, path2: str) -> None:
+    print(
+        f"- {campaign} › {ad_group} | Ad {ad_id} | {status}\n"
+        f"  Final URLs: {', '.join(urls) if urls else '(none)'}\n"
+        f"  Display path: /{path1}/{path2}\n"
+    )
+
+
 def main() -> int:
     p = argparse.ArgumentParser(description="List RSA final URLs for a campaign")
     p.add_argument("--customer-id", required=True)
     p.add_argument("--campaign-id", required=False)
     p.add_argument("--config", default="google-ads.yaml")
+    p.add_argument("--mirror", action="store_true", help="Sync the local account mirror, then read it")
+    p.add_argument("--offline", action="store_true", help="Read the local account mirror without calling the API")
+    p.add_argument("--db", default=ads_mirror.DEFAULT_DB)
     args = p.parse_args()
 
-    client = GoogleAdsClient.load_from_storage(path=args.config)
+    if args.mirror or args.offline:
+        client = None if args.offline else load_client(args.config)
+        conn = ads_mirror.open_for_tool(args.db, args.customer_id, client)
+        list_ad_urls_from_mirror(conn, args.customer_id, args.campaign_id)
+        return 0
+
+    client = load_client(args.config)
     list_ad_urls(client, args.customer_id, args.campaign_id)
     return 0
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(ads_profile.run(main))
 
 
 
@@ -1,74 +1,151 @@
 #!/usr/bin/env python3
 """
-List campaign assets (extensions) for a given campaign.
+List campaign assets (extensions) for a given campaign, or for every campaign when
+--campaign-id is omitted (one campaign_asset query over every campaign, grouped by
+campaign).
 
 Usage:
   python scripts/ads/list_campaign_assets.py --customer-id 5072649468 --campaign-id 22917408924 --config google-ads.yaml
+  python scripts/ads/list_campaign_assets.py --customer-id 5072649468
+
+  # From the local account mirror (ads_mirror.py): sync first, or no API calls at all
+  python scripts/ads/list_campaign_assets.py --customer-id 5072649468 --campaign-id 22917408924 --mirror
+  python scripts/ads/list_campaign_assets.py --customer-id 5072649468 --campaign-id 22917408924 --offline
 """
 
 import argparse
-from typing import Optional
-
-from google.ads.googleads.client import GoogleAdsClient
-
-
-def run_query(client: GoogleAdsClient, customer_id: str, query: str):
-    svc = client.get_service("GoogleAdsService")
-    return svc.search(customer_id=customer_id, query=query)
+import sqlite3
+from typing import Any, Dict, List, Optional
+
+from ads_client import load_client
+import ads_async
+import ads_mirror
+import ads_profile
+import gaql
+
+
+# Only the subtype fields asset_details() prints; each row carries one subtype anyway
+_CAMPAIGN_ASSETS = (
+    gaql.Query("campaign_asset")
+    .select(
+        "campaign.id",
+        "campaign.name",
+        "campaign_asset.field_type",
+        "campaign_asset.status",
+        "asset.id",
+        "asset.type",
+        "asset.sitelink_asset.link_text",
+        "asset.callout_asset.callout_text",
+        "asset.structured_snippet_asset.header",
+        "asset.price_asset.type",
+        "asset.promotion_asset.promotion_target",
+    )
+    .order_by("campaign.id", "campaign_asset.field_type")
+)
+CAMPAIGN_ASSETS = _CAMPAIGN_ASSETS.where("campaign.id = :campaign_id")
+ALL_CAMPAIGN_ASSETS = _CAMPAIGN_ASSETS.where("campaign.status != REMOVED")
+
+
+def asset_details(
+    asset_type: str,
+    sitelink_text: str,
+    callout_text: str,
+    snippet_header: str,
+    price_type: str,
+    promotion_target: str,
+) -> List[str]:
+    if asset_type == "SITELINK":
+        return [f"text='{sitelink_text}'"]
+    if asset_type == "CALLOUT":
+        return [f"text='{callout_text}'"]
+    if asset_type == "STRUCTURED_SNIPPET":
+        return [f"header={snippet_header}"]
+    if asset_type == "PRICE":
+        return [f"price_type={price_type}"]
+    if asset_type == "PROMOTION":
+        return [f"promo='{promotion_target}'"]
+    return []
+
+
+def print_asset(campaign_name: str, field_type: str, status: str, asset_id: int, asset_type: str, details: List[str]) -> None:
+    print(f"- {campaign_name} | {field_type} | {status} | asset_id={asset_id} | {asset_type} " + ("| " + ", ".join(details) if details else ""))
+
+
+def list_assets_from_mirror(conn: sqlite3.Connection, customer_id: str, campaign_id: Optional[str]) -> None:
+    rows = conn.execute(
+        """
+        SELECT ca.campaign_id, c.name AS campaign_name, ca.field_type, ca.status, a.asset_id, a.type, a.sitelink_text,
+               a.callout_text, a.snippet_header, a.price_type, a.promotion_target
+        FROM campaign_assets ca
+        JOIN campaigns c ON c.customer_id = ca.customer_id AND c.campaign_id = ca.campaign_id
+        JOIN assets a ON a.customer_id = ca.customer_id AND a.asset_id = ca.asset_id
+        WHERE ca.customer_id = ? AND (? IS NULL OR ca.campaign_id = ?)
+        ORDER BY ca.campaign_id, ca.field_type
+        """,
+        (customer_id, campaign_id, int(campaign_id) if campaign_id else None),
+    )
+    current = None
+    for row in rows:
+        if row["campaign_id"] != current:
+            current = row["campaign_id"]
+            print("Campaign assets for", current)
+        details = asset_details(
+            row["type"], row["sitelink_text"], row["callout_text"], row["snippet_header"], row["price_type"], row["promotion_target"]
+        )
+        print_asset(row["campaign_name"], row["field_type"], row["status"], row["asset_id"], row["type"], details)
+
+
+def print_row(row: Any) -> None:
+    ca = row.campaign_asset
+    asset = row.asset
+    header = asset.structured_snippet_asset.header
+    details = asset_details(
+        asset.type_.name,
+        asset.sitelink_asset.link_text,
+        asset.callout_asset.callout_text,
+        header if isinstance(header, str) else header.name,
+        asset.price_asset.type_.name,
+        asset.promotion_asset.promotion_target,
+    )
+    print_asset(row.campaign.name, ca.field_type.name, ca.status.name, asset.id, asset.type_.name, details)
 
 
 def main(argv: Optional[list[str]] = None) -> int:
     p = argparse.ArgumentParser(description="List campaign assets")
     p.add_argument("--customer-id", required=True)
-    p.add_argument("--campaign-id", required=True)
+    p.add_argument("--campaign-id", help="Omit to list every non-removed campaign")
     p.add_argument("--config", default="google-ads.yaml")
+    p.add_argument("--mirror", action="store_true", help="Sync the local account mirror, then read it")
+    p.add_argument("--offline", action="store_true", help="Read the local account mirror without calling the API")
+    p.add_argument("--db", default=ads_mirror.DEFAULT_DB)
     args = p.parse_args(argv)
 
-    client = GoogleAdsClient.load_from_storage(path=args.config)
+    if args.mirror or args.offline:
+        client = None if args.offline else load_client(args.config)
+        conn = ads_mirror.open_for_tool(args.db, args.customer_id, client)
+        list_assets_from_mirror(conn, args.customer_id, args.campaign_id)
+        return 0
 
-    query = f"""
-      SELECT
-        campaign.name,
-        campaign.id,
-        campaign_asset.field_type,
-        campaign_asset.status,
-        asset.id,
-        asset.type,
-        asset.sitelink_asset.link_text,
-        asset.callout_asset.callout_text,
-        asset.structured_snippet_asset.header,
-        asset.structured_snippet_asset.values,
-        asset.price_asset.type,
-        asset.promotion_asset.promotion_target
-      FROM campaign_asset
-      WHERE campaign.id = {args.campaign_id}
-      ORDER BY campaign_asset.field_type
-    """
-
-    rows = run_query(client, args.customer_id, query)
-    print("Campaign assets for", args.campaign_id)
-    for row in rows:
-        ca = row.campaign_asset
-        asset = row.asset
-        details = []
-        if asset.type_.name == "SITELINK":
-            details.append(f"text='{asset.sitelink_asset.link_text}'")
-        elif asset.type_.name == "CALLOUT":
-            details.append(f"text='{asset.callout_asset.callout_text}'")
-        elif asset.type_.name == "STRUCTURED_SNIPPET":
-            header = row.asset.structured_snippet_asset.header
-            details.append(f"header={header if isinstance(header, str) else header.name}")
-        elif asset.type_.name == "PRICE":
-            details.append(f"price_type={row.asset.price_asset.type_.name}")
-        elif asset.type_.name == "PROMOTION":
-            details.append(f"promo='{row.asset.promotion_asset.promotion_target}'")
-
-        print(f"- {row.campaign.name} | {ca.field_type.name} | {ca.status.name} | asset_id={asset.id} | {asset.type_.name} " + ("| " + ", ".join(details) if details else ""))
+    client = load_client(args.config)
+
+    if args.campaign_id:
+        query = CAMPAIGN_ASSETS.bind(campaign_id=int(args.campaign_id))
+    else:
+        query = ALL_CAMPAIGN_ASSETS.bind()
+    # One query for every campaign, grouped here; rows arrive ordered by campaign
+    by_campaign: Dict[str, List[Any]] = {}
+    for row in ads_async.fetch(client, args.customer_id, query):
+        by_campaign.setdefault(str(row.campaign.id), []).append(row)
+
+    for campaign_id, rows in by_campaign.items():
+        print("Campaign assets for", campaign_id)
+        for row in rows:
+            print_row(row)
 
     return 0
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(ads_profile.run(main))
 
 
@@ -8,40 +8,48 @@ Usage:
     --campaign-id 22917408924 \
     --base-url https://houstonmobilenotarypros.com \
     --config google-ads.yaml
+
+  # Have the API check the swap without applying it
+  python scripts/ads/replace_sitelinks.py --customer-id 5072649468 --campaign-id 22917408924 \
+    --base-url https://houstonmobilenotarypros.com --validate-only
+
+The swap is a single GoogleAdsService.mutate request: new sitelink assets are created
+under temporary resource names (customers/<id>/assets/-1, -2, ...), linked to the
+campaign by those names, and links to sitelinks no longer wanted are removed, all
+committed together. The campaign never serves without sitelinks, and a failure leaves
+it as it was. Sitelink assets whose content already exists in the account
+(asset_index.py) are linked again instead of created, and links that are already in
+place are kept rather than removed and recreated.
 """
 
 import argparse
-from typing import List
+from typing import Dict, List
 
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
 
+from ads_client import load_client
+import ads_profile
+import asset_index
+import gaql
+
+
+CAMPAIGN_SITELINKS = (
+    gaql.Query("campaign_asset")
+    .select("campaign_asset.resource_name", "campaign_asset.asset")
+    .where("campaign.id = :campaign_id")
+    .where("campaign_asset.field_type = SITELINK")
+    .where("campaign_asset.status != REMOVED")
+)
+
 
 def run_query(client: GoogleAdsClient, customer_id: str, query: str):
     return client.get_service("GoogleAdsService").search(customer_id=customer_id, query=query)
 
 
-def remove_existing_campaign_sitelinks(client: GoogleAdsClient, customer_id: str, campaign_id: str) -> None:
-    q = f"""
-      SELECT campaign.id, campaign_asset.resource_name, campaign_asset.field_type
-      FROM campaign_asset
-      WHERE campaign.id = {campaign_id} AND campaign_asset.field_type = SITELINK
-    """
-    cas = [row.campaign_asset.resource_name for row in run_query(client, customer_id, q)]
-    if not cas:
-        return
-    svc = client.get_service("CampaignAssetService")
-    ops = []
-    for rn in cas:
-        op = client.get_type("CampaignAssetOperation")
-        op.remove = rn
-        ops.append(op)
-    svc.mutate_campaign_assets(customer_id=customer_id, operations=ops)
-
-
-def add_sitelinks(client: GoogleAdsClient, customer_id: str, campaign_id: str, base_url: str) -> None:
+def desired_sitelinks(base_url: str) -> List[Dict[str, str]]:
     # Short texts that meet length limits
-    items = [
+    return [
         {"text": "Book Mobile Notary", "url": f"{base_url}/booking/enhanced"},
         {"text": "Start Online Notary", "url": f"{base_url}/ron/dashboard"},
         {"text": "Pricing & Fees", "url": f"{base_url}/pricing"},
@@ -50,28 +58,69 @@ def add_sitelinks(client: GoogleAdsClient, customer_id: str, campaign_id: str, b
         {"text": "Contact / Help", "url": f"{base_url}/contact"},
     ]
 
-    asset_svc = client.get_service("AssetService")
-    ops = []
-    for it in items:
-        op = client.get_type("AssetOperation")
-        asset = op.create
+
+def swap_sitelinks(
+    client: GoogleAdsClient,
+    customer_id: str,
+    campaign_id: str,
+    base_url: str,
+    index: asset_index.AssetIndex,
+    validate_only: bool = False,
+) -> Dict[str, int]:
+    """Make the campaign's sitelinks exactly desired_sitelinks() in one atomic mutate. Returns counts per operation."""
+    ga = client.get_service("GoogleAdsService")
+    campaign_path = ga.campaign_path(customer_id, campaign_id)
+    linked = {
+        row.campaign_asset.asset: row.campaign_asset.resource_name
+        for row in run_query(client, customer_id, CAMPAIGN_SITELINKS.bind(campaign_id=int(campaign_id)))
+    }
+
+    asset_ops: List[object] = []
+    link_ops: List[object] = []
+    created: List[object] = []  # Asset messages, in the order of asset_ops
+    wanted: List[str] = []
+    for it in desired_sitelinks(base_url):
+        op = client.get_type("MutateOperation")
+        asset = op.asset_operation.create
         asset.sitelink_asset.link_text = it["text"]
         asset.final_urls.append(it["url"])  # type: ignore[attr-defined]
-        ops.append(op)
-    resp = asset_svc.mutate_assets(customer_id=customer_id, operations=ops)
-    asset_rns = [r.resource_name for r in resp.results]
-
-    ca_svc = client.get_service("CampaignAssetService")
-    ca_ops = []
-    campaign_path = client.get_service("GoogleAdsService").campaign_path(customer_id, campaign_id)
-    for rn in asset_rns:
-        op = client.get_type("CampaignAssetOperation")
-        ca = op.create
-        ca.asset = rn
+        asset_rn = index.lookup("SITELINK", asset)
+        if not asset_rn:
+            # Temporary IDs are negative and only mean something inside this request
+            asset_rn = ga.asset_path(customer_id, str(-(len(asset_ops) + 1)))
+            asset.resource_name = asset_rn
+            asset_ops.append(op)
+            created.append(asset)
+        if asset_rn in wanted:
+            continue
+        wanted.append(asset_rn)
+        if asset_rn in linked:
+            continue
+        link_op = client.get_type("MutateOperation")
+        ca = link_op.campaign_asset_operation.create
+        ca.asset = asset_rn
         ca.field_type = client.enums.AssetFieldTypeEnum.SITELINK
         ca.campaign = campaign_path
-        ca_ops.append(op)
-    ca_svc.mutate_campaign_assets(customer_id=customer_id, operations=ca_ops)
+        link_ops.append(link_op)
+
+    remove_ops: List[object] = []
+    for asset_rn, link_rn in linked.items():
+        if asset_rn not in wanted:
+            op = client.get_type("MutateOperation")
+            op.campaign_asset_operation.remove = link_rn
+            remove_ops.append(op)
+
+    counts = {"assets_created": len(asset_ops), "linked": len(link_ops), "unlinked": len(remove_ops), "kept": len(wanted) - len(link_ops)}
+    # Assets before the links that reference them by temporary name
+    operations = asset_ops + link_ops + remove_ops
+    if not operations:
+        return counts
+    with ads_profile.phase("write"):
+        response = ga.mutate(customer_id=customer_id, mutate_operations=operations, validate_only=validate_only)
+    if not validate_only:
+        for asset, result in zip(created, response.mutate_operation_responses):
+            index.record("SITELINK", asset, result.asset_result.resource_name)
+    return counts
 
 
 def main():
@@ -80,13 +129,17 @@ def main():
     p.add_argument("--campaign-id", required=True)
     p.add_argument("--base-url", required=True)
     p.add_argument("--config", default="google-ads.yaml")
+    p.add_argument("--asset-index", default=asset_index.DEFAULT_DB, help="Local asset index (SQLite)")
+    p.add_argument("--rebuild-index", action="store_true", help="Re-read every asset into the index")
+    p.add_argument("--validate-only", action="store_true", help="Have the API validate the swap without applying it")
     args = p.parse_args()
 
-    client = GoogleAdsClient.load_from_storage(path=args.config)
+    client = load_client(args.config)
     try:
-        remove_existing_campaign_sitelinks(client, args.customer_id, args.campaign_id)
-        add_sitelinks(client, args.customer_id, args.campaign_id, args.base_url)
-        print("Sitelinks replaced for campaign", args.campaign_id)
+        index = asset_index.open_index(client, args.customer_id, args.asset_index, args.rebuild_index)
+        counts = swap_sitelinks(client, args.customer_id, args.campaign_id, args.base_url, index, args.validate_only)
+        verb = "validated" if args.validate_only else "replaced"
+        print(f"Sitelinks {verb} for campaign {args.campaign_id}: " + ", ".join(f"{k}={v}" for k, v in counts.items()))
     except GoogleAdsException as ex:
         print("GoogleAdsException:", ex)
         for e in ex.failure.errors:
@@ -95,6 +148,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
-
-
+    ads_profile.run(main)
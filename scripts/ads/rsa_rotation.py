@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Rank RSA headlines and descriptions by performance and rotate out the underperformers.
+
+create_rsa in houston_mobile_notary_campaign.py and add_new_rsa_with_url.py, and
+apply_fixes.add_second_rsa_if_needed, write fixed copy that never changes afterwards.
+This reads ad_group_ad_asset_view (performance label plus impressions, clicks and
+conversions per served headline/description, per ad) for enabled Search RSAs and
+pools it by text across all ads, so copy used in several ads is judged on all of it.
+
+Each text is scored in one pass over the pooled columns:
+
+  score = CTR index x conversion-rate index x label weight
+
+with CTR shrunk toward its field's average by PRIOR_IMPRESSIONS and conversion rate by
+PRIOR_CLICKS, so thin data scores near 1.0, and the label weight the impression-weighted
+mean of BEST 1.2 / GOOD 1.0 / LOW 0.7 (learning and pending count as 1.0). A text with at
+least --min-impressions is an underperformer when it is labelled LOW or scores under
+--min-score.
+
+Every ad carrying an underperformer gets a replacement RSA: same final URL and paths,
+its other assets kept (with their pins), and each underperformer swapped for the best
+text not already in the ad, first copy proven in other ads, then untested candidates
+(houston_mobile_notary_campaign.RSA_ASSETS and --candidates). Ad text can't be edited
+without resetting the ad's history, so the old ad is paused and the replacement created,
+in the same request (pause first, so an ad group at its enabled-RSA limit has room); all
+swaps go in batched AdGroupAdService mutates where each pair commits together. Weak copy
+with no replacement left is dropped only while the ad keeps the minimum 3 headlines and
+2 descriptions.
+
+Usage:
+  python3 scripts/ads/rsa_rotation.py --customer-id 5072649468 --dry-run
+  python3 scripts/ads/rsa_rotation.py --customer-id 5072649468 --campaign-id 22917408924 --days 60 \
+    --candidates scripts/ads/rsa_candidates.json --out scripts/ads/exports/rsa-rotation.json
+
+  --candidates is JSON: {"headlines": [...], "descriptions": [...]}
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from google.ads.googleads.client import GoogleAdsClient
+from google.ads.googleads.errors import GoogleAdsException
+from google.protobuf.field_mask_pb2 import FieldMask
+
+from ads_client import load_client
+import ads_async
+import ads_profile
+import gaql
+import houston_mobile_notary_campaign as houston
+
+
+DEFAULT_DAYS = 30
+MIN_IMPRESSIONS = 500
+MIN_SCORE = 0.8
+PRIOR_IMPRESSIONS = 200
+PRIOR_CLICKS = 20
+LABEL_WEIGHTS = {"BEST": 1.2, "GOOD": 1.0, "LOW": 0.7}
+MAX_OPERATIONS = 1000  # per mutate; swaps are two operations and never split across requests
+
+# field type -> (max characters, min assets, max assets)
+FIELDS = {"HEADLINE": (30, 3, 15), "DESCRIPTION": (90, 2, 4)}
+
+ASSET_PERFORMANCE = (
+    gaql.Query("ad_group_ad_asset_view")
+    .select(
+        "ad_group_ad_asset_view.ad_group_ad",
+        "ad_group_ad_asset_view.field_type",
+        "ad_group_ad_asset_view.performance_label",
+        "asset.text_asset.text",
+        "metrics.impressions",
+        "metrics.clicks",
+        "metrics.conversions",
+    )
+    .where("ad_group_ad_asset_view.field_type IN (HEADLINE, DESCRIPTION)")
+    .where("ad_group_ad_asset_view.enabled = TRUE")
+    .where("ad_group_ad.status = ENABLED")
+    .where("campaign.status = ENABLED")
+    .where("campaign.advertising_channel_type = SEARCH")
+    .where("segments.date BETWEEN :first AND :last")
+)
+ENABLED_RSAS = (
+    gaql.Query("ad_group_ad")
+    .select(
+        "ad_group_ad.resource_name",
+        "ad_group_ad.ad_group",
+        *gaql.fields("ad_group_ad.ad", "final_urls"),
+        *gaql.fields("ad_group_ad.ad.responsive_search_ad", "headlines descriptions path1 path2"),
+    )
+    .where("ad_group_ad.ad.type = RESPONSIVE_SEARCH_AD")
+    .where("ad_group_ad.status = ENABLED")
+    .where("campaign.status = ENABLED")
+    .where("campaign.advertising_channel_type = SEARCH")
+)
+
+
+class AssetScore(NamedTuple):
+    field_type: str
+    text: str
+    ads: int
+    impressions: int
+    clicks: int
+    conversions: float
+    label: str  # most common label, by impressions
+    score: float
+    underperforming: bool
+
+
+class Rsa(NamedTuple):
+    resource_name: str
+    ad_group: str
+    final_urls: List[str]
+    path1: str
+    path2: str
+    assets: Dict[str, List[Tuple[str, Optional[str]]]]  # field type -> [(text, pinned field name or None)]
+
+
+def _key(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def pool_by_text(rows: Iterable[Any]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """(field type, normalized text) -> summed metrics, ads served in and impressions per label."""
+    pooled: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for row in rows:
+        view = row.ad_group_ad_asset_view
+        field_type = view.field_type.name
+        text = row.asset.text_asset.text
+        p = pooled.setdefault(
+            (field_type, _key(text)),
+            {"text": text, "ads": set(), "impressions": 0, "clicks": 0, "conversions": 0.0, "labels": defaultdict(int)},
+        )
+        p["ads"].add(view.ad_group_ad)
+        p["impressions"] += row.metrics.impressions
+        p["clicks"] += row.metrics.clicks
+        p["conversions"] += row.metrics.conversions
+        p["labels"][view.performance_label.name] += row.metrics.impressions
+    return pooled
+
+
+def score_assets(
+    pooled: Dict[Tuple[str, str], Dict[str, Any]],
+    min_impressions: int = MIN_IMPRESSIONS,
+    min_score: float = MIN_SCORE,
+) -> Dict[Tuple[str, str], AssetScore]:
+    """Score every pooled text against the averages of its field type, column by column."""
+    scores: Dict[Tuple[str, str], AssetScore] = {}
+    for field_type in FIELDS:
+        keys = [k for k in pooled if k[0] == field_type]
+        if not keys:
+            continue
+        impressions = [pooled[k]["impressions"] for k in keys]
+        clicks = [pooled[k]["clicks"] for k in keys]
+        conversions = [pooled[k]["conversions"] for k in keys]
+        ctr = sum(clicks) / sum(impressions) if sum(impressions) else 0.0
+        cvr = sum(conversions) / sum(clicks) if sum(clicks) else 0.0
+        ctr_index = [
+            ((c + PRIOR_IMPRESSIONS * ctr) / (i + PRIOR_IMPRESSIONS)) / ctr if ctr else 1.0 for i, c in zip(impressions, clicks)
+        ]
+        cvr_index = [((v + PRIOR_CLICKS * cvr) / (c + PRIOR_CLICKS)) / cvr if cvr else 1.0 for c, v in zip(clicks, conversions)]
+        label_weight = []
+        labels = []
+        for k in keys:
+            served = pooled[k]["labels"]
+            total = sum(served.values())
+            labels.append(max(served, key=served.get) if served else "UNKNOWN")
+            label_weight.append(
+                sum(LABEL_WEIGHTS.get(label, 1.0) * n for label, n in served.items()) / total if total else 1.0
+            )
+        for k, i, c, v, a, b, w, label in zip(keys, impressions, clicks, conversions, ctr_index, cvr_index, label_weight, labels):
+            score = a * b * w
+            scores[k] = AssetScore(
+                field_type,
+                pooled[k]["text"],
+                len(pooled[k]["ads"]),
+                i,
+                c,
+                round(v, 2),
+                label,
+                round(score, 3),
+                i >= min_impressions and (label == "LOW" or score < min_score),
+            )
+    return scores
+
+
+def load_rsas(rows: Iterable[Any]) -> List[Rsa]:
+    rsas = []
+    for row in rows:
+        aga = row.ad_group_ad
+        ad = aga.ad
+        assets: Dict[str, List[Tuple[str, Optional[str]]]] = {"HEADLINE": [], "DESCRIPTION": []}
+        for field_type, items in (("HEADLINE", ad.responsive_search_ad.headlines), ("DESCRIPTION", ad.responsive_search_ad.descriptions)):
+            for item in items:
+                pinned = item.pinned_field.name if item.pinned_field.name not in ("UNSPECIFIED", "UNKNOWN") else None
+                assets[field_type].append((item.text, pinned))
+        rsas.append(
+            Rsa(
+                aga.resource_name,
+                aga.ad_group,
+                list(ad.final_urls),
+                ad.responsive_search_ad.path1,
+                ad.responsive_search_ad.path2,
+                assets,
+            )
+        )
+    return rsas
+
+
+def replacement_pool(
+    scores: Dict[Tuple[str, str], AssetScore],
+    candidates: Dict[str, List[str]],
+    field_type: str,
+    min_impressions: int = MIN_IMPRESSIONS,
+) -> List[str]:
+    """Texts to swap in, best first: proven copy by score, then candidates never served."""
+    max_chars = FIELDS[field_type][0]
+    proven = sorted(
+        (s for (f, _), s in scores.items() if f == field_type and not s.underperforming and s.impressions >= min_impressions),
+        key=lambda s: s.score,
+        reverse=True,
+    )
+    pool = [s.text for s in proven if s.score >= 1.0]
+    pool += [t for t in candidates.get(field_type, []) if (field_type, _key(t)) not in scores]
+    seen = set()
+    ordered = []
+    for text in pool:
+        if len(text) <= max_chars and _key(text) not in seen:
+            seen.add(_key(text))
+            ordered.append(text)
+    return ordered
+
+
+def _underperforming(scores: Dict[Tuple[str, str], AssetScore], field_type: str, text: str) -> bool:
+    score = scores.get((field_type, _key(text)))
+    return bool(score and score.underperforming)
+
+
+def plan_rotation(
+    rsas: List[Rsa],
+    scores: Dict[Tuple[str, str], AssetScore],
+    candidates: Dict[str, List[str]],
+    min_impressions: int = MIN_IMPRESSIONS,
+) -> List[Tuple[Rsa, Dict[str, List[Tuple[str, Optional[str]]]], List[str]]]:
+    """(ad, replacement assets by field type, texts dropped) for each ad worth rotating."""
+    pools = {field_type: replacement_pool(scores, candidates, field_type, min_impressions) for field_type in FIELDS}
+    plans = []
+    for rsa in rsas:
+        new_assets: Dict[str, List[Tuple[str, Optional[str]]]] = {}
+        dropped: List[str] = []
+        for field_type, (_, min_assets, max_assets) in FIELDS.items():
+            current = rsa.assets[field_type]
+            in_ad = {_key(text) for text, _ in current}
+            weak = [(text, pin) for text, pin in current if _underperforming(scores, field_type, text)]
+            kept = [(text, pin) for text, pin in current if not _underperforming(scores, field_type, text)]
+            fresh = [text for text in pools[field_type] if _key(text) not in in_ad]
+            swapped = []
+            for text, pin in weak:
+                if fresh:
+                    kept.append((fresh.pop(0), pin))
+                    swapped.append(text)
+                elif len(kept) < min_assets:
+                    kept.append((text, pin))
+                else:
+                    swapped.append(text)
+            new_assets[field_type] = kept[:max_assets]
+            dropped += swapped
+        if dropped:
+            plans.append((rsa, new_assets, dropped))
+    return plans
+
+
+def _swap_operations(client: GoogleAdsClient, rsa: Rsa, assets: Dict[str, List[Tuple[str, Optional[str]]]]) -> List[object]:
+    """[pause the original, create the replacement]: pausing first frees the ad group's enabled-RSA slot."""
+    pause = client.get_type("AdGroupAdOperation")
+    pause.update.resource_name = rsa.resource_name
+    pause.update.status = client.enums.AdGroupAdStatusEnum.PAUSED
+    pause.update_mask.CopyFrom(FieldMask(paths=["status"]))
+
+    create = client.get_type("AdGroupAdOperation")
+    aga = create.create
+    aga.ad_group = rsa.ad_group
+    aga.status = client.enums.AdGroupAdStatusEnum.ENABLED
+    ad = aga.ad
+    ad.final_urls.extend(rsa.final_urls)
+    ad.responsive_search_ad.path1 = rsa.path1
+    ad.responsive_search_ad.path2 = rsa.path2
+    for field_type, target in (("HEADLINE", ad.responsive_search_ad.headlines), ("DESCRIPTION", ad.responsive_search_ad.descriptions)):
+        for text, pinned in assets[field_type]:
+            asset = client.get_type("AdTextAsset")
+            asset.text = text
+            if pinned:
+                asset.pinned_field = getattr(client.enums.ServedAssetFieldTypeEnum, pinned)
+            target.append(asset)
+    return [pause, create]
+
+
+def apply_rotation(client: GoogleAdsClient, customer_id: str, plans: List[Tuple[Rsa, Dict[str, Any], List[str]]]) -> List[str]:
+    """Pause each original and create its replacement, batched; returns the new ads' resource names."""
+    svc = client.get_service("AdGroupAdService")
+    created: List[str] = []
+    per_request = MAX_OPERATIONS // 2
+    for start in range(0, len(plans), per_request):
+        operations: List[object] = []
+        for rsa, assets, _ in plans[start : start + per_request]:
+            operations.extend(_swap_operations(client, rsa, assets))
+        response = svc.mutate_ad_group_ads(customer_id=customer_id, operations=operations)
+        created.extend(r.resource_name for r in response.results[1::2])
+    return created
+
+
+def print_report(scores: Dict[Tuple[str, str], AssetScore], plans: List[Tuple[Rsa, Dict[str, Any], List[str]]]) -> None:
+    for field_type in FIELDS:
+        ranked = sorted((s for s in scores.values() if s.field_type == field_type), key=lambda s: s.score, reverse=True)
+        print(f"{field_type.title()}s ({len(ranked)}):")
+        for s in ranked:
+            flag = "  <- rotate out" if s.underperforming else ""
+            print(
+                f"  {s.score:5.2f}  {s.label:<8} impr {s.impressions:>7} clk {s.clicks:>5} conv {s.conversions:>6g} "
+                f"ads {s.ads:>2}  {s.text}{flag}"
+            )
+    print(f"\nAds to rotate: {len(plans)}")
+    for rsa, assets, dropped in plans:
+        old = {_key(t) for f in FIELDS for t, _ in rsa.assets[f]}
+        added = [t for f in FIELDS for t, _ in assets[f] if _key(t) not in old]
+        print(f"  {rsa.resource_name}")
+        print(f"    - {'; '.join(dropped)}")
+        print(f"    + {'; '.join(added) or '(none; weak copy dropped)'}")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Rank RSA assets and replace ads carrying underperforming copy")
+    p.add_argument("--customer-id", required=True)
+    p.add_argument("--campaign-id", type=int, default=None, help="Limit to one campaign (default: all enabled Search)")
+    p.add_argument("--config", default=None)
+    p.add_argument("--days", type=int, default=DEFAULT_DAYS, help="History to rank on, ending yesterday")
+    p.add_argument("--min-impressions", type=int, default=MIN_IMPRESSIONS, help="Impressions before a text can be rotated out, or swapped in as proven copy")
+    p.add_argument("--min-score", type=float, default=MIN_SCORE)
+    p.add_argument("--candidates", default=None, help='JSON {"headlines": [...], "descriptions": [...]} of untested copy')
+    p.add_argument("--out", default=None, help="Also write the ranking and plan as JSON")
+    p.add_argument("--dry-run", action="store_true", help="Report only; create and pause nothing")
+    args = p.parse_args(argv)
+
+    try:
+        candidates = {"HEADLINE": list(houston.RSA_ASSETS["headlines"]), "DESCRIPTION": list(houston.RSA_ASSETS["descriptions"])}
+        if args.candidates:
+            with open(args.candidates, encoding="utf-8") as f:
+                extra = json.load(f)
+            candidates["HEADLINE"] = extra.get("headlines", []) + candidates["HEADLINE"]
+            candidates["DESCRIPTION"] = extra.get("descriptions", []) + candidates["DESCRIPTION"]
+
+        client = load_client(args.config)
+        last = date.today() - timedelta(days=1)
+        performance, ads = ASSET_PERFORMANCE, ENABLED_RSAS
+        params: Dict[str, Any] = {}
+        if args.campaign_id:
+            performance = performance.where("campaign.id = :campaign_id")
+            ads = ads.where("campaign.id = :campaign_id")
+            params["campaign_id"] = args.campaign_id
+        results = ads_async.fetch_all(
+            client,
+            args.customer_id,
+            {
+                "assets": performance.bind(first=last - timedelta(days=args.days - 1), last=last, **params),
+                "ads": ads.bind(**params),
+            },
+        )
+        scores = score_assets(pool_by_text(results["assets"]), args.min_impressions, args.min_score)
+        plans = plan_rotation(load_rsas(results["ads"]), scores, candidates, args.min_impressions)
+        print_report(scores, plans)
+
+        if args.out:
+            os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "assets": [s._asdict() for s in sorted(scores.values(), key=lambda s: (s.field_type, -s.score))],
+                        "rotations": [
+                            {"ad_group_ad": rsa.resource_name, "dropped": dropped, "assets": assets} for rsa, assets, dropped in plans
+                        ],
+                    },
+                    f,
+                    indent=2,
+                )
+        if args.dry_run or not plans:
+            if args.dry_run:
+                print("Dry-run: no ads created or paused.")
+            return 0
+        with ads_profile.phase("write"):
+            created = apply_rotation(client, args.customer_id, plans)
+        print(f"Created {len(created)} replacement RSAs and paused their originals.")
+        return 0
+    except GoogleAdsException as ex:
+        print(f"GoogleAdsException: {ex}")
+        for e in ex.failure.errors:
+            print(f"  - {e.error_code}: {e.message}")
+        return 2
+    except Exception as ex:  # noqa: BLE001
+        print(f"Error: {ex}")
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(ads_profile.run(main))
@@ -28,6 +28,7 @@ from typing import Optional
 
 # Import campaign creation from existing script
 sys.path.insert(0, os.path.dirname(__file__))
+import ads_profile  # noqa: E402
 from houston_mobile_notary_campaign import (
     load_client,
     upsert_campaign,
@@ -275,5 +276,5 @@ def main(argv: Optional[list[str]] = None) -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(ads_profile.run(main))
 
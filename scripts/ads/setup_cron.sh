@@ -14,9 +14,21 @@ PROJECT_DIR="$(dirname "$SCRIPT_DIR")"
 (crontab -l 2>/dev/null; echo "# Google Ads Weekly Summary - runs every Monday at 9:00 AM UTC") | crontab -
 (crontab -l 2>/dev/null; echo "0 9 * * 1 cd $PROJECT_DIR && source .venv/bin/activate && python3 scripts/ads/weekly_summary.py --customer-id 5072649468 --config google-ads.yaml >> logs/ads-weekly.log 2>&1") | crontab -
 
+(crontab -l 2>/dev/null; echo "# Google Ads change history - runs every day at 5:30 AM UTC (change_event keeps 30 days)") | crontab -
+(crontab -l 2>/dev/null; echo "30 5 * * * cd $PROJECT_DIR && source .venv/bin/activate && python3 scripts/ads/change_history.py sync --customer-id 5072649468 --config google-ads.yaml >> logs/ads-changes.log 2>&1") | crontab -
+
+(crontab -l 2>/dev/null; echo "# Google Ads budget pacing report - runs hourly at :20 (remove --dry-run to apply budget changes)") | crontab -
+(crontab -l 2>/dev/null; echo "20 * * * * cd $PROJECT_DIR && source .venv/bin/activate && python3 scripts/ads/budget_pacing.py --customer-id 5072649468 --config google-ads.yaml --dry-run --report scripts/ads/exports/pacing.csv >> logs/ads-pacing.log 2>&1") | crontab -
+
+(crontab -l 2>/dev/null; echo "# Google Ads RSA rotation report - runs every Monday at 7:00 AM UTC (remove --dry-run to swap underperforming copy)") | crontab -
+(crontab -l 2>/dev/null; echo "0 7 * * 1 cd $PROJECT_DIR && source .venv/bin/activate && python3 scripts/ads/rsa_rotation.py --customer-id 5072649468 --config google-ads.yaml --dry-run --out scripts/ads/exports/rsa-rotation.json >> logs/ads-rsa.log 2>&1") | crontab -
+
 echo "✅ Cron jobs added:"
 echo "   - Daily export: 6:00 AM UTC daily"
 echo "   - Weekly summary: 9:00 AM UTC every Monday"
+echo "   - Change history sync: 5:30 AM UTC daily"
+echo "   - Budget pacing report: hourly (dry-run)"
+echo "   - RSA rotation report: 7:00 AM UTC every Monday (dry-run)"
 echo ""
 echo "To view current cron jobs: crontab -l"
 echo "To edit cron jobs: crontab -e"
@@ -25,3 +37,8 @@ echo ""
 echo "Logs will be saved to:"
 echo "   - logs/ads-daily.log"
 echo "   - logs/ads-weekly.log"
+echo "   - logs/ads-changes.log"
+echo "   - logs/ads-pacing.log"
+echo "   - logs/ads-rsa.log"
+echo "   - logs/ads-telemetry.jsonl (one line per API call)"
+echo "   - logs/ads-telemetry-<script>.prom (Prometheus textfile metrics)"
@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+Mine the search_term_view report for negative keyword candidates.
+
+Search terms are streamed (search_stream, no paging) into a local SQLite store where
+each distinct term is stored once in a dictionary table and metric rows reference it
+by integer id. N-gram (1–3 token) aggregates of cost, clicks and conversions are then
+computed over the distinct terms with flat array columns, and n-grams that spend
+without converting are ranked as negative candidates.
+
+Candidates are printed (and optionally written to CSV) in the same syntax that
+houston_mobile_notary_campaign.add_campaign_negative_keywords accepts:
+  [exact term]     full search terms that never converted
+  "phrase ngram"   1–3 token n-grams that never converted
+
+Usage:
+  python3 scripts/ads/suggest_negatives.py --customer-id 5072649468 --config google-ads.yaml \
+    --days 90 --min-cost 5 --min-clicks 3 --out scripts/ads/exports/negatives.csv
+
+  # Re-rank from the local store without hitting the API
+  python3 scripts/ads/suggest_negatives.py --customer-id 5072649468 --skip-sync
+
+  # Add the top candidates to a campaign
+  python3 scripts/ads/suggest_negatives.py --customer-id 5072649468 --campaign-id 22917408924 --apply --top 25
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import re
+import sqlite3
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from google.ads.googleads.client import GoogleAdsClient
+from google.ads.googleads.errors import GoogleAdsException
+
+from ads_client import load_client
+import ads_profile
+import gaql
+
+
+DEFAULT_DB = "scripts/ads/exports/search_terms.sqlite"
+INSERT_BATCH = 5_000
+MAX_NGRAM = 3
+
+_TOKEN_RE = re.compile(r"[^\w'&+-]+", re.UNICODE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS term_dict (
+  id INTEGER PRIMARY KEY,
+  text TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS term_stats (
+  term_id INTEGER NOT NULL,
+  campaign_id INTEGER NOT NULL,
+  ad_group_id INTEGER NOT NULL,
+  date TEXT NOT NULL,
+  cost_micros INTEGER NOT NULL,
+  clicks INTEGER NOT NULL,
+  conversions REAL NOT NULL,
+  PRIMARY KEY (term_id, campaign_id, ad_group_id, date)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS term_stats_campaign ON term_stats (campaign_id, date);
+"""
+
+
+def micros_to_usd(micros: int) -> float:
+    return round(micros / 1_000_000, 2)
+
+
+def open_store(path: str) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def normalize_term(text: str) -> str:
+    return " ".join(_TOKEN_RE.split(text.lower())).strip()
+
+
+class TermDictionary:
+    """Maps normalized term text to a stable integer id backed by term_dict."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+        self._ids: Dict[str, int] = {
+            text: term_id for term_id, text in conn.execute("SELECT id, text FROM term_dict")
+        }
+        self._next = max(self._ids.values(), default=0) + 1
+        self._pending: List[Tuple[int, str]] = []
+
+    def encode(self, text: str) -> int:
+        term_id = self._ids.get(text)
+        if term_id is None:
+            term_id = self._next
+            self._next += 1
+            self._ids[text] = term_id
+            self._pending.append((term_id, text))
+        return term_id
+
+    def flush(self) -> None:
+        if self._pending:
+            self._conn.executemany("INSERT INTO term_dict (id, text) VALUES (?, ?)", self._pending)
+            self._pending.clear()
+
+
+SEARCH_TERMS = (
+    gaql.Query("search_term_view")
+    .select(
+        "search_term_view.search_term",
+        "campaign.id",
+        "ad_group.id",
+        "segments.date",
+        "metrics.cost_micros",
+        "metrics.clicks",
+        "metrics.conversions",
+    )
+    .where("segments.date BETWEEN :start AND :end")
+)
+SEARCH_TERMS_IN_CAMPAIGN = SEARCH_TERMS.where("campaign.id = :campaign_id")
+POSITIVE_KEYWORDS = (
+    gaql.Query("ad_group_criterion")
+    .select("ad_group_criterion.keyword.text")
+    .where("ad_group_criterion.type = KEYWORD")
+    .where("ad_group_criterion.negative = FALSE")
+    .where("ad_group_criterion.status != REMOVED")
+)
+CAMPAIGN_NEGATIVES = (
+    gaql.Query("campaign_criterion")
+    .select("campaign_criterion.keyword.text", "campaign_criterion.keyword.match_type")
+    .where("campaign_criterion.type = KEYWORD")
+    .where("campaign_criterion.negative = TRUE")
+    .where("campaign_criterion.status != REMOVED")
+)
+CAMPAIGN_NEGATIVES_IN_CAMPAIGN = CAMPAIGN_NEGATIVES.where("campaign.id = :campaign_id")
+
+
+def stream_search_terms(
+    client: GoogleAdsClient,
+    customer_id: str,
+    start: str,
+    end: str,
+    campaign_id: Optional[str] = None,
+) -> Iterator[Tuple[str, int, int, str, int, int, float]]:
+    if campaign_id:
+        query = SEARCH_TERMS_IN_CAMPAIGN.bind(start=start, end=end, campaign_id=int(campaign_id))
+    else:
+        query = SEARCH_TERMS.bind(start=start, end=end)
+    svc = client.get_service("GoogleAdsService")
+    stream = svc.search_stream(customer_id=customer_id, query=query)
+    for batch in stream:
+        for row in batch.results:
+            yield (
+                row.search_term_view.search_term,
+                row.campaign.id,
+                row.ad_group.id,
+                row.segments.date,
+                row.metrics.cost_micros or 0,
+                row.metrics.clicks or 0,
+                row.metrics.conversions or 0.0,
+            )
+
+
+def sync_search_terms(
+    conn: sqlite3.Connection,
+    rows: Iterable[Tuple[str, int, int, str, int, int, float]],
+    start: str,
+    end: str,
+    campaign_id: Optional[str] = None,
+) -> int:
+    """
+    Replace the stored rows for [start, end] (and `campaign_id`) with the streamed rows,
+    written in fixed-size batches; returns rows written. Search terms that normalize to
+    the same text are summed into one row, in one transaction with the delete.
+    """
+    sql = "DELETE FROM term_stats WHERE date BETWEEN ? AND ?"
+    params: List[object] = [start, end]
+    if campaign_id:
+        sql += " AND campaign_id = ?"
+        params.append(int(campaign_id))
+    conn.execute(sql, params)
+    terms = TermDictionary(conn)
+    batch: List[Tuple[int, int, int, str, int, int, float]] = []
+    total = 0
+    for text, campaign_id, ad_group_id, day, cost, clicks, conversions in rows:
+        batch.append((terms.encode(normalize_term(text)), campaign_id, ad_group_id, day, cost, clicks, conversions))
+        if len(batch) >= INSERT_BATCH:
+            total += _write_batch(conn, terms, batch)
+    if batch:
+        total += _write_batch(conn, terms, batch)
+    conn.commit()
+    return total
+
+
+def _write_batch(conn: sqlite3.Connection, terms: TermDictionary, batch: List[tuple]) -> int:
+    terms.flush()
+    conn.executemany(
+        "INSERT INTO term_stats "
+        "(term_id, campaign_id, ad_group_id, date, cost_micros, clicks, conversions) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT (term_id, campaign_id, ad_group_id, date) DO UPDATE SET "
+        "cost_micros = cost_micros + excluded.cost_micros, "
+        "clicks = clicks + excluded.clicks, "
+        "conversions = conversions + excluded.conversions",
+        batch,
+    )
+    n = len(batch)
+    batch.clear()
+    return n
+
+
+def term_totals(
+    conn: sqlite3.Connection,
+    start: str,
+    end: str,
+    campaign_id: Optional[str] = None,
+) -> Tuple[List[str], array, array, array]:
+    """
+    Collapse metric rows to one row per distinct term, returned as parallel columns
+    (texts, cost_micros, clicks, conversions). The GROUP BY runs inside SQLite, so
+    the number of Python objects is bounded by distinct terms, not by rows.
+    """
+    sql = (
+        "SELECT d.text, SUM(s.cost_micros), SUM(s.clicks), SUM(s.conversions) "
+        "FROM term_stats s JOIN term_dict d ON d.id = s.term_id "
+        "WHERE s.date BETWEEN ? AND ?"
+    )
+    params: List[object] = [start, end]
+    if campaign_id:
+        sql += " AND s.campaign_id = ?"
+        params.append(int(campaign_id))
+    sql += " GROUP BY s.term_id"
+    texts: List[str] = []
+    cost = array("q")
+    clicks = array("q")
+    conversions = array("d")
+    for text, c, k, v in conn.execute(sql, params):
+        texts.append(text)
+        cost.append(c or 0)
+        clicks.append(k or 0)
+        conversions.append(v or 0.0)
+    return texts, cost, clicks, conversions
+
+
+def ngram_totals(
+    texts: List[str],
+    cost: array,
+    clicks: array,
+    conversions: array,
+    max_n: int = MAX_NGRAM,
+) -> Tuple[List[str], array, array, array, array]:
+    """
+    Aggregate term-level columns into n-gram columns. Each n-gram is counted at most
+    once per term so repeated tokens ("notary notary") don't double its cost.
+    Returns (ngrams, cost_micros, clicks, conversions, term_count).
+    """
+    index: Dict[str, int] = {}
+    g_cost = array("q")
+    g_clicks = array("q")
+    g_conv = array("d")
+    g_terms = array("q")
+    for i, text in enumerate(texts):
+        tokens = text.split()
+        seen: Set[str] = set()
+        for n in range(1, max_n + 1):
+            for j in range(len(tokens) - n + 1):
+                seen.add(" ".join(tokens[j:j + n]))
+        c, k, v = cost[i], clicks[i], conversions[i]
+        for gram in seen:
+            g = index.get(gram)
+            if g is None:
+                g = index[gram] = len(g_cost)
+                g_cost.append(0)
+                g_clicks.append(0)
+                g_conv.append(0.0)
+                g_terms.append(0)
+            g_cost[g] += c
+            g_clicks[g] += k
+            g_conv[g] += v
+            g_terms[g] += 1
+    grams = [""] * len(index)
+    for gram, g in index.items():
+        grams[g] = gram
+    return grams, g_cost, g_clicks, g_conv, g_terms
+
+
+def fetch_protected_phrases(client: GoogleAdsClient, customer_id: str) -> Set[str]:
+    """Normalized text of every non-removed positive keyword; never suggested as a negative."""
+    svc = client.get_service("GoogleAdsService")
+    protected: Set[str] = set()
+    for batch in svc.search_stream(customer_id=customer_id, query=POSITIVE_KEYWORDS.bind()):
+        for row in batch.results:
+            protected.add(normalize_term(row.ad_group_criterion.keyword.text))
+    return protected
+
+
+def fetch_existing_negatives(
+    client: GoogleAdsClient, customer_id: str, campaign_id: Optional[str] = None
+) -> Tuple[Set[str], Set[str]]:
+    """Normalized text of the campaign negative keywords: (exact, phrase or broad)."""
+    if campaign_id:
+        query = CAMPAIGN_NEGATIVES_IN_CAMPAIGN.bind(campaign_id=int(campaign_id))
+    else:
+        query = CAMPAIGN_NEGATIVES.bind()
+    svc = client.get_service("GoogleAdsService")
+    exact: Set[str] = set()
+    broader: Set[str] = set()
+    for batch in svc.search_stream(customer_id=customer_id, query=query):
+        for row in batch.results:
+            kw = row.campaign_criterion.keyword
+            (exact if kw.match_type.name == "EXACT" else broader).add(normalize_term(kw.text))
+    return exact, broader
+
+
+def _is_protected(gram: str, protected: Set[str]) -> bool:
+    padded = f" {gram} "
+    return any(padded in f" {kw} " for kw in protected)
+
+
+def _is_negated(text: str, negatives: Tuple[Set[str], Set[str]]) -> bool:
+    """Whether an existing negative already blocks `text`: the same exact text, or a phrase/broad negative inside it."""
+    exact, broader = negatives
+    padded = f" {text} "
+    return text in exact or any(f" {kw} " in padded for kw in broader)
+
+
+def rank_candidates(
+    texts: List[str],
+    cost: array,
+    clicks: array,
+    conversions: array,
+    min_cost_micros: int,
+    min_clicks: int,
+    protected: Set[str],
+    max_n: int = MAX_NGRAM,
+    negatives: Tuple[Set[str], Set[str]] = (set(), set()),
+) -> List[Tuple[str, int, int, float, int]]:
+    """
+    Return (keyword, cost_micros, clicks, conversions, term_count) sorted by wasted cost.
+    N-grams become "phrase" candidates; whole terms that are not already covered by a
+    phrase candidate become [exact] candidates. Anything an existing campaign negative
+    (`negatives`, from fetch_existing_negatives) already blocks is left out.
+    """
+    grams, g_cost, g_clicks, g_conv, g_terms = ngram_totals(texts, cost, clicks, conversions, max_n)
+    candidates: List[Tuple[str, int, int, float, int]] = []
+    chosen: List[str] = []
+    for g in sorted(range(len(grams)), key=g_cost.__getitem__, reverse=True):
+        if g_cost[g] < min_cost_micros:
+            break
+        if g_conv[g] > 0 or g_clicks[g] < min_clicks or _is_protected(grams[g], protected):
+            continue
+        if _is_negated(grams[g], negatives):
+            continue
+        chosen.append(grams[g])
+        candidates.append((f'"{grams[g]}"', g_cost[g], g_clicks[g], g_conv[g], g_terms[g]))
+
+    for i in sorted(range(len(texts)), key=cost.__getitem__, reverse=True):
+        if cost[i] < min_cost_micros:
+            break
+        text = texts[i]
+        if conversions[i] > 0 or clicks[i] < min_clicks or text in protected or _is_negated(text, negatives):
+            continue
+        padded = f" {text} "
+        if any(f" {gram} " in padded for gram in chosen):
+            continue
+        candidates.append((f"[{text}]", cost[i], clicks[i], conversions[i], 1))
+
+    candidates.sort(key=lambda c: c[1], reverse=True)
+    return candidates
+
+
+def write_candidates_csv(path: str, candidates: List[Tuple[str, int, int, float, int]]) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["negative", "cost_usd", "clicks", "conversions", "search_terms"])
+        for kw, c, k, v, n in candidates:
+            writer.writerow([kw, micros_to_usd(c), k, v, n])
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Suggest negative keywords from search term n-grams")
+    p.add_argument("--customer-id", required=True)
+    p.add_argument("--config", default=None)
+    p.add_argument("--campaign-id", default=None, help="Limit analysis (and --apply) to one campaign")
+    p.add_argument("--days", type=int, default=90, help="Lookback window in days")
+    p.add_argument("--db", default=DEFAULT_DB, help="Local search term store (SQLite)")
+    p.add_argument("--skip-sync", action="store_true", help="Rank from the local store without calling the API")
+    p.add_argument("--min-cost", type=float, default=5.0, help="Minimum wasted spend in USD")
+    p.add_argument("--min-clicks", type=int, default=3)
+    p.add_argument("--top", type=int, default=50, help="Number of candidates to print/apply")
+    p.add_argument("--out", default=None, help="Write all candidates to this CSV")
+    p.add_argument("--apply", action="store_true", help="Add the top candidates as campaign negatives (requires --campaign-id)")
+    args = p.parse_args(argv)
+
+    if args.apply and not args.campaign_id:
+        p.error("--apply requires --campaign-id")
+
+    end = datetime.now(timezone.utc).date()
+    start = end - timedelta(days=args.days)
+
+    try:
+        conn = open_store(args.db)
+        protected: Set[str] = set()
+        negatives: Tuple[Set[str], Set[str]] = (set(), set())
+        client = None
+        if not args.skip_sync or args.apply:
+            client = load_client(args.config)
+        if not args.skip_sync:
+            n = sync_search_terms(
+                conn,
+                stream_search_terms(client, args.customer_id, str(start), str(end), args.campaign_id),
+                str(start),
+                str(end),
+                args.campaign_id,
+            )
+            print(f"Synced {n} search term rows into {args.db}")
+        if client is not None:
+            # Never rank (let alone apply) a negative that blocks our own keywords or already exists
+            protected = fetch_protected_phrases(client, args.customer_id)
+            negatives = fetch_existing_negatives(client, args.customer_id, args.campaign_id)
+
+        texts, cost, clicks, conversions = term_totals(conn, str(start), str(end), args.campaign_id)
+        candidates = rank_candidates(
+            texts,
+            cost,
+            clicks,
+            conversions,
+            min_cost_micros=int(args.min_cost * 1_000_000),
+            min_clicks=args.min_clicks,
+            protected=protected,
+            negatives=negatives,
+        )
+        print(f"\n{len(texts)} distinct search terms, {len(candidates)} negative candidates ({start} → {end}):\n")
+        for kw, c, k, v, n in candidates[: args.top]:
+            print(f"- {kw:<45} ${micros_to_usd(c):>8.2f} | clicks={k} | conv={v:g} | terms={n}")
+
+        if args.out:
+            write_candidates_csv(args.out, candidates)
+            print(f"\nWrote {args.out}")
+
+        if args.apply and candidates:
+            from houston_mobile_notary_campaign import add_campaign_negative_keywords
+
+            campaign_res = client.get_service("GoogleAdsService").campaign_path(args.customer_id, args.campaign_id)
+            negatives = [kw for kw, *_ in candidates[: args.top]]
+            add_campaign_negative_keywords(client, args.customer_id, campaign_res, negatives)
+            print(f"Added {len(negatives)} negatives to campaign {args.campaign_id}")
+        return 0
+    except GoogleAdsException as ex:
+        print(f"GoogleAdsException: {ex}")
+        for e in ex.failure.errors:
+            print(f"  - {e.error_code}: {e.message}")
+        return 2
+    except Exception as ex:  # noqa: BLE001
+        print(f"Error: {ex}")
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(ads_profile.run(main))
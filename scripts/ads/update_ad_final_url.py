@@ -18,24 +18,24 @@ from typing import List
 from google.ads.googleads.client import GoogleAdsClient
 from google.api_core import protobuf_helpers
 
+from ads_client import load_client
+import ads_profile
+import gaql
+
+
+CAMPAIGN_RSAS = (
+    gaql.Query("ad_group_ad")
+    .select("ad_group_ad.resource_name", "ad_group_ad.ad.final_urls", "ad_group_ad.ad.id", "campaign.name", "ad_group.name")
+    .where("campaign.id = :campaign_id")
+    .where("ad_group_ad.ad.type = RESPONSIVE_SEARCH_AD")
+    .where("ad_group_ad.status != REMOVED")
+)
+
 
 def find_ads(client: GoogleAdsClient, customer_id: str, campaign_id: str, from_url: str) -> List[str]:
     """Return resource_names for RSAs in a campaign whose final_urls contain from_url."""
     ga_service = client.get_service("GoogleAdsService")
-    query = f"""
-      SELECT
-        ad_group_ad.resource_name,
-        ad_group_ad.ad.final_urls,
-        ad_group_ad.ad.id,
-        ad_group_ad.status,
-        campaign.id,
-        campaign.name,
-        ad_group.name
-      FROM ad_group_ad
-      WHERE campaign.id = {campaign_id}
-        AND ad_group_ad.ad.type = RESPONSIVE_SEARCH_AD
-        AND ad_group_ad.status != REMOVED
-    """
+    query = CAMPAIGN_RSAS.bind(campaign_id=int(campaign_id))
     to_update: List[str] = []
     rows = ga_service.search(customer_id=customer_id, query=query)
     for row in rows:
@@ -82,14 +82,14 @@ def main() -> int:
     p.add_argument("--config", default="google-ads.yaml")
     args = p.parse_args()
 
-    client = GoogleAdsClient.load_from_storage(path=args.config)
+    client = load_client(args.config)
     rns = find_ads(client, args.customer_id, args.campaign_id, args.from_url)
     update_final_urls(client, args.customer_id, rns, args.to_url)
     return 0
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(ads_profile.run(main))
 
 
 
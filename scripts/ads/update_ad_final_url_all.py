@@ -35,6 +35,25 @@ from urllib.parse import urlparse
 from google.ads.googleads.client import GoogleAdsClient
 from google.api_core import protobuf_helpers
 
+from ads_client import load_client
+import ads_async
+import ads_profile
+import gaql
+
+
+ACTIVE_RSAS = (
+  gaql.Query('ad_group_ad')
+  .select(
+    'ad_group_ad.resource_name',
+    'ad_group_ad.ad.id',
+    'ad_group_ad.ad.final_urls',
+    'campaign.name',
+    'ad_group.name',
+  )
+  .where('ad_group_ad.ad.type = RESPONSIVE_SEARCH_AD')
+  .where('ad_group_ad.status != REMOVED')
+)
+
 
 def _normalize_url(u: str) -> str:
   return u.rstrip('/')
@@ -71,20 +90,7 @@ def find_ads_all_campaigns(
   mode: str,
 ) -> List[Tuple[str, str, str, str, List[str]]]:
   """Return list of tuples (resource_name, ad_id, campaign_name, ad_group_name, urls) to update."""
-  ga = client.get_service('GoogleAdsService')
-  query = """
-    SELECT
-      ad_group_ad.resource_name,
-      ad_group_ad.ad.id,
-      ad_group_ad.ad.final_urls,
-      ad_group_ad.status,
-      campaign.name,
-      ad_group.name
-    FROM ad_group_ad
-    WHERE ad_group_ad.ad.type = RESPONSIVE_SEARCH_AD
-      AND ad_group_ad.status != REMOVED
-  """
-  results = ga.search(customer_id=customer_id, query=query)
+  results = ads_async.fetch(client, customer_id, ACTIVE_RSAS.bind())
   matches: List[Tuple[str, str, str, str, List[str]]] = []
   for row in results:
     urls = list(row.ad_group_ad.ad.final_urls) if row.ad_group_ad.ad.final_urls else []
@@ -136,7 +142,7 @@ def main() -> int:
   p.add_argument('--apply', action='store_true', help='Actually apply changes (omit for dry-run)')
   args = p.parse_args()
 
-  client = GoogleAdsClient.load_from_storage(path=args.config)
+  client = load_client(args.config)
 
   print(f"Searching for RSAs to update in customer {args.customer_id}…")
   matches = find_ads_all_campaigns(client, args.customer_id, args.from_url, args.mode)
@@ -169,7 +175,7 @@ def main() -> int:
 
 
 if __name__ == '__main__':
-  sys.exit(main())
+  sys.exit(ads_profile.run(main))
 
 
 
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Upload call conversions for calls from ads that turned into bookings, from phone-system
+call-log exports.
+
+Input files are CSV or JSONL (by extension) with one call per row:
+  caller             caller number, any format (aliases: caller_id, from, ani)
+  call_start         ISO 8601; naive times are read in --timezone (aliases: start_time, started_at)
+  duration           optional, seconds (alias: duration_seconds)
+  booked             the call counts when this is truthy (1/true/yes/booked) or a booking_id
+                     is present (aliases: converted, outcome)
+  conversion_time    optional; defaults to call_start + duration (alias: booked_at)
+  value, currency    optional, default --default-value / --currency
+
+Logs are streamed and only booked calls are kept. Google matches call conversions on the
+caller number and the call start Ads recorded, so each booked call is matched to an Ads
+call (call_view) from the same area code starting within --window seconds of the logged
+start; the phone system's clock and forwarding delay rarely agree to the second. Ads calls
+are indexed per area code as intervals sorted by start, so each lookup is a bisect plus a
+short scan; of the candidates, the one closest in start and length wins, and each Ads
+call is claimed by at most one logged call. call_view only
+reports the caller's area code, so callers outside the +1 numbering plan are not matched.
+
+Matched conversions are staged in a local SQLite store keyed by (caller, Ads call start,
+conversion action), so re-imported logs never upload a call twice, and go to
+ConversionUploadService.upload_call_conversions in batches of 2,000 with partial_failure
+on. Calls too recent for conversion tracking are retried on later runs.
+
+Usage:
+  python3 scripts/ads/upload_call_conversions.py --customer-id 5072649468 --config google-ads.yaml \
+    exports/calls-2025.csv
+
+  python3 scripts/ads/upload_call_conversions.py --customer-id 5072649468 calls.jsonl --window 180 --dry-run
+  python3 scripts/ads/upload_call_conversions.py --customer-id 5072649468 --status
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from google.ads.googleads.client import GoogleAdsClient
+from google.ads.googleads.errors import GoogleAdsException
+
+from ads_client import load_client
+import ads_async
+import ads_mirror
+import ads_profile
+import enhanced_conversions
+import gaql
+import upload_click_conversions
+
+
+DEFAULT_DB = "scripts/ads/exports/call_conversions.sqlite"
+DEFAULT_CONVERSION_ACTION = "Booked calls (import)"
+DEFAULT_WINDOW_SECONDS = 120
+MAX_BATCH = 2_000
+MAX_ATTEMPTS = 5
+# The call or a new conversion action is not visible to conversion tracking yet
+RETRYABLE_ERRORS = {"TOO_RECENT_CONVERSION_ACTION", "TOO_RECENT_CALL", "CALL_NOT_FOUND"}
+TRUTHY = {"1", "true", "yes", "y", "booked", "converted"}
+
+FIELD_ALIASES = {
+    "caller": ("caller", "caller_id", "from", "ani"),
+    "call_start": ("call_start", "start_time", "started_at"),
+    "duration": ("duration", "duration_seconds"),
+    "booked": ("booked", "converted", "outcome"),
+    "booking_id": ("booking_id", "order_id"),
+    "conversion_time": ("conversion_time", "booked_at"),
+    "value": ("value", "conversion_value", "amount"),
+    "currency": ("currency", "currency_code"),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS call_conversions (
+  caller_id TEXT NOT NULL,
+  call_start_date_time TEXT NOT NULL,
+  conversion_action TEXT NOT NULL,
+  logged_start TEXT NOT NULL,
+  conversion_date_time TEXT NOT NULL,
+  value REAL,
+  currency TEXT,
+  source TEXT,
+  status TEXT NOT NULL DEFAULT 'pending',
+  error TEXT,
+  attempts INTEGER NOT NULL DEFAULT 0,
+  updated_at TEXT NOT NULL,
+  PRIMARY KEY (caller_id, call_start_date_time, conversion_action)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS call_conversions_status ON call_conversions (status);
+CREATE INDEX IF NOT EXISTS call_conversions_logged ON call_conversions (caller_id, logged_start);
+"""
+
+ADS_CALLS = (
+    gaql.Query("call_view")
+    .select(
+        "call_view.caller_country_code",
+        "call_view.caller_area_code",
+        "call_view.start_call_date_time",
+        "call_view.end_call_date_time",
+        "call_view.call_status",
+    )
+    .where("call_view.start_call_date_time BETWEEN :since AND :until")
+)
+
+AdsCall = Tuple[float, float, str]  # start, end (epoch seconds), start as Ads reports it
+
+
+def open_store(path: str) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _field(record: Dict[str, Any], name: str) -> Optional[str]:
+    for key in FIELD_ALIASES[name]:
+        value = record.get(key)
+        if value not in (None, ""):
+            return str(value).strip()
+    return None
+
+
+def _aware(value: str, tz: ZoneInfo) -> datetime:
+    dt = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    return dt if dt.tzinfo else dt.replace(tzinfo=tz)
+
+
+def read_booked_calls(
+    paths: Iterable[str], tz: ZoneInfo, default_value: Optional[float], default_currency: str
+) -> Tuple[List[Dict[str, Any]], int, int]:
+    """
+    Booked calls from the logs, streamed row by row, sorted by logged start, with callers
+    normalized to E.164. Returns (calls, rows read, booked rows skipped as unusable).
+    """
+    calls: List[Dict[str, Any]] = []
+    callers: List[Optional[str]] = []
+    read = skipped = 0
+    for path in paths:
+        for record in upload_click_conversions.read_bookings(path):
+            read += 1
+            booked = _field(record, "booked")
+            if not _field(record, "booking_id") and (booked or "").lower() not in TRUTHY:
+                continue
+            start = _field(record, "call_start")
+            try:
+                started = _aware(start, tz) if start else None
+                converted_at = _field(record, "conversion_time")
+                converted = _aware(converted_at, tz) if converted_at else None
+                duration = float(_field(record, "duration") or 0)
+                value = _field(record, "value")
+                value = float(value) if value is not None else default_value
+            except ValueError:
+                started = None
+            if started is None:
+                skipped += 1
+                continue
+            callers.append(_field(record, "caller"))
+            calls.append(
+                {
+                    "logged_start": started,
+                    "duration": duration,
+                    "conversion_date_time": converted or started + timedelta(seconds=duration),
+                    "value": value,
+                    "currency": _field(record, "currency") or default_currency,
+                    "source": os.path.basename(path),
+                }
+            )
+    for call, caller in zip(calls, enhanced_conversions.normalize_phones(callers)):
+        call["caller_id"] = caller
+    usable = [c for c in calls if c["caller_id"]]
+    usable.sort(key=lambda c: c["logged_start"])
+    return usable, read, skipped + len(calls) - len(usable)
+
+
+def area_code(caller_id: str) -> Optional[str]:
+    """NANP area code of an E.164 number, the most call_view reports about a caller."""
+    return caller_id[2:5] if caller_id.startswith("+1") and len(caller_id) == 12 else None
+
+
+class CallIndex:
+    """Ads calls per caller area code as intervals sorted by start; each call matches once."""
+
+    def __init__(self, calls: Iterable[Tuple[str, AdsCall]]):
+        by_area: Dict[str, List[AdsCall]] = {}
+        for area, call in calls:
+            by_area.setdefault(area, []).append(call)
+        self._calls = {area: sorted(items) for area, items in by_area.items()}
+        self._starts = {area: [c[0] for c in items] for area, items in self._calls.items()}
+        # Lets a lookup bisect on start alone and still see long calls that began earlier
+        self._longest = {area: max(c[1] - c[0] for c in items) for area, items in self._calls.items()}
+        self._claimed: set = set()
+
+    def __len__(self) -> int:
+        return sum(len(items) for items in self._calls.values())
+
+    def match(self, area: str, when: float, window: float, duration: float = 0) -> Optional[str]:
+        """
+        Claim the unclaimed call whose interval, widened by `window`, holds `when` and whose
+        start (and length, when the log has one) is closest to the logged call's.
+        """
+        starts = self._starts.get(area)
+        if not starts:
+            return None
+        calls = self._calls[area]
+        lo = bisect_left(starts, when - window - self._longest[area])
+        hi = bisect_right(starts, when + window)
+        best = None
+        for i in range(lo, hi):
+            start, end, _ = calls[i]
+            if end + window < when or (area, i) in self._claimed:
+                continue
+            gap = abs(start - when) + (abs(end - start - duration) if duration else 0)
+            if best is None or gap < best[0]:
+                best = (gap, i)
+        if best is None:
+            return None
+        self._claimed.add((area, best[1]))
+        return calls[best[1]][2]
+
+
+def ads_calls(
+    client: GoogleAdsClient, customer_id: str, since: datetime, until: datetime
+) -> Tuple[ZoneInfo, Iterator[Tuple[str, AdsCall]]]:
+    """Account time zone, and answered Ads calls from +1 callers between two instants."""
+    # Bounds go out in UTC padded by a day, so they hold whatever the account's zone
+    pad = timedelta(days=1)
+    results = ads_async.fetch_all(
+        client,
+        customer_id,
+        {
+            "time_zone": ads_mirror.CUSTOMER_TIME_ZONE.bind(),
+            "calls": ADS_CALLS.bind(
+                since=(since - pad).astimezone(timezone.utc).replace(tzinfo=None),
+                until=(until + pad).astimezone(timezone.utc).replace(tzinfo=None),
+            ),
+        },
+    )
+    tz = ZoneInfo(results["time_zone"][0].customer.time_zone if results["time_zone"] else "UTC")
+
+    def calls() -> Iterator[Tuple[str, AdsCall]]:
+        for row in results["calls"]:
+            call = row.call_view
+            if call.caller_country_code not in ("US", "CA") or call.call_status.name == "MISSED":
+                continue
+            start = _aware(call.start_call_date_time, tz).timestamp()
+            end = _aware(call.end_call_date_time, tz).timestamp() if call.end_call_date_time else start
+            yield call.caller_area_code, (start, end, call.start_call_date_time)
+
+    return tz, calls()
+
+
+def _ads_datetime(dt: datetime) -> str:
+    offset = dt.strftime("%z")
+    return dt.strftime("%Y-%m-%d %H:%M:%S") + f"{offset[:3]}:{offset[3:]}"
+
+
+def already_imported(conn: sqlite3.Connection) -> set:
+    """(caller, logged start) pairs staged by earlier runs."""
+    return {
+        (caller_id, logged_start)
+        for caller_id, logged_start in conn.execute("SELECT caller_id, logged_start FROM call_conversions")
+    }
+
+
+def match_calls(
+    calls: List[Dict[str, Any]], index: CallIndex, account_tz: ZoneInfo, window: float
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Booked calls with the Ads call start they match, in one pass. Returns (matched, unmatched)."""
+    matched = []
+    for call in calls:
+        area = area_code(call["caller_id"])
+        start = index.match(area, call["logged_start"].timestamp(), window, call["duration"]) if area else None
+        if start is None:
+            continue
+        call["call_start_date_time"] = upload_click_conversions.ads_datetime(start, account_tz)
+        matched.append(call)
+    return matched, len(calls) - len(matched)
+
+
+def stage(conn: sqlite3.Connection, calls: Iterable[Dict[str, Any]], action: str) -> int:
+    """Insert matched calls not seen before as pending; returns how many were new."""
+    before = conn.total_changes
+    now = _now()
+    conn.executemany(
+        "INSERT OR IGNORE INTO call_conversions "
+        "(caller_id, call_start_date_time, conversion_action, logged_start, conversion_date_time, value, currency, "
+        "source, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (
+                c["caller_id"], c["call_start_date_time"], action, _ads_datetime(c["logged_start"]),
+                _ads_datetime(c["conversion_date_time"]), c["value"], c["currency"], c["source"], now,
+            )
+            for c in calls
+        ],
+    )
+    return conn.total_changes - before
+
+
+def due_for_upload(conn: sqlite3.Connection) -> List[sqlite3.Row]:
+    retryable = " OR ".join("error LIKE ?" for _ in RETRYABLE_ERRORS)
+    return conn.execute(
+        "SELECT caller_id, call_start_date_time, conversion_action, conversion_date_time, value, currency "
+        "FROM call_conversions "
+        f"WHERE status = 'pending' OR (status = 'failed' AND attempts < ? AND ({retryable})) "
+        "ORDER BY call_start_date_time",
+        (MAX_ATTEMPTS, *(f"%.{code}%" for code in RETRYABLE_ERRORS)),
+    ).fetchall()
+
+
+def upload(client: GoogleAdsClient, customer_id: str, conn: sqlite3.Connection, rows: List[sqlite3.Row]) -> Tuple[int, int]:
+    """Upload rows in MAX_BATCH requests, recording each row's outcome. Returns (uploaded, failed)."""
+    svc = client.get_service("ConversionUploadService")
+    uploaded = failed = 0
+    for start in range(0, len(rows), MAX_BATCH):
+        batch = rows[start : start + MAX_BATCH]
+        request = client.get_type("UploadCallConversionsRequest")
+        request.customer_id = customer_id
+        request.partial_failure = True
+        for row in batch:
+            conversion = client.get_type("CallConversion")
+            conversion.caller_id = row["caller_id"]
+            conversion.call_start_date_time = row["call_start_date_time"]
+            conversion.conversion_action = row["conversion_action"]
+            conversion.conversion_date_time = row["conversion_date_time"]
+            if row["value"] is not None:
+                conversion.conversion_value = row["value"]
+                conversion.currency_code = row["currency"]
+            request.conversions.append(conversion)
+        response = svc.upload_call_conversions(request=request)
+        errors = upload_click_conversions.partial_failures(client, response)
+        whole_request = errors.pop(-1, None)
+        now = _now()
+        results = []
+        for i, row in enumerate(batch):
+            codes = errors.get(i, whole_request)
+            status, error = ("failed", ", ".join(codes)) if codes else ("uploaded", None)
+            results.append((status, error, now, row["caller_id"], row["call_start_date_time"], row["conversion_action"]))
+        with conn:
+            conn.executemany(
+                "UPDATE call_conversions SET status = ?, error = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE caller_id = ? AND call_start_date_time = ? AND conversion_action = ?",
+                results,
+            )
+        batch_failed = sum(1 for r in results if r[0] == "failed")
+        uploaded += len(batch) - batch_failed
+        failed += batch_failed
+        print(f"  batch {start // MAX_BATCH + 1}: {len(batch) - batch_failed} uploaded, {batch_failed} failed")
+    return uploaded, failed
+
+
+def print_status(conn: sqlite3.Connection) -> None:
+    for status, n in conn.execute("SELECT status, COUNT(*) FROM call_conversions GROUP BY status ORDER BY status"):
+        print(f"  {status:<9} {n}")
+    rows = conn.execute(
+        "SELECT error, COUNT(*) AS n FROM call_conversions WHERE status = 'failed' GROUP BY error ORDER BY n DESC LIMIT 10"
+    ).fetchall()
+    if rows:
+        print("Top errors:")
+        for error, n in rows:
+            print(f"  {n:>6}  {error}")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Upload call conversions for booked calls from phone-system logs")
+    p.add_argument("files", nargs="*", help="Call-log exports (.csv or .jsonl)")
+    p.add_argument("--customer-id", required=True)
+    p.add_argument("--config", default=None)
+    p.add_argument("--conversion-action", default=DEFAULT_CONVERSION_ACTION, help="UPLOAD_CALLS conversion action name")
+    p.add_argument("--window", type=float, default=DEFAULT_WINDOW_SECONDS, help="Seconds between logged and Ads call start")
+    p.add_argument("--default-value", type=float, default=None, help="Value for calls without one")
+    p.add_argument("--currency", default="USD")
+    p.add_argument("--timezone", default="America/Chicago", help="Time zone of naive log times")
+    p.add_argument("--db", default=DEFAULT_DB, help="Local upload state (SQLite)")
+    p.add_argument("--dry-run", action="store_true", help="Report what would be uploaded; leave the store unchanged")
+    p.add_argument("--status", action="store_true", help="Print the store summary and exit")
+    args = p.parse_args(argv)
+
+    conn = open_store(args.db)
+    conn.row_factory = sqlite3.Row
+    if args.status:
+        print_status(conn)
+        return 0
+
+    try:
+        calls, read, skipped = read_booked_calls(args.files, ZoneInfo(args.timezone), args.default_value, args.currency)
+        seen = already_imported(conn)
+        calls = [c for c in calls if (c["caller_id"], _ads_datetime(c["logged_start"])) not in seen]
+        print(f"Read {read} calls from {len(args.files)} file(s): {len(calls)} new booked calls, {skipped} unusable")
+
+        client = load_client(args.config)
+        action = upload_click_conversions.resolve_conversion_actions(client, args.customer_id, [args.conversion_action])
+        new = 0
+        if calls:
+            account_tz, found = ads_calls(client, args.customer_id, calls[0]["logged_start"], calls[-1]["logged_start"])
+            index = CallIndex(found)
+            matched, unmatched = match_calls(calls, index, account_tz, args.window)
+            print(f"Matched {len(matched)} to {len(index)} Ads calls; {unmatched} booked calls did not come from ads")
+            new = stage(conn, matched, action[args.conversion_action])
+        due = due_for_upload(conn)
+        print(f"{new} new, {len(due)} due for upload (pending or retryable)")
+        if args.dry_run:
+            conn.rollback()
+            print("Dry-run only; store left unchanged.")
+            return 0
+        conn.commit()
+
+        if due:
+            uploaded, failed = upload(client, args.customer_id, conn, due)
+            print(f"Uploaded {uploaded}, failed {failed} in {-(-len(due) // MAX_BATCH)} request(s)")
+        print_status(conn)
+        return 0
+    except GoogleAdsException as ex:
+        print(f"GoogleAdsException: {ex}")
+        for e in ex.failure.errors:
+            print(f"  - {e.error_code}: {e.message}")
+        return 2
+    except Exception as ex:  # noqa: BLE001
+        print(f"Error: {ex}")
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(ads_profile.run(main))
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Upload offline click conversions (bookings completed by phone or offline) from booking
+exports.
+
+Input files are CSV or JSONL (by extension) with one booking per row:
+  gclid              required; rows without one are skipped
+  conversion_time    ISO 8601; naive times are read in --timezone
+                     (aliases: conversion_date_time, booked_at, completed_at)
+  value              optional; falls back to --default-value (aliases: conversion_value, amount);
+                     rows whose value or time doesn't parse are skipped
+  currency           optional, default --currency
+  order_id           optional (alias: booking_id)
+  conversion_action  optional conversion action name, overriding --conversion-action
+  email, phone       optional; normalized and hashed (enhanced_conversions.py) and sent as
+                     user identifiers alongside the gclid (aliases: customer_email, phone_number)
+
+Every booking is staged in a local SQLite store keyed by (gclid, conversion action), so
+re-exports and overlapping files never upload the same conversion twice. Pending rows go
+to ConversionUploadService.upload_click_conversions in batches of 2,000 (the per-request
+maximum) with partial_failure on; per-row errors are stored, and rows that failed only
+because the click is not visible to conversion tracking yet are retried on later runs.
+
+Usage:
+  python3 scripts/ads/upload_click_conversions.py --customer-id 5072649468 --config google-ads.yaml \
+    exports/bookings-2025-01-31.csv exports/phone-bookings.jsonl
+
+  # Stage and report without uploading or touching the store
+  python3 scripts/ads/upload_click_conversions.py --customer-id 5072649468 bookings.csv --dry-run
+
+  # Store summary only
+  python3 scripts/ads/upload_click_conversions.py --customer-id 5072649468 --status
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from google.ads.googleads.client import GoogleAdsClient
+from google.ads.googleads.errors import GoogleAdsException
+
+from ads_client import load_client
+import ads_profile
+import ads_telemetry
+import enhanced_conversions
+import gaql
+
+
+DEFAULT_DB = "scripts/ads/exports/click_conversions.sqlite"
+DEFAULT_CONVERSION_ACTION = "Booking – HMNP"
+MAX_BATCH = 2_000
+MAX_ATTEMPTS = 5
+# Upload errors that clear up on their own: the click or a new conversion action is not
+# visible to conversion tracking yet (named *_GCLID in older API versions, *_EVENT in newer)
+RETRYABLE_ERRORS = {
+    "TOO_RECENT_CONVERSION_ACTION",
+    "TOO_RECENT_EVENT",
+    "TOO_RECENT_GCLID",
+    "EVENT_NOT_FOUND",
+    "GCLID_NOT_FOUND",
+    "CLICK_NOT_FOUND",
+}
+
+FIELD_ALIASES = {
+    "gclid": ("gclid", "GCLID"),
+    "conversion_time": ("conversion_time", "conversion_date_time", "booked_at", "completed_at"),
+    "value": ("value", "conversion_value", "amount"),
+    "currency": ("currency", "currency_code"),
+    "order_id": ("order_id", "booking_id"),
+    "conversion_action": ("conversion_action",),
+    "email": ("email", "customer_email"),
+    "phone": ("phone", "phone_number", "customer_phone"),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS click_conversions (
+  gclid TEXT NOT NULL,
+  conversion_action TEXT NOT NULL,
+  conversion_date_time TEXT NOT NULL,
+  value REAL,
+  currency TEXT,
+  order_id TEXT,
+  source TEXT,
+  hashed_email TEXT,
+  hashed_phone TEXT,
+  status TEXT NOT NULL DEFAULT 'pending',
+  error TEXT,
+  attempts INTEGER NOT NULL DEFAULT 0,
+  updated_at TEXT NOT NULL,
+  PRIMARY KEY (gclid, conversion_action)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS click_conversions_status ON click_conversions (status);
+"""
+
+CONVERSION_ACTIONS_BY_NAME = (
+    gaql.Query("conversion_action")
+    .select("conversion_action.resource_name", "conversion_action.name")
+    .where("conversion_action.name IN :names")
+    .where("conversion_action.status != REMOVED")
+)
+
+
+def open_store(path: str) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    # Stores created before user identifiers were kept
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(click_conversions)")}
+    for column in ("hashed_email", "hashed_phone"):
+        if column not in columns:
+            conn.execute(f"ALTER TABLE click_conversions ADD COLUMN {column} TEXT")
+    return conn
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def ads_datetime(value: str, tz: ZoneInfo) -> str:
+    """ISO 8601 (naive values read in `tz`) -> "yyyy-mm-dd hh:mm:ss+hh:mm" as the API expects."""
+    dt = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=tz)
+    offset = dt.strftime("%z")
+    return dt.strftime("%Y-%m-%d %H:%M:%S") + f"{offset[:3]}:{offset[3:]}"
+
+
+def _field(record: Dict[str, Any], name: str) -> Optional[str]:
+    for key in FIELD_ALIASES[name]:
+        value = record.get(key)
+        if value not in (None, ""):
+            return str(value).strip()
+    return None
+
+
+def read_bookings(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+
+
+def parse_bookings(
+    paths: Iterable[str],
+    tz: ZoneInfo,
+    default_action: str,
+    default_value: Optional[float],
+    default_currency: str,
+) -> Tuple[Dict[Tuple[str, str], Dict[str, Any]], int]:
+    """
+    Conversions keyed by (gclid, conversion action name); a booking repeated across or
+    within files keeps its earliest conversion time. Returns (conversions, skipped rows).
+    """
+    conversions: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    skipped = 0
+    for path in paths:
+        for record in read_bookings(path):
+            gclid = _field(record, "gclid")
+            when = _field(record, "conversion_time")
+            if not gclid or not when:
+                skipped += 1
+                continue
+            value = _field(record, "value")
+            try:
+                conversion_time = ads_datetime(when, tz)
+                amount = float(value) if value is not None else default_value
+            except ValueError:
+                skipped += 1
+                continue
+            action = _field(record, "conversion_action") or default_action
+            key = (gclid, action)
+            existing = conversions.get(key)
+            # Offsets differ across a DST change, so compare instants rather than strings
+            if existing and datetime.fromisoformat(existing["conversion_date_time"]) <= datetime.fromisoformat(conversion_time):
+                continue
+            conversions[key] = {
+                "gclid": gclid,
+                "action_name": action,
+                "conversion_date_time": conversion_time,
+                "value": amount,
+                "currency": _field(record, "currency") or default_currency,
+                "order_id": _field(record, "order_id"),
+                "email": _field(record, "email"),
+                "phone": _field(record, "phone"),
+                "source": os.path.basename(path),
+            }
+    return conversions, skipped
+
+
+def hash_identifiers(conversions: List[Dict[str, Any]], country_code: str) -> None:
+    """Replace raw email/phone with hashed_email/hashed_phone, hashing each column in one pass."""
+    hashed_emails, hashed_phones = enhanced_conversions.hash_columns(
+        [c.pop("email") for c in conversions], [c.pop("phone") for c in conversions], country_code
+    )
+    for c, hashed_email, hashed_phone in zip(conversions, hashed_emails, hashed_phones):
+        c["hashed_email"] = hashed_email or None
+        c["hashed_phone"] = hashed_phone or None
+
+
+def resolve_conversion_actions(client: GoogleAdsClient, customer_id: str, names: Iterable[str]) -> Dict[str, str]:
+    """Conversion action name -> resource name; unknown names raise."""
+    names = set(names)
+    svc = client.get_service("GoogleAdsService")
+    found = {
+        row.conversion_action.name: row.conversion_action.resource_name
+        for row in svc.search(customer_id=customer_id, query=CONVERSION_ACTIONS_BY_NAME.bind(names=names))
+    }
+    missing = names - found.keys()
+    if missing:
+        raise RuntimeError(f"Conversion action(s) not found: {', '.join(sorted(missing))}")
+    return found
+
+
+def stage(conn: sqlite3.Connection, conversions: Iterable[Dict[str, Any]], actions: Dict[str, str]) -> int:
+    """Insert conversions not seen before as pending; returns how many were new."""
+    before = conn.total_changes
+    conn.executemany(
+        "INSERT OR IGNORE INTO click_conversions "
+        "(gclid, conversion_action, conversion_date_time, value, currency, order_id, source, hashed_email, hashed_phone, "
+        "updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (
+                c["gclid"], actions[c["action_name"]], c["conversion_date_time"], c["value"],
+                c["currency"], c["order_id"], c["source"], c.get("hashed_email"), c.get("hashed_phone"), _now(),
+            )
+            for c in conversions
+        ],
+    )
+    return conn.total_changes - before
+
+
+def due_for_upload(conn: sqlite3.Connection) -> List[sqlite3.Row]:
+    retryable = " OR ".join("error LIKE ?" for _ in RETRYABLE_ERRORS)
+    return conn.execute(
+        "SELECT gclid, conversion_action, conversion_date_time, value, currency, order_id, hashed_email, hashed_phone "
+        "FROM click_conversions "
+        f"WHERE status = 'pending' OR (status = 'failed' AND attempts < ? AND ({retryable})) "
+        "ORDER BY conversion_date_time",
+        (MAX_ATTEMPTS, *(f"%.{code}%" for code in RETRYABLE_ERRORS)),
+    ).fetchall()
+
+
+def partial_failures(client: GoogleAdsClient, response: Any) -> Dict[int, List[str]]:
+    """Operation index -> error codes ("conversion_upload_error.X") from a partial_failure response."""
+    failed: Dict[int, List[str]] = {}
+    status = response.partial_failure_error
+    if not status or not status.code:
+        return failed
+    failure_type = type(client.get_type("GoogleAdsFailure"))
+    for detail in status.details:
+        failure = failure_type.deserialize(detail.value)
+        for err, code in zip(failure.errors, ads_telemetry.failure_codes(failure)):
+            path = err.location.field_path_elements
+            failed.setdefault(path[0].index if path else -1, []).append(code)
+    return failed
+
+
+def upload(client: GoogleAdsClient, customer_id: str, conn: sqlite3.Connection, rows: List[sqlite3.Row]) -> Tuple[int, int]:
+    """Upload rows in MAX_BATCH requests, recording each row's outcome. Returns (uploaded, failed)."""
+    svc = client.get_service("ConversionUploadService")
+    uploaded = failed = 0
+    for start in range(0, len(rows), MAX_BATCH):
+        batch = rows[start : start + MAX_BATCH]
+        request = client.get_type("UploadClickConversionsRequest")
+        request.customer_id = customer_id
+        request.partial_failure = True
+        for row in batch:
+            conversion = client.get_type("ClickConversion")
+            conversion.gclid = row["gclid"]
+            conversion.conversion_action = row["conversion_action"]
+            conversion.conversion_date_time = row["conversion_date_time"]
+            if row["value"] is not None:
+                conversion.conversion_value = row["value"]
+                conversion.currency_code = row["currency"]
+            if row["order_id"]:
+                conversion.order_id = row["order_id"]
+            conversion.user_identifiers.extend(
+                enhanced_conversions.user_identifiers(client, row["hashed_email"], row["hashed_phone"])
+            )
+            request.conversions.append(conversion)
+        response = svc.upload_click_conversions(request=request)
+        errors = partial_failures(client, response)
+        whole_request = errors.pop(-1, None)
+        now = _now()
+        results = []
+        for i, row in enumerate(batch):
+            codes = errors.get(i, whole_request)
+            status, error = ("failed", ", ".join(codes)) if codes else ("uploaded", None)
+            results.append((status, error, now, row["gclid"], row["conversion_action"]))
+        with conn:
+            conn.executemany(
+                "UPDATE click_conversions SET status = ?, error = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE gclid = ? AND conversion_action = ?",
+                results,
+            )
+        batch_failed = sum(1 for r in results if r[0] == "failed")
+        uploaded += len(batch) - batch_failed
+        failed += batch_failed
+        print(f"  batch {start // MAX_BATCH + 1}: {len(batch) - batch_failed} uploaded, {batch_failed} failed")
+    return uploaded, failed
+
+
+def print_status(conn: sqlite3.Connection) -> None:
+    for status, n in conn.execute("SELECT status, COUNT(*) FROM click_conversions GROUP BY status ORDER BY status"):
+        print(f"  {status:<9} {n}")
+    rows = conn.execute(
+        "SELECT error, COUNT(*) AS n FROM click_conversions WHERE status = 'failed' GROUP BY error ORDER BY n DESC LIMIT 10"
+    ).fetchall()
+    if rows:
+        print("Top errors:")
+        for error, n in rows:
+            print(f"  {n:>6}  {error}")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Upload offline click conversions from booking exports")
+    p.add_argument("files", nargs="*", help="Booking exports (.csv or .jsonl)")
+    p.add_argument("--customer-id", required=True)
+    p.add_argument("--config", default=None)
+    p.add_argument("--conversion-action", default=DEFAULT_CONVERSION_ACTION, help="Conversion action name for rows without one")
+    p.add_argument("--default-value", type=float, default=None, help="Value for bookings without one")
+    p.add_argument("--currency", default="USD")
+    p.add_argument("--timezone", default="America/Chicago", help="Time zone of naive booking times")
+    p.add_argument("--country-code", default=enhanced_conversions.DEFAULT_COUNTRY_CODE, help="Calling code for 10-digit phones")
+    p.add_argument("--db", default=DEFAULT_DB, help="Local upload state (SQLite)")
+    p.add_argument("--dry-run", action="store_true", help="Report what would be uploaded; leave the store unchanged")
+    p.add_argument("--status", action="store_true", help="Print the store summary and exit")
+    args = p.parse_args(argv)
+
+    conn = open_store(args.db)
+    conn.row_factory = sqlite3.Row
+    if args.status:
+        print_status(conn)
+        return 0
+
+    try:
+        conversions, skipped = parse_bookings(
+            args.files, ZoneInfo(args.timezone), args.conversion_action, args.default_value, args.currency
+        )
+        print(f"Read {len(conversions)} distinct conversions from {len(args.files)} file(s); {skipped} rows skipped")
+        hash_identifiers(list(conversions.values()), args.country_code)
+        client = load_client(args.config)
+        actions = resolve_conversion_actions(
+            client, args.customer_id, {c["action_name"] for c in conversions.values()} or {args.conversion_action}
+        )
+
+        new = stage(conn, conversions.values(), actions)
+        due = due_for_upload(conn)
+        print(f"{new} new, {len(due)} due for upload (pending or retryable)")
+        if args.dry_run:
+            conn.rollback()
+            print("Dry-run only; store left unchanged.")
+            return 0
+        conn.commit()
+
+        if due:
+            uploaded, failed = upload(client, args.customer_id, conn, due)
+            print(f"Uploaded {uploaded}, failed {failed} in {-(-len(due) // MAX_BATCH)} request(s)")
+        print_status(conn)
+        return 0
+    except GoogleAdsException as ex:
+        print(f"GoogleAdsException: {ex}")
+        for e in ex.failure.errors:
+            print(f"  - {e.error_code}: {e.message}")
+        return 2
+    except Exception as ex:  # noqa: BLE001
+        print(f"Error: {ex}")
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(ads_profile.run(main))
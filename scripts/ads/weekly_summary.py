@@ -25,6 +25,30 @@ from typing import Any
 
 from google.ads.googleads.client import GoogleAdsClient
 
+from ads_client import load_client
+import ads_async
+import ads_profile
+import gaql
+
+
+WEEKLY_CAMPAIGN_METRICS = (
+    gaql.Query("campaign")
+    .select(
+        "segments.date",
+        "campaign.id",
+        "campaign.name",
+        "campaign.status",
+        "metrics.impressions",
+        "metrics.clicks",
+        "metrics.cost_micros",
+        "metrics.conversions",
+        "metrics.conversions_value",
+    )
+    .where("segments.date BETWEEN :start AND :end")
+    .where("campaign.status != REMOVED")
+    .order_by("segments.date DESC", "campaign.name")
+)
+
 
 def micros_to_usd(micros: int) -> float:
     return round(micros / 1_000_000, 2)
@@ -35,28 +59,8 @@ def get_weekly_data(client: GoogleAdsClient, customer_id: str) -> dict[str, Any]
     end_date = datetime.now(timezone.utc).date()
     start_date = end_date - timedelta(days=7)
     
-    query = f"""
-      SELECT
-        segments.date,
-        campaign.id,
-        campaign.name,
-        campaign.status,
-        metrics.impressions,
-        metrics.clicks,
-        metrics.cost_micros,
-        metrics.conversions,
-        metrics.conversions_value,
-        metrics.average_cpc,
-        metrics.ctr,
-        metrics.average_cpm
-      FROM campaign
-      WHERE segments.date BETWEEN '{start_date}' AND '{end_date}'
-        AND campaign.status != 'REMOVED'
-      ORDER BY segments.date DESC, campaign.name
-    """
-    
-    svc = client.get_service("GoogleAdsService")
-    rows = svc.search(customer_id=customer_id, query=query)
+    query = WEEKLY_CAMPAIGN_METRICS.bind(start=start_date, end=end_date)
+    rows = ads_async.fetch(client, customer_id, query)
     
     campaigns = {}
     total_impressions = 0
@@ -282,22 +286,23 @@ def main() -> int:
     os.environ['SMTP_HOST'] = 'smtp.gmail.com'
     os.environ['SMTP_PORT'] = '587'
     
-    client = GoogleAdsClient.load_from_storage(path=args.config)
+    client = load_client(args.config)
     data = get_weekly_data(client, args.customer_id)
     
     html_content = generate_html_report(data)
     subject = f"📊 HMNP Google Ads Weekly Report - {data['summary']['start_date']} to {data['summary']['end_date']}"
     
-    send_email(html_content, subject, args.recipient)
-    
-    # Also save HTML to file for backup
-    os.makedirs('scripts/ads/exports', exist_ok=True)
-    with open(f'scripts/ads/exports/weekly-{datetime.now().strftime("%Y%m%d")}.html', 'w') as f:
-        f.write(html_content)
+    with ads_profile.phase("write"):
+        send_email(html_content, subject, args.recipient)
+        
+        # Also save HTML to file for backup
+        os.makedirs('scripts/ads/exports', exist_ok=True)
+        with open(f'scripts/ads/exports/weekly-{datetime.now().strftime("%Y%m%d")}.html', 'w') as f:
+            f.write(html_content)
     
     print(f"📁 HTML report saved to scripts/ads/exports/weekly-{datetime.now().strftime('%Y%m%d')}.html")
     return 0
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(ads_profile.run(main))
@@ -1,17 +1,32 @@
+import argparse
+import base64
+import hashlib
+import json
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import markdown
-import pdfkit
 
 ROOT = Path(__file__).resolve().parents[1]
 SOP_SRC = ROOT / 'SOP_ENHANCED.md'
 PRICING_SRC = ROOT / 'fee-schedule.md'
 DIST = ROOT / 'dist'
 LOGO = ROOT / 'logo.png'
+CACHE_FILE = DIST / '.build-cache.json'
+
+# (markdown source, pdf output) pairs built by default
+DOCUMENTS = [
+    (SOP_SRC, DIST / 'HMNP_SOP.pdf'),
+    (PRICING_SRC, DIST / 'HMNP_Pricing_QuickRef.pdf'),
+]
+
+# Inline the logo once so renderers never go back to disk (or need local file access) per page
+LOGO_SRC = f"data:image/png;base64,{base64.b64encode(LOGO.read_bytes()).decode()}" if LOGO.exists() else LOGO.as_posix()
 
 HEADER_TEMPLATE = f"""
 <div style='width:100%;text-align:center;padding-bottom:10px;'>
-    <img src='{LOGO.as_posix()}' style='height:50px;' />
+    <img src='{LOGO_SRC}' style='height:50px;' />
 </div>
 """
 FOOTER_TEMPLATE = "<div style='text-align:center;font-size:10px;'>Houston Mobile Notary Pros</div>"
@@ -26,21 +41,185 @@ PDF_OPTIONS = {
 }
 
 
-def convert_markdown_to_pdf(src: Path, dest: Path):
+def markdown_to_html(src: Path) -> str:
     html_body = markdown.markdown(src.read_text())
-    html = f"""
+    return f"""
     <html><head><meta charset='utf-8'></head>
     <body>{HEADER_TEMPLATE}{html_body}{FOOTER_TEMPLATE}</body></html>
     """
-    pdfkit.from_string(html, dest.as_posix(), options=PDF_OPTIONS)
 
 
-def main():
+class PdfkitRenderer:
+    """wkhtmltopdf via pdfkit. The binary lookup is done once, but each document still forks wkhtmltopdf."""
+
+    def __init__(self):
+        import pdfkit
+
+        self._pdfkit = pdfkit
+        self._config = pdfkit.configuration()
+
+    def render(self, html: str, dest: Path):
+        self._pdfkit.from_string(html, dest.as_posix(), options=PDF_OPTIONS, configuration=self._config)
+
+
+class WeasyPrintRenderer:
+    """
+    In-process WeasyPrint renderer; page setup and fonts are shared across every document it renders.
+    WeasyPrint is an optional extra, only needed for --backend weasyprint: pip install weasyprint
+    """
+
+    def __init__(self):
+        try:
+            from weasyprint import CSS, HTML
+            from weasyprint.text.fonts import FontConfiguration
+        except ImportError as ex:
+            raise RuntimeError('--backend weasyprint needs the optional WeasyPrint package: pip install weasyprint') from ex
+
+        self._html = HTML
+        self._fonts = FontConfiguration()
+        margins = ' '.join(PDF_OPTIONS[f'margin-{side}'] for side in ('top', 'right', 'bottom', 'left'))
+        self._page_css = CSS(
+            string=f"@page {{ size: {PDF_OPTIONS['page-size']}; margin: {margins}; }}",
+            font_config=self._fonts,
+        )
+
+    def render(self, html: str, dest: Path):
+        document = self._html(string=html, base_url=ROOT.as_posix())
+        document.write_pdf(dest.as_posix(), stylesheets=[self._page_css], font_config=self._fonts)
+
+
+RENDERERS = {
+    'pdfkit': PdfkitRenderer,
+    'weasyprint': WeasyPrintRenderer,
+}
+
+
+def convert_markdown_to_pdf(src: Path, dest: Path, renderer=None):
+    (renderer or PdfkitRenderer()).render(markdown_to_html(src), dest)
+
+
+def render_batch(backend, documents):
+    """
+    Render (src, dest) pairs with one renderer instance.
+    Returns [(dest, markdown_seconds, render_seconds, error)] so one bad document doesn't sink the batch.
+    """
+    renderer = RENDERERS[backend]()
+    results = []
+    for src, dest in documents:
+        try:
+            t0 = time.perf_counter()
+            html = markdown_to_html(src)
+            t1 = time.perf_counter()
+            renderer.render(html, dest)
+            results.append((dest, t1 - t0, time.perf_counter() - t1, None))
+        except Exception as ex:  # noqa: BLE001
+            results.append((dest, 0.0, 0.0, f'{type(ex).__name__}: {ex}'))
+    return results
+
+
+def shared_inputs_hash() -> str:
+    """Hash of everything every document depends on: templates, options and logo."""
+    h = hashlib.sha256()
+    h.update(HEADER_TEMPLATE.encode())
+    h.update(FOOTER_TEMPLATE.encode())
+    h.update(json.dumps(PDF_OPTIONS, sort_keys=True).encode())
+    if LOGO.exists():
+        h.update(LOGO.read_bytes())
+    return h.hexdigest()
+
+
+def document_hash(src: Path, shared: str, backend: str) -> str:
+    """Hash of one document's inputs, including the backend: the renderers don't produce the same PDF."""
+    h = hashlib.sha256(shared.encode())
+    h.update(backend.encode())
+    h.update(src.read_bytes())
+    return h.hexdigest()
+
+
+def load_cache() -> dict:
+    try:
+        return json.loads(CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache: dict):
+    CACHE_FILE.write_text(json.dumps(cache, indent=2, sort_keys=True))
+
+
+def parse_documents(specs):
+    """'src.md' or 'src.md:out.pdf' -> (src, dest); dest defaults to dist/<stem>.pdf."""
+    docs = []
+    for spec in specs:
+        src, _, dest = spec.partition(':')
+        src_path = Path(src).resolve()
+        docs.append((src_path, Path(dest).resolve() if dest else DIST / f'{src_path.stem}.pdf'))
+    return docs
+
+
+def build(documents, force=False, jobs=None, backend='pdfkit'):
+    """
+    Render documents whose source/template hash changed.
+    Stale documents are split into one batch per worker process; each batch reuses a single renderer.
+    Returns (results, skipped) where results are render_batch tuples.
+    """
     DIST.mkdir(exist_ok=True)
-    convert_markdown_to_pdf(SOP_SRC, DIST / 'HMNP_SOP.pdf')
-    convert_markdown_to_pdf(PRICING_SRC, DIST / 'HMNP_Pricing_QuickRef.pdf')
-    print(f"\u2705 DONE {DIST / 'HMNP_SOP.pdf'} {DIST / 'HMNP_Pricing_QuickRef.pdf'}")
+    cache = load_cache()
+    shared = shared_inputs_hash()
+
+    stale = []
+    digests = {}
+    skipped = []
+    for src, dest in documents:
+        digest = document_hash(src, shared, backend)
+        if not force and dest.exists() and cache.get(dest.as_posix()) == digest:
+            skipped.append(dest)
+        else:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            stale.append((src, dest))
+            digests[dest] = digest
+
+    workers = min(len(stale), jobs or os.cpu_count() or 1)
+    if workers <= 1:
+        results = render_batch(backend, stale) if stale else []
+    else:
+        batches = [stale[i::workers] for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = [r for batch in pool.map(render_batch, [backend] * workers, batches) for r in batch]
+
+    for dest, _, _, error in results:
+        if error is None:
+            cache[dest.as_posix()] = digests[dest]
+    if any(error is None for *_, error in results):
+        save_cache(cache)
+    return results, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render Markdown documents to PDF')
+    parser.add_argument('documents', nargs='*', help="Sources as 'src.md' or 'src.md:out.pdf' (default: SOP and pricing)")
+    parser.add_argument('--force', action='store_true', help='Rebuild even if nothing changed')
+    parser.add_argument('--jobs', type=int, default=None, help='Parallel render processes')
+    parser.add_argument('--backend', choices=sorted(RENDERERS), default='pdfkit',
+                        help='pdfkit (wkhtmltopdf per document) or weasyprint (one in-process renderer per worker; '
+                             'optional extra: pip install weasyprint)')
+    args = parser.parse_args()
+
+    documents = parse_documents(args.documents) if args.documents else DOCUMENTS
+    results, skipped = build(documents, force=args.force, jobs=args.jobs, backend=args.backend)
+    for dest in skipped:
+        print(f"= unchanged {dest}")
+    failed = 0
+    for dest, md_s, render_s, error in results:
+        if error:
+            failed += 1
+            print(f"\u274c {dest}: {error}")
+        else:
+            print(f"  {md_s * 1000:8.1f} ms markdown {render_s * 1000:9.1f} ms render  {dest}")
+    built = [str(dest) for dest, *_, error in results if error is None]
+    print(f"\u2705 DONE {' '.join(built) or '(nothing to rebuild)'}")
+    return 1 if failed else 0
 
 
 if __name__ == '__main__':
-    main()
+    raise SystemExit(main())
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Analyze site-audit "mega export" CSVs (one row per URL, one count column per issue),
+e.g. docs/data/houstonmobilenotarypros.com_mega_export_20251123.csv.
+
+The export is streamed once into a per-issue bitset index: bit i of an issue is set
+when URL i has that issue. Summaries are popcounts and multi-issue queries are plain
+AND / AND NOT over the bitsets, so crawls of hundreds of thousands of pages answer in
+milliseconds. Two snapshots are diffed by loading the newer one onto the older one's
+URL positions, which keeps the bitsets aligned.
+
+Indexes can be saved (--save) and reloaded in place of a CSV (*.bitidx).
+
+Usage:
+  # Issue counts, most common first
+  python3 scripts/site_audit.py summary docs/data/houstonmobilenotarypros.com_mega_export_20251123.csv
+
+  # URLs with both issues, but not a third
+  python3 scripts/site_audit.py query export.csv --all "Missing h1" --all "Low word count" --none "Orphaned sitemap pages"
+
+  # Issues introduced / fixed per URL between two crawls
+  python3 scripts/site_audit.py diff old_export.csv new_export.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import re
+import struct
+import sys
+from typing import Dict, Iterator, List, Optional, Tuple
+
+URL_COLUMN = "Page URL"
+INDEX_MAGIC = b"HMNPBIT1"
+_NONZERO = re.compile(rb"[^\x00]")
+
+
+def _popcount(x: int) -> int:
+    return x.bit_count() if hasattr(x, "bit_count") else bin(x).count("1")
+
+
+def iter_set_bits(x: int, nbits: int) -> Iterator[int]:
+    """Positions of set bits, skipping zero bytes at C speed."""
+    raw = x.to_bytes((nbits + 7) // 8, "little")
+    for m in _NONZERO.finditer(raw):
+        byte_index = m.start()
+        b = raw[byte_index]
+        while b:
+            low = b & -b
+            yield byte_index * 8 + low.bit_length() - 1
+            b ^= low
+
+
+def _scatter(positions: Iterator[int], remap: List[int], nbytes: int) -> int:
+    out = bytearray(nbytes)
+    for i in positions:
+        pos = remap[i]
+        out[pos >> 3] |= 1 << (pos & 7)
+    return int.from_bytes(out, "little")
+
+
+class IssueIndex:
+    """URL list plus one bitset (and occurrence total) per issue column."""
+
+    def __init__(
+        self,
+        issues: List[str],
+        urls: List[str],
+        bits: List[int],
+        totals: List[int],
+        present: Optional[int] = None,
+    ):
+        self.issues = issues
+        self.urls = urls
+        self.bits = bits
+        self.totals = totals
+        # URLs that were actually in this crawl (an index aligned onto a base also carries base-only URLs)
+        self.present = (1 << len(urls)) - 1 if present is None else present
+        self._positions: Optional[Dict[str, int]] = None
+
+    @property
+    def positions(self) -> Dict[str, int]:
+        if self._positions is None:
+            self._positions = {url: i for i, url in enumerate(self.urls)}
+        return self._positions
+
+    @classmethod
+    def from_csv(cls, path: str, base: Optional["IssueIndex"] = None) -> "IssueIndex":
+        """
+        Stream an export into bitsets. With `base`, URLs already known to base keep its
+        bit positions and unseen URLs are appended, so bitsets of both indexes line up.
+        """
+        with open(path, newline="", encoding="utf-8", errors="replace") as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            url_col = header.index(URL_COLUMN) if URL_COLUMN in header else 0
+            issues = header[:url_col] + header[url_col + 1:]
+
+            urls: List[str] = list(base.urls) if base else []
+            positions: Dict[str, int] = dict(base.positions) if base else {}
+            # bytearrays give O(1) bit sets while streaming; converted to ints at the end
+            arrays = [bytearray() for _ in issues]
+            seen = bytearray((len(urls) + 7) // 8)
+            totals = [0] * len(issues)
+            for row in reader:
+                if not row or not row[url_col]:
+                    continue
+                url = row[url_col]
+                pos = positions.get(url)
+                if pos is None:
+                    pos = positions[url] = len(urls)
+                    urls.append(url)
+                byte_index, mask = pos >> 3, 1 << (pos & 7)
+                if len(seen) <= byte_index:
+                    seen.extend(b"\x00" * (byte_index + 1 - len(seen)))
+                seen[byte_index] |= mask
+                values = (row[:url_col] + row[url_col + 1:])[: len(issues)]
+                for k in [k for k, v in enumerate(values) if v != "0" and v]:
+                    try:
+                        count = int(values[k])
+                    except ValueError:
+                        count = 1
+                    if count <= 0:
+                        continue
+                    arr = arrays[k]
+                    if len(arr) <= byte_index:
+                        arr.extend(b"\x00" * (byte_index + 1 - len(arr)))
+                    arr[byte_index] |= mask
+                    totals[k] += count
+
+        index = cls(
+            issues,
+            urls,
+            [int.from_bytes(a, "little") for a in arrays],
+            totals,
+            present=int.from_bytes(seen, "little"),
+        )
+        index._positions = positions
+        return index
+
+    @classmethod
+    def load(cls, path: str, base: Optional["IssueIndex"] = None) -> "IssueIndex":
+        if path.endswith(".bitidx"):
+            index = cls.read(path)
+            return index.realign(base) if base else index
+        return cls.from_csv(path, base)
+
+    def save(self, path: str) -> None:
+        nbytes = (len(self.urls) + 7) // 8
+        meta = json.dumps({"issues": self.issues, "totals": self.totals, "urls": len(self.urls)}).encode()
+        with open(path, "wb") as f:
+            f.write(INDEX_MAGIC)
+            f.write(struct.pack("<I", len(meta)))
+            f.write(meta)
+            url_blob = "\n".join(self.urls).encode()
+            f.write(struct.pack("<Q", len(url_blob)))
+            f.write(url_blob)
+            for bits in self.bits:
+                f.write(bits.to_bytes(nbytes, "little"))
+
+    @classmethod
+    def read(cls, path: str) -> "IssueIndex":
+        with open(path, "rb") as f:
+            if f.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+                raise ValueError(f"{path} is not a site-audit bitset index")
+            (meta_len,) = struct.unpack("<I", f.read(4))
+            meta = json.loads(f.read(meta_len))
+            (url_len,) = struct.unpack("<Q", f.read(8))
+            urls = f.read(url_len).decode().split("\n") if meta["urls"] else []
+            nbytes = (len(urls) + 7) // 8
+            bits = [int.from_bytes(f.read(nbytes), "little") for _ in meta["issues"]]
+        return cls(meta["issues"], urls, bits, meta["totals"])
+
+    def realign(self, base: "IssueIndex") -> "IssueIndex":
+        """Re-map a loaded index onto base's URL positions (slow path; CSVs align while streaming)."""
+        urls = list(base.urls)
+        positions = dict(base.positions)
+        remap: List[int] = []
+        for url in self.urls:
+            pos = positions.get(url)
+            if pos is None:
+                pos = positions[url] = len(urls)
+                urls.append(url)
+            remap.append(pos)
+        nbytes = (len(urls) + 7) // 8
+        present = _scatter(range(len(self.urls)), remap, nbytes)
+        bits = [_scatter(iter_set_bits(b, len(self.urls)), remap, nbytes) for b in self.bits]
+        index = IssueIndex(self.issues, urls, bits, list(self.totals), present=present)
+        index._positions = positions
+        return index
+
+    def resolve(self, name: str) -> int:
+        """Issue column by exact name, then case-insensitive, then unique substring."""
+        if name in self.issues:
+            return self.issues.index(name)
+        lowered = [i.lower() for i in self.issues]
+        if name.lower() in lowered:
+            return lowered.index(name.lower())
+        matches = [k for k, issue in enumerate(lowered) if name.lower() in issue]
+        if len(matches) == 1:
+            return matches[0]
+        if not matches:
+            raise KeyError(f"Unknown issue '{name}'")
+        raise KeyError(f"Ambiguous issue '{name}': " + ", ".join(self.issues[k] for k in matches))
+
+    def issue_bits(self, name: str) -> int:
+        return self.bits[self.resolve(name)]
+
+    def query(self, all_of: List[str], any_of: List[str], none_of: List[str]) -> int:
+        mask = self.present
+        for name in all_of:
+            mask &= self.issue_bits(name)
+        if any_of:
+            either = 0
+            for name in any_of:
+                either |= self.issue_bits(name)
+            mask &= either
+        for name in none_of:
+            mask &= ~self.issue_bits(name)
+        return mask
+
+    def summary(self) -> List[Tuple[str, int, int]]:
+        """(issue, urls_affected, total_occurrences) for issues present, most URLs first."""
+        rows = [(issue, _popcount(b), t) for issue, b, t in zip(self.issues, self.bits, self.totals) if b]
+        rows.sort(key=lambda r: (-r[1], r[0]))
+        return rows
+
+
+def diff(old: IssueIndex, new: IssueIndex) -> Tuple[Dict[str, List[str]], Dict[str, List[str]], int, int]:
+    """
+    Per-URL issues introduced and fixed between two aligned indexes (new loaded with base=old).
+    Pages that only exist in one snapshot are counted, not diffed.
+    Returns (introduced, fixed, pages_added, pages_removed).
+    """
+    n = len(new.urls)
+    old_pages = old.present
+    new_pages = new.present
+    both = old_pages & new_pages
+
+    old_col = {issue: k for k, issue in enumerate(old.issues)}
+    introduced: Dict[str, List[str]] = {}
+    fixed: Dict[str, List[str]] = {}
+    for k, issue in enumerate(new.issues):
+        new_bits = new.bits[k] & both
+        old_bits = old.bits[old_col[issue]] & both if issue in old_col else 0
+        for i in iter_set_bits(new_bits & ~old_bits, n):
+            introduced.setdefault(new.urls[i], []).append(issue)
+        for i in iter_set_bits(old_bits & ~new_bits, n):
+            fixed.setdefault(new.urls[i], []).append(issue)
+    return introduced, fixed, _popcount(new_pages & ~old_pages), _popcount(old_pages & ~new_pages)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Bitset-indexed site-audit export analyzer")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    s = sub.add_parser("summary", help="Issue counts for one export")
+    s.add_argument("export", help="Mega export CSV or saved .bitidx")
+    s.add_argument("--save", default=None, help="Write the bitset index to this .bitidx path")
+
+    q = sub.add_parser("query", help="URLs matching a combination of issues")
+    q.add_argument("export")
+    q.add_argument("--all", dest="all_of", action="append", default=[], help="URL must have this issue; repeatable")
+    q.add_argument("--any", dest="any_of", action="append", default=[], help="URL must have at least one of these")
+    q.add_argument("--none", dest="none_of", action="append", default=[], help="URL must not have this issue")
+    q.add_argument("--count", action="store_true", help="Only print the number of matching URLs")
+
+    d = sub.add_parser("diff", help="Issues introduced/fixed per URL between two exports")
+    d.add_argument("old")
+    d.add_argument("new")
+    args = p.parse_args(argv)
+
+    try:
+        if args.command == "summary":
+            index = IssueIndex.load(args.export)
+            print(f"{len(index.urls)} URLs, {len(index.issues)} issue columns\n")
+            for issue, urls, total in index.summary():
+                print(f"{urls:>8}  {total:>8}  {issue}")
+            if args.save:
+                index.save(args.save)
+                print(f"\nSaved index to {args.save}")
+        elif args.command == "query":
+            index = IssueIndex.load(args.export)
+            mask = index.query(args.all_of, args.any_of, args.none_of)
+            if args.count:
+                print(_popcount(mask))
+            else:
+                for i in iter_set_bits(mask, len(index.urls)):
+                    print(index.urls[i])
+        else:
+            old = IssueIndex.load(args.old)
+            new = IssueIndex.load(args.new, base=old)
+            introduced, fixed, added, removed = diff(old, new)
+            print(f"Pages added: {added} | removed: {removed}")
+            print(f"\nNewly introduced issues ({sum(map(len, introduced.values()))} on {len(introduced)} URLs):")
+            for url in sorted(introduced):
+                print(f"+ {url}\n    " + "\n    ".join(introduced[url]))
+            print(f"\nFixed issues ({sum(map(len, fixed.values()))} on {len(fixed)} URLs):")
+            for url in sorted(fixed):
+                print(f"- {url}\n    " + "\n    ".join(fixed[url]))
+        return 0
+    except (KeyError, ValueError, OSError) as ex:
+        print(f"Error: {ex}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())